@@ -1,6 +1,37 @@
 # unified_tts/__init__.py
+import logging
 from .core import UnifiedTTS
-from .exceptions import UnifiedTTSError, ConfigurationError, ProviderNotFoundError, SynthesisError
+from .async_core import AsyncUnifiedTTS
+from .cache import SynthesisCache, CacheStats, make_cache_key
+from .mmap_cache import MmapCache
+from .batch import BatchItem, BatchResult
+from .incremental import TextChunker, TextStream, AsyncTextStream, AudioFrame
+from .routing import RoutingPolicy, CircuitBreaker
+from .ratelimit import RateLimiter
+from .scheduler import RequestScheduler, PRIORITIES
+from .client_pool import ClientPool
+from .batching import MicroBatcher
+from .warmup import Warmer, HotPromptTracker, load_manifest
+from .exceptions import UnifiedTTSError, ConfigurationError, ProviderNotFoundError, SynthesisError, DeadlineExceededError, OverloadedError
+from .transport import TransportConfig, RetryPolicy
+from .metrics import MetricsRegistry, MetricsHooks, SynthesisHooks, SynthesisEvent, REGISTRY
+from .registry import AVAILABLE_PROVIDERS, ProviderRegistry, register_provider
+
+# Imported on first access: the job subsystem pulls in sqlite3 and multiprocessing, audio processing NumPy
+_LAZY_EXPORTS = {
+    'JobStore': '.jobs', 'JobTask': '.jobs', 'WorkerPool': '.jobs',
+    'AudioPipeline': '.processing', 'StreamProcessor': '.processing', 'Resampler': '.processing',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Library logging: silent unless the application configures a handler
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __version__ = "0.1.0" # Example version
 
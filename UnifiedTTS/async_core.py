@@ -0,0 +1,737 @@
+# unified_tts/async_core.py
+
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, AsyncIterator, Dict, Any, Iterable, List, Union, TYPE_CHECKING
+from .core import UnifiedTTS, LOCAL_ERRORS, _remove_quietly
+from .batch import BatchItem, BatchResult
+from .audio import AudioJoiner, join_audio
+from .incremental import TextChunker, AsyncTextStream
+from .exceptions import UnifiedTTSError, SynthesisError, DeadlineExceededError
+from .ratelimit import Permit
+from .scheduler import Ticket
+from .metrics import Observation, SynthesisEvent
+from .warmup import Warmer, HotPromptTracker
+from .routing import RoutingPolicy
+from .providers.base import BaseTTSProvider, DEFAULT_STREAM_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from .processing import StreamProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUnifiedTTS(UnifiedTTS):
+    """
+    Asyncio counterpart of `UnifiedTTS`.
+
+    Providers are configured exactly as for `UnifiedTTS` (same `config` dict,
+    same `provider_key` kwargs, same `AVAILABLE_PROVIDERS` registry) and raise
+    the same exceptions. Synthesis goes through each provider's async methods,
+    so no thread is pinned per in-flight request for providers with a native
+    async client.
+
+    Use as an async context manager (or call `aclose`) to release connection pools:
+
+        async with AsyncUnifiedTTS(openai_api_key='sk-...') as tts:
+            audio = await tts.synthesize("Hello", provider='openai')
+    """
+
+    async def __aenter__(self) -> "AsyncUnifiedTTS":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the async clients of all initialized providers, the clients pooled for per-call API keys and the micro-batcher."""
+        if self.micro_batcher is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.micro_batcher.close) # Waits for batches in flight
+        for tts_provider in self.providers.values():
+            await tts_provider.aclose()
+        if self.client_pool is not None:
+            self.client_pool.close()
+
+    async def warm_up(self, providers: Optional[Iterable[str]] = None, connections: int = 1) -> Dict[str, Optional[str]]:
+        """
+        Initializes providers and opens connections of their async clients, so the first requests start warm.
+
+        Args and Returns are the same as for `UnifiedTTS.warm_up`; providers are warmed up concurrently.
+        """
+        names = list(providers) if providers is not None else self.list_available_providers()
+
+        async def warm_one(name: str) -> Optional[str]:
+            try:
+                await self._get_provider(name).awarm_up(connections)
+            except UnifiedTTSError as e:
+                logger.warning("Warm-up of provider '%s' failed: %s", name, e)
+                return str(e)
+            return None
+
+        return dict(zip(names, await asyncio.gather(*(warm_one(name) for name in names))))
+
+    def warmer(
+        self,
+        manifest: Union[str, Iterable[Any], None] = None,
+        tracker: Optional[HotPromptTracker] = None,
+        provider: Optional[str] = None,
+        connections: int = 1,
+        **kwargs
+    ) -> Warmer:
+        """
+        Builds a `Warmer` for this instance; must be called from a running event loop.
+
+        Arguments are the same as for `UnifiedTTS.warmer`. The warmer's thread runs the
+        connection warm-up and each pre-synthesis on this loop and waits for them, so
+        never block the loop on `wait_ready`; await it in an executor instead:
+
+            warmer = tts.warmer(manifest, provider="openai").start()
+            await asyncio.get_running_loop().run_in_executor(None, warmer.wait_ready)
+        """
+        loop = asyncio.get_running_loop()
+
+        def run(coroutine):
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        def synthesize(item: BatchItem) -> None:
+            run(self.synthesize(item.text, item.provider, output_format=item.output_format, priority='bulk', **item.kwargs))
+
+        return self._build_warmer(synthesize, lambda: run(self.warm_up(connections=connections)), manifest, tracker, provider, kwargs)
+
+    async def synthesize(
+        self,
+        text: str,
+        provider: Union[str, RoutingPolicy],
+        output_path: Optional[str] = None,
+        output_format: Optional[str] = None,
+        **kwargs
+    ) -> Optional[bytes]:
+        """
+        Asynchronously synthesizes speech using the specified provider.
+
+        Args, Returns and Raises are the same as for `UnifiedTTS.synthesize`, including
+        routing with `provider='auto'` or a RoutingPolicy. Micro-batches are sent from
+        the batcher's worker threads with the provider's synchronous client.
+        """
+        batchable = kwargs.pop('micro_batch', True)
+        policy = self._routing_policy(provider)
+        if policy is not None:
+            self._check_routable(kwargs)
+            audio_bytes = await self._asynthesize_routed(policy, text, output_format, kwargs)
+            if output_path:
+                await self._asave_chunks(output_path, _single_chunk(audio_bytes))
+                return None
+            return audio_bytes
+
+        if not output_path:
+            return (await self._asynthesize_single(text, provider, output_format, kwargs, batchable))[0]
+
+        pipeline = kwargs.pop('pipeline', self.pipeline)
+        with self._lease_provider(provider, kwargs.pop('api_key', None)) as tts_provider:
+            synth_args = self._build_synth_args(output_format, kwargs)
+            observation = self._observe('request', provider, text, synth_args, streaming=True)
+            chunks = self._astream_text(provider, tts_provider, text, synth_args, DEFAULT_STREAM_CHUNK_SIZE, observation)
+            if pipeline is not None:
+                chunks = self._aprocess_stream(chunks, pipeline.stream_processor(*self._pipeline_input(tts_provider, synth_args)))
+            try:
+                await self._asave_chunks(output_path, observation.wrap_async_stream(chunks))
+            except Exception as e:
+                observation.fail(e) # No-op if the stream already recorded the failure
+                raise
+            await asyncio.get_running_loop().run_in_executor(None, self._finalize_streamed_wav, output_path)
+            return None
+
+    async def _asynthesize_single(
+        self,
+        text: str,
+        provider: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+        batchable: bool = True,
+    ) -> tuple:
+        """Async variant of `UnifiedTTS._synthesize_single`."""
+        pipeline = kwargs.pop('pipeline', self.pipeline)
+        api_key = kwargs.pop('api_key', None)
+        with self._lease_provider(provider, api_key) as tts_provider:
+            synth_args = self._build_synth_args(output_format, kwargs)
+            observation = self._observe('request', provider, text, synth_args)
+            try:
+                audio_bytes = await self._asynthesize_bytes(
+                    provider, tts_provider, text, synth_args, observation, batchable=batchable and api_key is None
+                )
+                if pipeline is not None:
+                    # CPU-bound; keep it off the event loop
+                    audio_bytes = await asyncio.get_running_loop().run_in_executor(
+                        None, pipeline.process, audio_bytes, *self._pipeline_input(tts_provider, synth_args)
+                    )
+            except Exception as e:
+                observation.fail(e)
+                raise
+            observation.output(audio_bytes)
+            observation.finish()
+            return audio_bytes, observation.event
+
+    async def _asynthesize_bytes(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        observation: Observation,
+        batchable: bool = False,
+    ) -> bytes:
+        """Returns the complete clip for a request, from the cache, a micro-batch or the provider's async API (segmented if needed)."""
+        phrases = self._phrases(tts_provider, text, synth_args)
+        if phrases is not None:
+            return join_audio(
+                [audio async for audio in self._aphrase_audio(provider, tts_provider, phrases, synth_args, observation)],
+                self._join_format(tts_provider, synth_args), self.phrase_crossfade, synth_args.get('sample_rate'),
+            )
+
+        cache_key = self._cache_key(provider, text, synth_args)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                observation.event.cache_hit = True
+                return bytes(cached)
+
+        segments = self._segment_text(tts_provider, text)
+        if len(segments) > 1:
+            output_format = self._join_format(tts_provider, synth_args)
+            audio_bytes = join_audio(
+                [audio async for audio in self._asynthesize_segments(provider, tts_provider, segments, synth_args)], output_format
+            )
+        elif batchable and self._micro_batchable(tts_provider, text, synth_args):
+            audio_bytes = await asyncio.wrap_future(self._submit_micro_batch(provider, tts_provider, text, synth_args))
+        else:
+            audio_bytes = await self._acall_provider(provider, tts_provider, text, synth_args)
+        if cache_key is not None:
+            self.cache.put(cache_key, audio_bytes)
+        return audio_bytes
+
+    async def _acall_provider(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+    ) -> bytes:
+        """Async variant of `UnifiedTTS._call_provider`."""
+        permit = await self._aacquire_rate_limit(provider, text, synth_args)
+        observation = self._observe('provider', provider, text, synth_args)
+        try:
+            audio_bytes = await tts_provider.asynthesize(text, **self._provider_args(provider, text, synth_args))
+        except SynthesisError as e:
+            observation.fail(e)
+            raise
+        except Exception as e:
+            observation.fail(e)
+            raise SynthesisError(f"Unexpected error during synthesis with provider '{provider}': {e}")
+        finally:
+            if permit is not None:
+                permit.release()
+        observation.output(audio_bytes)
+        observation.finish()
+        return audio_bytes
+
+    async def _asynthesize_segments(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        segments: List[str],
+        synth_args: Dict[str, Any],
+    ) -> AsyncIterator[bytes]:
+        """
+        Async variant of `UnifiedTTS._synthesize_segments`: at most `segment_workers`
+        segments are in flight; each is yielded once it and every earlier segment are
+        done. Closing the generator early cancels the remaining segments.
+        """
+        limit = asyncio.Semaphore(max(1, self.segment_workers))
+
+        async def synthesize_segment(segment: str) -> bytes:
+            async with limit:
+                return await self._acall_provider(provider, tts_provider, segment, synth_args)
+
+        tasks = [asyncio.ensure_future(synthesize_segment(segment)) for segment in segments]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _aphrase_audio(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        phrases: List[str],
+        synth_args: Dict[str, Any],
+        observation: Optional[Observation] = None,
+    ) -> AsyncIterator[bytes]:
+        """Async variant of `UnifiedTTS._phrase_audio`."""
+        keys, found, missing = self._lookup_phrases(provider, phrases, synth_args, observation)
+        synthesized = self._asynthesize_segments(provider, tts_provider, missing, synth_args)
+        ready: Dict[str, bytes] = {}
+        try:
+            for key, audio in zip(keys, found):
+                if audio is None:
+                    audio = ready.get(key)
+                    if audio is None:
+                        audio = ready[key] = await synthesized.__anext__() # Misses complete in first-seen order
+                        self.cache.put(key, audio)
+                yield audio
+        finally:
+            await synthesized.aclose()
+
+    async def _astream_text(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        chunk_size: int,
+        observation: Optional[Observation] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Async variant of `UnifiedTTS._cached_stream`: streams from the cache on a hit;
+        otherwise phrase by phrase in phrase cache mode, segment by segment for long
+        texts, or straight from the provider's async stream, storing the complete clip
+        once the stream finishes successfully.
+        """
+        phrases = self._phrases(tts_provider, text, synth_args)
+        if phrases is not None:
+            joiner = AudioJoiner(self._join_format(tts_provider, synth_args), self.phrase_crossfade, synth_args.get('sample_rate'))
+            async for chunk in self._ajoin_stream(self._aphrase_audio(provider, tts_provider, phrases, synth_args, observation), joiner):
+                yield chunk
+            return
+
+        cache_key = self._cache_key(provider, text, synth_args)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if observation is not None:
+                    observation.event.cache_hit = True
+                view = memoryview(cached)
+                for start in range(0, len(view), chunk_size):
+                    yield bytes(view[start:start + chunk_size])
+                return
+
+        segments = self._segment_text(tts_provider, text)
+        if len(segments) > 1:
+            output_format = self._join_format(tts_provider, synth_args)
+            segment_audio: List[bytes] = []
+
+            async def collect() -> AsyncIterator[bytes]:
+                async for audio in self._asynthesize_segments(provider, tts_provider, segments, synth_args):
+                    if cache_key is not None:
+                        segment_audio.append(audio)
+                    yield audio
+
+            async for chunk in self._ajoin_stream(collect(), AudioJoiner(output_format)):
+                yield chunk
+            if cache_key is not None:
+                self.cache.put(cache_key, join_audio(segment_audio, output_format))
+            return
+
+        pieces = []
+        async for chunk in self._astream_from_provider(provider, tts_provider, text, synth_args, chunk_size):
+            if cache_key is not None:
+                pieces.append(chunk)
+            yield chunk
+        if cache_key is not None:
+            self.cache.put(cache_key, b''.join(pieces))
+
+    @staticmethod
+    async def _ajoin_stream(pieces: AsyncIterator[bytes], joiner: AudioJoiner) -> AsyncIterator[bytes]:
+        """Async variant of `audio.stream_joined_audio`: joins complete clips into one stream."""
+        try:
+            async for audio in pieces:
+                out = joiner.feed(audio)
+                if out:
+                    yield out
+        finally:
+            await pieces.aclose()
+        out = joiner.finish()
+        if out:
+            yield out
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        provider: Union[str, RoutingPolicy],
+        output_format: Optional[str] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Asynchronously synthesizes speech, yielding audio chunks as they arrive.
+
+        Args, Yields and Raises are the same as for `UnifiedTTS.synthesize_stream`;
+        routed streams fail over only until the first chunk arrives.
+        """
+        kwargs.pop('micro_batch', None) # Streams are never batched
+        policy = self._routing_policy(provider)
+        if policy is not None:
+            self._check_routable(kwargs)
+            async for chunk in self._astream_routed(policy, text, output_format, chunk_size, kwargs):
+                yield chunk
+            return
+        async for chunk in self._astream_single(text, provider, output_format, chunk_size, kwargs):
+            yield chunk
+
+    async def _astream_single(
+        self,
+        text: str,
+        provider: str,
+        output_format: Optional[str],
+        chunk_size: int,
+        kwargs: Dict[str, Any],
+        events: Optional[List[SynthesisEvent]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Async variant of `UnifiedTTS._stream_single`."""
+        pipeline = kwargs.pop('pipeline', self.pipeline)
+        with self._lease_provider(provider, kwargs.pop('api_key', None)) as tts_provider:
+            synth_args = self._build_synth_args(output_format, kwargs)
+            observation = self._observe('request', provider, text, synth_args, streaming=True)
+            if events is not None:
+                events.append(observation.event)
+            chunks = self._astream_text(provider, tts_provider, text, synth_args, chunk_size, observation)
+            if pipeline is not None:
+                chunks = self._aprocess_stream(chunks, pipeline.stream_processor(*self._pipeline_input(tts_provider, synth_args)))
+            async for chunk in observation.wrap_async_stream(chunks):
+                yield chunk
+
+    def open_text_stream(
+        self,
+        provider: str,
+        output_format: Optional[str] = None,
+        chunker: Optional[TextChunker] = None,
+        prefetch: int = 2,
+        **kwargs
+    ) -> AsyncTextStream:
+        """
+        Opens an incremental synthesis session; must be called from a running event loop.
+
+        Arguments are the same as for `UnifiedTTS.open_text_stream`; the audio is
+        consumed with `async for frame in stream`.
+        """
+        return AsyncTextStream(
+            lambda text: self.synthesize_stream(text, provider, output_format=output_format, **kwargs),
+            chunker=chunker,
+            prefetch=prefetch,
+        )
+
+    async def synthesize_batch(
+        self,
+        items: Iterable[Union[BatchItem, Dict[str, Any]]],
+        max_workers: int = 4,
+        per_provider_concurrency: Optional[Union[int, Dict[str, int]]] = None,
+        ordered: bool = False,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Asynchronously synthesizes many requests, at most `max_workers` at a time.
+
+        Arguments and behavior are the same as for `UnifiedTTS.synthesize_batch`
+        (deduplication, per-provider caps, per-item errors); results are consumed
+        with `async for result in tts.synthesize_batch(items)`.
+        """
+        batch = [BatchItem.coerce(item) for item in items]
+        pending_groups = iter(self._batch_groups(batch))
+        limits = {
+            name: asyncio.Semaphore(limit)
+            for name, limit in self._batch_limits(batch, per_provider_concurrency).items()
+        }
+
+        async def run_group(indices: List[int]) -> List[BatchResult]:
+            item = batch[indices[0]]
+            limit = limits.get(item.provider)
+            try:
+                if limit is not None:
+                    async with limit:
+                        audio = await self.synthesize(item.text, item.provider, output_format=item.output_format, **item.kwargs)
+                else:
+                    audio = await self.synthesize(item.text, item.provider, output_format=item.output_format, **item.kwargs)
+            except (UnifiedTTSError, IOError) as e:
+                return [BatchResult(index, batch[index], error=e) for index in indices]
+
+            results = []
+            for index in indices:
+                target = batch[index]
+                if not target.output_path:
+                    results.append(BatchResult(index, target, audio=audio))
+                    continue
+                try:
+                    await self._asave_chunks(target.output_path, _single_chunk(audio))
+                    results.append(BatchResult(index, target))
+                except IOError as e:
+                    results.append(BatchResult(index, target, error=e))
+            return results
+
+        # At most `max_workers` groups in flight; the next one starts as each finishes
+        in_flight = set()
+        for indices in pending_groups:
+            in_flight.add(asyncio.ensure_future(run_group(indices)))
+            if len(in_flight) >= max(1, max_workers):
+                break
+        next_index = 0
+        completed: Dict[int, BatchResult] = {}
+        try:
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for result in task.result():
+                        if ordered:
+                            completed[result.index] = result
+                        else:
+                            yield result
+                    next_group = next(pending_groups, None)
+                    if next_group is not None:
+                        in_flight.add(asyncio.ensure_future(run_group(next_group)))
+
+                while ordered and next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+        finally:
+            for task in in_flight:
+                task.cancel() # The caller stopped iterating early
+
+    # --- Routing ---
+
+    async def _arouted_attempt(
+        self,
+        policy: RoutingPolicy,
+        provider: str,
+        text: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> bytes:
+        """Async variant of `UnifiedTTS._routed_attempt`."""
+        start = time.monotonic()
+        ok: Optional[bool] = None # None: the attempt says nothing about the provider
+        try:
+            audio_bytes, event = await self._asynthesize_single(text, provider, output_format, policy.kwargs_for(provider, kwargs))
+            ok = None if event.cache_hit else True
+            return audio_bytes
+        except SynthesisError as e:
+            if not isinstance(e, LOCAL_ERRORS):
+                ok = False
+            raise
+        finally:
+            self._end_attempt(policy, provider, start, ok)
+
+    async def _asynthesize_routed(
+        self,
+        policy: RoutingPolicy,
+        text: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> bytes:
+        """Runs a request through the routing policy (failover, optionally hedged)."""
+        candidates = self._routing_candidates(policy)
+        if policy.hedge and len(candidates) > 1:
+            return await self._asynthesize_hedged(policy, candidates, text, output_format, kwargs)
+
+        errors = []
+        for name in candidates:
+            if not policy.breaker(name).allow_request():
+                continue
+            try:
+                return await self._arouted_attempt(policy, name, text, output_format, kwargs)
+            except SynthesisError as e:
+                errors.append(f"{name}: {e}")
+        raise SynthesisError(self._routing_failure_message(candidates, errors))
+
+    async def _asynthesize_hedged(
+        self,
+        policy: RoutingPolicy,
+        candidates: List[str],
+        text: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> bytes:
+        """
+        Async variant of `UnifiedTTS._synthesize_hedged`: attempts are tasks, and a
+        hedge is started when `asyncio.wait` times out on the primary. Losing attempts
+        finish in the background and still update the policy's statistics.
+        """
+        remaining = list(candidates)
+        pending: Dict["asyncio.Task[bytes]", str] = {}
+        errors: List[str] = []
+
+        def launch_next() -> Optional[str]:
+            while remaining:
+                name = remaining.pop(0)
+                if policy.breaker(name).allow_request():
+                    task = asyncio.ensure_future(self._arouted_attempt(policy, name, text, output_format, kwargs))
+                    pending[task] = name
+                    return name
+            return None
+
+        primary = launch_next()
+        if primary is None:
+            raise SynthesisError(self._routing_failure_message(candidates, errors))
+        hedge_timeout: Optional[float] = policy.hedge_delay(primary)
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=hedge_timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than its p95: hedge with the next healthy provider
+                    hedge_timeout = None
+                    launch_next()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    try:
+                        return task.result()
+                    except SynthesisError as e:
+                        errors.append(f"{name}: {e}")
+                if not pending:
+                    launch_next() # Fail over
+        finally:
+            for task in pending:
+                _BACKGROUND_TASKS.add(task) # Keep a reference until the losing attempt finishes
+                task.add_done_callback(_finish_background_task)
+        raise SynthesisError(self._routing_failure_message(candidates, errors))
+
+    async def _astream_routed(
+        self,
+        policy: RoutingPolicy,
+        text: str,
+        output_format: Optional[str],
+        chunk_size: int,
+        kwargs: Dict[str, Any],
+    ) -> AsyncIterator[bytes]:
+        """Streams from the best candidate, failing over until the first chunk arrives."""
+        candidates = self._routing_candidates(policy)
+        errors = []
+        for name in candidates:
+            if not policy.breaker(name).allow_request():
+                continue
+            start = time.monotonic()
+            events: List[SynthesisEvent] = []
+            stream = self._astream_single(text, name, output_format, chunk_size, policy.kwargs_for(name, kwargs), events)
+            ok: Optional[bool] = None
+            try:
+                try:
+                    first_chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    first_chunk = b''
+                # Time to first audio is what interactive callers wait on
+                ok = None if events and events[0].cache_hit else True
+            except SynthesisError as e:
+                if not isinstance(e, LOCAL_ERRORS):
+                    ok = False
+                errors.append(f"{name}: {e}")
+                continue
+            finally:
+                self._end_attempt(policy, name, start, ok)
+            if first_chunk:
+                yield first_chunk
+            async for chunk in stream:
+                yield chunk
+            return
+        raise SynthesisError(self._routing_failure_message(candidates, errors))
+
+    async def _aacquire_rate_limit(self, provider: str, text: str, synth_args: Dict[str, Any]) -> Union[Permit, Ticket, None]:
+        """Async variant of `UnifiedTTS._acquire_rate_limit`; queues without blocking the event loop."""
+        deadline = synth_args.get('deadline')
+        ticket = None
+        if self.scheduler is not None:
+            ticket = await self.scheduler.acquire_async(
+                synth_args.get('priority'), synth_args.get('tenant'), cost=len(text), deadline=deadline
+            )
+        limiter = self.rate_limiters.get(provider)
+        if limiter is None:
+            return ticket
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            permit = await limiter.acquire_async(chars=len(text), timeout=timeout)
+        except BaseException:
+            if ticket is not None:
+                ticket.release()
+            raise
+        if permit is None:
+            if ticket is not None:
+                ticket.release()
+            raise DeadlineExceededError(f"Deadline exceeded while waiting for the '{provider}' rate limiter.")
+        return permit if ticket is None else ticket.attach(permit)
+
+    async def _astream_from_provider(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        chunk_size: int,
+    ) -> AsyncIterator[bytes]:
+        """Iterates a provider's async stream under its rate limit, wrapping unexpected errors in SynthesisError."""
+        permit = await self._aacquire_rate_limit(provider, text, synth_args)
+        observation = self._observe('provider', provider, text, synth_args, streaming=True)
+        try:
+            async for chunk in observation.wrap_async_stream(tts_provider.asynthesize_stream(text, chunk_size=chunk_size, **self._provider_args(provider, text, synth_args))):
+                if chunk:
+                    yield chunk
+        except SynthesisError:
+            raise
+        except Exception as e:
+            raise SynthesisError(f"Unexpected error during streaming synthesis with provider '{provider}': {e}")
+        finally:
+            if permit is not None:
+                permit.release()
+
+    @staticmethod
+    async def _aprocess_stream(chunks: AsyncIterator[bytes], processor: "StreamProcessor") -> AsyncIterator[bytes]:
+        """Runs an async stream through an AudioPipeline's StreamProcessor."""
+        async for chunk in chunks:
+            out = processor.feed(chunk)
+            if out:
+                yield out
+        out = processor.finish()
+        if out:
+            yield out
+
+    @staticmethod
+    async def _asave_chunks(output_path: str, chunks: AsyncIterator[bytes]) -> None:
+        """Async variant of `UnifiedTTS._save_chunks`; file I/O runs in the default executor."""
+        loop = asyncio.get_running_loop()
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            f = await loop.run_in_executor(None, open, output_path, 'wb')
+        except Exception as e:
+            raise IOError(f"Failed to save audio to '{output_path}': {e}")
+
+        try:
+            try:
+                async for chunk in chunks:
+                    await loop.run_in_executor(None, f.write, chunk)
+            finally:
+                f.close()
+        except SynthesisError:
+            _remove_quietly(output_path)
+            raise
+        except IOError as e:
+            _remove_quietly(output_path)
+            raise IOError(f"Failed to save audio to '{output_path}': {e}")
+        except Exception as e:
+            _remove_quietly(output_path)
+            raise IOError(f"An unexpected error occurred while saving audio to '{output_path}': {e}")
+        logger.info("Audio successfully saved to: %s", output_path)
+
+
+# Hedged attempts that lost the race, referenced until they finish
+_BACKGROUND_TASKS: "set[asyncio.Task]" = set()
+
+
+def _finish_background_task(task: "asyncio.Task") -> None:
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled():
+        task.exception() # Retrieved, so a losing attempt's failure is not reported as unhandled
+
+
+async def _single_chunk(audio: bytes) -> AsyncIterator[bytes]:
+    yield audio
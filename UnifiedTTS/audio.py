@@ -0,0 +1,364 @@
+# unified_tts/audio.py
+
+import sys
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .exceptions import SynthesisError
+
+# Formats whose segments can be joined without re-encoding.
+# 'raw' / 'pcm' are headerless sample streams and concatenate byte-wise.
+PCM_FORMATS = ('pcm', 'raw')
+JOINABLE_FORMATS = ('wav', 'mp3') + PCM_FORMATS
+
+# Size placeholder used in WAV headers whose final length is not yet known (streaming).
+WAV_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+# --- WAV ---
+
+def parse_wav(data: bytes) -> Tuple[bytes, int, int]:
+    """
+    Locates the format and sample data of a RIFF/WAVE file.
+
+    Args:
+        data: A complete WAV file (or a streamed one whose size fields are unset).
+
+    Returns:
+        Tuple[bytes, int, int]: The raw 'fmt ' chunk body, and the start and end
+        offsets of the sample data within `data`.
+
+    Raises:
+        SynthesisError: If `data` is not a WAV file.
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise SynthesisError("Cannot join audio: segment is not a RIFF/WAVE file.")
+
+    fmt_chunk = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from('<I', data, offset + 4)[0]
+        body_start = offset + 8
+        if chunk_id == b'fmt ':
+            fmt_chunk = bytes(data[body_start:body_start + chunk_size])
+        elif chunk_id == b'data':
+            if fmt_chunk is None:
+                raise SynthesisError("Cannot join audio: WAV 'data' chunk precedes 'fmt ' chunk.")
+            # Streamed WAVs may carry a placeholder size; clamp to what we actually have
+            return fmt_chunk, body_start, min(body_start + chunk_size, len(data))
+        offset = body_start + chunk_size + (chunk_size & 1) # Chunks are word-aligned
+    raise SynthesisError("Cannot join audio: WAV segment has no 'data' chunk.")
+
+
+def wav_header(fmt_chunk: bytes, data_length: Optional[int]) -> bytes:
+    """
+    Builds a canonical WAV header for `data_length` bytes of samples.
+
+    Pass `data_length=None` for a streaming header whose sizes are unknown.
+    """
+    if data_length is None:
+        riff_size = data_size = WAV_UNKNOWN_SIZE
+    else:
+        data_size = data_length
+        riff_size = 4 + (8 + len(fmt_chunk)) + (8 + data_length)
+    return (
+        b'RIFF' + struct.pack('<I', riff_size) + b'WAVE'
+        + b'fmt ' + struct.pack('<I', len(fmt_chunk)) + fmt_chunk
+        + b'data' + struct.pack('<I', data_size)
+    )
+
+
+def finalize_wav_file(path: str) -> None:
+    """Rewrites the size fields of a WAV file written with a streaming header."""
+    with open(path, 'r+b') as f:
+        head = f.read(4096)
+        _, data_start, _ = parse_wav(head)
+        f.seek(0, 2)
+        file_size = f.tell()
+        f.seek(4)
+        f.write(struct.pack('<I', file_size - 8))
+        f.seek(data_start - 4)
+        f.write(struct.pack('<I', file_size - data_start))
+
+
+# --- MP3 ---
+
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320), # MPEG-1 Layer III
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),     # MPEG-2 Layer III
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_frame_length(data: bytes, offset: int) -> Optional[int]:
+    """Returns the length of the MPEG Layer III frame starting at `offset`, or None if there is none."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 0x3
+    layer = (data[offset + 1] >> 1) & 0x3
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x3
+    padding = (data[offset + 2] >> 1) & 0x1
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[3 if version == 3 else 2][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    return (144 if version == 3 else 72) * bitrate // sample_rate + padding
+
+
+def strip_mp3_metadata(data: bytes) -> bytes:
+    """
+    Returns the MPEG audio frames of an MP3 segment.
+
+    Removes a leading ID3v2 tag, a trailing ID3v1 tag and a leading Xing/Info
+    (VBR header) frame, whose frame counts would otherwise make players cut
+    the joined stream short after the first segment.
+    """
+    start, end = _mp3_audio_start(data), len(data)
+    if end - start >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128
+    frame_length = _mp3_frame_length(data, start)
+    if frame_length is not None:
+        first_frame = bytes(data[start:start + frame_length]) # Also accepts memoryviews
+        if b'Xing' in first_frame or b'Info' in first_frame:
+            start += frame_length
+    return bytes(data[start:end])
+
+
+def _mp3_audio_start(data: bytes) -> int:
+    """Returns the offset just past a leading ID3v2 tag (0 if there is none)."""
+    if data[:3] == b'ID3' and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9] # Syncsafe integer
+        return 10 + size + (10 if data[5] & 0x10 else 0) # Optional footer
+    return 0
+
+
+def _mp3_bitrate(data: bytes, offset: int) -> Optional[int]:
+    """Returns the bitrate (bits/s) of the MPEG Layer III frame at `offset`, or None."""
+    if _mp3_frame_length(data, offset) is None:
+        return None
+    version = (data[offset + 1] >> 3) & 0x3
+    return _MP3_BITRATES[3 if version == 3 else 2][data[offset + 2] >> 4] * 1000
+
+
+# --- Duration ---
+
+def estimate_duration(
+    head: bytes,
+    total_bytes: int,
+    output_format: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+) -> Optional[float]:
+    """
+    Estimates the duration in seconds of an audio clip from its first bytes and total size.
+
+    Exact for WAV, assumes 16-bit mono samples for headerless PCM ('pcm'/'raw',
+    requires `sample_rate`) and a constant bitrate for MP3 (from the first frame).
+
+    Args:
+        head: The first bytes of the clip (a few KB are enough).
+        total_bytes: Total size of the clip in bytes.
+        output_format: The clip's format, if known.
+        sample_rate: Sample rate for headerless PCM.
+
+    Returns:
+        Optional[float]: The duration, or None if it cannot be determined.
+    """
+    output_format = (output_format or '').lower()
+    try:
+        if head[:4] == b'RIFF':
+            fmt_chunk, data_start, _ = parse_wav(head)
+            byte_rate = struct.unpack_from('<I', fmt_chunk, 8)[0]
+            return (total_bytes - data_start) / byte_rate if byte_rate else None
+    except (SynthesisError, struct.error):
+        return None
+    if output_format in PCM_FORMATS:
+        return total_bytes / (sample_rate * 2) if sample_rate else None
+    if output_format in ('mp3', '') and head:
+        start = _mp3_audio_start(head)
+        bitrate = _mp3_bitrate(head, start)
+        if bitrate:
+            return (total_bytes - start) * 8 / bitrate
+    return None
+
+
+# --- Joining ---
+
+def _normalize_format(output_format: str) -> str:
+    output_format = (output_format or '').lower()
+    if output_format not in JOINABLE_FORMATS:
+        raise SynthesisError(
+            f"Cannot join audio segments in format '{output_format}'. "
+            f"Use one of {list(JOINABLE_FORMATS)} for long texts."
+        )
+    return output_format
+
+
+def _crossfade_frames(
+    output_format: str, fmt_chunk: Optional[bytes], crossfade: float, sample_rate: Optional[int]
+) -> Tuple[int, int]:
+    """Returns (frames, channels) of a crossfade between 16-bit segments, or (0, 0) if none applies."""
+    if crossfade <= 0 or output_format == 'mp3':
+        return 0, 0
+    if output_format == 'wav':
+        format_tag, channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', fmt_chunk)
+        if format_tag != 1 or bits != 16:
+            return 0, 0 # Only 16-bit integer PCM is mixed
+    else:
+        channels = 1 # Headerless PCM from providers is 16-bit mono
+        if not sample_rate:
+            return 0, 0
+    return int(crossfade * sample_rate), channels
+
+
+def _mix(tail: bytes, head: bytes, channels: int) -> bytes:
+    """Linear crossfade of the 16-bit little-endian `tail` of one segment into the `head` of the next."""
+    a, b = array('h', bytes(tail)), array('h', bytes(head))
+    if sys.byteorder == 'big':
+        a.byteswap()
+        b.byteswap()
+    frames = len(a) // channels
+    out = array('h', bytes(len(a) * 2))
+    for i in range(len(a)):
+        weight = (i // channels + 1) / (frames + 1)
+        out[i] = int(a[i] * (1.0 - weight) + b[i] * weight)
+    if sys.byteorder == 'big':
+        out.byteswap()
+    return out.tobytes()
+
+
+def join_audio(
+    segments: List[bytes],
+    output_format: str,
+    crossfade: float = 0.0,
+    sample_rate: Optional[int] = None,
+) -> bytes:
+    """
+    Joins independently synthesized audio segments without re-encoding.
+
+    WAV segments are merged under one header (all segments must share the same
+    'fmt ' parameters), PCM segments are concatenated, and MP3 segments are
+    concatenated frame-wise after stripping per-segment metadata.
+
+    Args:
+        segments: The audio of each segment, in playback order.
+        output_format: The format of the segments ('wav', 'mp3', 'pcm' or 'raw').
+        crossfade: Seconds by which consecutive 16-bit WAV/PCM segments overlap,
+                   mixed with a linear fade. Ignored for MP3.
+        sample_rate: Sample rate of headerless PCM segments (needed for a crossfade).
+
+    Returns:
+        bytes: A single clip in `output_format`.
+
+    Raises:
+        SynthesisError: If the format is not joinable or segments are inconsistent.
+    """
+    output_format = _normalize_format(output_format)
+    if len(segments) == 1:
+        return bytes(segments[0]) # No copy for bytes; views from a mapped cache tier are copied
+    if crossfade > 0 and output_format != 'mp3':
+        joined = b''.join(stream_joined_audio(segments, output_format, crossfade, sample_rate))
+        if output_format != 'wav':
+            return joined
+        # The stream starts with a header whose sizes are unknown; rebuild it for the mixed body
+        fmt_chunk, start, _ = parse_wav(joined)
+        body = memoryview(joined)[start:]
+        return b''.join([wav_header(fmt_chunk, len(body)), body])
+    if output_format == 'wav':
+        fmt_chunk = None
+        bodies = []
+        for segment in segments:
+            segment_fmt, start, end = parse_wav(segment)
+            if fmt_chunk is None:
+                fmt_chunk = segment_fmt
+            elif segment_fmt != fmt_chunk:
+                raise SynthesisError("Cannot join audio: WAV segments have different formats.")
+            bodies.append(memoryview(segment)[start:end])
+        data_length = sum(len(body) for body in bodies)
+        return b''.join([wav_header(fmt_chunk, data_length)] + bodies)
+    if output_format == 'mp3':
+        return b''.join(strip_mp3_metadata(segment) for segment in segments)
+    return b''.join(segments)
+
+
+def stream_joined_audio(
+    segments: Iterable[bytes],
+    output_format: str,
+    crossfade: float = 0.0,
+    sample_rate: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Streaming variant of `join_audio`: yields each segment as soon as it is available.
+
+    Because the total length is unknown up front, a joined WAV stream starts with a
+    streaming header (size fields set to 0xFFFFFFFF); use `finalize_wav_file` to fix
+    the sizes once the stream has been written to disk. With a crossfade, the last
+    `crossfade` seconds of each segment are held back to be mixed into the next one.
+    """
+    joiner = AudioJoiner(output_format, crossfade, sample_rate)
+    for segment in segments:
+        out = joiner.feed(segment)
+        if out:
+            yield out
+    out = joiner.finish()
+    if out:
+        yield out
+
+
+class AudioJoiner:
+    """
+    Joins segments one at a time, as `stream_joined_audio` does.
+
+    Feed each segment as it becomes available and call `finish` at the end; each
+    call returns the output bytes that are ready (possibly empty). Usable from
+    sync and async code alike.
+    """
+
+    def __init__(self, output_format: str, crossfade: float = 0.0, sample_rate: Optional[int] = None):
+        self.output_format = _normalize_format(output_format)
+        self.crossfade = crossfade
+        self.sample_rate = sample_rate
+        self._fmt_chunk: Optional[bytes] = None
+        self._fade_bytes: Optional[int] = None
+        self._channels = 0
+        self._tail = b''
+
+    def feed(self, segment: bytes) -> bytes:
+        """Adds the next segment, returning the output that is ready."""
+        if self.output_format == 'mp3':
+            return strip_mp3_metadata(segment)
+        out = []
+        if self.output_format == 'wav':
+            segment_fmt, start, end = parse_wav(segment)
+            if self._fmt_chunk is None:
+                self._fmt_chunk = segment_fmt
+                out.append(wav_header(segment_fmt, None))
+            elif segment_fmt != self._fmt_chunk:
+                raise SynthesisError("Cannot join audio: WAV segments have different formats.")
+            body = memoryview(segment)[start:end]
+        else:
+            body = memoryview(segment)
+        if self._fade_bytes is None:
+            frames, self._channels = _crossfade_frames(self.output_format, self._fmt_chunk, self.crossfade, self.sample_rate)
+            self._fade_bytes = frames * self._channels * 2
+        if not self._fade_bytes:
+            out.append(bytes(body))
+            return b''.join(out)
+        # Overlap at most half of either segment, in whole frames
+        tail = self._tail
+        frame_size = self._channels * 2
+        overlap = min(self._fade_bytes, len(tail), len(body) // 2 // frame_size * frame_size)
+        if overlap:
+            out.append(tail[:len(tail) - overlap] + _mix(tail[len(tail) - overlap:], body[:overlap], self._channels))
+        else:
+            out.append(tail)
+        keep = min(self._fade_bytes, (len(body) - overlap) // 2 // frame_size * frame_size)
+        out.append(bytes(body[overlap:len(body) - keep]))
+        self._tail = bytes(body[len(body) - keep:])
+        return b''.join(out)
+
+    def finish(self) -> bytes:
+        """Returns the audio held back for a crossfade at the end of the last segment."""
+        tail, self._tail = self._tail, b''
+        return tail
@@ -0,0 +1,72 @@
+# unified_tts/batch.py
+
+from typing import Optional, Dict, Any, Union
+
+
+class BatchItem:
+    """A single synthesis request in a `UnifiedTTS.synthesize_batch` call."""
+
+    def __init__(
+        self,
+        text: str,
+        provider: str,
+        output_path: Optional[str] = None,
+        output_format: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            text: The text to synthesize.
+            provider: The name of the provider to use.
+            output_path: If provided, the audio is written to this path as soon as it is ready.
+            output_format: Overrides the provider's default output format.
+            **kwargs: Additional provider-specific parameters (e.g., voice, model, speed).
+        """
+        self.text = text
+        self.provider = provider
+        self.output_path = output_path
+        self.output_format = output_format
+        self.kwargs = kwargs
+
+    @classmethod
+    def coerce(cls, item: Union["BatchItem", Dict[str, Any]]) -> "BatchItem":
+        """Accepts a BatchItem or a dict of BatchItem arguments."""
+        if isinstance(item, cls):
+            return item
+        if isinstance(item, dict):
+            return cls(**item)
+        raise TypeError(f"Batch items must be BatchItem instances or dicts, got {type(item).__name__}")
+
+    def __repr__(self) -> str:
+        return f"BatchItem(provider={self.provider!r}, text={self.text[:30]!r}, output_path={self.output_path!r})"
+
+
+class BatchResult:
+    """The outcome of one `BatchItem`."""
+
+    def __init__(
+        self,
+        index: int,
+        item: BatchItem,
+        audio: Optional[bytes] = None,
+        error: Optional[Exception] = None,
+    ):
+        """
+        Args:
+            index: Position of the item in the input sequence.
+            item: The request this result belongs to.
+            audio: The synthesized audio, or None if it was written to `item.output_path` or failed.
+            error: The `SynthesisError` (or other `UnifiedTTSError` / `IOError`) raised for this item, if any.
+        """
+        self.index = index
+        self.item = item
+        self.audio = audio
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = 'ok' if self.ok else f'error={self.error!r}'
+        return f"BatchResult(index={self.index}, {status})"
@@ -0,0 +1,378 @@
+# unified_tts/batching.py
+
+import re
+import sys
+import math
+import time
+import struct
+import logging
+import threading
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from .exceptions import SynthesisError
+from .audio import PCM_FORMATS, parse_wav, wav_header
+
+logger = logging.getLogger(__name__)
+
+# Formats whose audio can be cut at sample offsets
+BATCHABLE_FORMATS = ('wav',) + PCM_FORMATS
+
+_WORD = re.compile(r'\S+')
+_TERMINAL = re.compile(r'[.!?…。！？]["\'”’)\]]*$')
+
+# (word, start seconds, end seconds), as returned by `BaseTTSProvider.synthesize_with_timestamps`
+WordTimestamp = Tuple[str, float, float]
+# Runs one batch: (texts, synth_args of each item) -> one clip per text
+BatchRunner = Callable[[List[str], List[Dict[str, Any]]], List[bytes]]
+
+
+# --- Joining and splitting ---
+
+def join_texts(texts: Sequence[str], delimiter: str = '\n\n') -> str:
+    """
+    Joins short texts into one request, ending each with punctuation so the provider pauses between them.
+
+    A text without sentence-final punctuation gets a period, which makes the
+    pause long enough to be found by silence detection.
+    """
+    items = []
+    for text in texts:
+        text = ' '.join(text.split())
+        items.append(text if _TERMINAL.search(text) else text + '.')
+    return delimiter.join(items)
+
+
+def cuts_from_timestamps(texts: Sequence[str], words: Sequence[WordTimestamp]) -> Optional[List[float]]:
+    """
+    Finds the times (seconds) between consecutive texts from the provider's word timestamps.
+
+    Each cut lies halfway between the last word of one text and the first word of
+    the next. Returns None if the provider's words cannot be matched to the texts
+    (e.g. it spoke "42" as "forty two").
+    """
+    counts = [len(_WORD.findall(text)) for text in texts]
+    if sum(counts) != len(words) or not all(counts):
+        return None
+    cuts, index = [], 0
+    for count in counts[:-1]:
+        index += count
+        cuts.append((words[index - 1][2] + words[index][1]) / 2)
+    return cuts
+
+
+def cuts_from_silence(
+    samples: bytes,
+    sample_rate: int,
+    channels: int,
+    count: int,
+    threshold: float = -45.0,
+    min_gap: float = 0.12,
+    frame: float = 0.01,
+) -> Optional[List[float]]:
+    """
+    Finds `count` cut times (seconds) in 16-bit PCM at the longest interior silences.
+
+    Audio is scanned in `frame`-second windows; a window is silent when its peak
+    stays below `threshold` dBFS. Silences touching the start or end of the clip
+    are ignored, and so are those shorter than `min_gap` seconds. Each cut is
+    placed in the middle of its silence.
+
+    Returns:
+        Optional[List[float]]: The cut times in order, or None if fewer than `count`
+        silences were found.
+    """
+    if count <= 0:
+        return []
+    values = array('h', bytes(samples[:len(samples) - len(samples) % 2]))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    window = max(1, int(sample_rate * frame)) * channels
+    limit = 32768 * 10 ** (threshold / 20)
+    silent = []
+    for start in range(0, len(values), window):
+        chunk = values[start:start + window]
+        silent.append(max(chunk) < limit and -min(chunk) < limit)
+
+    gaps = [] # (length in frames, first frame)
+    run_start = None
+    for i, quiet in enumerate(silent):
+        if quiet and run_start is None:
+            run_start = i
+        elif not quiet and run_start is not None:
+            if run_start > 0: # Leading silence belongs to the first clip
+                gaps.append((i - run_start, run_start))
+            run_start = None
+    min_frames = max(1, math.ceil(min_gap / frame - 1e-9))
+    gaps = [gap for gap in gaps if gap[0] >= min_frames]
+    if len(gaps) < count:
+        return None
+    longest = sorted(sorted(gaps, reverse=True)[:count], key=lambda gap: gap[1])
+    window_seconds = window / channels / sample_rate
+    return [(first + length / 2) * window_seconds for length, first in longest]
+
+
+def split_audio(
+    audio: bytes,
+    cuts: Sequence[float],
+    output_format: str,
+    sample_rate: Optional[int] = None,
+) -> List[bytes]:
+    """
+    Cuts a WAV or headerless 16-bit mono PCM clip at the given times (seconds).
+
+    WAV pieces get a header of their own. `sample_rate` is required for PCM.
+    """
+    output_format = output_format.lower()
+    if output_format == 'wav':
+        fmt_chunk, start, end = parse_wav(audio)
+        _, _, sample_rate, _, block_align, _ = struct.unpack_from('<HHIIHH', fmt_chunk)
+        body = memoryview(audio)[start:end]
+    elif output_format in PCM_FORMATS and sample_rate:
+        fmt_chunk, block_align, body = None, 2, memoryview(audio)
+    else:
+        raise SynthesisError(f"Cannot split batched audio in format '{output_format}'.")
+    block_align = max(block_align, 1)
+
+    offsets = [0]
+    for cut in cuts:
+        offset = min(int(cut * sample_rate) * block_align, len(body))
+        offsets.append(max(offset, offsets[-1]))
+    offsets.append(len(body))
+    pieces = [bytes(body[a:b]) for a, b in zip(offsets, offsets[1:])]
+    if fmt_chunk is not None:
+        pieces = [wav_header(fmt_chunk, len(piece)) + piece for piece in pieces]
+    return pieces
+
+
+def pcm_layout(audio: bytes, output_format: str, sample_rate: Optional[int]) -> Tuple[bytes, int, int]:
+    """Returns (16-bit samples, sample rate, channels) of a WAV or headerless PCM clip, for silence detection."""
+    if output_format.lower() == 'wav':
+        fmt_chunk, start, end = parse_wav(audio)
+        format_tag, channels, rate, _, _, bits = struct.unpack_from('<HHIIHH', fmt_chunk)
+        if format_tag != 1 or bits != 16:
+            raise SynthesisError("Silence detection needs 16-bit integer PCM.")
+        return audio[start:end], rate, channels
+    if not sample_rate:
+        raise SynthesisError("Silence detection on headerless PCM needs its sample rate.")
+    return audio, sample_rate, 1
+
+
+# --- Batcher ---
+
+class _Batch:
+    __slots__ = ('group', 'run', 'texts', 'args', 'futures', 'chars', 'opened')
+
+    def __init__(self, group: Hashable, run: BatchRunner, opened: float):
+        self.group = group
+        self.run = run
+        self.texts: List[str] = []
+        self.args: List[Dict[str, Any]] = []
+        self.futures: List[Future] = []
+        self.chars = 0
+        self.opened = opened
+
+
+class MicroBatcher:
+    """
+    Collects short texts sent within a small time window into one provider request.
+
+    For traffic dominated by very short strings (single words, numbers, labels),
+    the fixed cost of a provider request outweighs the audio itself. With
+    `UnifiedTTS(micro_batch=True)` (or a `MicroBatcher` with custom limits),
+    `synthesize` calls for texts of at most `max_chars` characters that share a
+    provider and synthesis options are held for up to `window` seconds, sent
+    together as one text (see `join_texts`), and the returned audio is cut back
+    into one clip per caller:
+
+    - at the word timestamps of providers that report them
+      (`BaseTTSProvider.SUPPORTS_TIMESTAMPS`), otherwise
+    - at the longest pauses found by silence detection on the 16-bit PCM.
+
+    Silence detection is a heuristic: it assumes the pause the provider makes at
+    each delimiter between texts is longer than any pause inside a text. A longer
+    pause within one caller's text (after a comma, say) takes the place of a
+    delimiter, and the clips on either side of it are cut in the wrong place.
+    The batch is only synthesized text by text when fewer usable pauses than
+    cuts are found, or the audio is not 16-bit PCM. Keep `max_chars` small, or
+    opt out, for providers without timestamps when clips must be exact. Only
+    'wav' and 'pcm'/'raw' output is batched. Each caller waits on its own
+    future; a failed batch fails all of its callers with the same error.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = 40,
+        max_batch_chars: int = 400,
+        max_items: int = 16,
+        window: float = 0.02,
+        workers: int = 4,
+        delimiter: str = '\n\n',
+        silence_threshold: float = -45.0,
+        min_gap: float = 0.12,
+    ):
+        """
+        Args:
+            max_chars: Longest text that is batched; longer texts are sent as usual.
+            max_batch_chars: Maximum total length of the texts of one batch.
+            max_items: Maximum number of texts per batch.
+            window: Seconds the first text of a batch waits for others to join it.
+            workers: Batches sent to providers concurrently.
+            delimiter: Inserted between the texts of a batch.
+            silence_threshold: Peak level (dBFS) below which audio counts as silent.
+            min_gap: Shortest pause (seconds) accepted as the boundary between two texts.
+        """
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        self.max_chars = max_chars
+        self.max_batch_chars = max_batch_chars
+        self.max_items = max_items
+        self.window = window
+        self.delimiter = delimiter
+        self.silence_threshold = silence_threshold
+        self.min_gap = min_gap
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='tts-micro-batch')
+        self._open: Dict[Hashable, _Batch] = {} # Batches still collecting, by group
+        self._cond = threading.Condition()
+        self._collector: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {'requests': 0, 'batches': 0, 'batched_requests': 0, 'split_timestamps': 0, 'split_silence': 0, 'fallbacks': 0}
+
+    def accepts(self, text: str, output_format: Optional[str]) -> bool:
+        """Whether a request for `text` in `output_format` is eligible for batching."""
+        return 0 < len(text.strip()) <= self.max_chars and (output_format or '').lower() in BATCHABLE_FORMATS
+
+    def submit(self, group: Hashable, text: str, synth_args: Dict[str, Any], run: BatchRunner) -> Future:
+        """
+        Adds a text to the open batch of `group` and returns the future of its clip.
+
+        Args:
+            group: Key of the requests that may share a batch (same provider and synthesis options).
+            text: The text to synthesize.
+            synth_args: This request's synthesis arguments.
+            run: Sends a batch and returns one clip per text; the batch's first request supplies it.
+        """
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise SynthesisError("The micro-batcher is closed.")
+            self._stats['requests'] += 1
+            batch = self._open.get(group)
+            if batch is not None and (
+                len(batch.texts) >= self.max_items or batch.chars + len(text) > self.max_batch_chars
+            ):
+                self._dispatch(self._open.pop(group))
+                batch = None
+            if batch is None:
+                batch = self._open[group] = _Batch(group, run, time.monotonic())
+                self._ensure_collector()
+                self._cond.notify()
+            batch.texts.append(text)
+            batch.args.append(synth_args)
+            batch.futures.append(future)
+            batch.chars += len(text)
+            if len(batch.texts) >= self.max_items:
+                self._dispatch(self._open.pop(group))
+        return future
+
+    def _ensure_collector(self) -> None:
+        """Starts the thread that sends batches whose window has elapsed (lock held)."""
+        if self._collector is None:
+            self._collector = threading.Thread(target=self._collect, name='tts-micro-batch-collector', daemon=True)
+            self._collector.start()
+
+    def _collect(self) -> None:
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                for group, batch in list(self._open.items()):
+                    if batch.opened + self.window <= now:
+                        self._dispatch(self._open.pop(group))
+                if self._open:
+                    self._cond.wait(min(b.opened for b in self._open.values()) + self.window - now)
+                else:
+                    self._cond.wait()
+
+    def _dispatch(self, batch: _Batch) -> None:
+        """Hands a full or expired batch to a worker (lock held)."""
+        self._stats['batches'] += 1
+        if len(batch.texts) > 1:
+            self._stats['batched_requests'] += len(batch.texts)
+        self._executor.submit(self._run, batch)
+
+    def _run(self, batch: _Batch) -> None:
+        futures = [f for f in batch.futures if f.set_running_or_notify_cancel()]
+        if not futures:
+            return
+        try:
+            clips = batch.run(batch.texts, batch.args)
+        except BaseException as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, clip in zip(batch.futures, clips):
+            if future in futures:
+                future.set_result(clip)
+
+    def split(
+        self,
+        texts: Sequence[str],
+        audio: bytes,
+        output_format: str,
+        sample_rate: Optional[int] = None,
+        words: Optional[Sequence[WordTimestamp]] = None,
+    ) -> Optional[List[bytes]]:
+        """
+        Cuts the audio of a batch into one clip per text.
+
+        Uses the word timestamps when given and they match the texts, otherwise
+        silence detection (see the class docstring for its limits). Returns None
+        if not enough pauses were found.
+        """
+        if len(texts) == 1:
+            return [audio]
+        cuts = cuts_from_timestamps(texts, words) if words else None
+        if cuts is not None:
+            self._count('split_timestamps')
+        else:
+            try:
+                samples, rate, channels = pcm_layout(audio, output_format, sample_rate)
+                cuts = cuts_from_silence(samples, rate, channels, len(texts) - 1, self.silence_threshold, self.min_gap)
+            except SynthesisError:
+                cuts = None # E.g. 24-bit or float WAV
+            if cuts is None:
+                self._count('fallbacks')
+                logger.debug("No reliable split of a batch of %d texts; synthesizing them one by one.", len(texts))
+                return None
+            self._count('split_silence')
+            sample_rate = rate
+        return split_audio(audio, cuts, output_format, sample_rate)
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self._stats[name] += 1
+
+    def close(self) -> None:
+        """Sends the batches still collecting, then stops the collector and the workers."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            for group in list(self._open):
+                self._dispatch(self._open.pop(group))
+            self._cond.notify_all()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns counters: requests submitted, batches sent, requests that shared a batch,
+        batches split by timestamps or silence, and batches that fell back to single requests.
+        """
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot['open_batches'] = len(self._open)
+        return snapshot
+
+    def __repr__(self) -> str:
+        return (f"MicroBatcher(max_chars={self.max_chars}, max_items={self.max_items}, "
+                f"window={self.window}, max_batch_chars={self.max_batch_chars})")
@@ -0,0 +1,319 @@
+# unified_tts/cache.py
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Synthesis parameters that identify a distinct clip. Any other provider kwargs
+# are folded into the key as well, so unknown options never alias each other.
+KEY_PARAMS = ('voice', 'model', 'voice_id', 'model_id', 'speed', 'output_format', 'sample_rate')
+# Per-call options that do not affect the audio and must not split cache entries.
+NON_AUDIO_PARAMS = ('deadline', 'priority', 'tenant')
+
+
+def make_cache_key(provider: str, text: str, synth_args: Dict[str, Any]) -> str:
+    """
+    Builds a content-addressed cache key for a synthesis request.
+
+    Args:
+        provider: The provider name (e.g., 'openai').
+        text: The text to synthesize.
+        synth_args: The arguments passed to the provider's `synthesize`
+                    (output_format, voice, model, voice_id, model_id, speed, sample_rate, ...).
+
+    Returns:
+        str: A hex SHA-256 digest identifying the request.
+    """
+    material = {'provider': provider, 'text': text}
+    material.update({name: synth_args.get(name) for name in KEY_PARAMS})
+    material['extra'] = {
+        k: v for k, v in synth_args.items() if k not in KEY_PARAMS and k not in NON_AUDIO_PARAMS
+    }
+    encoded = json.dumps(material, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss/eviction counters for a `SynthesisCache`.
+
+    `segment_hits` / `segment_misses` count phrase lookups made by
+    `UnifiedTTS(phrase_cache=...)`; they are included in the tier counters too.
+    """
+
+    FIELDS = ('memory_hits', 'disk_hits', 'misses', 'memory_evictions', 'disk_evictions', 'stores', 'segment_hits', 'segment_misses')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def __getattr__(self, field: str) -> int:
+        if field in CacheStats.FIELDS:
+            return self._counts[field]
+        raise AttributeError(field)
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def segment_hit_rate(self) -> float:
+        lookups = self.segment_hits + self.segment_misses
+        return self.segment_hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns a snapshot of all counters, plus `hits`, `hit_rate` and `segment_hit_rate`."""
+        with self._lock:
+            snapshot = dict(self._counts)
+        snapshot['hits'] = snapshot['memory_hits'] + snapshot['disk_hits']
+        lookups = snapshot['hits'] + snapshot['misses']
+        snapshot['hit_rate'] = snapshot['hits'] / lookups if lookups else 0.0
+        segment_lookups = snapshot['segment_hits'] + snapshot['segment_misses']
+        snapshot['segment_hit_rate'] = snapshot['segment_hits'] / segment_lookups if segment_lookups else 0.0
+        return snapshot
+
+
+class MemoryCache:
+    """Bounded in-memory LRU tier, limited by entry count and total bytes."""
+
+    def __init__(self, max_items: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> int:
+        """Stores `data` and returns the number of entries evicted to make room."""
+        if len(data) > self.max_bytes:
+            return 0 # Never cache a clip that would flush the whole tier
+        evicted = 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while len(self._entries) > self.max_items or self._size > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._size -= len(dropped)
+                evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    Persistent tier storing one file per entry under `directory`.
+
+    Writes go to a temporary file in the target directory followed by an atomic
+    `os.replace`, so several worker processes can share one directory without
+    ever observing a partially written entry. When the tier grows beyond
+    `max_bytes`, the least recently used files (by modification time, refreshed
+    on every hit) are removed.
+    """
+
+    SUFFIX = '.audio'
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = self._scan_size()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path) # Mark as recently used for eviction
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> int:
+        """Atomically stores `data` and returns the number of entries evicted."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._size += len(data)
+            if self._size <= self.max_bytes:
+                return 0
+        return self._evict()
+
+    def _entries(self):
+        """Yields (mtime, size, path) for every entry file in the directory."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(self.SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue # Removed concurrently by another process
+                yield st.st_mtime, st.st_size, path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> int:
+        """Removes least recently used entries until the tier fits in `max_bytes`."""
+        with self._lock:
+            # Other processes share the directory, so rescan rather than trusting our running total
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    evicted += 1
+                except OSError:
+                    pass # Already evicted by another process
+                total -= size
+            self._size = total
+            return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+
+class SynthesisCache:
+    """
+    Two-tier (memory LRU + optional disk) cache of synthesized audio.
+
+    Pass an instance to `UnifiedTTS(cache=...)` to enable caching; identical
+    requests are then served without a provider round-trip. Counters are
+    available via `stats`.
+
+    Example:
+        cache = SynthesisCache(memory_max_items=512, directory='/var/cache/tts')
+        tts = UnifiedTTS(cache=cache, openai_api_key='sk-...')
+    """
+
+    def __init__(
+        self,
+        memory_max_items: int = 256,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        directory: Optional[str] = None,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+        disk_tier: Optional[Any] = None,
+    ):
+        """
+        Args:
+            memory_max_items: Maximum number of clips held in memory (0 disables the memory tier).
+            memory_max_bytes: Maximum total size of clips held in memory.
+            directory: Directory for the persistent tier. If None, only the memory tier is used.
+            disk_max_bytes: Size budget for the persistent tier.
+            disk_tier: A custom persistent tier exposing `get(key)` / `put(key, data)`;
+                       takes precedence over `directory`. See `mmap_cache.MmapCache` for
+                       a tier shared by all processes on a host (hits are zero-copy views;
+                       set `memory_max_items=0` to keep them that way).
+        """
+        self.memory = MemoryCache(memory_max_items, memory_max_bytes) if memory_max_items > 0 else None
+        if disk_tier is not None:
+            self.disk = disk_tier
+        elif directory:
+            self.disk = DiskCache(directory, disk_max_bytes)
+        else:
+            self.disk = None
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Looks up `key` in memory, then on disk (promoting disk hits to memory)."""
+        if self.memory is not None:
+            data = self.memory.get(key)
+            if data is not None:
+                self.stats.incr('memory_hits')
+                return data
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                self.stats.incr('disk_hits')
+                self._put_memory(key, bytes(data))
+                return data
+        self.stats.incr('misses')
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Stores `data` in every configured tier."""
+        self.stats.incr('stores')
+        self._put_memory(key, data)
+        if self.disk is not None:
+            try:
+                evicted = self.disk.put(key, data)
+            except OSError as e:
+                # A failing cache must never fail synthesis
+                logger.warning("Failed to write synthesis cache entry '%s': %s", key, e)
+                return
+            if evicted:
+                self.stats.incr('disk_evictions', evicted)
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        if self.memory is not None:
+            evicted = self.memory.put(key, data)
+            if evicted:
+                self.stats.incr('memory_evictions', evicted)
+
+    def clear(self) -> None:
+        """Empties every tier (counters are kept)."""
+        if self.memory is not None:
+            self.memory.clear()
+        if self.disk is not None and hasattr(self.disk, 'clear'):
+            self.disk.clear()
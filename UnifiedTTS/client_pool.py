@@ -0,0 +1,261 @@
+# unified_tts/client_pool.py
+
+import hmac
+import asyncio
+import inspect
+import time
+import hashlib
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pending `aclose()` tasks of evicted clients, referenced until they finish
+_CLOSING_TASKS: "set[asyncio.Task]" = set()
+
+
+def _close_client(client: Any) -> None:
+    """
+    Closes an evicted client: calls a synchronous `close()`, and schedules `aclose()`
+    (or a coroutine `close()`, as async SDK clients have) when evicted from within an event loop.
+    """
+    close = getattr(client, 'close', None)
+    aclose = getattr(client, 'aclose', None)
+    if close is not None and inspect.iscoroutinefunction(close):
+        aclose, close = aclose or close, None
+    if close is not None:
+        try:
+            close()
+        except Exception as e:
+            logger.warning("Failed to close pooled client %r: %s", client, e)
+    if aclose is None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return # No loop: async resources are released when the client is garbage collected
+    task = loop.create_task(aclose())
+    _CLOSING_TASKS.add(task)
+    task.add_done_callback(_finish_closing_task)
+
+
+def _finish_closing_task(task: "asyncio.Task") -> None:
+    _CLOSING_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Failed to close pooled client: %s", task.exception())
+
+
+def _connection_count(client: Any) -> int:
+    """Connections a client may keep open: its transport's pool size, if it has one."""
+    transport = getattr(client, 'transport', None)
+    return max(1, getattr(transport, 'pool_maxsize', 1))
+
+
+class _Entry:
+    __slots__ = ('client', 'secret', 'connections', 'last_used', 'leases', 'evicted')
+
+    def __init__(self, client: Any, secret: bytearray, connections: int, now: float):
+        self.client = client
+        self.secret = secret # Kept to rule out digest collisions; zeroed on eviction
+        self.connections = connections
+        self.last_used = now
+        self.leases = 0
+        self.evicted = False
+
+
+class ClientPool:
+    """
+    Bounded, thread-safe pool of warm clients for caller-supplied API keys.
+
+    Multi-tenant services that call providers with each user's own key can
+    lease a client per request instead of building one (and its TLS
+    connections) every time:
+
+        pool = ClientPool(max_clients=256, idle_ttl=300, max_connections=2048)
+        with pool.lease('cartesia', api_key, create=lambda key: CartesiaTTSProvider(api_key=key)) as client:
+            client.synthesize(text)
+
+    Entries are keyed by a salted hash of the key (never by the key itself),
+    evicted least-recently-used first when `max_clients` or `max_connections`
+    (the sum of the clients' connection-pool sizes) would be exceeded, and
+    closed after `idle_ttl` seconds without use. A client that is evicted while
+    leased is closed when its last lease ends. On eviction the pool overwrites
+    its own copy of the key, which it holds in a bytearray; strings passed in by
+    the caller and copies kept inside the client cannot be wiped from Python,
+    but are no longer referenced by the pool once the client is closed.
+    """
+
+    def __init__(self, max_clients: int = 256, idle_ttl: Optional[float] = 300.0, max_connections: Optional[int] = None):
+        """
+        Args:
+            max_clients: Maximum number of clients kept.
+            idle_ttl: Seconds after which an unused client is closed (None keeps clients until evicted).
+            max_connections: Cap on the connections all kept clients may hold open together.
+        """
+        if max_clients < 1:
+            raise ValueError("max_clients must be at least 1")
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.max_connections = max_connections
+        self._salt = secrets.token_bytes(16) # Per process, so digests cannot be matched against known keys
+        self._entries: "OrderedDict[Tuple[str, bytes], _Entry]" = OrderedDict() # Oldest first
+        self._connections = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def digest(self, api_key: str) -> bytes:
+        """Returns the salted hash under which clients for `api_key` are kept."""
+        return hashlib.blake2b(api_key.encode('utf-8'), digest_size=16, key=self._salt).digest()
+
+    @contextmanager
+    def lease(
+        self,
+        name: str,
+        api_key: str,
+        create: Callable[[str], Any],
+        connections: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Yields the pooled client for (`name`, `api_key`), creating it with `create(api_key)` on a miss.
+
+        Args:
+            name: Namespace of the client (e.g., the provider name).
+            api_key: The caller's API key.
+            create: Builds a new client for the key.
+            connections: Connections the client may hold open. Defaults to its
+                `transport.pool_maxsize`, or 1.
+        """
+        entry = self._acquire(name, api_key, create, connections)
+        try:
+            yield entry.client
+        finally:
+            self._release(entry)
+
+    def _acquire(self, name: str, api_key: str, create: Callable[[str], Any], connections: Optional[int]) -> _Entry:
+        key = (name, self.digest(api_key))
+        secret = bytearray(api_key.encode('utf-8'))
+        stale = self._sweep()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and hmac.compare_digest(entry.secret, secret):
+                self._entries.move_to_end(key)
+                entry.leases += 1
+                entry.last_used = time.monotonic()
+                self._stats['hits'] += 1
+            else:
+                entry = None
+                self._stats['misses'] += 1
+        self._close_all(stale)
+        if entry is not None:
+            _zero(secret)
+            return entry
+
+        # Built outside the lock: client construction may be slow
+        try:
+            client = create(api_key)
+        except BaseException:
+            _zero(secret)
+            raise
+        entry = _Entry(client, secret, connections or _connection_count(client), time.monotonic())
+        entry.leases = 1
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and hmac.compare_digest(current.secret, secret):
+                # Another thread created one concurrently: use it and discard ours
+                self._entries.move_to_end(key)
+                current.leases += 1
+                current.last_used = entry.last_used
+                entry.evicted = True
+                discarded, entry = entry, current
+            else:
+                discarded = None
+                if current is not None:
+                    evicted = [self._evict(key)] # Digest collision: the new key wins
+                else:
+                    evicted = []
+                evicted.extend(self._make_room(entry.connections))
+                self._entries[key] = entry
+                self._connections += entry.connections
+        if discarded is not None:
+            _zero(discarded.secret)
+            discarded.leases = 0
+            self._close_all([discarded])
+        else:
+            self._close_all(evicted)
+        return entry
+
+    def _release(self, entry: _Entry) -> None:
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            closing = entry.evicted
+        if closing:
+            self._close_all([entry])
+
+    def _make_room(self, connections: int) -> List[_Entry]:
+        """Evicts least-recently-used entries until one more client fits. Lock held."""
+        evicted = []
+        for key in list(self._entries):
+            over_clients = len(self._entries) >= self.max_clients
+            over_connections = self.max_connections is not None and self._connections + connections > self.max_connections
+            if not (over_clients or over_connections):
+                break
+            evicted.append(self._evict(key))
+        return evicted
+
+    def _evict(self, key: Tuple[str, bytes], expired: bool = False) -> _Entry:
+        """Removes an entry and wipes its key copy; the caller closes it via `_close_all`. Lock held."""
+        entry = self._entries.pop(key)
+        self._connections -= entry.connections
+        entry.evicted = True
+        _zero(entry.secret)
+        self._stats['expirations' if expired else 'evictions'] += 1
+        return entry
+
+    def _sweep(self) -> List[_Entry]:
+        """Evicts entries idle for longer than `idle_ttl`."""
+        if self.idle_ttl is None:
+            return []
+        cutoff = time.monotonic() - self.idle_ttl
+        expired = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.leases == 0 and entry.last_used <= cutoff:
+                    expired.append(self._evict(key, expired=True))
+        return expired
+
+    def _close_all(self, entries: List[_Entry]) -> None:
+        """Closes evicted clients that are no longer leased (leased ones are closed by the last `_release`)."""
+        for entry in entries:
+            with self._lock:
+                client = entry.client if entry.leases == 0 else None
+                if client is not None:
+                    entry.client = None # Closed exactly once
+            if client is not None:
+                _close_client(client)
+
+    def close(self) -> None:
+        """Evicts and closes every client."""
+        with self._lock:
+            evicted = [self._evict(key) for key in list(self._entries)]
+        self._close_all(evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hits, misses, evictions, expirations and the current number of clients and connections."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['clients'] = len(self._entries)
+            snapshot['connections'] = self._connections
+        return snapshot
+
+
+def _zero(buffer: bytearray) -> None:
+    buffer[:] = bytes(len(buffer)) # Same length: overwritten in place
@@ -1,25 +1,60 @@
 # unified_tts/core.py
 
 import os
-from typing import Dict, Type, Optional, Any
-from .exceptions import ProviderNotFoundError, SynthesisError
-from .providers.base import BaseTTSProvider
-from .providers.openai import OpenAITTSProvider
-from .providers.cartesia import CartesiaTTSProvider # Placeholder
-
-# Registry of available providers
-# Add new providers here
-AVAILABLE_PROVIDERS: Dict[str, Type[BaseTTSProvider]] = {
-    OpenAITTSProvider.PROVIDER_NAME: OpenAITTSProvider,
-    CartesiaTTSProvider.PROVIDER_NAME: CartesiaTTSProvider,
-}
+import time
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Type, Optional, Any, Callable, Iterator, Iterable, List, Union, TYPE_CHECKING
+from .exceptions import UnifiedTTSError, ConfigurationError, ProviderNotFoundError, SynthesisError, DeadlineExceededError, OverloadedError
+from .providers.base import BaseTTSProvider, DEFAULT_STREAM_CHUNK_SIZE
+from .cache import SynthesisCache, make_cache_key
+from .batch import BatchItem, BatchResult
+from .segmentation import split_text, split_phrases
+from .incremental import TextChunker, TextStream
+from .audio import JOINABLE_FORMATS, WAV_UNKNOWN_SIZE, join_audio, stream_joined_audio, finalize_wav_file
+from .routing import RoutingPolicy, AUTO_PROVIDER
+from .ratelimit import RateLimiter, Permit, RetryTokens, RATE_LIMIT_CONFIG_KEYS
+from .scheduler import RequestScheduler, Ticket, provider_args, priority_level
+from .client_pool import ClientPool
+from .batching import MicroBatcher, join_texts
+from .warmup import Warmer, HotPromptTracker, load_manifest
+from .metrics import MetricsRegistry, MetricsHooks, SynthesisHooks, SynthesisEvent, Observation
+from .registry import AVAILABLE_PROVIDERS # Providers are imported on first use
+
+if TYPE_CHECKING:
+    from .processing import AudioPipeline # Imports NumPy; only needed when a pipeline is used
+
+logger = logging.getLogger(__name__)
+
+# Failures raised on this side (deadline, scheduler shedding): routing does not count them against the provider
+LOCAL_ERRORS = (DeadlineExceededError, OverloadedError)
 
 class UnifiedTTS:
     """
     A unified interface for interacting with multiple Text-to-Speech providers.
     """
 
-    def __init__(self, config: Optional[Dict[str, Dict[str, Any]]] = None, **kwargs):
+    def __init__(
+        self,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache: Optional[SynthesisCache] = None,
+        max_segment_chars: Optional[int] = None,
+        segment_workers: int = 4,
+        routing: Optional[RoutingPolicy] = None,
+        metrics: Union[MetricsRegistry, bool, None] = None,
+        hooks: Optional[Iterable[SynthesisHooks]] = None,
+        lazy: bool = True,
+        pipeline: Optional["AudioPipeline"] = None,
+        phrase_cache: Optional[str] = None,
+        phrase_crossfade: float = 0.01,
+        scheduler: Optional[RequestScheduler] = None,
+        client_pool: Optional[ClientPool] = None,
+        micro_batch: Union[MicroBatcher, Dict[str, Any], bool, None] = None,
+        **kwargs
+    ):
         """
         Initializes the UnifiedTTS instance and configures providers.
 
@@ -32,18 +67,94 @@ class UnifiedTTS:
             config (Optional[Dict[str, Dict[str, Any]]]): A dictionary where keys
                 are provider names (e.g., 'openai') and values are dictionaries
                 of configuration options for that provider (e.g., {'api_key': '...', 'model': '...'}).
+            cache (Optional[SynthesisCache]): Opt-in cache of synthesized audio. When set,
+                identical requests (same provider, text and synthesis parameters) are
+                served from the cache instead of calling the provider.
+            max_segment_chars (Optional[int]): Split texts longer than this into
+                sentence/paragraph-aligned segments, synthesized concurrently and
+                joined in order. Texts longer than a provider's `MAX_INPUT_CHARS`
+                are always split. Lower values shorten time-to-first-audio when streaming.
+            segment_workers (int): Maximum number of segments of one text synthesized concurrently.
+            routing (Optional[RoutingPolicy]): Policy used when `provider='auto'` is passed to
+                `synthesize` / `synthesize_stream`. Defaults to `RoutingPolicy()` over all
+                initialized providers.
+            metrics (Union[MetricsRegistry, bool, None]): Registry that receives latency, throughput,
+                cache and error metrics (see `metrics.MetricsHooks`). Defaults to the process-wide
+                `metrics.REGISTRY`; pass False to disable the built-in metrics.
+            hooks (Optional[Iterable[SynthesisHooks]]): Additional callbacks invoked around every
+                synthesis request and provider call, e.g. for tracing.
             **kwargs: Direct configuration options for providers, prefixed with the
                 provider name and an underscore (e.g., `openai_api_key='...'`,
                 `cartesia_api_key='...'`, `openai_model='tts-1-hd'`).
+            lazy (bool): Import and initialize each provider on first use (default), so
+                unused providers cost nothing at startup. Pass False to initialize every
+                registered provider up front, as `list_available_providers` does.
+            pipeline (Optional[AudioPipeline]): Post-processing (resampling, channel conversion,
+                loudness normalization, silence trimming) applied to the audio of every request.
+                Can be overridden per call with `pipeline=` (None disables it).
+            phrase_cache (Optional[str]): 'sentence' or 'clause' to cache audio per phrase instead
+                of per utterance (requires `cache`). Each phrase is looked up on its own and only
+                the misses are synthesized, so the constant parts of templated prompts are
+                synthesized once. Applies to 'wav', 'pcm'/'raw' and 'mp3' output.
+            phrase_crossfade (float): Seconds by which consecutive WAV/PCM phrases are crossfaded.
+            scheduler (Optional[RequestScheduler]): Queues provider requests by priority class,
+                deadline and tenant before they are sent (see `scheduler.RequestScheduler`).
+                Per call, pass `priority=` ('interactive', 'normal', 'bulk') and `tenant=`;
+                `deadline=` also bounds the time spent queued.
+            client_pool (Optional[ClientPool]): Pool of provider instances for per-call API keys
+                (`api_key=` on `synthesize` / `synthesize_stream`), so repeat requests with the same
+                key reuse a warm client. Defaults to a `ClientPool()` created on first use.
+            micro_batch (Union[MicroBatcher, Dict[str, Any], bool, None]): Opt-in batching of short
+                texts: `synthesize` calls for short 'wav'/'pcm' texts with the same provider and
+                options that arrive within a few milliseconds are sent as one provider request and
+                the audio is split back per call (see `batching.MicroBatcher`). Pass True for the
+                defaults, or a dict of MicroBatcher arguments. Opt out per call with `micro_batch=False`.
+
+        Client-side rate limits are configured per provider through the same mechanism,
+        either as a `rate_limit` option (a RateLimiter or a dict of its arguments) or as
+        individual `requests_per_second`, `chars_per_minute`, `max_in_flight` and `burst`
+        options, e.g. `UnifiedTTS(openai_requests_per_second=5, openai_max_in_flight=4)`.
+        They are applied to every provider request, including long-text segments.
         """
-        self.providers: Dict[str, BaseTTSProvider] = {}
+        self.providers: Dict[str, BaseTTSProvider] = {} # Initialized providers
+        self._provider_errors: Dict[str, str] = {} # Providers that failed to initialize, with the reason
+        self._provider_configs: Dict[str, Dict[str, Any]] = {}
+        self._providers_lock = threading.Lock()
+        self.rate_limiters: Dict[str, RateLimiter] = {}
         self._config = config or {}
         self._direct_kwargs = kwargs
+        self.cache = cache
+        if phrase_cache not in (None, 'sentence', 'clause'):
+            raise ConfigurationError(f"phrase_cache must be 'sentence' or 'clause', not {phrase_cache!r}.")
+        if phrase_cache and cache is None:
+            raise ConfigurationError("phrase_cache requires a cache (UnifiedTTS(cache=SynthesisCache(...))).")
+        self.phrase_cache = phrase_cache
+        self.phrase_crossfade = phrase_crossfade
+        self.max_segment_chars = max_segment_chars
+        self.segment_workers = segment_workers
+        self.routing = routing or RoutingPolicy()
+        self.pipeline = pipeline
+        self.scheduler = scheduler
+        self.client_pool = client_pool
+        self._client_pool_lock = threading.Lock()
+        if micro_batch is True:
+            micro_batch = MicroBatcher()
+        elif isinstance(micro_batch, dict):
+            micro_batch = MicroBatcher(**micro_batch)
+        self.micro_batcher: Optional[MicroBatcher] = micro_batch or None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor_lock = threading.Lock()
+        self.hooks: List[SynthesisHooks] = []
+        if metrics is not False:
+            self.hooks.append(MetricsHooks(None if metrics is True else metrics))
+        self.hooks.extend(hooks or [])
 
-        self._initialize_providers()
+        self._configure_providers()
+        if not lazy:
+            self._initialize_all_providers()
 
-    def _initialize_providers(self):
-        """Initializes provider instances based on configuration."""
+    def _configure_providers(self):
+        """Consolidates per-provider configuration; providers themselves are created on first use."""
         # Consolidate configuration
         effective_config = {}
 
@@ -60,32 +171,151 @@ class UnifiedTTS:
                 effective_config.setdefault(provider_name, {})[config_key] = value
             # else: warn about unrecognized kwarg?
 
-        # Instantiate configured providers
-        for provider_name, provider_class in AVAILABLE_PROVIDERS.items():
-            # Get specific config for this provider, or empty dict if none
-            provider_conf = effective_config.get(provider_name, {})
+        for provider_name, provider_conf in effective_config.items():
+            # Rate limit options are handled here rather than by the provider
+            try:
+                limiter = self._build_rate_limiter(provider_conf)
+            except (TypeError, ValueError) as e:
+                logger.warning("Invalid rate limit configuration for provider '%s': %s. This provider will be unavailable.", provider_name, e)
+                self._provider_errors[provider_name] = f"invalid rate limit configuration: {e}"
+                continue
+            if limiter is not None:
+                self.rate_limiters[provider_name] = limiter
+        self._provider_configs = effective_config
 
+    def _initialize_provider(self, provider_name: str) -> Optional[BaseTTSProvider]:
+        """Imports and instantiates a provider once; returns None if it is unknown or cannot be initialized."""
+        tts_provider = self.providers.get(provider_name)
+        if tts_provider is not None or provider_name in self._provider_errors:
+            return tts_provider
+        with self._providers_lock:
+            if provider_name in self.providers or provider_name in self._provider_errors:
+                return self.providers.get(provider_name)
+            if provider_name not in AVAILABLE_PROVIDERS:
+                return None
             # Try to instantiate. Provider's __init__ handles env vars if keys missing here.
-            # We wrap in try-except to allow selective provider initialization
-            # based on available keys/config, without halting everything.
+            # Failures are remembered, so an unavailable provider is only attempted once.
             try:
-                # Pass the consolidated config dict to the provider's init
-                instance = provider_class(**provider_conf)
-                self.providers[provider_name] = instance
-                print(f"INFO: Successfully initialized provider: {provider_name}")
+                provider_class = AVAILABLE_PROVIDERS[provider_name]
+                instance = provider_class(**self._provider_configs.get(provider_name, {}))
             except Exception as e:
-                 # Catch potential ConfigurationErrors or others during init
-                 print(f"WARNING: Failed to initialize provider '{provider_name}': {e}. This provider will be unavailable.")
+                 # Catch potential ConfigurationErrors, missing SDKs (ImportError) or others during init
+                 logger.warning("Failed to initialize provider '%s': %s. This provider will be unavailable.", provider_name, e)
+                 self._provider_errors[provider_name] = str(e)
+                 return None
+            self.providers[provider_name] = instance
+            logger.info("Successfully initialized provider: %s", provider_name)
+            return instance
+
+    def _initialize_all_providers(self):
+        """Initializes every registered provider (imports all of them)."""
+        for provider_name in AVAILABLE_PROVIDERS:
+            self._initialize_provider(provider_name)
 
 
+    @staticmethod
+    def _build_rate_limiter(provider_conf: Dict[str, Any]) -> Optional[RateLimiter]:
+        """Pops rate limit options from a provider's config and builds its RateLimiter."""
+        limiter = RateLimiter.from_config(provider_conf.pop('rate_limit', None))
+        flat_options = {key: provider_conf.pop(key) for key in RATE_LIMIT_CONFIG_KEYS if key in provider_conf}
+        if flat_options:
+            if limiter is not None:
+                raise ValueError("Use either 'rate_limit' or individual rate limit options, not both")
+            limiter = RateLimiter(**flat_options)
+        return limiter
+
     def list_available_providers(self) -> list[str]:
-        """Returns a list of successfully initialized provider names."""
+        """Returns the names of the providers that can be used (initializes all registered providers)."""
+        self._initialize_all_providers()
         return list(self.providers.keys())
 
+    def warm_up(self, providers: Optional[Iterable[str]] = None, connections: int = 1) -> Dict[str, Optional[str]]:
+        """
+        Initializes providers and opens connections to their endpoints, so the first requests start warm.
+
+        Args:
+            providers: Providers to warm up (default: every provider that initializes).
+            connections: Connections to open per provider.
+
+        Returns:
+            Dict[str, Optional[str]]: None for each provider that was warmed up, or the reason it could not be.
+        """
+        names = list(providers) if providers is not None else self.list_available_providers()
+        results: Dict[str, Optional[str]] = {}
+        for name in names:
+            try:
+                self._get_provider(name).warm_up(connections)
+                results[name] = None
+            except UnifiedTTSError as e:
+                logger.warning("Warm-up of provider '%s' failed: %s", name, e)
+                results[name] = str(e)
+        return results
+
+    def warmer(
+        self,
+        manifest: Union[str, Iterable[Any], None] = None,
+        tracker: Optional[HotPromptTracker] = None,
+        provider: Optional[str] = None,
+        connections: int = 1,
+        **kwargs
+    ) -> Warmer:
+        """
+        Builds a `Warmer` that warms this instance up in the background (call `start()` on it).
+
+        It opens `connections` connections per provider, pre-synthesizes the manifest into
+        the cache at 'bulk' priority, then keeps the tracker's hot prompts cached. The
+        tracker is added to this instance's hooks, so it learns from live requests.
+
+            warmer = tts.warmer("hot_prompts.json", provider="cartesia", tracker=HotPromptTracker()).start()
+            # Readiness endpoint: 200 if warmer.ready else 503
+
+        Args:
+            manifest: Path of a JSON manifest, or a list of texts / BatchItems / dicts (see `warmup.load_manifest`).
+            tracker: Learns hot prompts from requests.
+            provider: Provider of manifest entries that do not name one.
+            connections: Connections to open per provider.
+            **kwargs: Other `Warmer` options (concurrency, hot_prompts, refresh_interval, require_manifest).
+
+        Raises:
+            ConfigurationError: If a manifest or tracker is given but this instance has no cache.
+        """
+        def synthesize(item: BatchItem) -> None:
+            self.synthesize(item.text, item.provider, output_format=item.output_format, priority='bulk', **item.kwargs)
+
+        return self._build_warmer(synthesize, lambda: self.warm_up(connections=connections), manifest, tracker, provider, kwargs)
+
+    def _build_warmer(
+        self,
+        synthesize: Callable[[BatchItem], Any],
+        connect: Callable[[], Dict[str, Optional[str]]],
+        manifest: Union[str, Iterable[Any], None],
+        tracker: Optional[HotPromptTracker],
+        provider: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> Warmer:
+        """Builds the Warmer of `warmer` around blocking `synthesize` and `connect` callables."""
+        if (manifest or tracker) and self.cache is None:
+            raise ConfigurationError("Pre-synthesis requires a cache (UnifiedTTS(cache=SynthesisCache(...))).")
+        if tracker is not None and tracker not in self.hooks:
+            self.hooks.append(tracker)
+
+        def is_cached(item: BatchItem) -> bool:
+            synth_args = self._build_synth_args(item.output_format, dict(item.kwargs))
+            return self.cache.get(make_cache_key(item.provider, item.text, synth_args)) is not None
+
+        return Warmer(
+            synthesize=synthesize if self.cache is not None else None,
+            manifest=load_manifest(manifest, provider) if manifest else (),
+            connect=connect,
+            tracker=tracker,
+            is_cached=is_cached if self.cache is not None else None,
+            **kwargs
+        )
+
     def synthesize(
         self,
         text: str,
-        provider: str,
+        provider: Union[str, RoutingPolicy],
         output_path: Optional[str] = None,
         output_format: Optional[str] = None, # Allow overriding default per call
         **kwargs
@@ -93,15 +323,25 @@ class UnifiedTTS:
         """
         Synthesizes speech using the specified provider.
 
+        Texts longer than the provider's input limit (or `max_segment_chars`) are
+        split into segments that are synthesized concurrently and joined in order
+        without re-encoding; this requires a 'wav', 'mp3' or 'pcm'/'raw' output format.
+
         Args:
             text (str): The text to synthesize.
-            provider (str): The name of the provider to use (e.g., 'openai', 'cartesia').
+            provider (Union[str, RoutingPolicy]): The name of the provider to use (e.g., 'openai',
+                'cartesia'), or 'auto' / a RoutingPolicy to pick among initialized providers by
+                observed latency and error rate, with failover and optional hedging.
             output_path (Optional[str]): If provided, the audio will be saved to this
                                          file path instead of being returned as bytes.
             output_format (Optional[str]): The desired audio output format (provider-specific,
                                            e.g., 'mp3', 'wav'). Overrides provider default if set.
             **kwargs: Additional provider-specific parameters (e.g., voice, model, speed).
                       These are passed directly to the selected provider's synthesize method.
+                      `pipeline=` overrides the instance's AudioPipeline for this call.
+                      `api_key=` runs the call on a pooled provider instance for that key
+                      instead of the configured one. `micro_batch=False` sends the text
+                      on its own even when micro-batching is enabled.
 
         Returns:
             Optional[bytes]: The synthesized audio data as bytes if `output_path` is None.
@@ -112,46 +352,943 @@ class UnifiedTTS:
             SynthesisError: If the synthesis process fails within the provider.
             IOError: If saving the file fails when `output_path` is provided.
         """
-        if provider not in self.providers:
-            available = self.list_available_providers()
+        batchable = kwargs.pop('micro_batch', True)
+        policy = self._routing_policy(provider)
+        if policy is not None:
+            self._check_routable(kwargs)
+            audio_bytes = self._synthesize_routed(policy, text, output_format, kwargs)
+            if output_path:
+                self._save_chunks(output_path, [audio_bytes])
+                return None
+            return audio_bytes
+
+        if not output_path:
+            return self._synthesize_single(text, provider, output_format, kwargs, batchable)[0]
+
+        pipeline = kwargs.pop('pipeline', self.pipeline)
+        with self._lease_provider(provider, kwargs.pop('api_key', None)) as tts_provider:
+            synth_args = self._build_synth_args(output_format, kwargs)
+            cache_key = self._cache_key(provider, text, synth_args)
+            # Stream straight to disk so the whole clip is never held in memory
+            observation = self._observe('request', provider, text, synth_args, streaming=True)
+            chunks = self._cached_stream(
+                cache_key, provider, tts_provider, text, synth_args, DEFAULT_STREAM_CHUNK_SIZE, observation
+            )
+            if pipeline is not None:
+                chunks = pipeline.process_stream(chunks, *self._pipeline_input(tts_provider, synth_args))
+            try:
+                self._save_chunks(output_path, observation.wrap_stream(chunks))
+            except Exception as e:
+                observation.fail(e) # No-op if the stream already recorded the failure
+                raise
+            self._finalize_streamed_wav(output_path)
+            return None # Indicate success when saving to file
+
+    def _synthesize_single(
+        self,
+        text: str,
+        provider: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+        batchable: bool = True,
+    ) -> tuple:
+        """Synthesizes with one named provider; returns the audio and the request's SynthesisEvent."""
+        pipeline = kwargs.pop('pipeline', self.pipeline)
+        api_key = kwargs.pop('api_key', None)
+        with self._lease_provider(provider, api_key) as tts_provider:
+            synth_args = self._build_synth_args(output_format, kwargs)
+            cache_key = self._cache_key(provider, text, synth_args)
+            observation = self._observe('request', provider, text, synth_args)
+            try:
+                audio_bytes = self._synthesize_bytes(
+                    cache_key, provider, tts_provider, text, synth_args, observation,
+                    batchable=batchable and api_key is None, # Pooled per-key providers are not batched
+                )
+                if pipeline is not None:
+                    audio_bytes = pipeline.process(audio_bytes, *self._pipeline_input(tts_provider, synth_args))
+            except Exception as e:
+                observation.fail(e)
+                raise
+            observation.output(audio_bytes)
+            observation.finish()
+            return audio_bytes, observation.event
+
+    def _synthesize_bytes(
+        self,
+        cache_key: Optional[str],
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        observation: Observation,
+        batchable: bool = False,
+    ) -> bytes:
+        """Returns the complete clip for a request, from the cache or the provider (segmented or micro-batched if needed)."""
+        phrases = self._phrases(tts_provider, text, synth_args)
+        if phrases is not None:
+            return join_audio(
+                list(self._phrase_audio(provider, tts_provider, phrases, synth_args, observation)),
+                self._join_format(tts_provider, synth_args), self.phrase_crossfade, synth_args.get('sample_rate'),
+            )
+
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                observation.event.cache_hit = True
+                return bytes(cached)
+
+        segments = self._segment_text(tts_provider, text)
+        if len(segments) > 1:
+            output_format = self._join_format(tts_provider, synth_args)
+            audio_bytes = join_audio(list(self._synthesize_segments(provider, tts_provider, segments, synth_args)), output_format)
+        elif batchable and self._micro_batchable(tts_provider, text, synth_args):
+            audio_bytes = self._submit_micro_batch(provider, tts_provider, text, synth_args).result()
+        else:
+            audio_bytes = self._call_provider(provider, tts_provider, text, synth_args)
+        if cache_key is not None:
+            self.cache.put(cache_key, audio_bytes)
+        return audio_bytes
+
+    def synthesize_stream(
+        self,
+        text: str,
+        provider: Union[str, RoutingPolicy],
+        output_format: Optional[str] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes speech using the specified provider, yielding audio chunks as they arrive.
+
+        Providers without native streaming support yield the whole clip as a single chunk.
+        Long texts are segmented as in `synthesize`; each segment's audio is yielded
+        as soon as it and all segments before it are ready.
+
+        Args:
+            text (str): The text to synthesize.
+            provider (Union[str, RoutingPolicy]): The name of the provider to use, or 'auto' / a
+                RoutingPolicy. Routed streams fail over only until the first chunk arrives.
+            output_format (Optional[str]): The desired audio output format. Overrides provider default if set.
+            chunk_size (int): Preferred chunk size in bytes (a hint passed to the provider).
+            **kwargs: Additional provider-specific parameters (e.g., voice, model, speed).
+                      `pipeline=` overrides the instance's AudioPipeline and `api_key=`
+                      the provider's key for this call, as in `synthesize`. Streams are
+                      never micro-batched; `micro_batch=` is accepted and ignored.
+
+        Yields:
+            bytes: Successive pieces of the synthesized audio data.
+
+        Raises:
+            ProviderNotFoundError: If the requested provider is not available or initialized.
+            SynthesisError: If the synthesis process fails within the provider.
+        """
+        kwargs.pop('micro_batch', None) # Streams are never batched
+        policy = self._routing_policy(provider)
+        if policy is not None:
+            self._check_routable(kwargs)
+            yield from self._stream_routed(policy, text, output_format, chunk_size, kwargs)
+            return
+        yield from self._stream_single(text, provider, output_format, chunk_size, kwargs)
+
+    def _stream_single(
+        self,
+        text: str,
+        provider: str,
+        output_format: Optional[str],
+        chunk_size: int,
+        kwargs: Dict[str, Any],
+        events: Optional[List[SynthesisEvent]] = None,
+    ) -> Iterator[bytes]:
+        """Streams from one named provider; the request's SynthesisEvent is appended to `events` once it starts."""
+        pipeline = kwargs.pop('pipeline', self.pipeline)
+        with self._lease_provider(provider, kwargs.pop('api_key', None)) as tts_provider:
+            synth_args = self._build_synth_args(output_format, kwargs)
+            cache_key = self._cache_key(provider, text, synth_args)
+            observation = self._observe('request', provider, text, synth_args, streaming=True)
+            if events is not None:
+                events.append(observation.event)
+            chunks = self._cached_stream(cache_key, provider, tts_provider, text, synth_args, chunk_size, observation)
+            if pipeline is not None:
+                chunks = pipeline.process_stream(chunks, *self._pipeline_input(tts_provider, synth_args))
+            yield from observation.wrap_stream(chunks)
+
+    def open_text_stream(
+        self,
+        provider: Union[str, RoutingPolicy],
+        output_format: Optional[str] = None,
+        chunker: Optional[TextChunker] = None,
+        prefetch: int = 2,
+        **kwargs
+    ) -> TextStream:
+        """
+        Opens an incremental synthesis session for text that arrives piece by piece (e.g. LLM output).
+
+        Text passed to the returned stream's `feed` is buffered up to sentence
+        boundaries; every complete chunk is synthesized through `synthesize_stream`
+        (so caching, routing, metrics and pipelines apply per chunk) and its audio
+        is yielded, in order and with sequence numbers, by iterating the stream.
+
+        Args:
+            provider (Union[str, RoutingPolicy]): The provider (or routing policy) used for every chunk.
+            output_format (Optional[str]): The desired audio output format. Prefer a raw format
+                ('pcm', or a provider's raw PCM format) so chunks can be played back to back.
+            chunker (Optional[TextChunker]): Controls how text is cut into chunks.
+            prefetch (int): Chunks synthesized concurrently ahead of the one being played.
+            **kwargs: Passed to `synthesize_stream` for every chunk.
+
+        Returns:
+            TextStream: The session; see `TextStream` for `feed`, `flush`, `cancel` and `close`.
+        """
+        return TextStream(
+            lambda text: self.synthesize_stream(text, provider, output_format=output_format, **kwargs),
+            chunker=chunker,
+            prefetch=prefetch,
+        )
+
+    def synthesize_batch(
+        self,
+        items: Iterable[Union[BatchItem, Dict[str, Any]]],
+        max_workers: int = 4,
+        per_provider_concurrency: Optional[Union[int, Dict[str, int]]] = None,
+        ordered: bool = False,
+    ) -> Iterator[BatchResult]:
+        """
+        Synthesizes many requests concurrently on a bounded thread pool.
+
+        Identical requests (same provider, text and synthesis parameters) are
+        synthesized only once and fanned out to every matching item. Items with
+        an `output_path` are written as soon as their audio is ready. Failures are
+        reported per item via `BatchResult.error` instead of aborting the batch.
+
+        Args:
+            items: BatchItem instances, or dicts of BatchItem arguments
+                   (e.g., {'text': 'Hi', 'provider': 'openai', 'voice': 'nova'}).
+            max_workers (int): Maximum number of synthesis calls in flight overall.
+            per_provider_concurrency (Optional[Union[int, Dict[str, int]]]): Cap on
+                in-flight calls per provider, either one value for all providers or a
+                dict keyed by provider name. Defaults to no per-provider cap.
+            ordered (bool): If True, results are yielded in input order; otherwise in
+                completion order.
+
+        Yields:
+            BatchResult: One result per input item.
+        """
+        batch = [BatchItem.coerce(item) for item in items]
+        pending_groups = iter(self._batch_groups(batch))
+        limits = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self._batch_limits(batch, per_provider_concurrency).items()
+        }
+
+        def run_group(indices: List[int]) -> List[BatchResult]:
+            item = batch[indices[0]]
+            limit = limits.get(item.provider)
+            try:
+                if limit is not None:
+                    with limit:
+                        audio = self.synthesize(item.text, item.provider, output_format=item.output_format, **item.kwargs)
+                else:
+                    audio = self.synthesize(item.text, item.provider, output_format=item.output_format, **item.kwargs)
+            except (UnifiedTTSError, IOError) as e:
+                return [BatchResult(index, batch[index], error=e) for index in indices]
+
+            results = []
+            for index in indices:
+                target = batch[index]
+                if not target.output_path:
+                    results.append(BatchResult(index, target, audio=audio))
+                    continue
+                try:
+                    self._save_chunks(target.output_path, [audio])
+                    results.append(BatchResult(index, target))
+                except IOError as e:
+                    results.append(BatchResult(index, target, error=e))
+            return results
+
+        # Keep a bounded window of groups in flight so huge batches don't queue every future at once
+        window = max(1, max_workers) * 2
+        next_index = 0
+        completed: Dict[int, BatchResult] = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            in_flight = set()
+            for indices in pending_groups:
+                in_flight.add(executor.submit(run_group, indices))
+                if len(in_flight) >= window:
+                    break
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        if ordered:
+                            completed[result.index] = result
+                        else:
+                            yield result
+                    next_group = next(pending_groups, None)
+                    if next_group is not None:
+                        in_flight.add(executor.submit(run_group, next_group))
+
+                while ordered and next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+
+    def _batch_groups(self, batch: List[BatchItem]) -> List[List[int]]:
+        """Groups item indices by request identity (first-seen order), so identical requests are synthesized once."""
+        groups: Dict[str, List[int]] = {}
+        for index, item in enumerate(batch):
+            synth_args = self._build_synth_args(item.output_format, item.kwargs)
+            groups.setdefault(make_cache_key(item.provider, item.text, synth_args), []).append(index)
+        return list(groups.values())
+
+    @staticmethod
+    def _batch_limits(
+        batch: List[BatchItem], per_provider_concurrency: Optional[Union[int, Dict[str, int]]]
+    ) -> Dict[str, int]:
+        """Resolves `per_provider_concurrency` to a cap per provider of the batch (providers without a cap are omitted)."""
+        limits: Dict[str, int] = {}
+        for provider_name in {item.provider for item in batch}:
+            if isinstance(per_provider_concurrency, dict):
+                limit = per_provider_concurrency.get(provider_name)
+            else:
+                limit = per_provider_concurrency
+            if limit:
+                limits[provider_name] = limit
+        return limits
+
+    def _routing_policy(self, provider: Union[str, RoutingPolicy]) -> Optional[RoutingPolicy]:
+        """Returns the policy to route with, or None if `provider` names a single provider."""
+        if isinstance(provider, RoutingPolicy):
+            return provider
+        if provider == AUTO_PROVIDER:
+            return self.routing
+        return None
+
+    def _routing_candidates(self, policy: RoutingPolicy) -> List[str]:
+        if policy.providers is not None:
+            for provider_name in policy.providers:
+                self._initialize_provider(provider_name)
+        else:
+            self._initialize_all_providers()
+        candidates = policy.rank(self.providers)
+        if not candidates:
+            raise ProviderNotFoundError(
+                f"No providers available for routing. Available providers: {self.list_available_providers()}"
+            )
+        return candidates
+
+    def _routed_attempt(
+        self,
+        policy: RoutingPolicy,
+        provider: str,
+        text: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> bytes:
+        """
+        Synthesizes with one provider, recording latency and outcome in the policy.
+        Cache hits and local errors are not recorded (see `RoutingPolicy.release`).
+        """
+        start = time.monotonic()
+        ok: Optional[bool] = None # None: the attempt says nothing about the provider
+        try:
+            audio_bytes, event = self._synthesize_single(text, provider, output_format, policy.kwargs_for(provider, kwargs))
+            ok = None if event.cache_hit else True
+            return audio_bytes
+        except SynthesisError as e:
+            if not isinstance(e, LOCAL_ERRORS):
+                ok = False
+            raise
+        finally:
+            self._end_attempt(policy, provider, start, ok)
+
+    @staticmethod
+    def _end_attempt(policy: RoutingPolicy, provider: str, start: float, ok: Optional[bool]) -> None:
+        """Records a routed attempt's outcome, or only releases the provider if it had none."""
+        if ok is None:
+            policy.release(provider)
+        else:
+            policy.record(provider, time.monotonic() - start, ok=ok)
+
+    def _synthesize_routed(
+        self,
+        policy: RoutingPolicy,
+        text: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> bytes:
+        """Runs a request through the routing policy (failover, optionally hedged)."""
+        candidates = self._routing_candidates(policy)
+        if policy.hedge and len(candidates) > 1:
+            return self._synthesize_hedged(policy, candidates, text, output_format, kwargs)
+
+        errors = []
+        for name in candidates:
+            if not policy.breaker(name).allow_request():
+                continue
+            try:
+                return self._routed_attempt(policy, name, text, output_format, kwargs)
+            except SynthesisError as e:
+                errors.append(f"{name}: {e}")
+        raise SynthesisError(self._routing_failure_message(candidates, errors))
+
+    def _synthesize_hedged(
+        self,
+        policy: RoutingPolicy,
+        candidates: List[str],
+        text: str,
+        output_format: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> bytes:
+        """
+        Starts the best candidate and, if it has not returned within its hedge delay,
+        the next one too; returns the first successful result. Failures fall through
+        to further candidates. Losing attempts finish in the background and still
+        update the policy's statistics.
+        """
+        executor = self._get_hedge_executor()
+        remaining = list(candidates)
+        pending: Dict[Any, str] = {}
+        errors: List[str] = []
+
+        def launch_next() -> Optional[str]:
+            while remaining:
+                name = remaining.pop(0)
+                if policy.breaker(name).allow_request():
+                    pending[executor.submit(self._routed_attempt, policy, name, text, output_format, kwargs)] = name
+                    return name
+            return None
+
+        primary = launch_next()
+        if primary is None:
+            raise SynthesisError(self._routing_failure_message(candidates, errors))
+        hedge_timeout: Optional[float] = policy.hedge_delay(primary)
+
+        while pending:
+            done, _ = wait(pending, timeout=hedge_timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is slower than its p95: hedge with the next healthy provider
+                hedge_timeout = None
+                launch_next()
+                continue
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    return future.result()
+                except SynthesisError as e:
+                    errors.append(f"{name}: {e}")
+            if not pending:
+                launch_next() # Fail over
+        raise SynthesisError(self._routing_failure_message(candidates, errors))
+
+    def _stream_routed(
+        self,
+        policy: RoutingPolicy,
+        text: str,
+        output_format: Optional[str],
+        chunk_size: int,
+        kwargs: Dict[str, Any],
+    ) -> Iterator[bytes]:
+        """Streams from the best candidate, failing over until the first chunk arrives."""
+        candidates = self._routing_candidates(policy)
+        errors = []
+        for name in candidates:
+            if not policy.breaker(name).allow_request():
+                continue
+            start = time.monotonic()
+            events: List[SynthesisEvent] = []
+            stream = self._stream_single(text, name, output_format, chunk_size, policy.kwargs_for(name, kwargs), events)
+            ok: Optional[bool] = None
+            try:
+                first_chunk = next(stream, b'')
+                # Time to first audio is what interactive callers wait on
+                ok = None if events and events[0].cache_hit else True
+            except SynthesisError as e:
+                if not isinstance(e, LOCAL_ERRORS):
+                    ok = False
+                errors.append(f"{name}: {e}")
+                continue
+            finally:
+                self._end_attempt(policy, name, start, ok)
+            if first_chunk:
+                yield first_chunk
+            yield from stream
+            return
+        raise SynthesisError(self._routing_failure_message(candidates, errors))
+
+    @staticmethod
+    def _routing_failure_message(candidates: List[str], errors: List[str]) -> str:
+        if not errors:
+            return f"All routing candidates {candidates} are unavailable (circuit breakers open)."
+        return f"All routing candidates failed: {'; '.join(errors)}"
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='unified-tts-hedge')
+            return self._hedge_executor
+
+    def _get_provider(self, provider: str) -> BaseTTSProvider:
+        """Returns the provider instance (initializing it on first use) or raises ProviderNotFoundError."""
+        tts_provider = self._initialize_provider(provider)
+        if tts_provider is None:
+            reason = self._provider_errors.get(provider)
+            detail = f": {reason}" if reason else ""
             raise ProviderNotFoundError(
-                f"Provider '{provider}' not found or not initialized. "
-                f"Available providers: {available}"
+                f"Provider '{provider}' not found or not initialized{detail}. "
+                f"Registered providers: {list(AVAILABLE_PROVIDERS)}"
+            )
+        return tts_provider
+
+    @contextmanager
+    def _lease_provider(self, provider: str, api_key: Optional[str]) -> Iterator[BaseTTSProvider]:
+        """Yields the configured provider instance, or a pooled one for a per-call `api_key`."""
+        if api_key is None:
+            yield self._get_provider(provider)
+            return
+        if provider not in AVAILABLE_PROVIDERS:
+            raise ProviderNotFoundError(f"Provider '{provider}' not found. Registered providers: {list(AVAILABLE_PROVIDERS)}")
+        pool = self.client_pool
+        if pool is None:
+            with self._client_pool_lock:
+                if self.client_pool is None:
+                    self.client_pool = ClientPool()
+                pool = self.client_pool
+        with pool.lease(provider, api_key, lambda key: self._create_keyed_provider(provider, key)) as tts_provider:
+            yield tts_provider
+
+    def _create_keyed_provider(self, provider: str, api_key: str) -> BaseTTSProvider:
+        """Instantiates a provider with the instance's configuration and a caller-supplied API key."""
+        try:
+            return AVAILABLE_PROVIDERS[provider](**{**self._provider_configs.get(provider, {}), 'api_key': api_key})
+        except UnifiedTTSError:
+            raise
+        except Exception as e:
+            raise ProviderNotFoundError(f"Provider '{provider}' could not be initialized: {e}")
+
+    @staticmethod
+    def _check_routable(kwargs: Dict[str, Any]) -> None:
+        if 'api_key' in kwargs:
+            raise ConfigurationError("A per-call api_key cannot be combined with routing; name the provider instead.")
+
+    def _cache_key(self, provider: str, text: str, synth_args: Dict[str, Any]) -> Optional[str]:
+        """Returns the cache key for a request, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return make_cache_key(provider, text, synth_args)
+
+    def _observe(
+        self,
+        scope: str,
+        provider: str,
+        text: str,
+        synth_args: Dict[str, Any],
+        streaming: bool = False,
+    ) -> Observation:
+        """Starts an observation of one request ('request' scope) or provider call ('provider' scope)."""
+        return Observation(self.hooks, SynthesisEvent(scope, provider, text, synth_args, streaming))
+
+    def _acquire_rate_limit(self, provider: str, text: str, synth_args: Dict[str, Any]) -> Union[Permit, Ticket, None]:
+        """
+        Waits for the scheduler and the provider's rate limiter (if any) before a request is sent.
+
+        Returns:
+            Union[Permit, Ticket, None]: Release it once the request has finished.
+
+        Raises:
+            DeadlineExceededError: If the call's `deadline` passes while queued.
+            OverloadedError: If the scheduler shed the request.
+        """
+        deadline = synth_args.get('deadline')
+        ticket = None
+        if self.scheduler is not None:
+            ticket = self.scheduler.acquire(
+                synth_args.get('priority'), synth_args.get('tenant'), cost=len(text), deadline=deadline
             )
+        limiter = self.rate_limiters.get(provider)
+        if limiter is None:
+            return ticket
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            permit = limiter.acquire(chars=len(text), timeout=timeout)
+        except BaseException:
+            if ticket is not None:
+                ticket.release()
+            raise
+        if permit is None:
+            if ticket is not None:
+                ticket.release()
+            raise DeadlineExceededError(f"Deadline exceeded while waiting for the '{provider}' rate limiter.")
+        return permit if ticket is None else ticket.attach(permit)
+
+    def _provider_args(self, provider: str, text: str, synth_args: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the provider options for a call, with a `before_retry` hook when the provider is rate limited."""
+        args = provider_args(synth_args)
+        limiter = self.rate_limiters.get(provider)
+        if limiter is None:
+            return args
+        # The permit covers the first attempt; every transport retry takes its own tokens
+        tokens = RetryTokens(limiter, len(text), synth_args.get('deadline'))
+        return dict(args, before_retry=tokens, abefore_retry=tokens.acall)
+
+    def _call_provider(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        timestamps: bool = False,
+    ) -> Any:
+        """
+        Calls a provider's synthesize under its rate limit, wrapping unexpected errors in SynthesisError.
+
+        With `timestamps`, calls `synthesize_with_timestamps` and returns its (audio, words) pair.
+        """
+        permit = self._acquire_rate_limit(provider, text, synth_args)
+        # Observed after the rate limit wait, so provider latency excludes client-side queueing
+        observation = self._observe('provider', provider, text, synth_args)
+        try:
+            if timestamps:
+                result = tts_provider.synthesize_with_timestamps(text, **self._provider_args(provider, text, synth_args))
+                audio_bytes = result[0]
+            else:
+                result = audio_bytes = tts_provider.synthesize(text, **self._provider_args(provider, text, synth_args))
+        except SynthesisError as e:
+            # Re-raise SynthesisError to propagate it
+            observation.fail(e)
+            raise
+        except Exception as e:
+            # Catch unexpected errors from provider implementation
+            observation.fail(e)
+            raise SynthesisError(f"Unexpected error during synthesis with provider '{provider}': {e}")
+        finally:
+            if permit is not None:
+                permit.release()
+        observation.output(audio_bytes)
+        observation.finish()
+        return result
+
+    # --- Micro-batching ---
+
+    def _batch_audio_format(self, tts_provider: BaseTTSProvider, synth_args: Dict[str, Any]) -> tuple:
+        """The (format, sample rate) of a request's audio; the rate of headerless PCM may come from the provider."""
+        output_format, sample_rate = self._pipeline_input(tts_provider, synth_args)
+        return output_format, sample_rate or getattr(tts_provider, 'sample_rate', None)
 
-        tts_provider = self.providers[provider]
+    def _micro_batchable(self, tts_provider: BaseTTSProvider, text: str, synth_args: Dict[str, Any]) -> bool:
+        if self.micro_batcher is None:
+            return False
+        output_format, sample_rate = self._batch_audio_format(tts_provider, synth_args)
+        if not self.micro_batcher.accepts(text, output_format):
+            return False
+        return output_format.lower() == 'wav' or bool(sample_rate) # PCM can only be cut at a known rate
 
-        # Prepare synthesis arguments, allowing per-call output_format override
+    def _submit_micro_batch(self, provider: str, tts_provider: BaseTTSProvider, text: str, synth_args: Dict[str, Any]):
+        """Queues a short text with others for the same provider and audio options; returns the future of its clip."""
+        group = (provider, make_cache_key(provider, '', synth_args)) # Ignores deadline, priority and tenant
+        return self.micro_batcher.submit(
+            group, text, synth_args, functools.partial(self._run_micro_batch, provider, tts_provider)
+        )
+
+    def _run_micro_batch(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        texts: List[str],
+        args: List[Dict[str, Any]],
+    ) -> List[bytes]:
+        """Sends the texts of a batch as one request and splits the audio, or sends them one by one if it cannot be split."""
+        synth_args = self._merge_batch_args(args)
+        if len(texts) == 1:
+            return [self._call_provider(provider, tts_provider, texts[0], synth_args)]
+        joined = join_texts(texts, self.micro_batcher.delimiter)
+        output_format, sample_rate = self._batch_audio_format(tts_provider, synth_args)
+        if tts_provider.SUPPORTS_TIMESTAMPS:
+            audio_bytes, words = self._call_provider(provider, tts_provider, joined, synth_args, timestamps=True)
+        else:
+            audio_bytes, words = self._call_provider(provider, tts_provider, joined, synth_args), None
+        clips = self.micro_batcher.split(texts, audio_bytes, output_format, sample_rate, words)
+        if clips is None:
+            clips = list(self._synthesize_segments(provider, tts_provider, texts, synth_args))
+        return clips
+
+    @staticmethod
+    def _merge_batch_args(args: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Synthesis arguments of a whole batch: its earliest deadline and most urgent priority."""
+        synth_args = dict(args[0])
+        deadlines = [a['deadline'] for a in args if a.get('deadline') is not None]
+        if deadlines:
+            synth_args['deadline'] = min(deadlines)
+        priorities = [a['priority'] for a in args if a.get('priority') is not None]
+        if priorities:
+            synth_args['priority'] = min(priorities, key=priority_level)
+        return synth_args
+
+    def _cached_stream(
+        self,
+        cache_key: Optional[str],
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        chunk_size: int,
+        observation: Optional[Observation] = None,
+    ) -> Iterator[bytes]:
+        """
+        Streams from the cache on a hit; otherwise streams from the provider (segment
+        by segment for long texts) and stores the complete clip once the stream
+        finishes successfully. In phrase cache mode, streams phrase by phrase instead.
+        """
+        phrases = self._phrases(tts_provider, text, synth_args)
+        if phrases is not None:
+            yield from stream_joined_audio(
+                self._phrase_audio(provider, tts_provider, phrases, synth_args, observation),
+                self._join_format(tts_provider, synth_args), self.phrase_crossfade, synth_args.get('sample_rate'),
+            )
+            return
+
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if observation is not None:
+                    observation.event.cache_hit = True
+                view = memoryview(cached)
+                for start in range(0, len(view), chunk_size):
+                    yield bytes(view[start:start + chunk_size])
+                return
+
+        segments = self._segment_text(tts_provider, text)
+        if len(segments) > 1:
+            output_format = self._join_format(tts_provider, synth_args)
+            segment_audio: List[bytes] = []
+
+            def collect():
+                for audio in self._synthesize_segments(provider, tts_provider, segments, synth_args):
+                    if cache_key is not None:
+                        segment_audio.append(audio)
+                    yield audio
+
+            yield from stream_joined_audio(collect(), output_format)
+            if cache_key is not None:
+                self.cache.put(cache_key, join_audio(segment_audio, output_format))
+            return
+
+        if cache_key is None:
+            yield from self._stream_from_provider(provider, tts_provider, text, synth_args, chunk_size)
+            return
+
+        pieces = []
+        for chunk in self._stream_from_provider(provider, tts_provider, text, synth_args, chunk_size):
+            pieces.append(chunk)
+            yield chunk
+        self.cache.put(cache_key, b''.join(pieces))
+
+    def _phrases(self, tts_provider: BaseTTSProvider, text: str, synth_args: Dict[str, Any]) -> Optional[List[str]]:
+        """Splits `text` for phrase-level caching, or returns None if the request is cached whole."""
+        if not self.phrase_cache:
+            return None
+        output_format = (
+            synth_args.get('response_format') or synth_args.get('output_format') or tts_provider.DEFAULT_OUTPUT_FORMAT
+        ).lower()
+        if output_format not in JOINABLE_FORMATS:
+            return None
+        phrases = []
+        for phrase in split_phrases(text, clauses=self.phrase_cache == 'clause'):
+            phrases.extend(self._segment_text(tts_provider, phrase))
+        return phrases or None
+
+    def _phrase_audio(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        phrases: List[str],
+        synth_args: Dict[str, Any],
+        observation: Optional[Observation] = None,
+    ) -> Iterator[bytes]:
+        """
+        Yields the audio of each phrase in order: cached phrases at once, the misses
+        synthesized concurrently (see `_synthesize_segments`) and added to the cache.
+        Hits and misses are counted in `cache.stats` and on the request's event.
+        """
+        keys, found, missing = self._lookup_phrases(provider, phrases, synth_args, observation)
+        synthesized = self._synthesize_segments(provider, tts_provider, missing, synth_args)
+        ready: Dict[str, bytes] = {}
+        try:
+            for key, audio in zip(keys, found):
+                if audio is None:
+                    audio = ready.get(key)
+                    if audio is None:
+                        audio = ready[key] = next(synthesized) # Misses complete in first-seen order
+                        self.cache.put(key, audio)
+                yield audio
+        finally:
+            synthesized.close()
+
+    def _lookup_phrases(
+        self,
+        provider: str,
+        phrases: List[str],
+        synth_args: Dict[str, Any],
+        observation: Optional[Observation] = None,
+    ) -> tuple:
+        """
+        Looks each phrase up in the cache and counts hits and misses.
+
+        Returns:
+            tuple: The cache key and cached audio (None on a miss) of each phrase, and the
+            texts to synthesize: the misses in first-seen order, each only once.
+        """
+        keys = [make_cache_key(provider, phrase, synth_args) for phrase in phrases]
+        found = [self.cache.get(key) for key in keys]
+        misses = [index for index, audio in enumerate(found) if audio is None]
+        hits = len(phrases) - len(misses)
+        self.cache.stats.incr('segment_hits', hits)
+        self.cache.stats.incr('segment_misses', len(misses))
+        if observation is not None:
+            observation.event.segments, observation.event.segment_hits = len(phrases), hits
+            observation.event.cache_hit = not misses
+
+        # A phrase repeated within the text is synthesized once
+        pending = dict.fromkeys(keys[index] for index in misses)
+        texts = dict(zip(keys, phrases))
+        return keys, found, [texts[key] for key in pending]
+
+    def _segment_text(self, tts_provider: BaseTTSProvider, text: str) -> List[str]:
+        """Splits `text` to fit the provider's input limit and `max_segment_chars`."""
+        limits = [limit for limit in (tts_provider.MAX_INPUT_CHARS, self.max_segment_chars) if limit]
+        if not limits:
+            return [text]
+        return split_text(text, min(limits)) or [text]
+
+    @staticmethod
+    def _join_format(tts_provider: BaseTTSProvider, synth_args: Dict[str, Any]) -> str:
+        """Resolves the effective output format and checks that its segments can be joined."""
+        output_format = (
+            synth_args.get('response_format')
+            or synth_args.get('output_format')
+            or tts_provider.DEFAULT_OUTPUT_FORMAT
+        ).lower()
+        if output_format not in JOINABLE_FORMATS:
+            raise SynthesisError(
+                f"Text is too long for a single '{tts_provider.name}' request and audio in format "
+                f"'{output_format}' cannot be joined. Use one of {list(JOINABLE_FORMATS)}."
+            )
+        return output_format
+
+    def _synthesize_segments(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        segments: List[str],
+        synth_args: Dict[str, Any],
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes segments concurrently, yielding their audio in order.
+
+        Each segment is yielded as soon as it and every earlier segment are done;
+        closing the generator early cancels segments that have not started yet.
+        """
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.segment_workers, len(segments))))
+        futures = [
+            executor.submit(self._call_provider, provider, tts_provider, segment, synth_args)
+            for segment in segments
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _pipeline_input(tts_provider: BaseTTSProvider, synth_args: Dict[str, Any]) -> tuple:
+        """The (format, sample rate) a request asked the provider for, as an AudioPipeline's input."""
+        output_format = (
+            synth_args.get('response_format')
+            or synth_args.get('output_format')
+            or tts_provider.DEFAULT_OUTPUT_FORMAT
+        )
+        return output_format, synth_args.get('sample_rate')
+
+    @staticmethod
+    def _finalize_streamed_wav(output_path: str) -> None:
+        """Fixes the size fields of a WAV file that was written with a streaming header."""
+        with open(output_path, 'rb') as f:
+            head = f.read(8)
+        if head[:4] == b'RIFF' and head[4:8] == WAV_UNKNOWN_SIZE.to_bytes(4, 'little'):
+            try:
+                finalize_wav_file(output_path)
+            except (OSError, SynthesisError) as e:
+                raise IOError(f"Failed to finalize WAV header of '{output_path}': {e}")
+
+    @staticmethod
+    def _build_synth_args(output_format: Optional[str], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Prepares synthesis arguments, allowing per-call output_format override."""
         synth_args = {}
         if output_format:
             synth_args['output_format'] = output_format
         synth_args.update(kwargs) # Add other specific params
+        return synth_args
 
+    def _stream_from_provider(
+        self,
+        provider: str,
+        tts_provider: BaseTTSProvider,
+        text: str,
+        synth_args: Dict[str, Any],
+        chunk_size: int,
+    ) -> Iterator[bytes]:
+        """Iterates a provider's stream under its rate limit, wrapping unexpected errors in SynthesisError."""
+        permit = self._acquire_rate_limit(provider, text, synth_args)
+        observation = self._observe('provider', provider, text, synth_args, streaming=True)
         try:
-            audio_bytes = tts_provider.synthesize(text, **synth_args)
+            for chunk in observation.wrap_stream(tts_provider.synthesize_stream(text, chunk_size=chunk_size, **self._provider_args(provider, text, synth_args))):
+                if chunk:
+                    yield chunk
         except SynthesisError:
-            # Re-raise SynthesisError to propagate it
             raise
         except Exception as e:
-            # Catch unexpected errors from provider implementation
-            raise SynthesisError(f"Unexpected error during synthesis with provider '{provider}': {e}")
+            raise SynthesisError(f"Unexpected error during streaming synthesis with provider '{provider}': {e}")
+        finally:
+            if permit is not None:
+                permit.release() # The in-flight slot is held until the stream is fully consumed
 
+    @staticmethod
+    def _save_chunks(output_path: str, chunks: Iterable[bytes]) -> None:
+        """
+        Writes audio chunks to `output_path` as they arrive.
 
-        if output_path:
-            try:
-                # Ensure directory exists if path includes directories
-                output_dir = os.path.dirname(output_path)
-                if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
-
-                with open(output_path, 'wb') as f:
-                    f.write(audio_bytes)
-                print(f"INFO: Audio successfully saved to: {output_path}")
-                return None # Indicate success when saving to file
-            except IOError as e:
-                raise IOError(f"Failed to save audio to '{output_path}': {e}")
-            except Exception as e:
-                raise IOError(f"An unexpected error occurred while saving audio to '{output_path}': {e}")
+        A partially written file is removed if synthesis fails midway, so callers
+        never mistake a truncated clip for a complete one.
+        """
+        try:
+            # Ensure directory exists if path includes directories
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            f = open(output_path, 'wb')
+        except Exception as e:
+            raise IOError(f"Failed to save audio to '{output_path}': {e}")
 
-        else:
-            return audio_bytes
\ No newline at end of file
+        try:
+            with f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except SynthesisError:
+            _remove_quietly(output_path)
+            raise
+        except IOError as e:
+            _remove_quietly(output_path)
+            raise IOError(f"Failed to save audio to '{output_path}': {e}")
+        except Exception as e:
+            _remove_quietly(output_path)
+            raise IOError(f"An unexpected error occurred while saving audio to '{output_path}': {e}")
+        logger.info("Audio successfully saved to: %s", output_path)
+
+
+def _remove_quietly(path: str) -> None:
+    """Removes a file, ignoring errors (used to clean up partial output)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -14,4 +14,12 @@ class ProviderNotFoundError(UnifiedTTSError):
 
 class SynthesisError(UnifiedTTSError):
     """Error during the speech synthesis process."""
-    pass
\ No newline at end of file
+    pass
+
+class DeadlineExceededError(SynthesisError):
+    """Error when a request cannot complete before its deadline."""
+    pass
+
+class OverloadedError(SynthesisError):
+    """Error when a request is shed by the scheduler (queue full, or displaced by higher-priority work)."""
+    pass
@@ -0,0 +1,328 @@
+# unified_tts/incremental.py
+
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+from .exceptions import SynthesisError
+from .segmentation import find_boundary
+
+# Markers passed through the per-segment audio queues
+_END = object()
+_CLOSED = object()
+
+
+class TextChunker:
+    """
+    Buffers text that arrives in fragments (e.g. LLM tokens) into speakable chunks.
+
+    A chunk is released as soon as a sentence is complete. To shorten the time to
+    first audio, the first chunk of a turn may end at a clause boundary (, ; :)
+    once it is `first_chunk_chars` long; later chunks wait for full sentences,
+    which sound more natural. Text without any boundary is cut at whitespace
+    once it reaches `max_chars`.
+    """
+
+    def __init__(self, first_chunk_chars: int = 24, max_chars: int = 250):
+        """
+        Args:
+            first_chunk_chars: Minimum length of a first chunk cut at a clause boundary (0 disables clause cuts).
+            max_chars: Length at which text is cut even without a boundary.
+        """
+        self.first_chunk_chars = first_chunk_chars
+        self.max_chars = max_chars
+        self._buffer = ''
+        self._first = True
+
+    def feed(self, text: str) -> List[str]:
+        """Adds a fragment and returns the chunks it completed (possibly none)."""
+        self._buffer += text
+        chunks = []
+        while True:
+            end = find_boundary(self._buffer)
+            if self._first and self.first_chunk_chars:
+                clause_end = find_boundary(self._buffer, clauses=True, min_chars=self.first_chunk_chars)
+                if clause_end is not None and (end is None or clause_end < end):
+                    end = clause_end
+            if end is None and len(self._buffer) >= self.max_chars:
+                cut = self._buffer.rfind(' ', 0, self.max_chars)
+                end = cut + 1 if cut > 0 else self.max_chars
+            if end is None:
+                return chunks
+            chunk, self._buffer = self._buffer[:end].strip(), self._buffer[end:]
+            if chunk:
+                chunks.append(chunk)
+                self._first = False
+
+    def flush(self) -> Optional[str]:
+        """Returns the buffered remainder (end of turn) and starts a new turn."""
+        chunk, self._buffer = self._buffer.strip(), ''
+        self._first = True
+        return chunk or None
+
+    def clear(self) -> None:
+        """Drops buffered text and starts a new turn."""
+        self._buffer = ''
+        self._first = True
+
+
+class AudioFrame:
+    """A piece of audio produced by a text stream."""
+
+    def __init__(self, seq: int, segment: int, text: str, data: bytes):
+        """
+        Args:
+            seq: Position of this frame in the stream (0, 1, 2, ... across the whole session).
+            segment: Index of the text chunk the audio belongs to.
+            text: That text chunk.
+            data: The audio bytes.
+        """
+        self.seq = seq
+        self.segment = segment
+        self.text = text
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"AudioFrame(seq={self.seq}, segment={self.segment}, bytes={len(self.data)})"
+
+
+class TextStream:
+    """
+    Incremental text-to-speech session: text goes in as it is produced, audio comes out as soon as it is ready.
+
+    Returned by `UnifiedTTS.open_text_stream`. Fragments passed to `feed` are
+    buffered into chunks by a `TextChunker`; each chunk is synthesized as soon
+    as it is complete (up to `prefetch` chunks concurrently) and its audio is
+    yielded, in text order, by iterating the stream. `flush` ends a turn,
+    `cancel` drops everything not yet played (barge-in), and `close` ends the
+    session once the remaining audio has been yielded.
+
+        stream = tts.open_text_stream('cartesia', output_format='pcm')
+        threading.Thread(target=lambda: [stream.feed(token) for token in llm_tokens()] and stream.close()).start()
+        for frame in stream:
+            player.write(frame.data)
+
+    `feed`, `flush`, `cancel` and `close` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str], Iterator[bytes]],
+        chunker: Optional[TextChunker] = None,
+        prefetch: int = 2,
+    ):
+        """
+        Args:
+            synthesize: Returns the audio stream for one chunk of text.
+            chunker: Splits incoming text into chunks (default `TextChunker()`).
+            prefetch: Chunks synthesized concurrently ahead of the one being played.
+        """
+        self._synthesize = synthesize
+        self.chunker = chunker or TextChunker()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix='tts-text-stream')
+        self._order: "queue.Queue" = queue.Queue() # (epoch, segment, text, audio queue), in text order
+        self._lock = threading.Lock()
+        self._epoch = 0 # Bumped by cancel; audio of older epochs is discarded
+        self._segment = 0
+        self._seq = 0
+        self._closed = False
+
+    def feed(self, text: str) -> None:
+        """Adds a text fragment; complete chunks start synthesizing immediately."""
+        with self._lock:
+            if self._closed:
+                raise SynthesisError("Cannot feed a closed text stream.")
+            for chunk in self.chunker.feed(text):
+                self._dispatch(chunk)
+
+    def flush(self) -> None:
+        """Ends the current turn: synthesizes buffered text even without a sentence boundary."""
+        with self._lock:
+            chunk = self.chunker.flush()
+            if chunk:
+                self._dispatch(chunk)
+
+    def cancel(self) -> int:
+        """
+        Barge-in: drops buffered text and all audio not yet yielded, stopping pending synthesis.
+
+        Returns:
+            int: The sequence number the next frame will carry; frames below it that a
+                 client still has buffered belong to the cancelled speech.
+        """
+        with self._lock:
+            self.chunker.clear()
+            self._epoch += 1
+            return self._seq
+
+    def close(self) -> None:
+        """Flushes buffered text; iteration ends after the remaining audio."""
+        with self._lock:
+            if self._closed:
+                return
+            chunk = self.chunker.flush()
+            if chunk:
+                self._dispatch(chunk)
+            self._closed = True
+            self._order.put(_CLOSED)
+
+    def _dispatch(self, text: str) -> None:
+        """Starts synthesizing one chunk (caller holds the lock)."""
+        audio: "queue.Queue" = queue.Queue()
+        epoch = self._epoch
+        self._order.put((epoch, self._segment, text, audio))
+        self._segment += 1
+        self._executor.submit(self._run, epoch, text, audio)
+
+    def _run(self, epoch: int, text: str, audio: "queue.Queue") -> None:
+        try:
+            if epoch != self._epoch:
+                return # Cancelled before it started
+            stream = self._synthesize(text)
+            try:
+                for chunk in stream:
+                    if epoch != self._epoch:
+                        return # Cancelled: stop reading from the provider
+                    audio.put(chunk)
+            finally:
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+        except Exception as e:
+            audio.put(e)
+        finally:
+            audio.put(_END)
+
+    def __iter__(self) -> Iterator[AudioFrame]:
+        try:
+            while True:
+                item = self._order.get()
+                if item is _CLOSED:
+                    return
+                epoch, segment, text, audio = item
+                while True:
+                    chunk = audio.get()
+                    if chunk is _END:
+                        break
+                    if epoch != self._epoch:
+                        continue # Cancelled speech: drain without yielding
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    with self._lock:
+                        seq = self._seq
+                        self._seq += 1
+                    yield AudioFrame(seq, segment, text, chunk)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+class AsyncTextStream:
+    """
+    Asyncio counterpart of `TextStream`, returned by `AsyncUnifiedTTS.open_text_stream`.
+
+    `feed`, `flush`, `cancel` and `close` are plain (non-blocking) methods, so they
+    can be called from a task that reads the text source while another task
+    iterates the audio with `async for`. Cancelling stops in-flight synthesis
+    tasks right away.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str], AsyncIterator[bytes]],
+        chunker: Optional[TextChunker] = None,
+        prefetch: int = 2,
+    ):
+        """
+        Args:
+            synthesize: Returns the async audio stream for one chunk of text.
+            chunker: Splits incoming text into chunks (default `TextChunker()`).
+            prefetch: Chunks synthesized concurrently ahead of the one being played.
+        """
+        self._synthesize = synthesize
+        self.chunker = chunker or TextChunker()
+        self._slots = asyncio.Semaphore(max(1, prefetch))
+        self._order: "asyncio.Queue" = asyncio.Queue()
+        self._tasks = set()
+        self._epoch = 0
+        self._segment = 0
+        self._seq = 0
+        self._closed = False
+
+    def feed(self, text: str) -> None:
+        """Adds a text fragment; complete chunks start synthesizing immediately."""
+        if self._closed:
+            raise SynthesisError("Cannot feed a closed text stream.")
+        for chunk in self.chunker.feed(text):
+            self._dispatch(chunk)
+
+    def flush(self) -> None:
+        """Ends the current turn: synthesizes buffered text even without a sentence boundary."""
+        chunk = self.chunker.flush()
+        if chunk:
+            self._dispatch(chunk)
+
+    def cancel(self) -> int:
+        """Barge-in; see `TextStream.cancel`."""
+        self.chunker.clear()
+        self._epoch += 1
+        for task in list(self._tasks):
+            task.cancel()
+        return self._seq
+
+    def close(self) -> None:
+        """Flushes buffered text; iteration ends after the remaining audio."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._order.put_nowait(_CLOSED)
+
+    async def aclose(self) -> None:
+        """Stops all synthesis immediately and ends iteration (e.g. when the client disconnects)."""
+        self.cancel()
+        self.close()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _dispatch(self, text: str) -> None:
+        audio: "asyncio.Queue" = asyncio.Queue()
+        epoch = self._epoch
+        self._order.put_nowait((epoch, self._segment, text, audio))
+        self._segment += 1
+        task = asyncio.ensure_future(self._run(epoch, text, audio))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # Also runs for tasks cancelled before they started, which never reach a finally block
+        task.add_done_callback(lambda _: audio.put_nowait(_END))
+
+    async def _run(self, epoch: int, text: str, audio: "asyncio.Queue") -> None:
+        try:
+            async with self._slots:
+                if epoch != self._epoch:
+                    return
+                async for chunk in self._synthesize(text):
+                    audio.put_nowait(chunk)
+        except Exception as e:
+            audio.put_nowait(e)
+
+    def __aiter__(self) -> AsyncIterator[AudioFrame]:
+        return self._frames()
+
+    async def _frames(self) -> AsyncIterator[AudioFrame]:
+        while True:
+            item = await self._order.get()
+            if item is _CLOSED:
+                return
+            epoch, segment, text, audio = item
+            while True:
+                chunk = await audio.get()
+                if chunk is _END:
+                    break
+                if epoch != self._epoch:
+                    continue
+                if isinstance(chunk, Exception):
+                    raise chunk
+                seq = self._seq
+                self._seq += 1
+                yield AudioFrame(seq, segment, text, chunk)
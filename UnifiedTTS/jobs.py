@@ -0,0 +1,572 @@
+# unified_tts/jobs.py
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import argparse
+import threading
+import multiprocessing
+from typing import Optional, Dict, Any, List, Iterable, Union
+from .exceptions import ConfigurationError, ProviderNotFoundError
+from .core import UnifiedTTS
+from .batch import BatchItem
+from .transport import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+# Task states
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+TASK_STATES = (PENDING, RUNNING, DONE, FAILED)
+# Errors that would fail again on every retry
+PERMANENT_ERRORS = (ConfigurationError, ProviderNotFoundError, TypeError, ValueError)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    owner TEXT -- Client that submitted the job, if the producer tracks one
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    output_format TEXT,
+    options TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL, -- Retry backoff while pending, lease expiry while running
+    worker TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (status, available_at);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job_id, position);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner);
+"""
+
+
+class JobTask:
+    """One synthesis task of a job, as claimed by a worker."""
+
+    FIELDS = ('id', 'job_id', 'position', 'text', 'provider', 'output_format', 'options',
+              'output_path', 'status', 'attempts', 'max_attempts', 'worker', 'error')
+
+    def __init__(self, row: sqlite3.Row):
+        for field in self.FIELDS:
+            setattr(self, field, row[field])
+        self.options = json.loads(self.options)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"JobTask(job_id={self.job_id!r}, position={self.position}, status={self.status!r})"
+
+
+class JobStore:
+    """
+    Durable queue of synthesis tasks in a local SQLite database.
+
+    Tasks are claimed under a lease: a worker that crashes or hangs loses its
+    tasks to another worker once the lease expires, so a job always runs to
+    completion as long as some worker is running. Failed attempts are retried
+    with backoff up to `max_attempts` times; permanent errors fail at once.
+    Several processes (and threads) may share one database file.
+
+    Example:
+        store = JobStore('jobs.db')
+        job_id = store.submit([{'text': 'Hello', 'provider': 'openai'}], output_dir='out')
+        store.job(job_id)  # {'job_id': ..., 'total': 1, 'pending': 1, ...}
+    """
+
+    def __init__(self, path: str, retry: Optional[RetryPolicy] = None, output_dir: Optional[str] = None):
+        """
+        Args:
+            path: The SQLite database file (created if missing).
+            retry: Attempts and backoff between attempts of a failed task. Defaults to
+                   3 attempts, 5 s doubling up to 5 min.
+            output_dir: Default directory for task audio (`<output_dir>/<job_id>/<position>.<format>`).
+                        Defaults to a 'job-output' directory next to the database.
+        """
+        self.path = path
+        self.retry = retry or RetryPolicy(max_retries=2, backoff_base=5.0, backoff_max=300.0)
+        self.output_dir = output_dir or os.path.join(os.path.dirname(os.path.abspath(path)), 'job-output')
+        self._local = threading.local()
+        conn = self._connection()
+        columns = [row['name'] for row in conn.execute('PRAGMA table_info(jobs)')]
+        if columns and 'owner' not in columns:
+            conn.execute('ALTER TABLE jobs ADD COLUMN owner TEXT') # Database created before jobs had owners
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection (sqlite3 connections are not shared across threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; writes that must be atomic use explicit BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL') # Readers do not block the writer
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    # --- Producers ---
+
+    def submit(
+        self,
+        items: Iterable[Union[BatchItem, Dict[str, Any]]],
+        job_id: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        owner: Optional[str] = None,
+    ) -> str:
+        """
+        Enqueues a job of synthesis tasks.
+
+        Args:
+            items: BatchItems (or dicts of BatchItem arguments). Items without an
+                   `output_path` are written under `output_dir`.
+            job_id: Identifier for the job; generated if not given.
+            output_dir: Overrides the store's default output directory for this job.
+            max_attempts: Overrides the number of attempts per task.
+            owner: Client the job is accounted to (see `job` and `unfinished`).
+
+        Returns:
+            str: The job id.
+        """
+        items = [BatchItem.coerce(item) for item in items]
+        job_id = job_id or uuid.uuid4().hex
+        job_dir = os.path.join(output_dir or self.output_dir, job_id)
+        max_attempts = max_attempts or self.retry.max_retries + 1
+        now = time.time()
+        rows = []
+        for position, item in enumerate(items):
+            output_path = item.output_path or os.path.join(job_dir, f'{position:06d}.{item.output_format or "audio"}')
+            options = json.dumps(item.kwargs, sort_keys=True)
+            rows.append((job_id, position, item.text, item.provider, item.output_format, options,
+                         output_path, PENDING, max_attempts, now, now))
+        with self._transaction() as conn:
+            conn.execute('INSERT INTO jobs (id, created_at, owner) VALUES (?, ?, ?)', (job_id, now, owner))
+            conn.executemany(
+                'INSERT INTO tasks (job_id, position, text, provider, output_format, options, output_path,'
+                ' status, max_attempts, available_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+        logger.info("Submitted job %s with %d tasks", job_id, len(rows))
+        return job_id
+
+    def retry_failed(self, job_id: str) -> int:
+        """Puts the failed tasks of a job back in the queue; returns how many."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE tasks SET status = ?, attempts = 0, error = NULL, available_at = ?, updated_at = ?'
+                ' WHERE job_id = ? AND status = ?',
+                (PENDING, time.time(), time.time(), job_id, FAILED),
+            )
+            return cursor.rowcount
+
+    def requeue_running(self) -> int:
+        """
+        Releases every leased task immediately; returns how many.
+
+        For recovery after a crash when no worker can still be running
+        (otherwise leases expire on their own).
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE tasks SET status = ?, worker = NULL, available_at = ?, updated_at = ? WHERE status = ?',
+                (PENDING, time.time(), time.time(), RUNNING),
+            )
+            return cursor.rowcount
+
+    # --- Workers ---
+
+    def claim(self, worker: str, limit: int = 1, lease_seconds: float = 300.0) -> List[JobTask]:
+        """
+        Leases up to `limit` runnable tasks to `worker`.
+
+        Runnable tasks are pending ones past their backoff and running ones whose
+        lease has expired (their worker is presumed dead).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Abandoned tasks that already used all their attempts fail instead of running again
+            conn.execute(
+                'UPDATE tasks SET status = ?, error = ?, worker = NULL, updated_at = ?'
+                ' WHERE status = ? AND available_at <= ? AND attempts >= max_attempts',
+                (FAILED, 'Lease expired: worker stopped responding', now, RUNNING, now),
+            )
+            ids = [row[0] for row in conn.execute(
+                'SELECT id FROM tasks WHERE status IN (?, ?) AND available_at <= ? ORDER BY id LIMIT ?',
+                (PENDING, RUNNING, now, limit),
+            )]
+            if not ids:
+                return []
+            marks = ','.join('?' * len(ids))
+            conn.execute(
+                f'UPDATE tasks SET status = ?, worker = ?, attempts = attempts + 1, available_at = ?, updated_at = ?'
+                f' WHERE id IN ({marks})',
+                (RUNNING, worker, now + lease_seconds, now, *ids),
+            )
+            rows = conn.execute(f'SELECT * FROM tasks WHERE id IN ({marks}) ORDER BY id', ids).fetchall()
+        return [JobTask(row) for row in rows]
+
+    def complete(self, task_id: int, worker: str) -> bool:
+        """Marks a task done; returns False if `worker` no longer holds its lease."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE tasks SET status = ?, error = NULL, updated_at = ? WHERE id = ? AND status = ? AND worker = ?',
+                (DONE, time.time(), task_id, RUNNING, worker),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker: str, error: str, retry: bool = True) -> Optional[str]:
+        """
+        Records a failed attempt: reschedules the task with backoff, or fails it for
+        good if `retry` is False or it has no attempts left.
+
+        Returns:
+            Optional[str]: The task's new state, or None if `worker` no longer holds its lease.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT attempts, max_attempts FROM tasks WHERE id = ? AND status = ? AND worker = ?',
+                (task_id, RUNNING, worker),
+            ).fetchone()
+            if row is None:
+                return None
+            if retry and row['attempts'] < row['max_attempts']:
+                status, available_at = PENDING, now + self.retry.delay(row['attempts'] - 1)
+            else:
+                status, available_at = FAILED, now
+            conn.execute(
+                'UPDATE tasks SET status = ?, error = ?, worker = NULL, available_at = ?, updated_at = ? WHERE id = ?',
+                (status, error, available_at, now, task_id),
+            )
+        return status
+
+    # --- Status ---
+
+    def job(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns a summary of a job (task counts per state), or None if it does not
+        exist or, with `owner`, was submitted by another client.
+        """
+        conn = self._connection()
+        job = conn.execute('SELECT id, created_at, owner FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if job is None or (owner is not None and job['owner'] != owner):
+            return None
+        counts = dict.fromkeys(TASK_STATES, 0)
+        for row in conn.execute('SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status', (job_id,)):
+            counts[row[0]] = row[1]
+        total = sum(counts.values())
+        summary = {'job_id': job['id'], 'created_at': job['created_at'], 'total': total}
+        summary.update(counts)
+        summary['finished'] = counts[DONE] + counts[FAILED] == total
+        return summary
+
+    def tasks(self, job_id: str) -> List[JobTask]:
+        """Returns every task of a job, in submission order."""
+        rows = self._connection().execute('SELECT * FROM tasks WHERE job_id = ? ORDER BY position', (job_id,))
+        return [JobTask(row) for row in rows]
+
+    def task(self, job_id: str, position: int) -> Optional[JobTask]:
+        row = self._connection().execute(
+            'SELECT * FROM tasks WHERE job_id = ? AND position = ?', (job_id, position)
+        ).fetchone()
+        return JobTask(row) if row is not None else None
+
+    def unfinished(self, job_id: Optional[str] = None, owner: Optional[str] = None) -> int:
+        """Number of pending or running tasks (of one job, of one owner's jobs, or of the whole queue)."""
+        query = 'SELECT COUNT(*) FROM tasks WHERE status IN (?, ?)'
+        params: tuple = (PENDING, RUNNING)
+        if job_id is not None:
+            query += ' AND job_id = ?'
+            params += (job_id,)
+        if owner is not None:
+            query += ' AND job_id IN (SELECT id FROM jobs WHERE owner = ?)'
+            params += (owner,)
+        return self._connection().execute(query, params).fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT / ROLLBACK; takes the write lock up front so claims never race."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+# --- Workers ---
+
+def run_worker(
+    db_path: str,
+    tts_config: Optional[Dict[str, Any]] = None,
+    worker_id: Optional[str] = None,
+    lease_seconds: float = 300.0,
+    poll_interval: float = 0.5,
+    stop_event=None,
+    exit_when_idle: bool = False,
+) -> int:
+    """
+    Claims and synthesizes tasks from the store at `db_path` until stopped.
+
+    Audio is written to a temporary file and renamed into place, so a task's
+    `output_path` only ever holds complete audio.
+
+    Args:
+        db_path: The JobStore database.
+        tts_config: Keyword arguments for this worker's `UnifiedTTS` instance.
+        worker_id: Lease owner name; defaults to '<host>:<pid>'.
+        lease_seconds: How long a claimed task is reserved; also bounds each synthesis call.
+        poll_interval: Sleep between polls when the queue is empty.
+        stop_event: A threading/multiprocessing Event that stops the loop when set.
+        exit_when_idle: Return once no task is pending or running.
+
+    Returns:
+        int: The number of tasks completed.
+    """
+    worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+    tts = UnifiedTTS(**(tts_config or {}))
+    store = JobStore(db_path)
+    completed = 0
+    try:
+        while stop_event is None or not stop_event.is_set():
+            tasks = store.claim(worker_id, lease_seconds=lease_seconds)
+            if not tasks:
+                if exit_when_idle and not store.unfinished():
+                    break
+                if stop_event is not None:
+                    stop_event.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+                continue
+            for task in tasks:
+                completed += _run_task(tts, store, task, worker_id, lease_seconds)
+    finally:
+        store.close()
+    return completed
+
+
+def _run_task(tts, store: JobStore, task: JobTask, worker_id: str, lease_seconds: float) -> int:
+    partial_path = f'{task.output_path}.{os.getpid()}.part'
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(task.output_path)), exist_ok=True)
+        # Finish (or give up) before the lease runs out and another worker takes the task over
+        options = dict(task.options, deadline=time.monotonic() + lease_seconds)
+        tts.synthesize(task.text, provider=task.provider, output_path=partial_path,
+                       output_format=task.output_format, **options)
+        os.replace(partial_path, task.output_path)
+    except Exception as e:
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+        retry = not isinstance(e, PERMANENT_ERRORS)
+        status = store.fail(task.id, worker_id, f'{type(e).__name__}: {e}', retry=retry)
+        logger.warning("Task %s/%d failed (attempt %d/%d, now %s): %s",
+                       task.job_id, task.position, task.attempts, task.max_attempts, status, e)
+        return 0
+    if not store.complete(task.id, worker_id):
+        logger.warning("Task %s/%d finished after its lease expired", task.job_id, task.position)
+        return 0
+    return 1
+
+
+class WorkerPool:
+    """
+    A pool of worker processes draining a `JobStore`.
+
+    Each process builds its own `UnifiedTTS(**tts_config)`, so client-side rate
+    limits configured there apply per worker: divide a provider's quota by
+    `workers`. Workers that die are replaced while `wait` runs; their tasks are
+    picked up again once their lease expires.
+
+    Example:
+        with WorkerPool('jobs.db', {'openai_api_key': 'sk-...'}, workers=8) as pool:
+            pool.wait(job_id)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        tts_config: Optional[Dict[str, Any]] = None,
+        workers: int = 4,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Args:
+            db_path: The JobStore database.
+            tts_config: Keyword arguments for each worker's `UnifiedTTS` (must be picklable).
+            workers: Number of worker processes.
+            lease_seconds: Lease per claimed task; a crashed worker's tasks are retried after this.
+            poll_interval: Sleep between polls when the queue is empty.
+        """
+        self.db_path = db_path
+        self.tts_config = tts_config or {}
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        # Spawned, not forked: children must not inherit locks or open connections of the parent
+        self._context = multiprocessing.get_context('spawn')
+        self._stop = self._context.Event()
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        JobStore(db_path).close() # Create the schema before the workers race to
+
+    def start(self) -> "WorkerPool":
+        self._stop.clear()
+        self._ensure_workers()
+        return self
+
+    def _ensure_workers(self) -> None:
+        """Starts processes until `workers` are alive."""
+        alive = [process for process in self._processes if process.is_alive()]
+        for process in self._processes:
+            if not process.is_alive() and process.exitcode not in (0, None):
+                logger.warning("Job worker %s exited with code %s; replacing it", process.name, process.exitcode)
+        while len(alive) < self.workers:
+            process = self._context.Process(
+                target=run_worker,
+                kwargs={'db_path': self.db_path, 'tts_config': self.tts_config, 'lease_seconds': self.lease_seconds,
+                        'poll_interval': self.poll_interval, 'stop_event': self._stop},
+                name=f'unified-tts-worker-{len(self._processes)}',
+                daemon=True,
+            )
+            process.start()
+            alive.append(process)
+            self._processes.append(process)
+        self._processes = alive
+
+    def wait(self, job_id: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until a job (or, with no `job_id`, the whole queue) has no pending or running tasks.
+
+        Returns:
+            bool: True if finished, False on timeout.
+        """
+        store = JobStore(self.db_path)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while store.unfinished(job_id):
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                self._ensure_workers()
+                time.sleep(self.poll_interval)
+            return True
+        finally:
+            store.close()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stops the workers after their current task (terminating any still busy after `timeout`)."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(deadline - time.monotonic(), 0.0))
+            if process.is_alive():
+                process.terminate() # Its task is retried once the lease expires
+                process.join()
+        self._processes = []
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+# --- Command line ---
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m UnifiedTTS.jobs', description='Offline bulk synthesis jobs.')
+    parser.add_argument('--db', default='jobs.db', help='Job database file.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help='Enqueue one task per line of a text file.')
+    submit.add_argument('file', help="Text file ('-' for stdin); blank lines are skipped.")
+    submit.add_argument('--provider', required=True)
+    submit.add_argument('--format', dest='output_format')
+    submit.add_argument('--output-dir')
+    submit.add_argument('--option', action='append', default=[], metavar='KEY=JSON',
+                        help="Provider option, e.g. --option voice='\"alloy\"' (repeatable).")
+
+    work = commands.add_parser('work', help='Run a worker pool until the queue is empty (or forever).')
+    work.add_argument('--workers', type=int, default=4)
+    work.add_argument('--config', default='{}', help='UnifiedTTS keyword arguments as JSON, e.g. {"mock_enabled": true}.')
+    work.add_argument('--lease', type=float, default=300.0, help='Task lease in seconds.')
+    work.add_argument('--forever', action='store_true', help='Keep polling for new jobs.')
+    work.add_argument('--recover', action='store_true',
+                      help='Release all leased tasks first (only when no other worker uses this database).')
+
+    status = commands.add_parser('status', help='Show the state of a job.')
+    status.add_argument('job_id')
+    status.add_argument('--retry-failed', action='store_true', help='Requeue failed tasks.')
+
+    args = parser.parse_args(argv)
+    store = JobStore(args.db)
+
+    if args.command == 'submit':
+        stream = sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')
+        with stream:
+            texts = [line.strip() for line in stream if line.strip()]
+        options = {}
+        for option in args.option:
+            key, _, value = option.partition('=')
+            options[key] = json.loads(value)
+        items = [BatchItem(text, args.provider, output_format=args.output_format, **options) for text in texts]
+        print(store.submit(items, output_dir=args.output_dir))
+        return 0
+
+    if args.command == 'work':
+        if args.recover:
+            logger.info("Released %d leased tasks", store.requeue_running())
+        with WorkerPool(args.db, json.loads(args.config), workers=args.workers, lease_seconds=args.lease) as pool:
+            while True:
+                pool.wait()
+                if not args.forever:
+                    break
+                time.sleep(pool.poll_interval)
+        return 0
+
+    if args.retry_failed:
+        store.retry_failed(args.job_id)
+    summary = store.job(args.job_id)
+    if summary is None:
+        print(f"No such job: {args.job_id}")
+        return 1
+    summary['failures'] = [
+        {'position': task.position, 'error': task.error} for task in store.tasks(args.job_id) if task.status == FAILED
+    ]
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(processName)s %(levelname)s %(message)s')
+    raise SystemExit(main())
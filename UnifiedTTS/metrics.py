@@ -0,0 +1,396 @@
+# unified_tts/metrics.py
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Iterable, Iterator, AsyncIterator, Tuple, Sequence
+from .audio import estimate_duration
+
+logger = logging.getLogger(__name__)
+
+# Default histogram buckets (seconds), spanning cache hits to long-form synthesis
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Labels attached to every synthesis metric
+SYNTHESIS_LABELS = ('provider', 'model', 'voice')
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing, labeled counter."""
+
+    TYPE = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+
+class Gauge:
+    """A labeled value that can go up and down (queue depths, in-flight requests)."""
+
+    TYPE = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+
+class Histogram:
+    """A labeled histogram with cumulative buckets, rendered in Prometheus format."""
+
+    TYPE = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {} # bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return series[-1] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(series[-2])}')
+            lines.append(f'{self.name}_count{labels} {series[-1]}')
+        return lines
+
+
+class MetricsRegistry:
+    """In-process collection of counters, gauges and histograms, exportable in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter `name`, creating it on first use."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Returns the gauge `name`, creating it on first use."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Returns the histogram `name`, creating it on first use."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide default registry used by UnifiedTTS unless another one is passed
+REGISTRY = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class SynthesisEvent:
+    """
+    Describes one synthesis call as seen by `SynthesisHooks`.
+
+    `scope` is 'request' for a `UnifiedTTS.synthesize` / `synthesize_stream` call
+    and 'provider' for each underlying provider request (a long text produces one
+    request event and several provider events). Timing fields are filled in as
+    the call progresses; `attributes` is free for hooks to stash state (e.g., a span).
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        provider: str,
+        text: str,
+        synth_args: Dict[str, Any],
+        streaming: bool = False,
+    ):
+        self.scope = scope
+        self.provider = provider
+        self.text = text
+        self.synth_args = synth_args
+        self.model = synth_args.get('model') or synth_args.get('model_id') or ''
+        self.voice = synth_args.get('voice') or synth_args.get('voice_id') or ''
+        self.output_format = synth_args.get('response_format') or synth_args.get('output_format')
+        self.sample_rate = synth_args.get('sample_rate')
+        self.input_chars = len(text)
+        self.streaming = streaming
+        self.start_time = time.monotonic()
+        self.ttfb: Optional[float] = None # Seconds until the first audio byte
+        self.latency: Optional[float] = None # Seconds until the call completed
+        self.output_bytes = 0
+        self.audio_seconds: Optional[float] = None
+        self.cache_hit = False
+        self.segments = 0 # Phrases looked up in the cache (phrase_cache mode)
+        self.segment_hits = 0 # ... of which were served from the cache
+        self.error: Optional[BaseException] = None
+        self.error_class: Optional[str] = None
+        self.cancelled = False # The consumer closed a stream before it finished
+        self.attributes: Dict[str, Any] = {}
+        self._head = b'' # First bytes of output, used to estimate audio duration
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        return {'provider': self.provider, 'model': self.model, 'voice': self.voice}
+
+
+class SynthesisHooks:
+    """
+    Callback interface for tracing and instrumentation.
+
+    Subclass and override any of the methods; pass instances to
+    `UnifiedTTS(hooks=[...])`. Hooks run synchronously on the calling thread, so
+    they should be cheap. Exceptions raised by hooks are logged and ignored.
+    """
+
+    def on_start(self, event: SynthesisEvent) -> None:
+        """Called before the cache or provider is consulted."""
+
+    def on_first_byte(self, event: SynthesisEvent) -> None:
+        """Called when the first audio bytes are available (`event.ttfb` is set)."""
+
+    def on_end(self, event: SynthesisEvent) -> None:
+        """Called once the call finished; `event.error` is set if it failed, `event.cancelled` if it was abandoned."""
+
+
+class MetricsHooks(SynthesisHooks):
+    """Records synthesis events into a `MetricsRegistry`."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry or REGISTRY
+        labels = SYNTHESIS_LABELS
+        self.requests = registry.counter('unified_tts_requests_total', 'Synthesis calls by outcome.', labels + ('scope', 'status'))
+        self.errors = registry.counter('unified_tts_errors_total', 'Failed synthesis calls by error class.', labels + ('scope', 'error'))
+        self.cache_hits = registry.counter('unified_tts_cache_hits_total', 'Synthesis requests served from the cache.', labels)
+        self.segment_lookups = registry.counter('unified_tts_segment_cache_lookups_total', 'Phrase cache lookups by result.', labels + ('result',))
+        self.input_chars = registry.counter('unified_tts_input_characters_total', 'Characters of input text sent for synthesis.', labels + ('scope',))
+        self.output_bytes = registry.counter('unified_tts_output_bytes_total', 'Bytes of audio produced.', labels + ('scope',))
+        self.audio_seconds = registry.counter('unified_tts_audio_seconds_total', 'Seconds of audio produced (when the duration can be determined).', labels + ('scope',))
+        self.latency = registry.histogram('unified_tts_latency_seconds', 'Total synthesis latency.', labels + ('scope',))
+        self.ttfb = registry.histogram('unified_tts_time_to_first_byte_seconds', 'Time until the first audio byte.', labels + ('scope',))
+
+    def on_end(self, event: SynthesisEvent) -> None:
+        labels = dict(event.labels, scope=event.scope)
+        if event.cancelled:
+            self.requests.inc(status='cancelled', **labels)
+            return
+        if event.error is not None:
+            self.requests.inc(status='error', **labels)
+            self.errors.inc(error=event.error_class, **labels)
+            return
+        self.requests.inc(status='ok', **labels)
+        if event.cache_hit:
+            self.cache_hits.inc(**event.labels)
+        if event.segments:
+            self.segment_lookups.inc(event.segment_hits, result='hit', **event.labels)
+            self.segment_lookups.inc(event.segments - event.segment_hits, result='miss', **event.labels)
+        self.input_chars.inc(event.input_chars, **labels)
+        self.output_bytes.inc(event.output_bytes, **labels)
+        if event.audio_seconds is not None:
+            self.audio_seconds.inc(event.audio_seconds, **labels)
+        self.latency.observe(event.latency, **labels)
+        if event.ttfb is not None:
+            self.ttfb.observe(event.ttfb, **labels)
+
+
+class Observation:
+    """Drives the hooks for one `SynthesisEvent` (used internally by UnifiedTTS)."""
+
+    HEAD_BYTES = 4096
+
+    def __init__(self, hooks: Iterable[SynthesisHooks], event: SynthesisEvent):
+        self.hooks = list(hooks)
+        self.event = event
+        self._ended = False
+        self._dispatch('on_start')
+
+    def _dispatch(self, method: str) -> None:
+        for hook in self.hooks:
+            try:
+                getattr(hook, method)(self.event)
+            except Exception:
+                logger.exception("Synthesis hook %r failed in %s", hook, method)
+
+    def output(self, data: bytes) -> None:
+        """Records a chunk (or the whole clip) of produced audio."""
+        event = self.event
+        if not data:
+            return
+        if event.ttfb is None:
+            event.ttfb = time.monotonic() - event.start_time
+            self._dispatch('on_first_byte')
+        if len(event._head) < self.HEAD_BYTES:
+            event._head += bytes(data[:self.HEAD_BYTES - len(event._head)])
+        event.output_bytes += len(data)
+
+    def _end(self) -> bool:
+        """Marks the observation as ended; returns False if it already was (on_end fires once)."""
+        if self._ended:
+            return False
+        self._ended = True
+        self.event.latency = time.monotonic() - self.event.start_time
+        return True
+
+    def finish(self) -> None:
+        if not self._end():
+            return
+        event = self.event
+        event.audio_seconds = estimate_duration(event._head, event.output_bytes, event.output_format, event.sample_rate)
+        self._dispatch('on_end')
+
+    def fail(self, error: BaseException) -> None:
+        if not self._end():
+            return
+        event = self.event
+        event.error = error
+        event.error_class = type(error).__name__
+        self._dispatch('on_end')
+
+    def cancel(self) -> None:
+        if not self._end():
+            return
+        self.event.cancelled = True
+        self._dispatch('on_end')
+
+    def wrap_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yields `chunks`, recording each one and finishing (or failing) the observation at the end."""
+        try:
+            for chunk in chunks:
+                self.output(chunk)
+                yield chunk
+        except GeneratorExit:
+            self.cancel()
+            raise
+        except Exception as e:
+            self.fail(e)
+            raise
+        self.finish()
+
+    async def wrap_async_stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Async variant of `wrap_stream`."""
+        try:
+            async for chunk in chunks:
+                self.output(chunk)
+                yield chunk
+        except (GeneratorExit, asyncio.CancelledError):
+            self.cancel()
+            raise
+        except Exception as e:
+            self.fail(e)
+            raise
+        self.finish()
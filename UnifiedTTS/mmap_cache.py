@@ -0,0 +1,397 @@
+# unified_tts/mmap_cache.py
+
+import os
+import mmap
+import struct
+import hashlib
+import logging
+import threading
+from typing import Optional, Tuple
+from .exceptions import ConfigurationError
+
+# Optional dependency: POSIX advisory file locks (not available on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Index file: header, then `capacity` slots of (key hash, record offset, record length).
+# Slots use open addressing with linear probing; an all-zero key hash marks an empty slot.
+_INDEX_MAGIC = b'TTSIDX1\0'
+_INDEX_HEADER = struct.Struct('<8sQQQQQB') # magic, capacity, count, generation, live_bytes, dead_bytes, retired
+_INDEX_HEADER_SIZE = 64
+_SLOT = struct.Struct('<16sQI4x') # key hash, offset, length
+_MAX_LOAD = 0.7
+# Dead space below which replaced entries never trigger a compaction
+_MIN_COMPACT_BYTES = 1024 * 1024
+
+# Data file ('data.<generation>'): header, then records of (record header, audio) appended back to back.
+# Each record repeats its key hash and length, so readers can validate a slot without a lock.
+_DATA_MAGIC = b'TTSSEG1\0'
+_DATA_HEADER_SIZE = 64
+_RECORD = struct.Struct('<4s16sI8x') # magic, key hash, length
+_RECORD_MAGIC = b'REC1'
+
+_EMPTY = bytes(16)
+
+
+def _key_hash(key: str) -> bytes:
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    return digest if digest != _EMPTY else b'\x01' + digest[1:]
+
+
+class MmapCache:
+    """
+    Persistent cache tier shared by all processes on one machine through memory-mapped files.
+
+    Audio is appended to a single data file and located through an on-disk hash
+    index; both are mapped into every process, so a hit is a lookup in the shared
+    page cache returning a zero-copy `memoryview` of the mapped audio, with no
+    file read or heap copy. Readers take no lock: each record repeats its key and
+    length, so a slot that is being updated concurrently is detected and ignored.
+    Writers serialize on an `fcntl` lock file, so any number of processes (web
+    workers, job workers) can share one directory.
+
+    Replaced entries leave dead space behind. When dead space outweighs live data,
+    or the data file outgrows `max_bytes`, a background thread compacts the store
+    into a new data file, dropping the oldest entries to get back under budget.
+    Processes switch to the new files on their next lookup; views handed out
+    earlier stay valid.
+
+    Use it as the persistent tier of a `SynthesisCache` (with the memory tier
+    disabled, hits are served straight from the mapping):
+
+        cache = SynthesisCache(memory_max_items=0, disk_tier=MmapCache('/var/cache/tts'))
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024, initial_slots: int = 4096):
+        """
+        Args:
+            directory: Directory holding the index, data and lock files (created if missing).
+            max_bytes: Size budget for the data file; compaction evicts the oldest entries beyond it.
+            initial_slots: Initial capacity of the hash index (rounded up to a power of two);
+                           the index is rebuilt larger as it fills up.
+
+        Raises:
+            ConfigurationError: If file locking is not available on this platform.
+        """
+        if fcntl is None:
+            raise ConfigurationError("MmapCache requires POSIX file locking (fcntl), which this platform lacks.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.initial_slots = 1 << max(initial_slots - 1, 1).bit_length()
+        self.evictions = 0 # Entries dropped by compactions started in this process
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._compacting = threading.Event()
+        self._pid = None
+        self._open()
+
+    # --- Files ---
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _open(self) -> None:
+        """(Re)opens the lock file and the current index and data files, creating them if needed."""
+        self._pid = os.getpid()
+        self._lock_fd = os.open(self._path('lock'), os.O_RDWR | os.O_CREAT, 0o644)
+        self._index = None
+        self._data = None
+        self._data_fd = None
+        self._generation = None
+        with self._write_lock():
+            if not os.path.exists(self._path('index')):
+                self._create_files(generation=1, capacity=self.initial_slots)
+        self._refresh()
+
+    def _check_process(self) -> None:
+        """After a fork, reopens files so the child gets its own lock."""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._open()
+
+    def _write_lock(self):
+        return _FileLock(self._lock_fd)
+
+    def _create_files(self, generation: int, capacity: int) -> None:
+        """Writes an empty data file and index for `generation` (caller holds the write lock)."""
+        with open(self._path(f'data.{generation}'), 'wb') as f:
+            f.write(_DATA_MAGIC.ljust(_DATA_HEADER_SIZE, b'\0'))
+        self._write_index(generation, capacity, [], 0)
+
+    def _write_index(self, generation: int, capacity: int, entries, live_bytes: int) -> None:
+        """Atomically replaces the index with one holding `entries` [(hash, offset, length)]."""
+        table = bytearray(_INDEX_HEADER_SIZE + capacity * _SLOT.size)
+        _INDEX_HEADER.pack_into(table, 0, _INDEX_MAGIC, capacity, len(entries), generation, live_bytes, 0, 0)
+        for key_hash, offset, length in entries:
+            slot = _probe(table, capacity, key_hash)
+            _SLOT.pack_into(table, _INDEX_HEADER_SIZE + slot * _SLOT.size, key_hash, offset, length)
+        tmp_path = self._path('index.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(table)
+        os.replace(tmp_path, self._path('index'))
+        if self._index is not None:
+            self._index[_INDEX_HEADER.size - 1] = 1 # Retire the old index: other processes reopen
+
+    def _refresh(self) -> None:
+        """Switches to the current index (and its data file) if ours was retired or never opened."""
+        if self._index is not None and not self._index[_INDEX_HEADER.size - 1]:
+            return
+        with self._lock:
+            if self._index is not None and not self._index[_INDEX_HEADER.size - 1]:
+                return
+            while True:
+                with open(self._path('index'), 'r+b') as f:
+                    index = mmap.mmap(f.fileno(), 0)
+                magic, _, _, generation = _INDEX_HEADER.unpack_from(index)[:4]
+                if magic != _INDEX_MAGIC:
+                    raise ConfigurationError(f"'{self._path('index')}' is not an MmapCache index.")
+                if generation == self._generation:
+                    break
+                try:
+                    data_fd = os.open(self._path(f'data.{generation}'), os.O_RDWR)
+                except FileNotFoundError:
+                    continue # Compacted again between reading the index and opening its data file
+                if self._data_fd is not None:
+                    os.close(self._data_fd)
+                # Views of the previous mapping keep it alive; it is unmapped once they are gone
+                self._data_fd, self._data, self._generation = data_fd, None, generation
+                self._remap_data()
+                break
+            self._index = index
+
+    def _remap_data(self) -> None:
+        """Maps the data file again after it grew."""
+        self._data = mmap.mmap(self._data_fd, 0, access=mmap.ACCESS_READ)
+
+    # --- Lookups ---
+
+    def _find(self, key_hash: bytes) -> Tuple[int, Optional[Tuple[int, int]]]:
+        """Returns (slot, (offset, length)) for `key_hash`, or (free slot, None) if absent."""
+        index = self._index
+        capacity = _INDEX_HEADER.unpack_from(index)[1]
+        slot = int.from_bytes(key_hash[:8], 'little') & (capacity - 1)
+        for _ in range(capacity):
+            base = _INDEX_HEADER_SIZE + slot * _SLOT.size
+            stored = index[base:base + 16]
+            if stored == _EMPTY:
+                return slot, None
+            if stored == key_hash:
+                _, offset, length = _SLOT.unpack_from(index, base)
+                return slot, (offset, length)
+            slot = (slot + 1) & (capacity - 1)
+        return -1, None # Full; never happens below the load limit
+
+    def get(self, key: str) -> Optional[memoryview]:
+        """Returns a read-only view of the cached audio for `key`, or None."""
+        self._check_process()
+        self._refresh()
+        key_hash = _key_hash(key)
+        _, location = self._find(key_hash)
+        if location is None:
+            return None
+        offset, length = location
+        data = self._data
+        end = offset + _RECORD.size + length
+        if end > len(data):
+            with self._lock:
+                if end > len(self._data):
+                    self._remap_data() # Appended by another process since we mapped the file
+                data = self._data
+            if end > len(data):
+                return None
+        magic, stored_hash, stored_length = _RECORD.unpack_from(data, offset)
+        if magic != _RECORD_MAGIC or stored_hash != key_hash or stored_length != length:
+            return None # Slot changed while we read it
+        return memoryview(data)[offset + _RECORD.size:end]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    # --- Writes ---
+
+    def put(self, key: str, data) -> int:
+        """
+        Appends `data` for `key` and points the index at it.
+
+        Returns:
+            int: Always 0; eviction happens during background compaction (counted in `evictions`).
+        """
+        self._check_process()
+        key_hash = _key_hash(key)
+        with self._lock, self._write_lock():
+            self._refresh()
+            offset = os.lseek(self._data_fd, 0, os.SEEK_END)
+            _write_all(self._data_fd, _RECORD.pack(_RECORD_MAGIC, key_hash, len(data)))
+            _write_all(self._data_fd, data)
+
+            index = self._index
+            _, capacity, count, generation, live_bytes, dead_bytes, _ = _INDEX_HEADER.unpack_from(index)
+            slot, previous = self._find(key_hash)
+            if previous is None and (count + 1) > capacity * _MAX_LOAD:
+                self._rebuild(capacity * 2, extra=(key_hash, offset, len(data)))
+                compact = False
+            else:
+                base = _INDEX_HEADER_SIZE + slot * _SLOT.size
+                # Location first, then the key: a reader never sees a new key with a stale location
+                struct.pack_into('<QI', index, base + 16, offset, len(data))
+                if previous is None:
+                    index[base:base + 16] = key_hash
+                    count += 1
+                else:
+                    dead_bytes += _RECORD.size + previous[1]
+                    live_bytes -= _RECORD.size + previous[1]
+                live_bytes += _RECORD.size + len(data)
+                struct.pack_into('<QQQQ', index, 16, count, generation, live_bytes, dead_bytes)
+                compact = dead_bytes > max(live_bytes, _MIN_COMPACT_BYTES) or offset + _RECORD.size + len(data) > self.max_bytes
+        if compact:
+            self._compact_in_background()
+        return 0
+
+    def _live_entries(self):
+        """(hash, offset, length) of every indexed entry, oldest first (caller holds the write lock)."""
+        index = self._index
+        capacity = _INDEX_HEADER.unpack_from(index)[1]
+        entries = []
+        for slot in range(capacity):
+            key_hash, offset, length = _SLOT.unpack_from(index, _INDEX_HEADER_SIZE + slot * _SLOT.size)
+            if key_hash != _EMPTY:
+                entries.append((key_hash, offset, length))
+        entries.sort(key=lambda entry: entry[1])
+        return entries
+
+    def _rebuild(self, capacity: int, extra: Tuple[bytes, int, int]) -> None:
+        """Replaces the index with a larger one over the same data file (caller holds the write lock)."""
+        entries = self._live_entries() + [extra]
+        live_bytes = sum(_RECORD.size + length for _, _, length in entries)
+        self._write_index(self._generation, capacity, entries, live_bytes)
+        self._refresh()
+
+    def _compact_in_background(self) -> None:
+        if self._compacting.is_set():
+            return
+        self._compacting.set()
+
+        def run():
+            try:
+                self.compact()
+            except OSError as e:
+                logger.warning("Failed to compact cache '%s': %s", self.directory, e)
+            finally:
+                self._compacting.clear()
+
+        threading.Thread(target=run, name='mmap-cache-compact', daemon=True).start()
+
+    def compact(self) -> int:
+        """
+        Rewrites live entries into a new data file, dropping dead space and, if the
+        store is over `max_bytes`, the oldest entries (down to 3/4 of the budget).
+
+        Returns:
+            int: The number of entries evicted.
+        """
+        self._check_process()
+        with self._lock, self._write_lock():
+            self._refresh()
+            entries = self._live_entries()
+            total = sum(_RECORD.size + length for _, _, length in entries)
+            budget = self.max_bytes * 3 // 4 if _DATA_HEADER_SIZE + total > self.max_bytes else total
+            evicted = 0
+            while entries and total > budget:
+                total -= _RECORD.size + entries.pop(0)[2] # Oldest first
+                evicted += 1
+
+            old_generation = self._generation
+            generation = old_generation + 1
+            if len(self._data) < os.fstat(self._data_fd).st_size:
+                self._remap_data()
+            source = memoryview(self._data)
+            moved = []
+            path = self._path(f'data.{generation}')
+            with open(path, 'wb') as f:
+                f.write(_DATA_MAGIC.ljust(_DATA_HEADER_SIZE, b'\0'))
+                for key_hash, offset, length in entries:
+                    moved.append((key_hash, f.tell(), length))
+                    f.write(source[offset:offset + _RECORD.size + length]) # Straight from the mapping
+            del source
+            capacity = max(self.initial_slots, _INDEX_HEADER.unpack_from(self._index)[1])
+            while len(moved) > capacity * _MAX_LOAD:
+                capacity *= 2
+            self._write_index(generation, capacity, moved, total)
+            self._refresh()
+            try:
+                os.remove(self._path(f'data.{old_generation}'))
+            except OSError:
+                pass
+        self.evictions += evicted
+        if evicted:
+            logger.info("Cache '%s' compacted: %d entries evicted.", self.directory, evicted)
+        return evicted
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._check_process()
+        with self._lock, self._write_lock():
+            self._refresh()
+            old_generation = self._generation
+            self._create_files(old_generation + 1, self.initial_slots)
+            self._refresh()
+            try:
+                os.remove(self._path(f'data.{old_generation}'))
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        self._check_process()
+        self._refresh()
+        return _INDEX_HEADER.unpack_from(self._index)[2]
+
+    def stats(self) -> dict:
+        """Entry count, live and dead bytes, and current data file size."""
+        self._check_process()
+        self._refresh()
+        _, capacity, count, generation, live_bytes, dead_bytes, _ = _INDEX_HEADER.unpack_from(self._index)
+        return {
+            'entries': count,
+            'slots': capacity,
+            'generation': generation,
+            'live_bytes': live_bytes,
+            'dead_bytes': dead_bytes,
+            'file_bytes': os.fstat(self._data_fd).st_size,
+        }
+
+
+class _FileLock:
+    """Exclusive `flock` on a file descriptor, as a context manager."""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    def __enter__(self):
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+def _probe(table, capacity: int, key_hash: bytes) -> int:
+    """First slot for `key_hash` in a table being built (its own slot or the first empty one)."""
+    slot = int.from_bytes(key_hash[:8], 'little') & (capacity - 1)
+    while True:
+        base = _INDEX_HEADER_SIZE + slot * _SLOT.size
+        stored = bytes(table[base:base + 16])
+        if stored == _EMPTY or stored == key_hash:
+            return slot
+        slot = (slot + 1) & (capacity - 1)
+
+
+def _write_all(fd: int, data) -> None:
+    view = memoryview(data).cast('B')
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
@@ -0,0 +1,507 @@
+# unified_tts/processing.py
+
+import math
+import struct
+from typing import Iterable, Iterator, Optional, Tuple, Union
+from .exceptions import ConfigurationError, SynthesisError
+from .audio import PCM_FORMATS, parse_wav, wav_header
+
+# Optional dependency: pip install unified-tts[audio]
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# WAV format tags
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ConfigurationError(
+            "Audio post-processing requires NumPy. Install it with: pip install unified-tts[audio]"
+        )
+
+
+def _sample_dtype(fmt_chunk: bytes) -> Tuple[int, int, str]:
+    """Returns (sample_rate, channels, numpy dtype) for a WAV 'fmt ' chunk."""
+    if len(fmt_chunk) < 16:
+        raise SynthesisError("Cannot process audio: WAV 'fmt ' chunk is truncated.")
+    format_tag, channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', fmt_chunk)
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt_chunk) >= 26:
+        format_tag = struct.unpack_from('<H', fmt_chunk, 24)[0] # Sub-format GUID starts with the tag
+    dtypes = {(_WAVE_FORMAT_PCM, 8): 'u1', (_WAVE_FORMAT_PCM, 16): '<i2', (_WAVE_FORMAT_PCM, 32): '<i4',
+              (_WAVE_FORMAT_IEEE_FLOAT, 32): '<f4'}
+    dtype = dtypes.get((format_tag, bits))
+    if dtype is None or not channels:
+        raise SynthesisError(f"Cannot process audio: unsupported WAV encoding (format {format_tag}, {bits}-bit).")
+    return sample_rate, channels, dtype
+
+
+def _unsupported_input(input_format: Optional[str]) -> str:
+    return (f"Audio post-processing needs 'wav' or 'pcm' input, got '{input_format or 'unknown'}'. "
+            f"Request one of them from the provider.")
+
+
+def _wav_data_offset(head: BytesLike) -> Optional[int]:
+    """Offset of the sample data in a (possibly incomplete) WAV stream, or None if the header is not complete yet."""
+    if len(head) < 12:
+        return None
+    if bytes(head[:4]) != b'RIFF' or bytes(head[8:12]) != b'WAVE':
+        raise SynthesisError("Cannot process audio: stream is not a RIFF/WAVE file.")
+    offset = 12
+    while offset + 8 <= len(head):
+        chunk_id = bytes(head[offset:offset + 4])
+        chunk_size = struct.unpack_from('<I', head, offset + 4)[0]
+        if chunk_id == b'data':
+            return offset + 8
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def pcm_fmt_chunk(sample_rate: int, channels: int) -> bytes:
+    """'fmt ' chunk body for 16-bit integer PCM."""
+    return struct.pack('<HHIIHH', _WAVE_FORMAT_PCM, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16)
+
+
+def decode_audio(
+    audio: BytesLike,
+    input_format: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    channels: int = 1,
+):
+    """
+    Returns the samples of a WAV or headerless PCM clip as a NumPy view, without copying.
+
+    Args:
+        audio: The clip (bytes, bytearray or memoryview).
+        input_format: 'wav', or 'pcm' / 'raw' for headerless 16-bit little-endian samples.
+                      WAV is also detected from the header.
+        sample_rate: Sample rate of headerless PCM.
+        channels: Interleaved channels of headerless PCM.
+
+    Returns:
+        Tuple[numpy.ndarray, int]: A read-only (frames, channels) array backed by `audio`,
+        and its sample rate.
+
+    Raises:
+        SynthesisError: If the clip is not WAV/PCM or lacks the information needed to decode it.
+    """
+    _require_numpy()
+    view = memoryview(audio).cast('B')
+    input_format = (input_format or '').lower()
+    if bytes(view[:4]) == b'RIFF':
+        fmt_chunk, start, end = parse_wav(view)
+        rate, channels, dtype = _sample_dtype(fmt_chunk)
+    elif input_format in PCM_FORMATS:
+        if not sample_rate:
+            raise SynthesisError("Cannot process headerless PCM audio without its sample rate.")
+        rate, dtype, start, end = sample_rate, '<i2', 0, len(view)
+    else:
+        raise SynthesisError(_unsupported_input(input_format))
+    itemsize = np.dtype(dtype).itemsize * channels
+    end = start + (end - start) // itemsize * itemsize # Ignore a trailing partial frame
+    samples = np.frombuffer(view[start:end], dtype=dtype).reshape(-1, channels)
+    return samples, rate
+
+
+def _to_float(samples) -> "np.ndarray":
+    """Converts integer or float samples to float32 in [-1, 1] (one copy)."""
+    kind = samples.dtype
+    if kind == np.float32:
+        return samples.astype(np.float32, copy=True)
+    if kind == np.uint8:
+        return (samples.astype(np.float32) - 128.0) * (1.0 / 128.0)
+    scale = 1.0 / float(2 ** (8 * kind.itemsize - 1))
+    return samples.astype(np.float32) * scale
+
+
+def _to_int16(samples) -> "np.ndarray":
+    return np.clip(np.rint(samples * 32767.0), -32768, 32767).astype('<i2')
+
+
+class Resampler:
+    """
+    Band-limited sample rate converter (polyphase windowed sinc), usable chunk by chunk.
+
+    Output sample k is interpolated at input position k * in_rate / out_rate from
+    `2 * half_width` neighbouring input samples, with the low-pass cutoff set
+    below the lower of the two Nyquist frequencies. The kernel for every
+    fractional position is precomputed, and each chunk is converted with one
+    vectorized gather and dot product per block.
+    """
+
+    BLOCK = 4096 # Output frames per vectorized step (bounds the temporary gather array)
+
+    def __init__(self, in_rate: int, out_rate: int, channels: int = 1, half_width: int = 16, rolloff: float = 0.94):
+        """
+        Args:
+            in_rate: Input sample rate.
+            out_rate: Output sample rate.
+            channels: Number of interleaved channels.
+            half_width: Input samples used on each side of an output sample (quality vs. speed).
+            rolloff: Cutoff as a fraction of the lower Nyquist frequency.
+        """
+        _require_numpy()
+        g = math.gcd(in_rate, out_rate)
+        self.up, self.down = out_rate // g, in_rate // g
+        self.half = half_width
+        self.channels = channels
+        self._offsets = np.arange(-half_width + 1, half_width + 1)
+        # Kernel per phase: phase p interpolates at fractional position p / up
+        cutoff = rolloff * min(1.0, self.up / self.down)
+        positions = self._offsets[None, :] - (np.arange(self.up)[:, None] / self.up)
+        window = np.kaiser(2 * half_width + 1, 8.0)
+        window_at = np.interp(positions, np.arange(-half_width, half_width + 1), window)
+        bank = cutoff * np.sinc(cutoff * positions) * window_at
+        self._bank = (bank / bank.sum(axis=1, keepdims=True)).astype(np.float32) # Unity gain at DC
+        # Input history, with `half` samples of leading silence so the first outputs have left context
+        self._buffer = np.zeros((half_width, channels), dtype=np.float32)
+        self._buffer_start = -half_width
+        self._next_out = 0
+        self._total_in = 0
+
+    def process(self, samples, final: bool = False):
+        """
+        Converts the next chunk of (frames, channels) float samples.
+
+        Output lags the input by `half_width` frames; pass `final=True` with the
+        last chunk (possibly empty) to flush it.
+        """
+        if len(samples):
+            self._buffer = np.concatenate((self._buffer, samples))
+            self._total_in += len(samples)
+        if final:
+            self._buffer = np.concatenate((self._buffer, np.zeros((self.half, self.channels), dtype=np.float32)))
+            last = -(-self._total_in * self.up // self.down) - 1 # ceil(total * up / down) outputs in all
+        else:
+            # Outputs whose whole kernel lies within the buffer
+            available = self._buffer_start + len(self._buffer) - self.half # Input index limit (exclusive)
+            last = (available * self.up - 1) // self.down
+        count = max(last - self._next_out + 1, 0)
+        out = np.empty((count, self.channels), dtype=np.float32)
+        for block in range(0, count, self.BLOCK):
+            ks = np.arange(self._next_out + block, self._next_out + min(block + self.BLOCK, count))
+            bases = ks * self.down // self.up
+            phases = ks * self.down % self.up
+            gathered = self._buffer[bases[:, None] + self._offsets[None, :] - self._buffer_start]
+            out[block:block + len(ks)] = np.einsum('ntc,nt->nc', gathered, self._bank[phases])
+        self._next_out += count
+        # Drop input no longer needed by any future output
+        keep_from = self._next_out * self.down // self.up - self.half + 1
+        drop = min(max(keep_from - self._buffer_start, 0), len(self._buffer))
+        if drop:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start += drop
+        return out
+
+
+def resample(samples, in_rate: int, out_rate: int, half_width: int = 16):
+    """Resamples a whole (frames, channels) float array; see `Resampler`."""
+    if in_rate == out_rate:
+        return samples
+    return Resampler(in_rate, out_rate, samples.shape[1], half_width).process(samples, final=True)
+
+
+class AudioPipeline:
+    """
+    Optional post-processing applied to synthesized WAV/PCM audio.
+
+    Steps (each optional, applied in this order): channel conversion, silence
+    trimming, resampling and loudness normalization, then encoding as 16-bit
+    WAV or headerless PCM. Input samples are read through NumPy views of the
+    provider's buffer; a pipeline that only changes the container (e.g. PCM
+    to WAV) copies nothing but the final output. Works on whole clips
+    (`process`) and chunk by chunk on streams (`process_stream`).
+
+    Pass it to `UnifiedTTS(pipeline=...)` or per call (`synthesize(..., pipeline=...)`).
+    This lets you request the cheapest format from a provider and convert locally:
+
+        pipeline = AudioPipeline(sample_rate=16000, channels=1, normalize=-20.0, trim_silence=True)
+        audio = tts.synthesize("Hello", provider='cartesia', output_format='pcm', sample_rate=24000, pipeline=pipeline)
+    """
+
+    def __init__(
+        self,
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+        normalize: Optional[float] = None,
+        trim_silence: bool = False,
+        output_format: str = 'wav',
+        silence_threshold: float = -50.0,
+        trim_padding: float = 0.05,
+        peak_ceiling: float = -1.0,
+        max_gain: float = 20.0,
+        input_sample_rate: Optional[int] = None,
+        input_channels: int = 1,
+    ):
+        """
+        Args:
+            sample_rate: Output sample rate; None keeps the input rate.
+            channels: Output channels (1 or 2); None keeps the input layout. Downmixing averages channels.
+            normalize: Target loudness as RMS level in dBFS (e.g. -20.0); None disables normalization.
+            trim_silence: Remove leading and trailing silence.
+            output_format: 'wav', or 'pcm' / 'raw' for headerless 16-bit little-endian samples.
+            silence_threshold: Level in dBFS below which audio counts as silence.
+            trim_padding: Seconds of silence kept at each trimmed end.
+            peak_ceiling: Normalization never raises peaks above this level in dBFS.
+            max_gain: Largest boost normalization applies, in dB (keeps near-silent clips from being blown up).
+            input_sample_rate: Sample rate of headerless PCM input, if the request does not say.
+            input_channels: Channels of headerless PCM input.
+        """
+        _require_numpy()
+        output_format = output_format.lower()
+        if output_format not in ('wav',) + PCM_FORMATS:
+            raise ConfigurationError(f"AudioPipeline output_format must be 'wav', 'pcm' or 'raw', not '{output_format}'.")
+        if channels not in (None, 1, 2):
+            raise ConfigurationError("AudioPipeline channels must be 1 or 2.")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.normalize = normalize
+        self.trim_silence = trim_silence
+        self.output_format = output_format
+        self.silence_threshold = silence_threshold
+        self.trim_padding = trim_padding
+        self.peak_ceiling = peak_ceiling
+        self.max_gain = max_gain
+        self.input_sample_rate = input_sample_rate
+        self.input_channels = input_channels
+
+    def __repr__(self) -> str:
+        return (f"AudioPipeline(sample_rate={self.sample_rate}, channels={self.channels}, normalize={self.normalize}, "
+                f"trim_silence={self.trim_silence}, output_format={self.output_format!r}, silence_threshold={self.silence_threshold}, "
+                f"trim_padding={self.trim_padding}, peak_ceiling={self.peak_ceiling}, max_gain={self.max_gain})")
+
+    def _needs_dsp(self, samples, rate: int) -> bool:
+        return bool(
+            self.normalize is not None or self.trim_silence
+            or (self.sample_rate and self.sample_rate != rate)
+            or (self.channels and self.channels != samples.shape[1])
+            or samples.dtype != np.dtype('<i2')
+        )
+
+    def _encode(self, pcm, rate: int, with_header: bool) -> bytes:
+        """Joins the output header (if any) and the int16 samples with a single copy."""
+        data = memoryview(np.ascontiguousarray(pcm)).cast('B')
+        if self.output_format == 'wav' and with_header:
+            return b''.join((wav_header(pcm_fmt_chunk(rate, pcm.shape[1]), len(data)), data))
+        return bytes(data)
+
+    # --- Whole clips ---
+
+    def process(self, audio: BytesLike, input_format: Optional[str] = None, sample_rate: Optional[int] = None) -> bytes:
+        """
+        Processes a complete WAV or PCM clip.
+
+        Args:
+            audio: The clip.
+            input_format: Format the provider was asked for ('wav', 'pcm', ...).
+            sample_rate: Sample rate the provider was asked for (needed for headerless PCM).
+
+        Returns:
+            bytes: The processed clip in `output_format`.
+
+        Raises:
+            SynthesisError: If the input is not WAV/PCM.
+        """
+        samples, rate = decode_audio(audio, input_format, sample_rate or self.input_sample_rate, self.input_channels)
+        if not self._needs_dsp(samples, rate):
+            if self.output_format == 'wav' and bytes(memoryview(audio)[:4]) == b'RIFF':
+                return bytes(audio) # Already what was asked for
+            return self._encode(samples, rate, with_header=True)
+
+        x = _to_float(samples)
+        x = self._convert_channels(x)
+        if self.trim_silence:
+            x = self._trim(x, rate)
+        out_rate = self.sample_rate or rate
+        x = resample(x, rate, out_rate)
+        if self.normalize is not None:
+            x = x * self._gain(x)
+        return self._encode(_to_int16(x), out_rate, with_header=True)
+
+    def _convert_channels(self, x):
+        if not self.channels or self.channels == x.shape[1]:
+            return x
+        if self.channels == 1:
+            return x.mean(axis=1, keepdims=True)
+        return np.repeat(x[:, :1] if x.shape[1] == 1 else x.mean(axis=1, keepdims=True), self.channels, axis=1)
+
+    def _trim(self, x, rate: int):
+        loud = np.flatnonzero(np.abs(x).max(axis=1) > 10 ** (self.silence_threshold / 20.0))
+        if not len(loud):
+            return x[:0]
+        pad = int(self.trim_padding * rate)
+        return x[max(loud[0] - pad, 0):min(loud[-1] + 1 + pad, len(x))]
+
+    def _gain(self, x, rms: Optional[float] = None, peak: Optional[float] = None) -> float:
+        """Gain that brings `x` (or the given levels) to the target RMS level without peaks above the ceiling."""
+        rms = float(np.sqrt(np.mean(np.square(x, dtype=np.float64)))) if rms is None else rms
+        if rms <= 0.0:
+            return 1.0
+        gain = min(10 ** (self.normalize / 20.0) / rms, 10 ** (self.max_gain / 20.0))
+        if peak is None:
+            peak = float(np.abs(x).max()) if len(x) else 0.0
+        if peak > 0.0:
+            gain = min(gain, 10 ** (self.peak_ceiling / 20.0) / peak)
+        return gain
+
+    # --- Streams ---
+
+    def stream_processor(self, input_format: Optional[str] = None, sample_rate: Optional[int] = None) -> "StreamProcessor":
+        """Returns a push-style processor for one stream (see `StreamProcessor`)."""
+        return StreamProcessor(self, input_format, sample_rate)
+
+    def process_stream(
+        self,
+        chunks: Iterable[BytesLike],
+        input_format: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """
+        Processes a WAV or PCM stream chunk by chunk.
+
+        A WAV output starts with a streaming header whose size fields are unset
+        (see `audio.finalize_wav_file`). Streamed normalization adapts its gain to
+        the loudness heard so far (ramped between chunks), so it converges to the
+        whole-clip result rather than matching it exactly. Trailing silence is held
+        back until more sound arrives, or dropped at the end of the stream.
+
+        Args and Raises are the same as for `process`.
+        """
+        processor = self.stream_processor(input_format, sample_rate)
+        for chunk in chunks:
+            out = processor.feed(chunk)
+            if out:
+                yield out
+        out = processor.finish()
+        if out:
+            yield out
+
+
+class StreamProcessor:
+    """
+    Applies an `AudioPipeline` to one stream, one chunk at a time.
+
+    Feed chunks as they arrive and call `finish` at the end; each call returns
+    the output bytes that are ready (possibly empty). Chunks may split WAV
+    headers and sample frames anywhere. Usable from sync and async code alike.
+    """
+
+    def __init__(self, pipeline: AudioPipeline, input_format: Optional[str] = None, sample_rate: Optional[int] = None):
+        self.pipeline = pipeline
+        self.input_format = (input_format or '').lower()
+        self.sample_rate = sample_rate or pipeline.input_sample_rate
+        self._head: Optional[bytearray] = bytearray() # Input buffered until the format is known
+        self._passthrough = False
+        self._carry = b'' # Trailing partial frame of the previous chunk
+
+    def feed(self, chunk: BytesLike) -> bytes:
+        """Processes the next chunk, returning the output that is ready."""
+        if self._head is None:
+            return bytes(chunk) if self._passthrough else self._convert(chunk, final=False)
+        self._head += chunk
+        if len(self._head) < 4 or (self._head[:4] == b'RIFF' and _wav_data_offset(self._head) is None):
+            return b''
+        return self._start()
+
+    def finish(self) -> bytes:
+        """Flushes buffered audio at the end of the stream."""
+        out = b''
+        if self._head is not None:
+            if not self._head:
+                return b''
+            if self._head[:4] == b'RIFF' and _wav_data_offset(self._head) is None:
+                raise SynthesisError("Cannot process audio: WAV stream ended inside its header.")
+            out = self._start()
+        if self._passthrough:
+            return out
+        return out + self._convert(b'', final=True)
+
+    def _start(self) -> bytes:
+        """Reads the input format from the buffered head and returns the first output."""
+        head, self._head = self._head, None
+        pipeline = self.pipeline
+        if head[:4] == b'RIFF':
+            data_offset = _wav_data_offset(head)
+            fmt_chunk, _, _ = parse_wav(bytes(head[:data_offset]))
+            rate, channels, dtype = _sample_dtype(fmt_chunk)
+        elif self.input_format in PCM_FORMATS:
+            if not self.sample_rate:
+                raise SynthesisError("Cannot process headerless PCM audio without its sample rate.")
+            rate, channels, dtype, data_offset = self.sample_rate, pipeline.input_channels, '<i2', 0
+        else:
+            raise SynthesisError(_unsupported_input(self.input_format))
+
+        self._rate, self._channels, self._dtype = rate, channels, np.dtype(dtype)
+        if not pipeline._needs_dsp(np.zeros((0, channels), dtype=dtype), rate):
+            self._passthrough = True
+            if pipeline.output_format == 'wav' and head[:4] == b'RIFF':
+                return bytes(head) # Already what was asked for
+            # Container change only: drop or add the header, forward samples as they come
+            header = wav_header(pcm_fmt_chunk(rate, channels), None) if pipeline.output_format == 'wav' else b''
+            return header + bytes(memoryview(head)[data_offset:])
+
+        self._out_channels = pipeline.channels or channels
+        self._out_rate = pipeline.sample_rate or rate
+        self._resampler = Resampler(rate, self._out_rate, self._out_channels) if self._out_rate != rate else None
+        self._frame_size = self._dtype.itemsize * channels
+        self._threshold = 10 ** (pipeline.silence_threshold / 20.0)
+        self._pad = int(pipeline.trim_padding * rate)
+        self._started = not pipeline.trim_silence # Leading silence dropped until the first loud sample
+        self._held = np.zeros((0, self._out_channels), dtype=np.float32) # Trailing silence awaiting more sound
+        self._energy, self._values_seen, self._peak, self._gain = 0.0, 0, 0.0, None
+        header = wav_header(pcm_fmt_chunk(self._out_rate, self._out_channels), None) if pipeline.output_format == 'wav' else b''
+        return header + self._convert(memoryview(head)[data_offset:], final=False)
+
+    def _convert(self, chunk: BytesLike, final: bool) -> bytes:
+        pipeline = self.pipeline
+        frames, self._carry = _split_frames(self._carry + bytes(chunk) if self._carry else chunk, self._frame_size)
+        x = np.frombuffer(frames, dtype=self._dtype).reshape(-1, self._channels) # View of the chunk, no copy
+        x = pipeline._convert_channels(_to_float(x))
+        if pipeline.trim_silence:
+            x = self._trim(x, final)
+        if self._resampler is not None:
+            x = self._resampler.process(x, final=final)
+        if pipeline.normalize is not None and len(x):
+            self._energy += float(np.sum(np.square(x, dtype=np.float64)))
+            self._values_seen += x.size
+            self._peak = max(self._peak, float(np.abs(x).max()))
+            target = pipeline._gain(x, rms=math.sqrt(self._energy / self._values_seen), peak=self._peak)
+            # Cut gain at once (peaks stay under the ceiling), raise it gradually (no audible steps)
+            previous = target if self._gain is None or target < self._gain else self._gain
+            x = x * np.linspace(previous, target, len(x), dtype=np.float32)[:, None]
+            self._gain = target
+        if not len(x):
+            return b''
+        return bytes(memoryview(_to_int16(x)).cast('B'))
+
+    def _trim(self, x, final: bool):
+        pad = self._pad
+        x = np.concatenate((self._held, x)) if len(self._held) else x
+        self._held = x[:0]
+        loud = np.flatnonzero(np.abs(x).max(axis=1) > self._threshold)
+        if not self._started:
+            if not len(loud):
+                self._held = x[-pad:] if pad else x[:0] # Leading padding, in case sound starts next
+                return x[:0]
+            self._started = True
+            start = max(loud[0] - pad, 0)
+            x, loud = x[start:], loud - start
+        # Hold back trailing silence until more sound arrives
+        cut = loud[-1] + 1 if len(loud) else 0
+        x, self._held = x[:cut], x[cut:]
+        if final:
+            x, self._held = np.concatenate((x, self._held[:pad])), self._held[:0]
+        return x
+
+
+def _split_frames(data: BytesLike, frame_size: int) -> Tuple[memoryview, bytes]:
+    """Splits `data` into whole frames (a view) and the bytes of a trailing partial frame."""
+    view = memoryview(data).cast('B')
+    whole = len(view) // frame_size * frame_size
+    return view[:whole], bytes(view[whole:])
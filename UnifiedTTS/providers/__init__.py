@@ -1,4 +1,4 @@
 # unified_tts/providers/__init__.py
 # This file can be empty, but it marks the directory as a Python package.
-# Optionally, you could import provider classes here for easier access,
-# but the core module handles discovery via AVAILABLE_PROVIDERS.
\ No newline at end of file
+# Provider modules are imported lazily by name through the registry
+# (see ..registry.AVAILABLE_PROVIDERS), so nothing is imported here.
\ No newline at end of file
@@ -1,13 +1,29 @@
 # unified_tts/providers/base.py
 
 import os
+import asyncio
+import logging
+import functools
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
-from ..exceptions import ConfigurationError
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, List, Tuple
+from ..exceptions import ConfigurationError, SynthesisError
+
+logger = logging.getLogger(__name__)
+
+# Default size (in bytes) of the chunks yielded by streaming synthesis.
+DEFAULT_STREAM_CHUNK_SIZE = 8192
 
 class BaseTTSProvider(ABC):
     """Abstract base class for all TTS providers."""
 
+    # Longest text accepted in a single request; longer texts are split into
+    # segments by UnifiedTTS. None means no known limit.
+    MAX_INPUT_CHARS: Optional[int] = None
+    # Format used when the caller does not pass `output_format`
+    DEFAULT_OUTPUT_FORMAT = 'mp3'
+    # Whether `synthesize_with_timestamps` is implemented
+    SUPPORTS_TIMESTAMPS = False
+
     def __init__(self, api_key: Optional[str] = None, api_key_env_var: Optional[str] = None, **kwargs):
         """
         Initializes the provider.
@@ -20,7 +36,7 @@ class BaseTTSProvider(ABC):
         self.api_key = api_key or os.environ.get(api_key_env_var) if api_key_env_var else None
         if not self.api_key and api_key_env_var:
              # Only raise if the env var was specified but key not found directly or in env
-             print(f"Warning: API key for {self.__class__.__name__} not found via argument or environment variable '{api_key_env_var}'. Provider might not work.")
+             logger.warning("API key for %s not found via argument or environment variable '%s'. Provider might not work.", self.__class__.__name__, api_key_env_var)
              # Optional: Raise ConfigurationError immediately if key is absolutely required
              # raise ConfigurationError(f"API key for {self.__class__.__name__} is missing. Set the '{api_key_env_var}' environment variable or pass 'api_key'.")
 
@@ -58,6 +74,131 @@ class BaseTTSProvider(ABC):
         """
         pass
 
+    def synthesize_with_timestamps(
+        self, text: str, output_format: str = 'wav', **kwargs
+    ) -> Tuple[bytes, List[Tuple[str, float, float]]]:
+        """
+        Synthesizes speech and reports when each word is spoken.
+
+        Providers whose API returns word timings should override this and set
+        `SUPPORTS_TIMESTAMPS = True`; micro-batching uses the timings to cut the
+        audio of a batch between its texts.
+
+        Args:
+            text: The text to synthesize.
+            output_format: The desired audio output format.
+            **kwargs: Provider-specific options (e.g., voice, model, speed).
+
+        Returns:
+            Tuple[bytes, List[Tuple[str, float, float]]]: The audio, and (word, start, end)
+            for each whitespace-separated word of `text`, in seconds from the start of the audio.
+
+        Raises:
+            SynthesisError: If synthesis fails or the provider does not report timestamps.
+        """
+        raise SynthesisError(f"Provider '{self.name}' does not report word timestamps.")
+
+    def synthesize_stream(
+        self,
+        text: str,
+        output_format: str = 'mp3',
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes speech from text, yielding audio chunks as they arrive.
+
+        Providers that support streamed responses should override this. The
+        default implementation falls back to `synthesize` and yields the whole
+        clip as a single chunk.
+
+        Args:
+            text: The text to synthesize.
+            output_format: The desired audio output format.
+            chunk_size: Preferred size in bytes of each yielded chunk (a hint;
+                        providers may yield smaller or larger chunks).
+            **kwargs: Provider-specific options (e.g., voice, model, speed).
+
+        Yields:
+            bytes: Successive pieces of the synthesized audio data.
+
+        Raises:
+            SynthesisError: If synthesis fails.
+            ConfigurationError: If the provider is not properly configured.
+        """
+        yield self.synthesize(text, output_format=output_format, **kwargs)
+
+    async def asynthesize(self, text: str, output_format: Optional[str] = None, **kwargs) -> bytes:
+        """
+        Asynchronously synthesizes speech from text.
+
+        Providers with an async client should override this. The default
+        implementation runs the blocking `synthesize` in the event loop's
+        default executor so it never blocks the loop.
+
+        Args, Returns and Raises are the same as for `synthesize`.
+        """
+        loop = asyncio.get_running_loop()
+        output_format = output_format or self.DEFAULT_OUTPUT_FORMAT # Same default as the sync call
+        return await loop.run_in_executor(
+            None, functools.partial(self.synthesize, text, output_format=output_format, **kwargs)
+        )
+
+    async def asynthesize_stream(
+        self,
+        text: str,
+        output_format: Optional[str] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Asynchronously synthesizes speech, yielding audio chunks as they arrive.
+
+        The default implementation yields the result of `asynthesize` as a single chunk.
+
+        Args and Raises are the same as for `synthesize_stream`.
+        """
+        yield await self.asynthesize(text, output_format=output_format, **kwargs)
+
+    def warm_up(self, connections: int = 1) -> None:
+        """
+        Opens connections to the provider's endpoint ahead of the first request.
+
+        Providers with pooled HTTP clients should override this, so DNS, TCP and
+        TLS setup happen at startup instead of in the first user request. The
+        default implementation does nothing.
+
+        Args:
+            connections: Connections to open (the client keeps at most its pool size).
+
+        Raises:
+            SynthesisError: If the endpoint cannot be reached.
+        """
+        pass
+
+    async def awarm_up(self, connections: int = 1) -> None:
+        """
+        Opens connections of the client used by the async methods ahead of the first request.
+
+        Providers with an async client should override this. The default
+        implementation runs the blocking `warm_up` in the event loop's default
+        executor, which warms the client the default `asynthesize` uses.
+
+        Args and Raises are the same as for `warm_up`.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.warm_up, connections)
+
+    def close(self) -> None:
+        """Releases any synchronous resources (e.g., HTTP connection pools) held by the provider."""
+        # Default implementation does nothing, override in subclasses.
+        pass
+
+    async def aclose(self) -> None:
+        """Releases any async resources (e.g., HTTP connection pools) held by the provider."""
+        # Default implementation does nothing, override in subclasses.
+        pass
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -1,10 +1,15 @@
 # unified_tts/providers/cartesia.py
 
 import os
+import logging
 import requests # Assuming REST API if no SDK
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator
 from ..exceptions import ConfigurationError, SynthesisError
-from .base import BaseTTSProvider
+from ..transport import (
+    TransportConfig, build_session, build_httpx_limits, request_with_retries, asend_with_retries, warm_connections,
+    awarm_connections,
+)
+from .base import BaseTTSProvider, DEFAULT_STREAM_CHUNK_SIZE
 
 # Hypothetical: Try importing cartesia SDK if it exists
 try:
@@ -14,6 +19,14 @@ except ImportError:
     cartesia = None
     CARTESIA_SDK_AVAILABLE = False
 
+# Optional async HTTP client, used for asynthesize/asynthesize_stream on the requests path
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
 
 class CartesiaTTSProvider(BaseTTSProvider):
     """
@@ -22,15 +35,26 @@ class CartesiaTTSProvider(BaseTTSProvider):
     """
 
     PROVIDER_NAME = "cartesia"
+    DEFAULT_OUTPUT_FORMAT = 'wav'
+    MAX_INPUT_CHARS = 5000 # Conservative placeholder, check Cartesia docs
     # Hypothetical API Endpoint
     DEFAULT_API_ENDPOINT = "https://api.cartesia.ai/tts" # Replace with actual endpoint
 
-    def __init__(self, api_key: Optional[str] = None, api_endpoint: Optional[str] = None, **kwargs):
-        super().__init__(api_key=api_key, api_key_env_var="CARTESIA_API_KEY", **kwargs)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_endpoint: Optional[str] = None,
+        transport: Optional[TransportConfig] = None,
+        **kwargs
+    ):
+        # Set attributes before the base __init__, which calls _initialize_client
+        self.transport = transport or TransportConfig() # Pooling, timeouts and retries for HTTP calls
         self.client = None # For SDK
         self.session = None # For requests
+        self.async_session = None # For httpx (async), if installed
         self.api_endpoint = api_endpoint or self.DEFAULT_API_ENDPOINT
         self._extra_config = kwargs # Store other config if needed
+        super().__init__(api_key=api_key, api_key_env_var="CARTESIA_API_KEY", **kwargs)
 
     def _validate_config(self):
         """Ensure API key is present."""
@@ -45,19 +69,22 @@ class CartesiaTTSProvider(BaseTTSProvider):
             try:
                 # Hypothetical SDK initialization
                 self.client = cartesia.Client(api_key=self.api_key, **self._extra_config)
-                print("INFO: Using Cartesia SDK.")
+                logger.info("Using Cartesia SDK.")
             except Exception as e:
                 raise ConfigurationError(f"Failed to initialize Cartesia SDK client: {e}")
         else:
             # Fallback to using requests
-            print("INFO: Cartesia SDK not found or failed to load. Using requests for API calls.")
-            self.session = requests.Session()
-            self.session.headers.update({
+            logger.info("Cartesia SDK not found or failed to load. Using requests for API calls.")
+            headers = {
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
                 # Add other necessary headers based on Cartesia docs
                 # "X-Api-Version": "v1",
-            })
+            }
+            self.session = build_session(self.transport, headers)
+            if httpx is not None:
+                limits, timeout = build_httpx_limits(self.transport)
+                self.async_session = httpx.AsyncClient(headers=headers, limits=limits, timeout=timeout)
 
     @property
     def name(self) -> str:
@@ -74,6 +101,10 @@ class CartesiaTTSProvider(BaseTTSProvider):
                 voice_id (str): Identifier for the desired Cartesia voice.
                 model_id (str): Identifier for the model to use.
                 sample_rate (int): Audio sample rate (e.g., 24000, 44100).
+                deadline (float): Absolute `time.monotonic()` time by which the call must
+                                  finish; bounds timeouts and retries (requests path only).
+                before_retry (callable): Called before each retry (`abefore_retry` is
+                                         awaited instead by the async methods).
                 # other potential parameters...
 
         Returns:
@@ -97,7 +128,7 @@ class CartesiaTTSProvider(BaseTTSProvider):
                     output_format=output_format,
                     sample_rate=kwargs.get('sample_rate', 24000),
                     # Pass other relevant kwargs...
-                    **{k: v for k, v in kwargs.items() if k not in ['voice_id', 'model_id', 'sample_rate']}
+                    **{k: v for k, v in kwargs.items() if k not in ['voice_id', 'model_id', 'sample_rate', 'deadline', 'before_retry', 'abefore_retry']}
                 )
                 # Assuming response object has a method or attribute for audio bytes
                 audio_bytes = response.get_audio_bytes()
@@ -107,19 +138,14 @@ class CartesiaTTSProvider(BaseTTSProvider):
 
         # --- requests Path ---
         elif self.session:
-            payload = {
-                "transcript": text,
-                "voice_id": kwargs.get("voice_id"), # Replace with actual required field names
-                "model_id": kwargs.get("model_id"),
-                "output_format": output_format,
-                "sample_rate": kwargs.get("sample_rate", 24000),
-                # Add other parameters from kwargs as needed by the API
-            }
-            # Filter out None values if the API doesn't like them
-            payload = {k: v for k, v in payload.items() if v is not None}
+            payload = self._build_payload(text, output_format, kwargs)
 
             try:
-                response = self.session.post(self.api_endpoint, json=payload)
+                # Retries transient failures (429/5xx, connection errors) with backoff
+                response = request_with_retries(
+                    self.session, 'POST', self.api_endpoint, self.transport,
+                    deadline=kwargs.get('deadline'), before_retry=kwargs.get('before_retry'), json=payload,
+                )
                 response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
 
                 # Assuming the API returns raw audio bytes in the response body
@@ -127,16 +153,193 @@ class CartesiaTTSProvider(BaseTTSProvider):
 
             except requests.exceptions.RequestException as e:
                 # Handle connection errors, timeouts, invalid JSON response etc.
-                error_details = f"{e}"
-                if e.response is not None:
-                    try:
-                       error_details += f" - Status Code: {e.response.status_code}, Response: {e.response.text[:200]}"
-                    except Exception: # pragma: no cover
-                       error_details += f" - Status Code: {e.response.status_code}"
-
-                raise SynthesisError(f"Cartesia API request error: {error_details}")
+                raise SynthesisError(f"Cartesia API request error: {self._describe_request_error(e)}")
+            except SynthesisError:
+                raise # e.g., DeadlineExceededError
             except Exception as e:
                  raise SynthesisError(f"An unexpected error occurred during Cartesia synthesis via requests: {e}")
 
         else:
-             raise ConfigurationError("Cartesia provider not initialized (neither SDK nor requests session available).")
\ No newline at end of file
+             raise ConfigurationError("Cartesia provider not initialized (neither SDK nor requests session available).")
+
+    def synthesize_stream(
+        self,
+        text: str,
+        output_format: str = 'wav',
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes speech using Cartesia TTS, yielding chunks as the response body arrives.
+
+        Accepts the same arguments as `synthesize`, plus `chunk_size`. The SDK path
+        does not stream and falls back to a single chunk.
+
+        Yields:
+            bytes: Successive pieces of the synthesized audio data.
+
+        Raises:
+            SynthesisError: If the Cartesia API call fails.
+            ConfigurationError: If the provider is not properly configured.
+        """
+        if not self.api_key:
+             raise ConfigurationError("Cartesia API key not configured.")
+
+        if self.client or not self.session:
+            yield from super().synthesize_stream(text, output_format=output_format, chunk_size=chunk_size, **kwargs)
+            return
+
+        payload = self._build_payload(text, output_format, kwargs)
+
+        try:
+            response = request_with_retries(
+                self.session, 'POST', self.api_endpoint, self.transport,
+                deadline=kwargs.get('deadline'), before_retry=kwargs.get('before_retry'), json=payload, stream=True,
+            )
+            with response:
+                if not response.ok:
+                    response.content # Load the error body so it can be reported after the response closes
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk: # Skip keep-alive chunks
+                        yield chunk
+        except requests.exceptions.RequestException as e:
+            raise SynthesisError(f"Cartesia API streaming request error: {self._describe_request_error(e)}")
+        except SynthesisError:
+            raise
+        except Exception as e:
+             raise SynthesisError(f"An unexpected error occurred during Cartesia streaming synthesis via requests: {e}")
+
+    async def asynthesize(self, text: str, output_format: str = 'wav', **kwargs) -> bytes:
+        """
+        Asynchronously synthesizes speech using Cartesia TTS. See `synthesize`.
+
+        Uses `httpx.AsyncClient` when available; otherwise (SDK path or httpx not
+        installed) falls back to running `synthesize` in an executor.
+        """
+        if not self.async_session:
+            return await super().asynthesize(text, output_format=output_format, **kwargs)
+
+        payload = self._build_payload(text, output_format, kwargs)
+
+        try:
+            response = await asend_with_retries(
+                self.async_session, 'POST', self.api_endpoint, self.transport,
+                deadline=kwargs.get('deadline'), before_retry=kwargs.get('abefore_retry'), json=payload,
+            )
+            response.raise_for_status()
+            return response.content
+        except httpx.HTTPError as e:
+            raise SynthesisError(f"Cartesia API request error: {self._describe_async_request_error(e)}")
+        except SynthesisError:
+            raise
+        except Exception as e:
+             raise SynthesisError(f"An unexpected error occurred during Cartesia synthesis via httpx: {e}")
+
+    async def asynthesize_stream(
+        self,
+        text: str,
+        output_format: str = 'wav',
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """Asynchronously streams speech using Cartesia TTS. See `synthesize_stream`."""
+        if not self.async_session:
+            async for chunk in super().asynthesize_stream(text, output_format=output_format, chunk_size=chunk_size, **kwargs):
+                yield chunk
+            return
+
+        payload = self._build_payload(text, output_format, kwargs)
+
+        try:
+            response = await asend_with_retries(
+                self.async_session, 'POST', self.api_endpoint, self.transport,
+                deadline=kwargs.get('deadline'), before_retry=kwargs.get('abefore_retry'), json=payload, stream=True,
+            )
+            try:
+                if response.is_error:
+                    await response.aread() # Load the error body so it can be reported
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                    yield chunk
+            finally:
+                await response.aclose()
+        except httpx.HTTPError as e:
+            raise SynthesisError(f"Cartesia API streaming request error: {self._describe_async_request_error(e)}")
+        except SynthesisError:
+            raise
+        except Exception as e:
+             raise SynthesisError(f"An unexpected error occurred during Cartesia streaming synthesis via httpx: {e}")
+
+    def warm_up(self, connections: int = 1) -> None:
+        """Opens pooled connections to the API endpoint with HEAD requests (requests path only)."""
+        if self.session is None:
+            return
+
+        def open_one() -> None:
+            try:
+                # Any response means the connection is up; it goes back to the pool for the next request
+                self.session.head(self.api_endpoint, timeout=self.transport.timeout()).close()
+            except requests.exceptions.RequestException as e:
+                raise SynthesisError(f"Could not reach the Cartesia API at {self.api_endpoint}: {self._describe_request_error(e)}")
+
+        warm_connections(open_one, min(connections, self.transport.pool_maxsize))
+
+    async def awarm_up(self, connections: int = 1) -> None:
+        """Opens connections of the async HTTP client with HEAD requests (falls back to `warm_up` without httpx)."""
+        if not self.async_session:
+            await super().awarm_up(connections)
+            return
+
+        async def open_one() -> None:
+            try:
+                await self.async_session.head(self.api_endpoint)
+            except httpx.HTTPError as e:
+                raise SynthesisError(f"Could not reach the Cartesia API at {self.api_endpoint}: {self._describe_async_request_error(e)}")
+
+        await awarm_connections(open_one, min(connections, self.transport.pool_maxsize))
+
+    def close(self) -> None:
+        """Closes the requests session's connection pool."""
+        if self.session is not None:
+            self.session.close()
+
+    async def aclose(self) -> None:
+        """Closes the async HTTP client's connection pool."""
+        if self.async_session is not None:
+            await self.async_session.aclose()
+
+    def _build_payload(self, text: str, output_format: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Builds the JSON payload for the Cartesia REST API."""
+        payload = {
+            "transcript": text,
+            "voice_id": kwargs.get("voice_id"), # Replace with actual required field names
+            "model_id": kwargs.get("model_id"),
+            "output_format": output_format,
+            "sample_rate": kwargs.get("sample_rate", 24000),
+            # Add other parameters from kwargs as needed by the API
+        }
+        # Filter out None values if the API doesn't like them
+        return {k: v for k, v in payload.items() if v is not None}
+
+    @staticmethod
+    def _describe_request_error(e: requests.exceptions.RequestException) -> str:
+        """Formats a requests exception, including status code and body excerpt when available."""
+        error_details = f"{e}"
+        if e.response is not None:
+            try:
+               error_details += f" - Status Code: {e.response.status_code}, Response: {e.response.text[:200]}"
+            except Exception: # pragma: no cover
+               error_details += f" - Status Code: {e.response.status_code}"
+        return error_details
+
+    @staticmethod
+    def _describe_async_request_error(e: "httpx.HTTPError") -> str:
+        """Formats an httpx exception, including status code and body excerpt when available."""
+        error_details = f"{e}"
+        if isinstance(e, httpx.HTTPStatusError):
+            try:
+               error_details += f" - Status Code: {e.response.status_code}, Response: {e.response.text[:200]}"
+            except Exception: # pragma: no cover
+               error_details += f" - Status Code: {e.response.status_code}"
+        return error_details
\ No newline at end of file
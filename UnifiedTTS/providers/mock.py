@@ -0,0 +1,152 @@
+# unified_tts/providers/mock.py
+
+import os
+import re
+import time
+import random
+import struct
+import threading
+from typing import Optional, Iterator, List, Tuple
+from ..exceptions import ConfigurationError, SynthesisError
+from ..audio import wav_header
+from .base import BaseTTSProvider, DEFAULT_STREAM_CHUNK_SIZE
+
+# 16-bit mono PCM 'fmt ' chunk body at a given sample rate
+_PCM_FMT = '<HHIIHH'
+
+# One silent MPEG-1 Layer III frame: 128 kbit/s, 44.1 kHz, no padding (417 bytes)
+_MP3_FRAME = b'\xff\xfb\x90\x00' + bytes(413)
+# Half period (samples) and amplitude of the square wave standing in for voiced characters
+_TONE_HALF_PERIOD = 24
+_TONE_AMPLITUDE = 8000
+
+
+class MockTTSProvider(BaseTTSProvider):
+    """
+    Offline provider producing silent audio, for tests, benchmarks and job dry-runs.
+
+    With `voiced=True`, WAV/PCM output carries a tone for every letter and digit
+    and silence for spaces and punctuation, so pauses can be detected in it.
+
+    Opt-in: it is only initialized with `enabled=True` (e.g. `UnifiedTTS(mock_enabled=True)`)
+    or when the `UNIFIED_TTS_MOCK` environment variable is set, so it never shows
+    up among the providers of a production configuration.
+    """
+
+    PROVIDER_NAME = "mock"
+    DEFAULT_OUTPUT_FORMAT = 'wav'
+    SUPPORTS_TIMESTAMPS = True
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        latency: float = 0.0,
+        chars_per_second: float = 15.0,
+        sample_rate: int = 24000,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        voiced: bool = False,
+        **kwargs
+    ):
+        """
+        Args:
+            enabled: Must be True (or `UNIFIED_TTS_MOCK` set) for the provider to initialize.
+            latency: Seconds each request takes before returning audio.
+            chars_per_second: Speaking rate used to size the audio for a text.
+            sample_rate: Default sample rate of WAV/PCM output.
+            error_rate: Fraction of requests (0..1) that raise a SynthesisError.
+            seed: Seed for error injection, for reproducible runs.
+            voiced: Produce a tone for letters and digits instead of uniform silence (WAV/PCM).
+        """
+        self.enabled = enabled if enabled is not None else bool(os.environ.get('UNIFIED_TTS_MOCK'))
+        self.latency = latency
+        self.chars_per_second = chars_per_second
+        self.sample_rate = sample_rate
+        self.error_rate = error_rate
+        self.voiced = voiced
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _validate_config(self):
+        if not self.enabled:
+            raise ConfigurationError(
+                "The mock provider is disabled. Pass 'enabled=True' (e.g. mock_enabled=True) or set 'UNIFIED_TTS_MOCK'."
+            )
+
+    @property
+    def name(self) -> str:
+        return self.PROVIDER_NAME
+
+    def synthesize(self, text: str, output_format: str = 'wav', **kwargs) -> bytes:
+        """
+        Returns silent audio as long as `text` would take to speak.
+
+        Args:
+            text: The text to "synthesize".
+            output_format: 'wav', 'mp3', or headerless 16-bit mono 'pcm' / 'raw'.
+            **kwargs: `sample_rate` overrides the provider default; `deadline` is honored;
+                      other options are accepted and ignored.
+
+        Raises:
+            SynthesisError: For injected errors or an unsupported format.
+        """
+        if self.latency:
+            deadline = kwargs.get('deadline')
+            if deadline is not None and time.monotonic() + self.latency > deadline:
+                raise SynthesisError("Mock synthesis would exceed the request deadline.")
+            time.sleep(self.latency)
+        if self.error_rate:
+            with self._random_lock:
+                failed = self._random.random() < self.error_rate
+            if failed:
+                raise SynthesisError("Injected mock synthesis error.")
+
+        sample_rate = kwargs.get('sample_rate') or self.sample_rate
+        seconds = max(len(text), 1) / self.chars_per_second
+        output_format = (output_format or self.DEFAULT_OUTPUT_FORMAT).lower()
+        if output_format == 'mp3':
+            return _MP3_FRAME * max(1, int(seconds * 128000 / 8 / len(_MP3_FRAME)))
+        samples = self._voiced_samples(text, sample_rate) if self.voiced else bytes(int(seconds * sample_rate) * 2)
+        if output_format == 'wav':
+            fmt_chunk = struct.pack(_PCM_FMT, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+            return wav_header(fmt_chunk, len(samples)) + samples
+        if output_format in ('pcm', 'raw'):
+            return samples
+        raise SynthesisError(f"Mock provider does not support output format '{output_format}'.")
+
+    def synthesize_with_timestamps(
+        self, text: str, output_format: str = 'wav', **kwargs
+    ) -> Tuple[bytes, List[Tuple[str, float, float]]]:
+        """Returns the audio of `synthesize` and word timings derived from the speaking rate."""
+        audio = self.synthesize(text, output_format=output_format, **kwargs)
+        if self.voiced:
+            rate = kwargs.get('sample_rate') or self.sample_rate
+            seconds_per_char = int(rate / self.chars_per_second) / rate # Same rounding as _voiced_samples
+        else:
+            seconds_per_char = 1 / self.chars_per_second
+        words = [
+            (m.group(), m.start() * seconds_per_char, m.end() * seconds_per_char)
+            for m in re.finditer(r'\S+', text)
+        ]
+        return audio, words
+
+    def _voiced_samples(self, text: str, sample_rate: int) -> bytes:
+        """16-bit mono samples: one character's worth of tone or silence per character of `text`."""
+        per_char = int(sample_rate / self.chars_per_second)
+        half = struct.pack('<h', _TONE_AMPLITUDE) * _TONE_HALF_PERIOD
+        wave = half + struct.pack('<h', -_TONE_AMPLITUDE) * _TONE_HALF_PERIOD
+        tone = (wave * (per_char // (2 * _TONE_HALF_PERIOD) + 1))[:per_char * 2]
+        silence = bytes(per_char * 2)
+        return b''.join(tone if c.isalnum() else silence for c in text or ' ')
+
+    def synthesize_stream(
+        self,
+        text: str,
+        output_format: str = 'wav',
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> Iterator[bytes]:
+        audio = self.synthesize(text, output_format=output_format, **kwargs)
+        for start in range(0, len(audio), chunk_size):
+            yield audio[start:start + chunk_size]
@@ -1,13 +1,18 @@
 # unified_tts/providers/openai.py
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator
 from ..exceptions import ConfigurationError, SynthesisError
-from .base import BaseTTSProvider
+from ..transport import (
+    TransportConfig, RetryableError, call_with_retries, acall_with_retries,
+    openai_client_options, parse_retry_after, warm_connections, awarm_connections,
+)
+from .base import BaseTTSProvider, DEFAULT_STREAM_CHUNK_SIZE
 
 # Try importing openai, handle if not installed
 try:
     import openai
+    import httpx # Installed with openai; used for per-attempt timeouts
 except ImportError:
     openai = None # Set to None if not installed
 
@@ -15,12 +20,15 @@ class OpenAITTSProvider(BaseTTSProvider):
     """TTS Provider implementation for OpenAI."""
 
     PROVIDER_NAME = "openai"
+    MAX_INPUT_CHARS = 4096 # Documented limit of the speech endpoint
 
-    def __init__(self, api_key: Optional[str] = None, **kwargs):
+    def __init__(self, api_key: Optional[str] = None, transport: Optional[TransportConfig] = None, **kwargs):
         if openai is None:
             raise ImportError("The 'openai' package is not installed. Please install it: pip install openai")
-        super().__init__(api_key=api_key, api_key_env_var="OPENAI_API_KEY", **kwargs)
+        self.transport = transport or TransportConfig() # Pooling, timeouts and retries for HTTP calls
         self.client = None # Initialized in _initialize_client
+        self.async_client = None # Initialized in _initialize_client
+        super().__init__(api_key=api_key, api_key_env_var="OPENAI_API_KEY", **kwargs)
 
     def _validate_config(self):
         """Ensure API key is present."""
@@ -30,9 +38,13 @@ class OpenAITTSProvider(BaseTTSProvider):
             )
 
     def _initialize_client(self, **kwargs):
-        """Initializes the OpenAI client."""
+        """Initializes the OpenAI clients on pooled HTTP connections from the shared transport config."""
         try:
-            self.client = openai.OpenAI(api_key=self.api_key, **kwargs) # Pass extra kwargs to client if needed
+            # Pass extra kwargs to client if needed; they take precedence over transport defaults
+            sync_options = {**openai_client_options(self.transport), **kwargs}
+            async_options = {**openai_client_options(self.transport, async_client=True), **kwargs}
+            self.client = openai.OpenAI(api_key=self.api_key, **sync_options)
+            self.async_client = openai.AsyncOpenAI(api_key=self.api_key, **async_options)
         except Exception as e:
             raise ConfigurationError(f"Failed to initialize OpenAI client: {e}")
 
@@ -52,6 +64,10 @@ class OpenAITTSProvider(BaseTTSProvider):
                 model (str): The model to use (e.g., 'tts-1', 'tts-1-hd'). Defaults to 'tts-1'.
                 speed (float): Speed multiplier (0.25 to 4.0). Defaults to 1.0.
                 response_format (str): Overrides output_format if provided directly.
+                deadline (float): Absolute `time.monotonic()` time by which the call must
+                                  finish; bounds timeouts and retries.
+                before_retry (callable): Called before each retry (`abefore_retry` is
+                                         awaited instead by the async methods).
 
         Returns:
             bytes: The synthesized audio data.
@@ -60,25 +76,188 @@ class OpenAITTSProvider(BaseTTSProvider):
             SynthesisError: If the OpenAI API call fails.
             ConfigurationError: If the client is not initialized.
         """
-        if not self.client:
-             raise ConfigurationError("OpenAI client not initialized. Check configuration.")
+        params = self._build_params(text, output_format, kwargs)
 
-        # Prepare parameters for OpenAI API
-        params = {
-            'input': text,
-            'voice': kwargs.get('voice', 'alloy'),
-            'model': kwargs.get('model', 'tts-1'),
-            'response_format': kwargs.get('response_format', output_format),
-            'speed': kwargs.get('speed', 1.0),
-        }
+        def attempt(timeout):
+            client = self.client.with_options(timeout=self._httpx_timeout(timeout))
+            return self._retryable(lambda: client.audio.speech.create(**params))
 
         try:
-            response = self.client.audio.speech.create(**params)
+            response = call_with_retries(attempt, self.transport, kwargs.get('deadline'), kwargs.get('before_retry'))
             # The response object has a .content attribute with the audio bytes
             audio_bytes = response.content
             return audio_bytes
         except openai.APIError as e:
             raise SynthesisError(f"OpenAI API error during synthesis: {e}")
+        except SynthesisError:
+            raise # e.g., DeadlineExceededError
         except Exception as e:
             # Catch other potential errors (network issues, etc.)
-            raise SynthesisError(f"An unexpected error occurred during OpenAI synthesis: {e}")
\ No newline at end of file
+            raise SynthesisError(f"An unexpected error occurred during OpenAI synthesis: {e}")
+
+    def synthesize_stream(
+        self,
+        text: str,
+        output_format: str = 'mp3',
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes speech using OpenAI TTS, yielding chunks of the streamed response body.
+
+        Accepts the same arguments as `synthesize`, plus `chunk_size`. Retries only
+        happen before the first chunk is yielded.
+
+        Yields:
+            bytes: Successive pieces of the synthesized audio data.
+
+        Raises:
+            SynthesisError: If the OpenAI API call fails.
+            ConfigurationError: If the client is not initialized.
+        """
+        params = self._build_params(text, output_format, kwargs)
+
+        def attempt(timeout):
+            client = self.client.with_options(timeout=self._httpx_timeout(timeout))
+            manager = client.audio.speech.with_streaming_response.create(**params)
+            return manager, self._retryable(manager.__enter__)
+
+        try:
+            manager, response = call_with_retries(attempt, self.transport, kwargs.get('deadline'), kwargs.get('before_retry'))
+            try:
+                for chunk in response.iter_bytes(chunk_size=chunk_size):
+                    yield chunk
+            finally:
+                manager.__exit__(None, None, None)
+        except openai.APIError as e:
+            raise SynthesisError(f"OpenAI API error during streaming synthesis: {e}")
+        except SynthesisError:
+            raise
+        except Exception as e:
+            raise SynthesisError(f"An unexpected error occurred during OpenAI streaming synthesis: {e}")
+
+    async def asynthesize(self, text: str, output_format: str = 'mp3', **kwargs) -> bytes:
+        """Asynchronously synthesizes speech using the `openai.AsyncOpenAI` client. See `synthesize`."""
+        params = self._build_params(text, output_format, kwargs, use_async=True)
+
+        async def attempt(timeout):
+            client = self.async_client.with_options(timeout=self._httpx_timeout(timeout))
+            try:
+                return await client.audio.speech.create(**params)
+            except openai.APIError as e:
+                raise self._as_retryable(e)
+
+        try:
+            response = await acall_with_retries(attempt, self.transport, kwargs.get('deadline'), kwargs.get('abefore_retry'))
+            return response.content
+        except openai.APIError as e:
+            raise SynthesisError(f"OpenAI API error during synthesis: {e}")
+        except SynthesisError:
+            raise
+        except Exception as e:
+            raise SynthesisError(f"An unexpected error occurred during OpenAI synthesis: {e}")
+
+    async def asynthesize_stream(
+        self,
+        text: str,
+        output_format: str = 'mp3',
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        **kwargs
+    ) -> AsyncIterator[bytes]:
+        """Asynchronously streams speech using the `openai.AsyncOpenAI` client. See `synthesize_stream`."""
+        params = self._build_params(text, output_format, kwargs, use_async=True)
+
+        async def attempt(timeout):
+            client = self.async_client.with_options(timeout=self._httpx_timeout(timeout))
+            manager = client.audio.speech.with_streaming_response.create(**params)
+            try:
+                return manager, await manager.__aenter__()
+            except openai.APIError as e:
+                raise self._as_retryable(e)
+
+        try:
+            manager, response = await acall_with_retries(attempt, self.transport, kwargs.get('deadline'), kwargs.get('abefore_retry'))
+            try:
+                async for chunk in response.iter_bytes(chunk_size=chunk_size):
+                    yield chunk
+            finally:
+                await manager.__aexit__(None, None, None)
+        except openai.APIError as e:
+            raise SynthesisError(f"OpenAI API error during streaming synthesis: {e}")
+        except SynthesisError:
+            raise
+        except Exception as e:
+            raise SynthesisError(f"An unexpected error occurred during OpenAI streaming synthesis: {e}")
+
+    def warm_up(self, connections: int = 1) -> None:
+        """Opens pooled connections of the sync client by listing models (a free request)."""
+        client = self.client.with_options(max_retries=0)
+
+        def open_one() -> None:
+            try:
+                client.models.list()
+            except openai.APIStatusError:
+                pass # The connection is up; the status (e.g. a restricted key) does not matter here
+            except openai.OpenAIError as e:
+                raise SynthesisError(f"Could not reach the OpenAI API: {e}")
+
+        warm_connections(open_one, min(connections, self.transport.pool_maxsize))
+
+    async def awarm_up(self, connections: int = 1) -> None:
+        """Opens pooled connections of the async client by listing models. See `warm_up`."""
+        client = self.async_client.with_options(max_retries=0)
+
+        async def open_one() -> None:
+            try:
+                await client.models.list()
+            except openai.APIStatusError:
+                pass
+            except openai.OpenAIError as e:
+                raise SynthesisError(f"Could not reach the OpenAI API: {e}")
+
+        await awarm_connections(open_one, min(connections, self.transport.pool_maxsize))
+
+    def close(self) -> None:
+        """Closes the sync client's connection pool."""
+        if self.client is not None:
+            self.client.close()
+
+    async def aclose(self) -> None:
+        """Closes the async client's connection pool."""
+        if self.async_client is not None:
+            await self.async_client.close()
+
+    @staticmethod
+    def _httpx_timeout(timeout) -> "httpx.Timeout":
+        """Converts a (connect, read) pair from TransportConfig.timeout into an httpx.Timeout."""
+        connect_timeout, read_timeout = timeout
+        return httpx.Timeout(read_timeout, connect=connect_timeout)
+
+    def _as_retryable(self, e: "openai.APIError") -> Exception:
+        """Maps transient OpenAI errors (connection failures, 429/5xx) to RetryableError."""
+        if isinstance(e, openai.APIConnectionError): # Includes APITimeoutError
+            return RetryableError(e)
+        if isinstance(e, openai.APIStatusError) and e.status_code in self.transport.retry.retry_statuses:
+            return RetryableError(e, parse_retry_after(e.response.headers.get('retry-after')))
+        return e
+
+    def _retryable(self, call):
+        """Runs `call()`, converting transient OpenAI errors to RetryableError."""
+        try:
+            return call()
+        except openai.APIError as e:
+            raise self._as_retryable(e)
+
+    def _build_params(self, text: str, output_format: str, kwargs: Dict[str, Any], use_async: bool = False) -> Dict[str, Any]:
+        """Validates the (sync or async) client and builds the parameters for the OpenAI speech API."""
+        if not (self.async_client if use_async else self.client):
+             raise ConfigurationError("OpenAI client not initialized. Check configuration.")
+
+        # Prepare parameters for OpenAI API
+        return {
+            'input': text,
+            'voice': kwargs.get('voice', 'alloy'),
+            'model': kwargs.get('model', 'tts-1'),
+            'response_format': kwargs.get('response_format', output_format),
+            'speed': kwargs.get('speed', 1.0),
+        }
\ No newline at end of file
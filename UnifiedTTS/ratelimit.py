@@ -0,0 +1,293 @@
+# unified_tts/ratelimit.py
+
+import time
+import asyncio
+import threading
+from typing import Optional, Dict, Any, Union
+from .exceptions import DeadlineExceededError
+
+# Provider config keys consumed by UnifiedTTS to build a RateLimiter (not passed to providers)
+RATE_LIMIT_CONFIG_KEYS = ('requests_per_second', 'chars_per_minute', 'max_in_flight', 'burst')
+
+# Upper bound on a single sleep while waiting, so timeouts and freed slots are noticed promptly
+_MAX_POLL_INTERVAL = 0.05
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("TokenBucket rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now). Caller holds the lock."""
+        self._refill(now)
+        amount = min(amount, self.capacity) # Oversized requests wait for a full bucket
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Consumes `amount` tokens (capped at capacity). Caller holds the lock."""
+        self._tokens -= min(amount, self.capacity)
+
+
+class Permit:
+    """A granted acquisition; release it (or use it as a context manager) when the request finishes."""
+
+    def __init__(self, limiter: "RateLimiter", wait_time: float):
+        self.wait_time = wait_time # Seconds spent queued before the permit was granted
+        self._limiter = limiter
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release()
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter and concurrency governor for one provider.
+
+    Combines a requests-per-second token bucket, a characters-per-minute token
+    bucket and a cap on in-flight requests. Every limit is optional. Acquire a
+    `Permit` before calling the provider and release it when the call finishes:
+
+        with limiter.acquire(chars=len(text)):
+            provider.synthesize(text)
+
+    `acquire` blocks (optionally with a timeout), `try_acquire` never blocks and
+    `acquire_async` waits without blocking the event loop. Queue-wait time is
+    reported per permit (`Permit.wait_time`) and in aggregate via `stats()`.
+    Transport retries of a permitted request take further tokens through
+    `acquire_retry` (see `RetryTokens`), without another in-flight slot.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        chars_per_minute: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        burst: Optional[float] = None,
+    ):
+        """
+        Args:
+            requests_per_second: Sustained request rate.
+            chars_per_minute: Sustained input-character rate (a minute's worth may be used in a burst).
+            max_in_flight: Maximum number of concurrent requests.
+            burst: Request bucket capacity. Defaults to max(1, requests_per_second).
+        """
+        self.requests = TokenBucket(requests_per_second, burst or max(1.0, requests_per_second)) if requests_per_second else None
+        self.chars = TokenBucket(chars_per_minute / 60.0, chars_per_minute) if chars_per_minute else None
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._stats = {'acquired': 0, 'retries': 0, 'rejected': 0, 'timeouts': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    @classmethod
+    def from_config(cls, config: Union["RateLimiter", Dict[str, Any], None]) -> Optional["RateLimiter"]:
+        """Builds a limiter from a dict of RATE_LIMIT_CONFIG_KEYS (an existing RateLimiter is returned as-is)."""
+        if config is None or isinstance(config, RateLimiter):
+            return config
+        unknown = set(config) - set(RATE_LIMIT_CONFIG_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown rate limit option(s): {sorted(unknown)}")
+        return cls(**config)
+
+    def _try_take(self, chars: int, now: float, slot: bool = True) -> float:
+        """
+        Takes tokens (and, with `slot`, an in-flight slot) if all are available;
+        otherwise returns the seconds to wait. Lock held.
+        """
+        if slot and self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return _MAX_POLL_INTERVAL # Woken early by release()
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.chars is not None and chars:
+            wait = max(wait, self.chars.wait_time(chars, now))
+        if wait > 0:
+            return wait
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.chars is not None and chars:
+            self.chars.take(chars)
+        if slot:
+            self._in_flight += 1
+        return 0.0
+
+    def _grant(self, waited: float) -> Permit:
+        """Records a successful acquisition. Lock held."""
+        self._stats['acquired'] += 1
+        self._stats['total_wait'] += waited
+        self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+        return Permit(self, waited)
+
+    def try_acquire(self, chars: int = 0) -> Optional[Permit]:
+        """Returns a Permit if one is available right now, else None (never blocks)."""
+        with self._lock:
+            if self._try_take(chars, time.monotonic()) == 0.0:
+                return self._grant(0.0)
+            self._stats['rejected'] += 1
+            return None
+
+    def acquire(self, chars: int = 0, blocking: bool = True, timeout: Optional[float] = None) -> Optional[Permit]:
+        """
+        Waits until a request of `chars` input characters may be sent.
+
+        Args:
+            chars: Input characters the request will consume.
+            blocking: If False, behaves like `try_acquire`.
+            timeout: Maximum seconds to wait; None waits indefinitely.
+
+        Returns:
+            Optional[Permit]: The permit, or None if `timeout` expired (or not blocking and unavailable).
+        """
+        if not blocking:
+            return self.try_acquire(chars)
+        start = time.monotonic()
+        with self._lock:
+            waited = self._wait(chars, timeout, start, slot=True)
+            return None if waited is None else self._grant(waited)
+
+    def acquire_retry(self, chars: int = 0, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the tokens of one more attempt of a request that already holds a Permit.
+
+        Transport retries resend the request, so each one counts against the
+        request and character rates; the in-flight slot is the permit's.
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        with self._lock:
+            waited = self._wait(chars, timeout, time.monotonic(), slot=False)
+            if waited is None:
+                return False
+            self._stats['retries'] += 1
+            return True
+
+    def _wait(self, chars: int, timeout: Optional[float], start: float, slot: bool) -> Optional[float]:
+        """Blocks until `_try_take` succeeds; returns the seconds waited, or None on timeout. Lock held."""
+        self._waiting += 1
+        try:
+            while True:
+                now = time.monotonic()
+                wait = self._try_take(chars, now, slot)
+                if wait == 0.0:
+                    return now - start
+                if timeout is not None:
+                    remaining = start + timeout - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        return None
+                    wait = min(wait, remaining)
+                self._released.wait(min(wait, _MAX_POLL_INTERVAL))
+        finally:
+            self._waiting -= 1
+
+    async def acquire_async(self, chars: int = 0, timeout: Optional[float] = None) -> Optional[Permit]:
+        """Async variant of `acquire`: waits with `asyncio.sleep` instead of blocking the loop."""
+        start = time.monotonic()
+        waited = await self._wait_async(chars, timeout, start, slot=True)
+        if waited is None:
+            return None
+        with self._lock:
+            return self._grant(waited)
+
+    async def acquire_retry_async(self, chars: int = 0, timeout: Optional[float] = None) -> bool:
+        """Async variant of `acquire_retry`."""
+        if await self._wait_async(chars, timeout, time.monotonic(), slot=False) is None:
+            return False
+        with self._lock:
+            self._stats['retries'] += 1
+        return True
+
+    async def _wait_async(self, chars: int, timeout: Optional[float], start: float, slot: bool) -> Optional[float]:
+        """Async variant of `_wait`; takes the lock itself."""
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                now = time.monotonic()
+                with self._lock:
+                    wait = self._try_take(chars, now, slot)
+                    if wait == 0.0:
+                        return now - start
+                    if timeout is not None:
+                        remaining = start + timeout - now
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            return None
+                        wait = min(wait, remaining)
+                await asyncio.sleep(min(wait, _MAX_POLL_INTERVAL))
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._released.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns acquisition counters and queue-wait statistics.
+
+        Keys: acquired, retries (tokens taken by `acquire_retry`), rejected
+        (try_acquire misses), timeouts, total_wait and
+        max_wait (seconds), avg_wait, in_flight and waiting (current values).
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['in_flight'] = self._in_flight
+            snapshot['waiting'] = self._waiting
+        snapshot['avg_wait'] = snapshot['total_wait'] / snapshot['acquired'] if snapshot['acquired'] else 0.0
+        return snapshot
+
+
+class RetryTokens:
+    """
+    Before-retry hook that takes a limiter's tokens for every transport retry.
+
+    `UnifiedTTS` passes one to providers as the `before_retry` (sync) and
+    `abefore_retry` (async) options, which they hand to `call_with_retries` /
+    `acall_with_retries`, so a request sent N times consumes N requests' worth
+    of the provider's rate limit.
+    """
+
+    def __init__(self, limiter: RateLimiter, chars: int = 0, deadline: Optional[float] = None):
+        self.limiter = limiter
+        self.chars = chars
+        self.deadline = deadline
+
+    def _timeout(self) -> Optional[float]:
+        return None if self.deadline is None else max(self.deadline - time.monotonic(), 0.0)
+
+    def __call__(self) -> None:
+        """Waits for the next attempt's tokens; raises DeadlineExceededError if the deadline passes first."""
+        if not self.limiter.acquire_retry(self.chars, self._timeout()):
+            raise DeadlineExceededError("Deadline exceeded while waiting for the rate limiter to retry.")
+
+    async def acall(self) -> None:
+        """Async variant of calling the hook."""
+        if not await self.limiter.acquire_retry_async(self.chars, self._timeout()):
+            raise DeadlineExceededError("Deadline exceeded while waiting for the rate limiter to retry.")
@@ -0,0 +1,140 @@
+# unified_tts/registry.py
+
+import logging
+import importlib
+import threading
+from typing import Dict, Iterator, Mapping, Optional, Type, Union, TYPE_CHECKING
+from .exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    from .providers.base import BaseTTSProvider
+
+logger = logging.getLogger(__name__)
+
+# Entry point group through which installed packages contribute providers, e.g. in their pyproject.toml:
+#   [project.entry-points."unified_tts.providers"]
+#   acme = "acme_tts.provider:AcmeTTSProvider"
+ENTRY_POINT_GROUP = 'unified_tts.providers'
+
+# Built-in providers as "module:Class" targets; modules are imported on first use only
+BUILTIN_PROVIDERS: Dict[str, str] = {
+    'openai': '.providers.openai:OpenAITTSProvider',
+    'cartesia': '.providers.cartesia:CartesiaTTSProvider', # Placeholder
+    'mock': '.providers.mock:MockTTSProvider', # Opt-in, offline
+}
+
+ProviderTarget = Union[str, Type["BaseTTSProvider"]]
+
+
+class ProviderRegistry(Mapping):
+    """
+    Provider classes by name, imported lazily.
+
+    Behaves like a read-only dict of name -> provider class, except that a
+    provider's module is only imported when its class is first looked up.
+    Names can be checked (`in`, iteration) without importing anything.
+    Providers installed by other packages under the `unified_tts.providers`
+    entry point group are discovered the first time the registry is listed or
+    an unknown name is looked up.
+    """
+
+    def __init__(self, targets: Optional[Mapping[str, ProviderTarget]] = None, entry_points: bool = True):
+        """
+        Args:
+            targets: Initial providers, as "module:Class" strings (relative to this
+                     package if they start with '.') or classes.
+            entry_points: Whether to discover providers from installed entry points.
+        """
+        self._targets: Dict[str, ProviderTarget] = dict(targets or {})
+        self._classes: Dict[str, Type["BaseTTSProvider"]] = {}
+        self._discover = entry_points
+        self._lock = threading.RLock()
+
+    def register(self, name: str, target: ProviderTarget) -> None:
+        """Registers (or replaces) a provider by "module:Class" target or class."""
+        with self._lock:
+            self._targets[name] = target
+            self._classes.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether the provider's class has been imported already."""
+        return name in self._classes
+
+    def _discover_entry_points(self) -> None:
+        """Adds entry point providers once; explicitly registered names take precedence."""
+        if not self._discover:
+            return
+        with self._lock:
+            if not self._discover:
+                return
+            self._discover = False
+            try:
+                from importlib.metadata import entry_points
+                found = entry_points()
+                group = found.select(group=ENTRY_POINT_GROUP) if hasattr(found, 'select') else found.get(ENTRY_POINT_GROUP, ())
+            except Exception as e: # Broken distribution metadata must not break the library
+                logger.warning("Failed to discover TTS provider entry points: %s", e)
+                return
+            for entry_point in group:
+                self._targets.setdefault(entry_point.name, entry_point.value)
+
+    def __getitem__(self, name: str) -> Type["BaseTTSProvider"]:
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        if name not in self:
+            raise KeyError(name)
+        with self._lock:
+            cls = self._classes.get(name)
+            if cls is None:
+                cls = self._classes[name] = _load(self._targets[name])
+        return cls
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._targets:
+            return True
+        self._discover_entry_points()
+        return name in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover_entry_points()
+        return iter(list(self._targets))
+
+    def __len__(self) -> int:
+        self._discover_entry_points()
+        return len(self._targets)
+
+
+def _load(target: ProviderTarget) -> Type["BaseTTSProvider"]:
+    """Imports a "module:Class" target (classes are returned as is)."""
+    if not isinstance(target, str):
+        return target
+    module_name, _, attribute = target.partition(':')
+    if not attribute:
+        raise ConfigurationError(f"Invalid provider target '{target}': expected 'module:Class'.")
+    try:
+        module = importlib.import_module(module_name, package=__package__)
+        cls = module
+        for part in attribute.split('.'):
+            cls = getattr(cls, part)
+    except (ImportError, AttributeError) as e:
+        raise ConfigurationError(f"Failed to load provider '{target}': {e}") from e
+    return cls
+
+
+# Registry of available providers, used by UnifiedTTS
+AVAILABLE_PROVIDERS = ProviderRegistry(BUILTIN_PROVIDERS)
+
+
+def register_provider(name: str, target: ProviderTarget) -> None:
+    """
+    Makes a provider available to every UnifiedTTS instance under `name`.
+
+    Args:
+        name: Provider name, used as `provider=` and as the config/kwargs prefix
+              (e.g. `acme_api_key=...`). Must not contain underscores.
+        target: The provider class, or a "package.module:Class" string imported on first use.
+    """
+    if '_' in name:
+        raise ValueError(f"Provider names cannot contain underscores (used as config prefixes): '{name}'")
+    AVAILABLE_PROVIDERS.register(name, target)
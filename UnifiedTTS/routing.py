@@ -0,0 +1,235 @@
+# unified_tts/routing.py
+
+import time
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, Iterable
+
+# Value of the `provider` argument that selects providers via the instance's RoutingPolicy
+AUTO_PROVIDER = 'auto'
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    provider is skipped for `recovery_timeout` seconds. Then a single trial
+    request is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Returns True if a request may be sent (claims the trial slot when half-open)."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Frees the trial slot after a request that says nothing about the provider's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class ProviderHealth:
+    """Rolling window of latency and outcome samples for one provider."""
+
+    def __init__(self, window: int = 100):
+        self._samples: "deque[tuple]" = deque(maxlen=window) # (latency_seconds, ok)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.append((latency, ok))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return 0.0
+        return sum(1 for _, ok in samples if not ok) / len(samples)
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Returns the `q` quantile (0..1) of successful-call latency, or None without data."""
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return None
+        index = min(int(q * len(latencies)), len(latencies) - 1)
+        return latencies[index]
+
+
+class RoutingPolicy:
+    """
+    Chooses among initialized providers using observed latency and error rate.
+
+    Used when `UnifiedTTS.synthesize` is called with `provider='auto'` (the
+    instance's policy) or with a RoutingPolicy instance. Candidates are ranked
+    by p95 latency inflated by their error rate; providers with an open
+    circuit breaker are skipped, and a failing call fails over to the next
+    candidate. With `hedge=True`, a second provider is started if the first
+    has not returned within its own p95 latency, and the first success wins.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Iterable[str]] = None,
+        provider_kwargs: Optional[Dict[str, Dict[str, Any]]] = None,
+        window: int = 100,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        error_penalty: float = 4.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        min_samples: int = 5,
+    ):
+        """
+        Args:
+            providers: Candidate provider names, in tie-break preference order.
+                       Defaults to every initialized provider.
+            provider_kwargs: Per-provider synthesis kwargs (e.g., {'openai': {'voice': 'nova'},
+                             'cartesia': {'voice_id': '...'}}), merged under the call's kwargs,
+                             since voice options are not portable between providers.
+            window: Number of recent calls per provider used for latency/error statistics.
+            failure_threshold: Consecutive failures that open a provider's circuit.
+            recovery_timeout: Seconds an open circuit waits before a trial request.
+            error_penalty: How strongly the error rate inflates a provider's latency score.
+            hedge: Fire a second provider when the first is slower than its hedge delay.
+            hedge_quantile: Latency quantile of the primary used as the hedge delay.
+            hedge_min_delay: Lower bound of the hedge delay in seconds (also used until
+                             `min_samples` latencies have been observed).
+            min_samples: Samples needed before a provider's latency quantile is trusted.
+        """
+        self.providers = list(providers) if providers is not None else None
+        self.provider_kwargs = provider_kwargs or {}
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.error_penalty = error_penalty
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.min_samples = min_samples
+        self._health: Dict[str, ProviderHealth] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def health(self, provider: str) -> ProviderHealth:
+        with self._lock:
+            if provider not in self._health:
+                self._health[provider] = ProviderHealth(self.window)
+            return self._health[provider]
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            return self._breakers[provider]
+
+    def _score(self, provider: str) -> float:
+        health = self.health(provider)
+        if len(health) < self.min_samples:
+            return 0.0 # Explore providers we know little about
+        p95 = health.latency_quantile(0.95)
+        if p95 is None:
+            return float('inf') # Only failures observed
+        return p95 * (1.0 + self.error_penalty * health.error_rate)
+
+    def rank(self, available: Iterable[str]) -> List[str]:
+        """Returns the candidates from `available`, best first (circuit state not applied)."""
+        available = list(available)
+        candidates = [p for p in self.providers if p in available] if self.providers is not None else available
+        order = {name: i for i, name in enumerate(candidates)}
+        return sorted(candidates, key=lambda name: (self._score(name), order[name]))
+
+    def hedge_delay(self, provider: str) -> float:
+        """Seconds to wait on `provider` before hedging with the next candidate."""
+        health = self.health(provider)
+        if len(health) < self.min_samples:
+            return self.hedge_min_delay
+        quantile = health.latency_quantile(self.hedge_quantile)
+        return max(quantile or 0.0, self.hedge_min_delay)
+
+    def kwargs_for(self, provider: str, call_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Merges the provider's configured kwargs with the call's kwargs (call wins)."""
+        merged = dict(self.provider_kwargs.get(provider, {}))
+        merged.update(call_kwargs)
+        return merged
+
+    def record(self, provider: str, latency: float, ok: bool) -> None:
+        """Records the outcome of one call to `provider`."""
+        self.health(provider).record(latency, ok)
+        breaker = self.breaker(provider)
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def release(self, provider: str) -> None:
+        """
+        Ends a call to `provider` without recording it: a cache hit or an error raised
+        locally (deadline, scheduler shedding) says nothing about the provider, but a
+        half-open circuit's trial slot must still be freed.
+        """
+        self.breaker(provider).release_trial()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns per-provider error rate, p50/p95 latency and circuit state."""
+        with self._lock:
+            names = sorted(set(self._health) | set(self._breakers))
+        return {
+            name: {
+                'samples': len(self.health(name)),
+                'error_rate': self.health(name).error_rate,
+                'p50': self.health(name).latency_quantile(0.5),
+                'p95': self.health(name).latency_quantile(0.95),
+                'circuit': self.breaker(name).state,
+            }
+            for name in names
+        }
@@ -0,0 +1,387 @@
+# unified_tts/scheduler.py
+
+import time
+import heapq
+import asyncio
+import threading
+import itertools
+from typing import Optional, Dict, Any, List, Union, TYPE_CHECKING
+from .exceptions import DeadlineExceededError, OverloadedError
+
+if TYPE_CHECKING:
+    from .metrics import MetricsRegistry
+    from .ratelimit import Permit
+
+# Named priority classes; lower values are served first. Plain non-negative ints are accepted too.
+PRIORITIES = {'interactive': 0, 'normal': 1, 'bulk': 2}
+DEFAULT_PRIORITY = 'normal'
+# Per-call options consumed by UnifiedTTS for scheduling (not passed to providers)
+SCHEDULING_PARAMS = ('priority', 'tenant')
+
+_QUEUED, _GRANTED, _EXPIRED, _SHED = 'queued', 'granted', 'expired', 'shed'
+
+
+def priority_level(priority: Union[str, int, None]) -> int:
+    """Maps a priority class name (or int) to its level; raises ValueError if unknown."""
+    if priority is None:
+        return PRIORITIES[DEFAULT_PRIORITY]
+    if isinstance(priority, int) and not isinstance(priority, bool) and priority >= 0:
+        return priority
+    if isinstance(priority, str) and priority in PRIORITIES: # Unhashable JSON values must not raise TypeError
+        return PRIORITIES[priority]
+    raise ValueError(f"Unknown priority {priority!r}; expected one of {sorted(PRIORITIES)} or a non-negative int")
+
+
+def _priority_label(level: int) -> str:
+    for name, value in PRIORITIES.items():
+        if value == level:
+            return name
+    return str(level)
+
+
+def provider_args(synth_args: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns `synth_args` without the scheduling options, for passing to a provider."""
+    if not any(name in synth_args for name in SCHEDULING_PARAMS):
+        return synth_args
+    return {k: v for k, v in synth_args.items() if k not in SCHEDULING_PARAMS}
+
+
+class Ticket:
+    """A dispatch slot granted by a `RequestScheduler`; release it (or use it as a context manager) when the request finishes."""
+
+    def __init__(self, scheduler: "RequestScheduler", wait_time: float):
+        self.wait_time = wait_time # Seconds spent queued before dispatch
+        self._scheduler = scheduler
+        self._permit: Optional["Permit"] = None
+        self._released = False
+
+    def attach(self, permit: Optional["Permit"]) -> "Ticket":
+        """Ties a rate limiter permit to this ticket, so both are released together."""
+        self._permit = permit
+        return self
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            if self._permit is not None:
+                self._permit.release()
+            self._scheduler._release()
+
+    def __enter__(self) -> "Ticket":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class _Waiter:
+    __slots__ = ('level', 'tenant', 'tag', 'deadline', 'enqueued', 'state', 'event', 'loop', 'future')
+
+    def __init__(self, level: int, tenant: str, deadline: Optional[float], enqueued: float):
+        self.level = level
+        self.tenant = tenant
+        self.tag = 0.0
+        self.deadline = deadline
+        self.enqueued = enqueued
+        self.state = _QUEUED
+        self.event: Optional[threading.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.future: Optional[asyncio.Future] = None
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        elif self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _Level:
+    """Queue of one priority class: start-time fair queuing across tenants."""
+
+    def __init__(self):
+        self.heap: List[tuple] = [] # (start tag, arrival, waiter); entries no longer queued are skipped
+        self.virtual_time = 0.0
+        self.finish: Dict[str, float] = {} # Finish tag of each tenant's last queued request
+        self.queued = 0
+
+
+class RequestScheduler:
+    """
+    Admission control in front of provider calls: priority classes, deadlines and weighted fair queuing.
+
+    At most `max_in_flight` requests are dispatched at a time; the rest wait in
+    a queue per priority class. A free slot always goes to the highest class
+    with queued work, so interactive requests overtake any queued bulk work.
+    Within a class, tenants share slots in proportion to their `weights`
+    (start-time fair queuing, with each request costing its input length), so
+    one tenant's burst cannot starve the others. Requests whose deadline passes
+    while queued are dropped before dispatch with DeadlineExceededError. With
+    `max_queue`, a request arriving at a full queue displaces the newest queued
+    request of a lower class, or is rejected with OverloadedError if there is none.
+
+        scheduler = RequestScheduler(max_in_flight=8, weights={'tenant-a': 2})
+        tts = UnifiedTTS(scheduler=scheduler)
+        tts.synthesize(text, provider='openai', priority='interactive', tenant='tenant-a')
+
+    `acquire` blocks the calling thread, `acquire_async` waits without blocking
+    the event loop; both work on the same queue. Queue depth and wait times are
+    reported by `stats()` and, with `metrics`, exported to a MetricsRegistry.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+        max_queue: Optional[int] = None,
+        metrics: Optional["MetricsRegistry"] = None,
+    ):
+        """
+        Args:
+            max_in_flight: Maximum number of requests dispatched at once.
+            weights: Relative share of each tenant within a priority class.
+            default_weight: Weight of tenants not listed in `weights`.
+            max_queue: Maximum number of queued requests (None for unbounded).
+            metrics: Registry that receives queue depth, wait time and outcome metrics.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if default_weight <= 0 or any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("Tenant weights must be positive")
+        self.max_in_flight = max_in_flight
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.max_queue = max_queue
+        self._levels: Dict[int, _Level] = {}
+        self._in_flight = 0
+        self._queued = 0
+        self._arrivals = itertools.count()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {} # Per priority label
+        if metrics is not None:
+            self._m_requests = metrics.counter(
+                'unified_tts_scheduler_requests_total', 'Scheduled requests by outcome.', ('priority', 'result')
+            )
+            self._m_wait = metrics.histogram('unified_tts_scheduler_wait_seconds', 'Time spent queued before dispatch.', ('priority',))
+            self._m_depth = metrics.gauge('unified_tts_scheduler_queue_depth', 'Requests currently queued.', ('priority',))
+            self._m_in_flight = metrics.gauge('unified_tts_scheduler_in_flight', 'Requests currently dispatched.')
+        self._metrics = metrics is not None
+
+    def acquire(
+        self,
+        priority: Union[str, int, None] = None,
+        tenant: Optional[str] = None,
+        cost: float = 1.0,
+        deadline: Optional[float] = None,
+    ) -> Ticket:
+        """
+        Waits until the request may be dispatched.
+
+        Args:
+            priority: Priority class ('interactive', 'normal', 'bulk' or an int; lower is served first).
+            tenant: Tenant the request is accounted to for fair queuing.
+            cost: Work the request represents (e.g. input characters).
+            deadline: Absolute `time.monotonic()` time after which the request is dropped.
+
+        Returns:
+            Ticket: Release it once the request has finished.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before the request is dispatched.
+            OverloadedError: If the request was rejected or displaced from a full queue.
+        """
+        waiter = self._enqueue(priority, tenant, cost, deadline, threading.Event())
+        if waiter.state == _QUEUED:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            waiter.event.wait(timeout)
+        return self._outcome(waiter)
+
+    async def acquire_async(
+        self,
+        priority: Union[str, int, None] = None,
+        tenant: Optional[str] = None,
+        cost: float = 1.0,
+        deadline: Optional[float] = None,
+    ) -> Ticket:
+        """Async variant of `acquire`: waits on a future instead of blocking the loop."""
+        loop = asyncio.get_running_loop()
+        waiter = self._enqueue(priority, tenant, cost, deadline, None, loop)
+        if waiter.state == _QUEUED:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter.state == _QUEUED:
+                        self._drop(waiter, _EXPIRED)
+                    elif waiter.state == _GRANTED:
+                        self._in_flight -= 1 # Granted just as the caller went away: give the slot back
+                        self._dispatch()
+                raise
+        return self._outcome(waiter)
+
+    def _enqueue(
+        self,
+        priority: Union[str, int, None],
+        tenant: Optional[str],
+        cost: float,
+        deadline: Optional[float],
+        event: Optional[threading.Event],
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> _Waiter:
+        level_number = priority_level(priority)
+        tenant = tenant or ''
+        now = time.monotonic()
+        waiter = _Waiter(level_number, tenant, deadline, now)
+        waiter.event = event
+        if loop is not None:
+            waiter.loop = loop
+            waiter.future = loop.create_future()
+        with self._lock:
+            if deadline is not None and now >= deadline:
+                self._record(waiter, _EXPIRED)
+                waiter.state = _EXPIRED
+                return waiter
+            if self._queued == 0 and self._in_flight < self.max_in_flight:
+                self._grant(waiter, now)
+                return waiter
+            if self.max_queue is not None and self._queued >= self.max_queue and not self._shed_below(level_number):
+                self._record(waiter, _SHED)
+                waiter.state = _SHED
+                return waiter
+            level = self._levels.get(level_number)
+            if level is None:
+                level = self._levels[level_number] = _Level()
+            weight = self.weights.get(tenant, self.default_weight)
+            waiter.tag = max(level.virtual_time, level.finish.get(tenant, 0.0))
+            level.finish[tenant] = waiter.tag + max(cost, 1.0) / weight
+            heapq.heappush(level.heap, (waiter.tag, next(self._arrivals), waiter))
+            level.queued += 1
+            self._queued += 1
+            self._update_depth(level_number)
+            self._dispatch()
+        return waiter
+
+    def _shed_below(self, level_number: int) -> bool:
+        """Displaces the newest queued request of the lowest class below `level_number`. Lock held."""
+        for number in sorted(self._levels, reverse=True):
+            if number <= level_number:
+                return False
+            level = self._levels[number]
+            live = [entry for entry in level.heap if entry[2].state == _QUEUED]
+            if live:
+                self._drop(max(live)[2], _SHED)
+                return True
+        return False
+
+    def _dispatch(self) -> None:
+        """Grants free slots to the best queued requests. Lock held."""
+        now = time.monotonic()
+        for number in sorted(self._levels):
+            level = self._levels[number]
+            while self._in_flight < self.max_in_flight and level.heap:
+                _, _, waiter = heapq.heappop(level.heap)
+                if waiter.state != _QUEUED:
+                    continue
+                level.queued -= 1
+                self._queued -= 1
+                self._update_depth(number)
+                if waiter.deadline is not None and now >= waiter.deadline:
+                    waiter.state = _EXPIRED # Dropped before dispatch
+                    self._record(waiter, _EXPIRED)
+                    waiter.wake()
+                    continue
+                level.virtual_time = waiter.tag
+                self._grant(waiter, now)
+                waiter.wake()
+            if not level.heap:
+                level.finish.clear() # Idle class: tenants start over on equal terms
+            if self._in_flight >= self.max_in_flight:
+                return
+
+    def _grant(self, waiter: _Waiter, now: float) -> None:
+        waiter.state = _GRANTED
+        self._in_flight += 1
+        self._record(waiter, _GRANTED, now - waiter.enqueued)
+
+    def _drop(self, waiter: _Waiter, state: str) -> None:
+        """Removes a queued request (left in its heap and skipped later). Lock held."""
+        waiter.state = state
+        level = self._levels[waiter.level]
+        level.queued -= 1
+        self._queued -= 1
+        self._update_depth(waiter.level)
+        self._record(waiter, state)
+        waiter.wake()
+
+    def _outcome(self, waiter: _Waiter) -> Ticket:
+        with self._lock:
+            if waiter.state == _QUEUED:
+                self._drop(waiter, _EXPIRED) # Timed out waiting
+            state = waiter.state
+        if state == _GRANTED:
+            return Ticket(self, time.monotonic() - waiter.enqueued)
+        if state == _EXPIRED:
+            raise DeadlineExceededError("Deadline exceeded while queued in the request scheduler.")
+        raise OverloadedError("The request scheduler's queue is full.")
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+            if self._metrics:
+                self._m_in_flight.set(self._in_flight)
+
+    def _record(self, waiter: _Waiter, result: str, wait: float = 0.0) -> None:
+        """Updates counters for one outcome. Lock held."""
+        label = _priority_label(waiter.level)
+        stats = self._stats.get(label)
+        if stats is None:
+            stats = self._stats[label] = {'dispatched': 0, 'expired': 0, 'shed': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+        if result == _GRANTED:
+            stats['dispatched'] += 1
+            stats['total_wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+        else:
+            stats[result] += 1
+        if self._metrics:
+            self._m_requests.inc(priority=label, result='dispatched' if result == _GRANTED else result)
+            if result == _GRANTED:
+                self._m_wait.observe(wait, priority=label)
+                self._m_in_flight.set(self._in_flight)
+
+    def _update_depth(self, level_number: int) -> None:
+        if self._metrics:
+            self._m_depth.set(self._levels[level_number].queued, priority=_priority_label(level_number))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns queue depth and wait-time statistics.
+
+        Keys: in_flight, queued (current values), queued_by_tenant, and per priority
+        class under `priorities`: queued, dispatched, expired, shed, total_wait,
+        max_wait and avg_wait (seconds).
+        """
+        with self._lock:
+            priorities = {label: dict(stats, queued=0) for label, stats in self._stats.items()}
+            by_tenant: Dict[str, int] = {}
+            for number, level in self._levels.items():
+                label = _priority_label(number)
+                priorities.setdefault(label, {'dispatched': 0, 'expired': 0, 'shed': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+                priorities[label]['queued'] = level.queued
+                for _, _, waiter in level.heap:
+                    if waiter.state == _QUEUED:
+                        by_tenant[waiter.tenant] = by_tenant.get(waiter.tenant, 0) + 1
+            snapshot = {'in_flight': self._in_flight, 'queued': self._queued, 'queued_by_tenant': by_tenant}
+        for stats in priorities.values():
+            stats.setdefault('queued', 0)
+            stats['avg_wait'] = stats['total_wait'] / stats['dispatched'] if stats['dispatched'] else 0.0
+        snapshot['priorities'] = priorities
+        return snapshot
@@ -0,0 +1,119 @@
+# unified_tts/segmentation.py
+
+import re
+from typing import List, Optional
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+# Split after sentence-final punctuation (optionally followed by closing quotes/brackets)
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?…。！？])["\'”’)\]]*\s+')
+_CLAUSE_BREAK = re.compile(r'(?<=[,;:—])\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits text into paragraphs and then sentences, dropping empty pieces."""
+    sentences = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        for sentence in _SENTENCE_BREAK.split(paragraph.strip()):
+            sentence = ' '.join(sentence.split())
+            if sentence:
+                sentences.append(sentence)
+    return sentences
+
+
+def find_boundary(text: str, clauses: bool = False, min_chars: int = 0) -> Optional[int]:
+    """
+    Finds the end of the first complete sentence (or, with `clauses`, clause) in `text`.
+
+    A boundary only counts once the whitespace after its punctuation has been
+    seen, so text arriving piece by piece is never cut inside "3.5" or "e.g.x".
+
+    Args:
+        text: Text received so far.
+        clauses: Also accept clause punctuation (, ; : —) as a boundary.
+        min_chars: Ignore boundaries before this many characters.
+
+    Returns:
+        Optional[int]: The offset just past the boundary's whitespace, or None if there is none yet.
+    """
+    ends = []
+    for pattern in ((_SENTENCE_BREAK, _CLAUSE_BREAK) if clauses else (_SENTENCE_BREAK,)):
+        for match in pattern.finditer(text):
+            if match.start() >= min_chars:
+                ends.append(match.end())
+                break
+    return min(ends) if ends else None
+
+
+def split_phrases(text: str, clauses: bool = False) -> List[str]:
+    """
+    Splits text into sentences (and, with `clauses`, at clause punctuation) for phrase-level caching.
+
+    Whitespace inside each phrase is normalized, so the same phrase in different
+    templates yields the same text (and cache key).
+    """
+    phrases = []
+    for sentence in split_sentences(text):
+        phrases.extend(_CLAUSE_BREAK.split(sentence) if clauses else [sentence])
+    return [phrase for phrase in phrases if phrase]
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """
+    Splits text into segments of at most `max_chars` characters.
+
+    Paragraph and sentence boundaries are preferred; consecutive sentences are
+    packed into one segment while they fit, but never across a paragraph break.
+    Sentences longer than `max_chars` are split on clause punctuation, then on
+    whitespace, and as a last resort at exactly `max_chars`.
+
+    Args:
+        text: The text to split.
+        max_chars: Maximum length of each segment (must be positive).
+
+    Returns:
+        List[str]: The segments, in order. Text that already fits is returned as a single segment.
+    """
+    if max_chars <= 0:
+        raise ValueError("max_chars must be positive")
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+
+    segments = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        current = ''
+        for sentence in split_sentences(paragraph):
+            for piece in _split_long(sentence, max_chars):
+                if current and len(current) + 1 + len(piece) <= max_chars:
+                    current = f'{current} {piece}'
+                else:
+                    if current:
+                        segments.append(current)
+                    current = piece
+        if current:
+            segments.append(current)
+    return segments
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Breaks a single over-long sentence into pieces no longer than `max_chars`."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces = []
+    for separator in (_CLAUSE_BREAK, re.compile(r'\s+')):
+        parts = separator.split(sentence)
+        if len(parts) > 1:
+            current = ''
+            for part in parts:
+                if current and len(current) + 1 + len(part) <= max_chars:
+                    current = f'{current} {part}'
+                else:
+                    if current:
+                        pieces.extend(_split_long(current, max_chars))
+                    current = part
+            if current:
+                pieces.extend(_split_long(current, max_chars))
+            return pieces
+
+    # No whitespace at all (e.g., CJK text or a very long token): hard cut
+    return [sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars)]
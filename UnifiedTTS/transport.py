@@ -0,0 +1,379 @@
+# unified_tts/transport.py
+
+import time
+import random
+import asyncio
+import email.utils
+from typing import Optional, Dict, Any, Callable, Awaitable, TypeVar, Tuple, Iterable
+from .exceptions import DeadlineExceededError
+
+# requests/httpx are imported lazily by the builders below so this module stays
+# importable for providers that only need the retry helpers.
+
+T = TypeVar('T')
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient HTTP failures."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        respect_retry_after: bool = True,
+    ):
+        """
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying).
+            backoff_base: Delay in seconds before the first retry; doubled on every attempt.
+            backoff_max: Upper bound for a single delay (including Retry-After values).
+            jitter: Draw each delay uniformly from [0, backoff] ("full jitter") to
+                    avoid synchronized retry storms across clients.
+            retry_statuses: HTTP status codes that trigger a retry.
+            respect_retry_after: Honor the server's Retry-After header when present.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Returns the delay in seconds before retry number `attempt` (0-based)."""
+        if retry_after is not None and self.respect_retry_after:
+            return min(max(retry_after, 0.0), self.backoff_max)
+        backoff = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+class TransportConfig:
+    """
+    Connection pooling, timeout and retry settings shared by providers and the webapp.
+
+    Pass one to a provider via its `transport` option, e.g.
+    `UnifiedTTS(cartesia_transport=TransportConfig(pool_maxsize=64))`.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        keepalive_expiry: float = 60.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        """
+        Args:
+            pool_connections: Number of distinct hosts to keep connection pools for.
+            pool_maxsize: Maximum pooled (keep-alive) connections per host.
+            keepalive_expiry: Seconds an idle keep-alive connection is kept open
+                              (honored by httpx-based clients; urllib3 keeps them until the server closes).
+            connect_timeout: Seconds to wait for a TCP/TLS connection.
+            read_timeout: Seconds to wait between bytes of the response.
+            retry: Retry/backoff policy. Defaults to `RetryPolicy()`.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+
+    def timeout(self, deadline: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Returns the (connect, read) timeout for one attempt, shortened to fit `deadline`.
+
+        Raises:
+            DeadlineExceededError: If the deadline has already passed.
+        """
+        if deadline is None:
+            return self.connect_timeout, self.read_timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError("Deadline exceeded before the request could be sent.")
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+
+class RetryableError(Exception):
+    """Raised by an attempt function to ask `call_with_retries` for another attempt."""
+
+    def __init__(self, cause: Exception, retry_after: Optional[float] = None):
+        super().__init__(str(cause))
+        self.cause = cause
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (delta-seconds or HTTP-date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _next_delay(config: TransportConfig, attempt: int, error: RetryableError, deadline: Optional[float]) -> float:
+    """Returns the backoff before the next attempt, or re-raises if retrying is not possible."""
+    if attempt >= config.retry.max_retries:
+        raise error.cause
+    delay = config.retry.delay(attempt, error.retry_after)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        raise DeadlineExceededError(
+            f"Deadline exceeded after {attempt + 1} attempt(s); last error: {error.cause}"
+        ) from error.cause
+    return delay
+
+
+def call_with_retries(
+    attempt_fn: Callable[[Tuple[float, float]], T],
+    config: TransportConfig,
+    deadline: Optional[float] = None,
+    before_retry: Optional[Callable[[], None]] = None,
+) -> T:
+    """
+    Calls `attempt_fn(timeout)` until it succeeds, retrying on `RetryableError`.
+
+    Args:
+        attempt_fn: Performs one attempt with the given (connect, read) timeout.
+                    Raises `RetryableError` for transient failures; any other
+                    exception is propagated immediately.
+        config: Supplies timeouts and the retry policy.
+        deadline: Absolute `time.monotonic()` time by which the call must finish.
+                  Timeouts are shortened and retries stop so the deadline is honored.
+        before_retry: Called after the backoff and before each retry, e.g. to take
+                      a rate limit token for the resent request (`RetryTokens`).
+
+    Returns:
+        The result of the first successful attempt.
+
+    Raises:
+        DeadlineExceededError: If the deadline passes before an attempt succeeds.
+        Exception: The underlying cause of the last failed attempt once retries are exhausted.
+    """
+    attempt = 0
+    while True:
+        try:
+            return attempt_fn(config.timeout(deadline))
+        except RetryableError as e:
+            time.sleep(_next_delay(config, attempt, e, deadline))
+            attempt += 1
+            if before_retry is not None:
+                before_retry()
+
+
+async def acall_with_retries(
+    attempt_fn: Callable[[Tuple[float, float]], Awaitable[T]],
+    config: TransportConfig,
+    deadline: Optional[float] = None,
+    before_retry: Optional[Callable[[], Awaitable[None]]] = None,
+) -> T:
+    """Async variant of `call_with_retries`; backoff sleeps and `before_retry` do not block the event loop."""
+    attempt = 0
+    while True:
+        try:
+            return await attempt_fn(config.timeout(deadline))
+        except RetryableError as e:
+            await asyncio.sleep(_next_delay(config, attempt, e, deadline))
+            attempt += 1
+            if before_retry is not None:
+                await before_retry()
+
+
+def warm_connections(open_one: Callable[[], None], count: int) -> None:
+    """
+    Calls `open_one` `count` times concurrently, so each call opens its own pooled connection.
+
+    Raises the first error raised by any call.
+    """
+    if count <= 1:
+        open_one()
+        return
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix='tts-warm-connection') as executor:
+        for future in [executor.submit(open_one) for _ in range(count)]:
+            future.result()
+
+
+async def awarm_connections(open_one: Callable[[], Awaitable[None]], count: int) -> None:
+    """Async variant of `warm_connections`: awaits `count` calls of `open_one` concurrently."""
+    await asyncio.gather(*(open_one() for _ in range(max(1, count))))
+
+
+def build_session(config: Optional[TransportConfig] = None, headers: Optional[Dict[str, str]] = None):
+    """
+    Builds a `requests.Session` with pooled keep-alive connections sized by `config`.
+
+    Retries are handled by `request_with_retries` (not urllib3) so that they
+    honor Retry-After and per-call deadlines consistently across providers.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    config = config or TransportConfig()
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=0,
+        pool_block=False,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def request_with_retries(
+    session,
+    method: str,
+    url: str,
+    config: Optional[TransportConfig] = None,
+    deadline: Optional[float] = None,
+    before_retry: Optional[Callable[[], None]] = None,
+    **kwargs
+):
+    """
+    Sends an HTTP request through `session`, retrying transient failures.
+
+    Connection errors, timeouts and responses whose status is in
+    `config.retry.retry_statuses` are retried with exponential backoff and
+    jitter (or the server's Retry-After). The final response is returned
+    as-is, so callers still call `raise_for_status()`.
+
+    Args:
+        session: A `requests.Session`, typically from `build_session`.
+        method: HTTP method (e.g., 'POST').
+        url: Target URL.
+        config: Timeouts and retry policy. Defaults to `TransportConfig()`.
+        deadline: Absolute `time.monotonic()` time by which the call must finish.
+        before_retry: Called before each retry (see `call_with_retries`).
+        **kwargs: Passed to `session.request` (json, headers, stream, ...).
+
+    Returns:
+        requests.Response: The last response received.
+
+    Raises:
+        DeadlineExceededError: If the deadline passes before a response is received.
+        requests.exceptions.RequestException: If the final attempt fails at the transport level.
+    """
+    import requests
+
+    config = config or TransportConfig()
+
+    def attempt(timeout):
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise RetryableError(e)
+        if response.status_code in config.retry.retry_statuses:
+            error = requests.exceptions.HTTPError(
+                f"{response.status_code} Error for url: {url}", response=response
+            )
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            response.content # Drain the (small) error body so the connection returns to the pool
+            raise RetryableError(error, retry_after)
+        return response
+
+    try:
+        return call_with_retries(attempt, config, deadline, before_retry)
+    except requests.exceptions.HTTPError as e:
+        # Retries exhausted on a retryable status: hand back the last response
+        if e.response is not None:
+            return e.response
+        raise
+
+
+def build_httpx_limits(config: TransportConfig):
+    """Returns `httpx.Limits` and `httpx.Timeout` objects matching `config`."""
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=config.pool_maxsize * config.pool_connections,
+        max_keepalive_connections=config.pool_maxsize,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(config.read_timeout, connect=config.connect_timeout)
+    return limits, timeout
+
+
+def openai_client_options(config: TransportConfig, async_client: bool = False) -> Dict[str, Any]:
+    """
+    Returns keyword arguments for `openai.OpenAI` / `openai.AsyncOpenAI` that apply `config`.
+
+    The SDK's own retries are disabled (`max_retries=0`) because the provider
+    retries through `call_with_retries` with the shared policy.
+    """
+    import httpx
+
+    limits, timeout = build_httpx_limits(config)
+    client_cls = httpx.AsyncClient if async_client else httpx.Client
+    return {
+        'timeout': timeout,
+        'max_retries': 0,
+        'http_client': client_cls(limits=limits, timeout=timeout),
+    }
+
+
+async def asend_with_retries(
+    client,
+    method: str,
+    url: str,
+    config: Optional[TransportConfig] = None,
+    deadline: Optional[float] = None,
+    stream: bool = False,
+    before_retry: Optional[Callable[[], Awaitable[None]]] = None,
+    **kwargs
+):
+    """
+    Async (httpx) variant of `request_with_retries`.
+
+    Args:
+        client: An `httpx.AsyncClient`.
+        stream: If True, the response body is not read; the caller must
+                iterate it and call `await response.aclose()`.
+        before_retry: Awaited before each retry (see `acall_with_retries`).
+        Other arguments are the same as for `request_with_retries`.
+
+    Returns:
+        httpx.Response: The last response received.
+    """
+    import httpx
+
+    config = config or TransportConfig()
+
+    async def attempt(timeout):
+        request = client.build_request(method, url, timeout=httpx.Timeout(timeout[1], connect=timeout[0]), **kwargs)
+        try:
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            raise RetryableError(e)
+        if response.status_code in config.retry.retry_statuses:
+            await response.aread() # Drain the error body so the connection returns to the pool
+            error = httpx.HTTPStatusError(
+                f"{response.status_code} Error for url: {url}", request=request, response=response
+            )
+            raise RetryableError(error, parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    try:
+        return await acall_with_retries(attempt, config, deadline, before_retry)
+    except httpx.HTTPStatusError as e:
+        return e.response
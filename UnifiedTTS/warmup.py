@@ -0,0 +1,347 @@
+# unified_tts/warmup.py
+
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from .batch import BatchItem
+from .cache import NON_AUDIO_PARAMS, make_cache_key
+from .metrics import SynthesisHooks, SynthesisEvent
+
+logger = logging.getLogger(__name__)
+
+# Warm-up phases reported by `Warmer.status`
+IDLE, CONNECTING, PRESYNTHESIZING, READY, STOPPED = 'idle', 'connecting', 'presynthesizing', 'ready', 'stopped'
+
+
+def load_manifest(source: Union[str, Iterable[Any]], provider: Optional[str] = None) -> List[BatchItem]:
+    """
+    Reads a manifest of prompts to pre-synthesize.
+
+    Args:
+        source: Path of a JSON file holding a list, or the list itself. Entries are
+            texts, or dicts of `BatchItem` arguments ({"text": ..., "provider": ..., "voice": ...}).
+        provider: Provider of entries that do not name one.
+
+    Returns:
+        List[BatchItem]: One item per entry.
+
+    Raises:
+        ValueError: If an entry has no text or no provider.
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            source = json.load(f)
+    items = []
+    for entry in source:
+        if isinstance(entry, str):
+            entry = {'text': entry}
+        elif isinstance(entry, dict):
+            entry = dict(entry)
+        else:
+            items.append(BatchItem.coerce(entry))
+            continue
+        entry.setdefault('provider', provider)
+        if not entry.get('text') or not entry.get('provider'):
+            raise ValueError(f"Manifest entries need a text and a provider: {entry!r}")
+        items.append(BatchItem.coerce(entry))
+    return items
+
+
+class HotPromptTracker(SynthesisHooks):
+    """
+    Learns which prompts are requested most, to keep them pre-synthesized.
+
+    Register it as a hook (`UnifiedTTS(hooks=[tracker])`, or let `UnifiedTTS.warmer`
+    do it) and every successful request is counted under its cache key; counts
+    decay with a half-life, so prompts that stop being requested fade out. Past
+    request logs can be replayed with `load_log`. At most `capacity` prompts are
+    tracked; the least popular are forgotten first.
+    """
+
+    def __init__(self, capacity: int = 1000, half_life: float = 3600.0, min_count: float = 1.5, max_chars: int = 500):
+        """
+        Args:
+            capacity: Maximum number of distinct prompts tracked.
+            half_life: Seconds after which a request counts half as much.
+            min_count: Decayed request count a prompt needs to be reported as hot (the
+                default means requested at least twice within about a half-life).
+            max_chars: Longer texts are not tracked (they are rarely repeated verbatim).
+        """
+        self.capacity = capacity
+        self.half_life = half_life
+        self.min_count = min_count
+        self.max_chars = max_chars
+        self._entries: Dict[str, List[Any]] = {} # Cache key -> [score, updated, provider, text, synth_args]
+        self._lock = threading.Lock()
+        self._paused = threading.local()
+
+    def record(
+        self,
+        provider: str,
+        text: str,
+        synth_args: Optional[Dict[str, Any]] = None,
+        weight: float = 1.0,
+        at: Optional[float] = None,
+    ) -> None:
+        """
+        Counts one request for `text`.
+
+        Args:
+            provider: The provider it was sent to.
+            text: The requested text.
+            synth_args: Its synthesis options (scheduling options and deadlines are ignored).
+            weight: How much the request counts.
+            at: `time.monotonic()` time of the request (default: now).
+        """
+        if not text or len(text) > self.max_chars:
+            return
+        synth_args = {k: v for k, v in (synth_args or {}).items() if k not in NON_AUDIO_PARAMS}
+        key = make_cache_key(provider, text, synth_args)
+        now = time.monotonic() if at is None else at
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [weight, now, provider, text, synth_args]
+                if len(self._entries) > self.capacity * 1.1: # Pruned in bulk, not on every insert
+                    self._prune(now)
+            else:
+                entry[0] = self._decayed(entry, now) + weight
+                entry[1] = max(entry[1], now)
+
+    def on_end(self, event: SynthesisEvent) -> None:
+        if event.scope != 'request' or event.error is not None or event.cancelled:
+            return
+        if getattr(self._paused, 'active', False):
+            return
+        self.record(event.provider, event.text, event.synth_args)
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Ignores requests made by the current thread (e.g. pre-synthesis) while active."""
+        self._paused.active = True
+        try:
+            yield
+        finally:
+            self._paused.active = False
+
+    def load_log(self, lines: Iterable[str]) -> int:
+        """
+        Replays a request log of JSON lines ({"provider": ..., "text": ..., "time": <unix seconds>, ...}).
+
+        Other fields are taken as synthesis options. Entries without a time count
+        as requested now; malformed lines are skipped.
+
+        Returns:
+            int: Number of requests recorded.
+        """
+        recorded = 0
+        offset = time.monotonic() - time.time() # Wall-clock log times -> monotonic
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                provider, text = entry.pop('provider'), entry.pop('text')
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            at = entry.pop('time', None)
+            self.record(provider, text, entry, at=None if at is None else float(at) + offset)
+            recorded += 1
+        return recorded
+
+    def hot(self, limit: int = 50) -> List[BatchItem]:
+        """Returns the `limit` most requested prompts (decayed count of at least `min_count`), most popular first."""
+        now = time.monotonic()
+        with self._lock:
+            scored = [(self._decayed(entry, now), entry) for entry in self._entries.values()]
+        scored = sorted((item for item in scored if item[0] >= self.min_count), key=lambda item: item[0], reverse=True)
+        items = []
+        for _, (_, _, provider, text, synth_args) in scored[:limit]:
+            synth_args = dict(synth_args)
+            output_format = synth_args.pop('output_format', None)
+            items.append(BatchItem(text, provider, output_format=output_format, **synth_args))
+        return items
+
+    def _decayed(self, entry: List[Any], now: float) -> float:
+        return entry[0] * 0.5 ** (max(now - entry[1], 0.0) / self.half_life)
+
+    def _prune(self, now: float) -> None:
+        """Forgets the least popular prompts down to `capacity`. Lock held."""
+        ranked = sorted(self._entries, key=lambda key: self._decayed(self._entries[key], now))
+        for key in ranked[:len(self._entries) - self.capacity]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class Warmer:
+    """
+    Warms a worker up after a deploy, then keeps hot prompts pre-synthesized.
+
+    Runs in a background thread:
+
+    1. opens connections to every provider endpoint (`connect`), so the first
+       requests do not pay DNS, TCP and TLS setup;
+    2. pre-synthesizes the `manifest`, at most `concurrency` prompts at a time;
+    3. every `refresh_interval` seconds, pre-synthesizes the prompts the
+       `tracker` reports as hot and that are no longer cached.
+
+    `ready` turns true once steps 1 and 2 are done (step 2 only with
+    `require_manifest`), whether or not every prompt succeeded; failures are
+    counted in `status()`. Serve it on a readiness endpoint so a load balancer
+    only routes traffic to warmed workers. `UnifiedTTS.warmer` builds one for a
+    UnifiedTTS instance; services with their own upstream client can pass their
+    own callables.
+    """
+
+    def __init__(
+        self,
+        synthesize: Optional[Callable[[BatchItem], Any]] = None,
+        manifest: Iterable[BatchItem] = (),
+        connect: Optional[Callable[[], Dict[str, Optional[str]]]] = None,
+        tracker: Optional[HotPromptTracker] = None,
+        is_cached: Optional[Callable[[BatchItem], bool]] = None,
+        concurrency: int = 2,
+        hot_prompts: int = 50,
+        refresh_interval: float = 300.0,
+        require_manifest: bool = True,
+    ):
+        """
+        Args:
+            synthesize: Synthesizes one prompt into the cache. None disables pre-synthesis.
+            manifest: Prompts to pre-synthesize at startup (see `load_manifest`).
+            connect: Opens provider connections; returns {provider: None, or the error message}.
+            tracker: Source of hot prompts to keep pre-synthesized.
+            is_cached: Whether a prompt is already cached (skipped if so).
+            concurrency: Prompts pre-synthesized at a time, so warm-up leaves capacity for live traffic.
+            hot_prompts: Number of hot prompts kept pre-synthesized.
+            refresh_interval: Seconds between hot prompt refreshes (None: no refreshes).
+            require_manifest: Only report ready once the manifest has been pre-synthesized.
+        """
+        self._synthesize = synthesize
+        self.manifest = [BatchItem.coerce(item) for item in manifest]
+        self._connect = connect
+        self.tracker = tracker
+        self._is_cached = is_cached
+        self.concurrency = max(1, concurrency)
+        self.hot_prompts = hot_prompts
+        self.refresh_interval = refresh_interval
+        self.require_manifest = require_manifest
+        self.phase = IDLE
+        self.connections: Dict[str, Optional[str]] = {}
+        self._counts = {'presynthesized': 0, 'skipped': 0, 'failed': 0, 'refreshes': 0}
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.ready_after: Optional[float] = None # Seconds from start to ready
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the worker is warm (or `timeout` passes); returns `ready`."""
+        return self._ready.wait(timeout)
+
+    def start(self) -> "Warmer":
+        """Starts warming up in a background thread (once)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='tts-warmup', daemon=True)
+                self._thread.start()
+        return self
+
+    def run(self) -> None:
+        """Warms up on the calling thread, then refreshes hot prompts until `stop`."""
+        self.started_at = time.monotonic()
+        self.phase = CONNECTING
+        if self._connect is not None:
+            try:
+                self.connections = self._connect()
+            except Exception as e:
+                logger.warning("Connection warm-up failed: %s", e)
+                self.connections = {'*': str(e)}
+        if self._synthesize is not None and self.manifest:
+            if not self.require_manifest:
+                self._set_ready()
+            self.phase = PRESYNTHESIZING
+            self.presynthesize(self.manifest)
+        self._set_ready()
+        while self.refresh_interval is not None and not self._stop.wait(self.refresh_interval):
+            self.refresh()
+        self.phase = STOPPED
+
+    def refresh(self) -> int:
+        """Pre-synthesizes the tracker's hot prompts that are not cached; returns how many were synthesized."""
+        if self.tracker is None or self._synthesize is None:
+            return 0
+        with self._lock:
+            self._counts['refreshes'] += 1
+        return self.presynthesize(self.tracker.hot(self.hot_prompts))
+
+    def presynthesize(self, items: Iterable[BatchItem]) -> int:
+        """Synthesizes the uncached `items`, `concurrency` at a time; returns how many were synthesized."""
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='tts-warmup') as executor:
+            results = list(executor.map(self._presynthesize_one, items))
+        return sum(results)
+
+    def _presynthesize_one(self, item: BatchItem) -> bool:
+        if self._stop.is_set():
+            return False
+        try:
+            if self._is_cached is not None and self._is_cached(item):
+                self._count('skipped')
+                return False
+            if self.tracker is not None:
+                with self.tracker.paused(): # Pre-synthesis is not demand
+                    self._synthesize(item)
+            else:
+                self._synthesize(item)
+        except Exception as e:
+            logger.warning("Pre-synthesis of %r failed: %s", item, e)
+            self._count('failed')
+            return False
+        self._count('presynthesized')
+        return True
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _set_ready(self) -> None:
+        if not self._ready.is_set():
+            self.ready_after = time.monotonic() - self.started_at
+            self._ready.set()
+            if self.phase != STOPPED:
+                self.phase = READY
+            logger.info("Warm-up finished in %.2fs.", self.ready_after)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops pre-synthesis and refreshes; prompts already being synthesized finish first."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """Returns readiness, the current phase, per-provider connection results and pre-synthesis counters."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'ready': self.ready,
+            'phase': self.phase,
+            'ready_after_s': None if self.ready_after is None else round(self.ready_after, 3),
+            'connections': dict(self.connections),
+            'manifest': len(self.manifest),
+            'tracked_prompts': len(self.tracker) if self.tracker is not None else 0,
+            **counts,
+        }
+
+    def __repr__(self) -> str:
+        return f"Warmer(phase={self.phase!r}, manifest={len(self.manifest)}, concurrency={self.concurrency})"
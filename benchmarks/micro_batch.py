@@ -0,0 +1,107 @@
+# benchmarks/micro_batch.py
+"""
+Throughput benchmark for micro-batching of short utterances.
+
+Sends short texts (single words, numbers, labels) from many threads to the
+offline mock provider, whose latency is charged per request, and compares:
+
+    single      micro-batching off: one provider request per text
+    timestamps  micro-batching, audio split at the mock's word timestamps
+    silence     micro-batching, audio split by silence detection
+
+Provider concurrency is capped with `--max-in-flight`, as real providers cap
+concurrent requests per key. Each clip is checked against the clip of the same
+text synthesized on its own (`split_errors` counts mismatches).
+
+    python benchmarks/micro_batch.py --requests 400 --concurrency 64 --latency 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+from UnifiedTTS import UnifiedTTS, register_provider
+from UnifiedTTS.audio import parse_wav
+from UnifiedTTS.providers.mock import MockTTSProvider
+
+MODES = ('single', 'timestamps', 'silence')
+TEXTS = (
+    "Yes", "No", "Seven", "42", "Gate B12", "Order ready", "Thank you!", "Next stop, Main Street",
+    "Aisle 4", "Cancelled", "Boarding now", "Room 210", "Hello", "Goodbye.", "Three minutes", "Pickup",
+)
+
+
+class _UntimedMockProvider(MockTTSProvider):
+    """The mock without word timestamps, so batches are split by silence detection."""
+    PROVIDER_NAME = "mocksilence"
+    SUPPORTS_TIMESTAMPS = False
+
+
+def _voiced_samples(clip: bytes) -> int:
+    return sum(1 for sample in array('h', clip[parse_wav(clip)[1]:]) if sample)
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Runs `args.requests` short-text requests on `args.concurrency` threads in one mode."""
+    provider = 'mocksilence' if mode == 'silence' else 'mock'
+    options = {'enabled': True, 'voiced': True, 'latency': args.latency, 'max_in_flight': args.max_in_flight}
+    micro_batch = None if mode == 'single' else {'window': args.window, 'max_items': args.max_items}
+    tts = UnifiedTTS(config={provider: options}, micro_batch=micro_batch, metrics=False)
+    reference = UnifiedTTS(config={provider: {'enabled': True, 'voiced': True}}, metrics=False)
+    texts = [TEXTS[i % len(TEXTS)] for i in range(args.requests)]
+    latencies: List[float] = []
+
+    def one(text: str) -> bytes:
+        start = time.perf_counter()
+        clip = tts.synthesize(text, provider=provider, output_format='wav')
+        latencies.append(time.perf_counter() - start)
+        return clip
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        clips = list(executor.map(one, texts))
+    elapsed = time.perf_counter() - started
+
+    expected = {text: _voiced_samples(reference.synthesize(text, provider=provider, output_format='wav')) for text in TEXTS}
+    split_errors = sum(1 for text, clip in zip(texts, clips) if _voiced_samples(clip) != expected[text])
+    latencies.sort()
+    report: Dict[str, Any] = {
+        'mode': mode,
+        'requests': args.requests,
+        'throughput_rps': round(args.requests / elapsed, 1),
+        'latency_ms': {f'p{q}': round(latencies[min(len(latencies) - 1, len(latencies) * q // 100)] * 1000, 1) for q in (50, 95, 99)},
+        'split_errors': split_errors,
+    }
+    if tts.micro_batcher is not None:
+        report['batcher'] = tts.micro_batcher.stats()
+        tts.micro_batcher.close()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated modes to run.')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per mode.')
+    parser.add_argument('--concurrency', type=int, default=64, help='Caller threads.')
+    parser.add_argument('--latency', type=float, default=0.1, help='Seconds each provider request takes.')
+    parser.add_argument('--max-in-flight', type=int, default=4, help='Concurrent provider requests allowed.')
+    parser.add_argument('--window', type=float, default=0.02, help='Micro-batching window in seconds.')
+    parser.add_argument('--max-items', type=int, default=16, help='Texts per batch.')
+    args = parser.parse_args(argv)
+
+    register_provider('mocksilence', _UntimedMockProvider)
+    reports = [run_mode(mode.strip(), args) for mode in args.modes.split(',') if mode.strip()]
+    print(json.dumps(reports, indent=2))
+    return reports
+
+
+if __name__ == '__main__':
+    main()
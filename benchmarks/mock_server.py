@@ -0,0 +1,271 @@
+# benchmarks/mock_server.py
+"""
+Local stand-in for the Cartesia and OpenAI speech endpoints.
+
+Serves synthetic audio so UnifiedTTS and the webapp relay can be benchmarked
+without network access or API keys:
+
+    POST /tts                 Cartesia (UnifiedTTS CartesiaTTSProvider default path)
+    POST /v1/text-to-speech   Cartesia (webapp relay)
+    POST /v1/audio/speech     OpenAI (use base_url=<server url>/v1)
+
+Latency, chunked streaming, payload size and error injection are configurable.
+Run standalone with `python benchmarks/mock_server.py --port 8765 --latency 0.05`,
+or embed it via `MockTTSServer` (see benchmarks/run.py).
+"""
+
+import json
+import time
+import random
+import struct
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any
+
+CARTESIA_PATHS = ('/tts', '/v1/text-to-speech')
+OPENAI_PATHS = ('/v1/audio/speech',)
+
+# One MPEG-1 Layer III frame header: 128 kbit/s, 44.1 kHz, no padding (417-byte frames)
+_MP3_FRAME_HEADER = b'\xff\xfb\x90\x00'
+_MP3_FRAME_LENGTH = 417
+
+
+class MockTTSConfig:
+    """Behavior of the mock server; attributes may be changed while it runs."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        payload_bytes: int = 64 * 1024,
+        bytes_per_char: int = 0,
+        chunk_size: int = 4096,
+        chunk_interval: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Seconds before the response headers are sent (time to first byte).
+            jitter: Uniform random extra latency in [0, jitter] seconds.
+            payload_bytes: Audio bytes per response (when `bytes_per_char` is 0).
+            bytes_per_char: If set, the payload scales with the input text length instead.
+            chunk_size: Size of the chunks the body is streamed in.
+            chunk_interval: Delay between chunks in seconds (simulates real-time generation).
+            error_rate: Fraction of requests (0..1) answered with `error_status`.
+            error_status: HTTP status used for injected errors.
+            seed: Seed for jitter and error injection, for reproducible runs.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.payload_bytes = payload_bytes
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = chunk_size
+        self.chunk_interval = chunk_interval
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in vars(self).items() if not k.startswith('_')}
+
+
+def synthetic_audio(output_format: str, size: int, sample_rate: int = 24000) -> bytes:
+    """Builds `size` bytes (approximately, for MP3) of silent audio in `output_format`."""
+    output_format = (output_format or 'mp3').lower()
+    if output_format == 'wav':
+        data_length = max(size - 44, 0) & ~1
+        fmt_chunk = struct.pack('<HHIIHH', 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        return (
+            b'RIFF' + struct.pack('<I', 36 + data_length) + b'WAVE'
+            + b'fmt ' + struct.pack('<I', len(fmt_chunk)) + fmt_chunk
+            + b'data' + struct.pack('<I', data_length) + bytes(data_length)
+        )
+    if output_format == 'mp3':
+        frame = _MP3_FRAME_HEADER + bytes(_MP3_FRAME_LENGTH - len(_MP3_FRAME_HEADER))
+        return frame * max(1, size // _MP3_FRAME_LENGTH)
+    return bytes(size) # pcm / raw / anything else
+
+
+class MockTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Keep-alive, so client connection pooling is exercised
+    disable_nagle_algorithm = True # Small chunk writes must not wait on delayed ACKs
+    server: "MockTTSServer"
+
+    def log_message(self, format, *args):
+        pass # Quiet: the harness reports its own numbers
+
+    def setup(self):
+        super().setup()
+        self.server.record('connections') # One handler per accepted connection
+
+    def do_GET(self):
+        # The OpenAI client's warm-up lists models
+        if self.path == '/v1/models':
+            self._send_json(200, {'object': 'list', 'data': []})
+        else:
+            self._send_json(404, {'message': f'Unknown path {self.path}'})
+
+    def do_HEAD(self):
+        # Like the real APIs: the speech endpoints only accept POST, on a kept-alive connection
+        self.send_response(405 if self.path in CARTESIA_PATHS + OPENAI_PATHS else 404)
+        self.send_header('Allow', 'POST')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.path not in CARTESIA_PATHS + OPENAI_PATHS:
+            self._send_json(404, {'message': f'Unknown path {self.path}'})
+            return
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            self._send_json(400, {'message': 'Request body is not JSON'})
+            return
+
+        config = self.server.config
+        self.server.record('requests')
+        delay = config.latency + (config.jitter * config.draw() if config.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if config.error_rate and config.draw() < config.error_rate:
+            self.server.record('errors')
+            self._send_json(config.error_status, {'message': 'Injected error'})
+            return
+
+        output_format, sample_rate, text = self._parse_request(request)
+        size = len(text) * config.bytes_per_char if config.bytes_per_char else config.payload_bytes
+        audio = synthetic_audio(output_format, size, sample_rate)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg' if output_format == 'mp3' else f'audio/{output_format}')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        view = memoryview(audio)
+        try:
+            for start in range(0, len(view), config.chunk_size):
+                if start and config.chunk_interval:
+                    time.sleep(config.chunk_interval)
+                chunk = view[start:start + config.chunk_size]
+                self.wfile.write(b'%x\r\n%b\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True # Client went away mid-stream
+            return
+        self.server.record('bytes_sent', len(audio))
+
+    def _parse_request(self, request: Dict[str, Any]):
+        """Returns (output_format, sample_rate, text) from a Cartesia or OpenAI request body."""
+        if self.path in OPENAI_PATHS:
+            return request.get('response_format', 'mp3'), 24000, request.get('input', '')
+        output_format = request.get('output_format', 'wav')
+        sample_rate = request.get('sample_rate', 24000)
+        if isinstance(output_format, dict): # Webapp style: {'container': 'mp3', 'sample_rate': ...}
+            sample_rate = output_format.get('sample_rate', sample_rate)
+            output_format = output_format.get('container', 'mp3')
+        return output_format, sample_rate, request.get('transcript') or request.get('text', '')
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockTTSServer(ThreadingHTTPServer):
+    """Threaded mock server; use as a context manager to run it in a background thread."""
+
+    daemon_threads = True
+    request_queue_size = 1024 # Listen backlog; the default of 5 drops connections under load
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, config: Optional[MockTTSConfig] = None):
+        super().__init__((host, port), MockTTSHandler)
+        self.config = config or MockTTSConfig()
+        self.counters = {'requests': 0, 'errors': 0, 'bytes_sent': 0, 'connections': 0}
+        self._counters_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        with self._counters_lock:
+            self.counters[counter] += amount
+
+    def reset_counters(self) -> None:
+        with self._counters_lock:
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def start(self) -> "MockTTSServer":
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-tts-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockTTSServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the MockTTSConfig options to a command-line parser."""
+    defaults = MockTTSConfig()
+    parser.add_argument('--latency', type=float, default=defaults.latency, help='Seconds before the first byte.')
+    parser.add_argument('--jitter', type=float, default=defaults.jitter, help='Uniform extra latency in seconds.')
+    parser.add_argument('--payload-bytes', type=int, default=defaults.payload_bytes, help='Audio bytes per response.')
+    parser.add_argument('--bytes-per-char', type=int, default=defaults.bytes_per_char, help='Scale the payload with the text length.')
+    parser.add_argument('--chunk-size', type=int, default=defaults.chunk_size, help='Streaming chunk size in bytes.')
+    parser.add_argument('--chunk-interval', type=float, default=defaults.chunk_interval, help='Delay between chunks in seconds.')
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate, help='Fraction of requests that fail.')
+    parser.add_argument('--error-status', type=int, default=defaults.error_status, help='HTTP status of injected errors.')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for jitter and error injection.')
+
+
+def config_from_args(args: argparse.Namespace) -> MockTTSConfig:
+    return MockTTSConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        payload_bytes=args.payload_bytes,
+        bytes_per_char=args.bytes_per_char,
+        chunk_size=args.chunk_size,
+        chunk_interval=args.chunk_interval,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = MockTTSServer(args.host, args.port, config_from_args(args))
+    print(f"Mock TTS server listening on {server.url} ({json.dumps(server.config.as_dict())})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
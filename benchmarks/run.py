@@ -0,0 +1,293 @@
+# benchmarks/run.py
+"""
+Offline benchmark harness for UnifiedTTS and the webapp relay.
+
+Starts a local mock TTS server (benchmarks/mock_server.py) and runs each
+scenario against it, printing one JSON report:
+
+    raw_http            Direct pooled HTTP calls to the mock (baseline for overhead)
+    synthesize          Sequential UnifiedTTS.synthesize calls
+    synthesize_pool     UnifiedTTS.synthesize under thread-pool load
+    synthesize_stream   UnifiedTTS.synthesize_stream under thread-pool load (TTFB)
+    openai              UnifiedTTS.synthesize via the OpenAI provider (needs `openai`)
+    webapp              POST /generate_speech on webapp/app.py under thread-pool load
+    webapp_asgi         POST /generate_speech on webapp/asgi.py (needs `uvicorn`)
+
+Each scenario reports throughput, p50/p95/p99 latency and time to first byte,
+error count and process RSS. Example:
+
+    python benchmarks/run.py --requests 200 --concurrency 16 --latency 0.05 -o bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import platform
+import argparse
+import itertools
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+from UnifiedTTS import UnifiedTTS, UnifiedTTSError
+from mock_server import MockTTSServer, add_config_arguments, config_from_args
+
+SCENARIOS = ('raw_http', 'synthesize', 'synthesize_pool', 'synthesize_stream', 'openai', 'webapp', 'webapp_asgi')
+BENCH_TEXT = "The quick brown fox jumps over the lazy dog. " * 4
+
+# A timed call returns (ttfb, total_bytes); exceptions count as errors
+TimedCall = Callable[[], Tuple[float, int]]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of `values`, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def rss_mb() -> Dict[str, Optional[float]]:
+    """Returns current (Linux only) and peak resident set size in MiB."""
+    current = None
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10 # bytes on macOS, KiB elsewhere
+    return {'rss_mb': current, 'rss_peak_mb': peak}
+
+
+def run_scenario(name: str, call: TimedCall, requests_count: int, concurrency: int) -> Dict[str, Any]:
+    """Runs `call` `requests_count` times on `concurrency` threads and summarizes the timings."""
+    latencies: List[float] = []
+    ttfbs: List[float] = []
+    errors: Dict[str, int] = {}
+    total_bytes = 0
+    lock = threading.Lock()
+
+    def one() -> None:
+        nonlocal total_bytes
+        start = time.perf_counter()
+        try:
+            ttfb, size = call()
+        except Exception as e:
+            with lock:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            return
+        latency = time.perf_counter() - start
+        with lock:
+            latencies.append(latency)
+            ttfbs.append(ttfb)
+            total_bytes += size
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        for _ in range(requests_count):
+            one()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(one) for _ in range(requests_count)]:
+                future.result()
+    elapsed = time.perf_counter() - started
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 3)
+
+    report = {
+        'scenario': name,
+        'requests': requests_count,
+        'concurrency': concurrency,
+        'ok': len(latencies),
+        'errors': sum(errors.values()),
+        'error_classes': errors,
+        'duration_s': round(elapsed, 4),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'throughput_mib_s': round(total_bytes / 2 ** 20 / elapsed, 3) if elapsed else None,
+        'latency_ms': {f'p{q}': ms(percentile(latencies, q)) for q in (50, 95, 99)},
+        'ttfb_ms': {f'p{q}': ms(percentile(ttfbs, q)) for q in (50, 95, 99)},
+    }
+    report.update(rss_mb())
+    return report
+
+
+def build_calls(server: MockTTSServer, args: argparse.Namespace) -> Dict[str, TimedCall]:
+    """Builds the timed call of every scenario against `server`."""
+    tts = UnifiedTTS(cartesia_api_key='bench', cartesia_api_endpoint=f'{server.url}/tts')
+    calls: Dict[str, TimedCall] = {}
+
+    raw_session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(args.concurrency, 10))
+    raw_session.mount('http://', adapter)
+
+    def raw_http() -> Tuple[float, int]:
+        start = time.perf_counter()
+        with raw_session.post(f'{server.url}/tts', json={'transcript': BENCH_TEXT, 'output_format': args.format}, stream=True) as response:
+            response.raise_for_status()
+            return _consume(response.iter_content(chunk_size=args.read_chunk_size), start)
+    calls['raw_http'] = raw_http
+
+    def synthesize() -> Tuple[float, int]:
+        start = time.perf_counter()
+        audio = tts.synthesize(BENCH_TEXT, provider='cartesia', output_format=args.format)
+        return time.perf_counter() - start, len(audio)
+    calls['synthesize'] = calls['synthesize_pool'] = synthesize
+
+    def synthesize_stream() -> Tuple[float, int]:
+        start = time.perf_counter()
+        chunks = tts.synthesize_stream(BENCH_TEXT, provider='cartesia', output_format=args.format, chunk_size=args.read_chunk_size)
+        return _consume(chunks, start)
+    calls['synthesize_stream'] = synthesize_stream
+
+    openai_tts = UnifiedTTS(openai_api_key='bench', openai_base_url=f'{server.url}/v1')
+    if 'openai' in openai_tts.list_available_providers():
+        def openai_call() -> Tuple[float, int]:
+            start = time.perf_counter()
+            audio = openai_tts.synthesize(BENCH_TEXT, provider='openai', output_format='mp3')
+            return time.perf_counter() - start, len(audio)
+        calls['openai'] = openai_call
+
+    os.environ['CARTESIA_API_URL'] = f'{server.url}/v1/text-to-speech' # Read by both webapps at import
+    for name, start_app in (('webapp', start_webapp), ('webapp_asgi', start_webapp_asgi)):
+        app_url = start_app()
+        if app_url is not None:
+            calls[name] = _relay_call(app_url, args)
+    return calls
+
+
+def _relay_call(app_url: str, args: argparse.Namespace) -> TimedCall:
+    client = requests.Session()
+    client.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=max(args.concurrency, 10)))
+
+    request_ids = itertools.count()
+
+    def relay_call() -> Tuple[float, int]:
+        # Unique text per request: measures the relay path, not the webapp's response cache
+        text = f'{BENCH_TEXT}#{next(request_ids)}'
+        start = time.perf_counter()
+        with client.post(f'{app_url}/generate_speech', json={'apiKey': 'bench', 'text': text}, stream=True) as response:
+            response.raise_for_status()
+            return _consume(response.iter_content(chunk_size=args.read_chunk_size), start)
+    return relay_call
+
+
+def _consume(chunks, start: float) -> Tuple[float, int]:
+    """Drains an iterator of chunks; returns (seconds to first chunk, total bytes)."""
+    ttfb = None
+    size = 0
+    for chunk in chunks:
+        if ttfb is None:
+            ttfb = time.perf_counter() - start
+        size += len(chunk)
+    return (ttfb if ttfb is not None else time.perf_counter() - start), size
+
+
+def _load_webapp_module(filename: str):
+    spec = importlib.util.spec_from_file_location(f'webapp_{filename[:-3]}', os.path.join(REPO_ROOT, 'webapp', filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _wait_ready(app_url: str, timeout: float = 30.0) -> str:
+    """Waits until the webapp's /readyz reports its warm-up done, as a load balancer would."""
+    deadline = time.monotonic() + timeout
+    while requests.get(f'{app_url}/readyz').status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return app_url
+
+
+def start_webapp() -> Optional[str]:
+    """Serves webapp/app.py on a threaded WSGI server; returns its URL."""
+    try:
+        from werkzeug.serving import make_server
+    except ImportError:
+        return None
+    module = _load_webapp_module('app.py')
+    logging.getLogger('werkzeug').setLevel(logging.WARNING) # No per-request access log lines
+    wsgi_server = make_server('127.0.0.1', 0, module.app, threaded=True)
+    threading.Thread(target=wsgi_server.serve_forever, name='bench-webapp', daemon=True).start()
+    return _wait_ready(f'http://127.0.0.1:{wsgi_server.server_port}')
+
+
+def start_webapp_asgi() -> Optional[str]:
+    """Serves webapp/asgi.py with uvicorn in a background thread; returns its URL."""
+    try:
+        import uvicorn
+    except ImportError:
+        return None
+    module = _load_webapp_module('asgi.py')
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    asgi_server = uvicorn.Server(uvicorn.Config(module.app, log_level='warning'))
+    thread = threading.Thread(target=asgi_server.run, kwargs={'sockets': [sock]}, name='bench-webapp-asgi', daemon=True)
+    thread.start()
+    while not asgi_server.started:
+        time.sleep(0.01)
+    return _wait_ready(f'http://127.0.0.1:{sock.getsockname()[1]}')
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenarios to run.')
+    parser.add_argument('--requests', type=int, default=100, help='Requests per scenario.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Threads for the *_pool, stream and webapp scenarios.')
+    parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per scenario before measuring.')
+    parser.add_argument('--format', default='mp3', help='Output format requested from the providers.')
+    parser.add_argument('--read-chunk-size', type=int, default=4096, help='Chunk size used when consuming streams.')
+    parser.add_argument('-o', '--output', help='Write the JSON report to this file instead of stdout.')
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'scenarios': [],
+    }
+    with MockTTSServer(config=config_from_args(args)) as server:
+        report['mock_server'] = server.config.as_dict()
+        calls = build_calls(server, args)
+        for name in [s.strip() for s in args.scenarios.split(',') if s.strip()]:
+            if name not in calls:
+                report['scenarios'].append({'scenario': name, 'skipped': 'unavailable in this environment'})
+                continue
+            concurrency = 1 if name in ('raw_http', 'synthesize') else args.concurrency
+            for _ in range(args.warmup):
+                try:
+                    calls[name]()
+                except (UnifiedTTSError, requests.RequestException):
+                    pass
+            server.reset_counters()
+            result = run_scenario(name, calls[name], args.requests, concurrency)
+            result['server'] = dict(server.counters)
+            report['scenarios'].append(result)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/startup.py
+"""
+Cold-start benchmark for UnifiedTTS.
+
+Runs each measurement in a fresh interpreter (so nothing is cached in
+sys.modules) and reports the median over several runs:
+
+    import_ms       `import UnifiedTTS`
+    construct_ms    `UnifiedTTS(...)` with OpenAI and Cartesia keys configured
+    first_call_ms   first `synthesize` call on the offline mock provider
+    modules         number of modules loaded after the first call
+
+Compare two checkouts with --repo, e.g.:
+
+    git worktree add /tmp/before HEAD~1
+    python benchmarks/startup.py --repo /tmp/before --repo .
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+_PROBE = r"""
+import sys, time, json
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import UnifiedTTS
+imported = time.perf_counter()
+tts = UnifiedTTS.UnifiedTTS(openai_api_key='bench', cartesia_api_key='bench', mock_enabled=True, metrics=False)
+constructed = time.perf_counter()
+tts.synthesize('Hello there.', provider='mock', output_format='wav')
+called = time.perf_counter()
+heavy = [name for name in ('openai', 'httpx', 'requests', 'sqlite3', 'multiprocessing') if name in sys.modules]
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'construct_ms': (constructed - imported) * 1000,
+    'first_call_ms': (called - constructed) * 1000,
+    'modules': len(sys.modules),
+    'heavy_modules': heavy,
+}))
+"""
+
+
+def measure(repo: str, runs: int) -> Dict[str, object]:
+    """Median timings of `runs` fresh interpreters importing UnifiedTTS from `repo`."""
+    samples: List[Dict[str, object]] = []
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='0')
+    subprocess.run([sys.executable, '-c', _PROBE, repo], check=True, capture_output=True, env=env) # Warm .pyc files
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', _PROBE, repo], check=True, capture_output=True, text=True, env=env)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    report: Dict[str, object] = {'repo': os.path.abspath(repo), 'runs': runs}
+    for key in ('import_ms', 'construct_ms', 'first_call_ms', 'modules'):
+        report[key] = round(statistics.median(sample[key] for sample in samples), 1)
+    report['total_ms'] = round(report['import_ms'] + report['construct_ms'] + report['first_call_ms'], 1)
+    report['heavy_modules'] = samples[-1]['heavy_modules']
+    return report
+
+
+def main(argv=None) -> List[Dict[str, object]]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repo', action='append', help='Checkout to measure (repeatable). Defaults to this one.')
+    parser.add_argument('--runs', type=int, default=15, help='Fresh interpreters per checkout.')
+    args = parser.parse_args(argv)
+    reports = [measure(repo, args.runs) for repo in (args.repo or [REPO_ROOT])]
+    print(json.dumps(reports, indent=2))
+    return reports
+
+
+if __name__ == '__main__':
+    main()
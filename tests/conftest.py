@@ -0,0 +1,29 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+# The package is imported from the checkout, as the benchmarks do
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from UnifiedTTS import UnifiedTTS, AsyncUnifiedTTS, SynthesisCache
+
+
+@pytest.fixture
+def tts():
+    """A UnifiedTTS with only the offline mock provider."""
+    return UnifiedTTS(mock_enabled=True, metrics=False)
+
+
+@pytest.fixture
+def async_tts():
+    """An AsyncUnifiedTTS with only the offline mock provider."""
+    return AsyncUnifiedTTS(mock_enabled=True, metrics=False)
+
+
+@pytest.fixture
+def cache():
+    return SynthesisCache(memory_max_items=256)
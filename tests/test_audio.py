@@ -0,0 +1,60 @@
+# tests/test_audio.py
+
+import io
+import wave
+import struct
+
+from UnifiedTTS import UnifiedTTS
+from UnifiedTTS.audio import join_audio, parse_wav, stream_joined_audio, WAV_UNKNOWN_SIZE
+
+
+def _wav(samples: bytes, sample_rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples)
+    return buffer.getvalue()
+
+
+def _assert_sizes(clip: bytes) -> None:
+    riff_size = struct.unpack_from('<I', clip, 4)[0]
+    _, start, end = parse_wav(clip)
+    data_size = struct.unpack_from('<I', clip, start - 4)[0]
+    assert riff_size == len(clip) - 8
+    assert data_size == end - start == len(clip) - start
+
+
+def test_join_wav_sizes():
+    clip = join_audio([_wav(bytes(800)), _wav(bytes(400))], 'wav')
+    _assert_sizes(clip)
+    assert len(clip) - parse_wav(clip)[1] == 1200
+
+
+def test_crossfaded_wav_sizes():
+    clip = join_audio([_wav(bytes(800)), _wav(bytes(800))], 'wav', crossfade=0.01)
+    _assert_sizes(clip)
+    with wave.open(io.BytesIO(clip)) as f:
+        assert f.getnframes() == 800 - 80 # 10 ms at 8 kHz overlap
+
+
+def test_streamed_wav_has_placeholder_sizes():
+    clip = b''.join(stream_joined_audio([_wav(bytes(800)), _wav(bytes(800))], 'wav'))
+    assert struct.unpack_from('<I', clip, 4)[0] == WAV_UNKNOWN_SIZE
+
+
+def test_phrase_assembled_wav_header(cache):
+    tts = UnifiedTTS(mock_enabled=True, mock_sample_rate=8000, metrics=False, cache=cache, phrase_cache='sentence')
+    clip = tts.synthesize("Your order ships today. Thank you for calling.", "mock", output_format='wav')
+    _assert_sizes(clip)
+    with wave.open(io.BytesIO(clip)) as f:
+        assert f.getnframes() == (len(clip) - parse_wav(clip)[1]) // 2
+
+
+def test_phrase_assembled_pcm_matches_wav_body(cache):
+    tts = UnifiedTTS(mock_enabled=True, mock_sample_rate=8000, metrics=False, cache=cache, phrase_cache='sentence')
+    text = "Your order ships today. Thank you for calling."
+    wav_clip = tts.synthesize(text, "mock", output_format='wav')
+    pcm_clip = tts.synthesize(text, "mock", output_format='pcm', sample_rate=8000)
+    assert wav_clip[parse_wav(wav_clip)[1]:] == pcm_clip
@@ -0,0 +1,34 @@
+# tests/test_batch.py
+
+import asyncio
+
+from UnifiedTTS import BatchItem
+
+
+def test_batch_deduplicates_and_orders(tts):
+    items = [BatchItem("Hello.", "mock"), BatchItem("World.", "mock"), BatchItem("Hello.", "mock")]
+    results = list(tts.synthesize_batch(items, max_workers=2, ordered=True))
+    assert [result.index for result in results] == [0, 1, 2]
+    assert all(result.ok for result in results)
+    assert results[0].audio == results[2].audio == tts.synthesize("Hello.", "mock")
+
+
+def test_async_batch_awaits_synthesis(async_tts):
+    async def run():
+        items = [{"text": f"Item {i}.", "provider": "mock"} for i in range(6)] + [{"text": "Bad", "provider": "nope"}]
+        return [result async for result in async_tts.synthesize_batch(items, max_workers=3, ordered=True)]
+
+    results = asyncio.run(run())
+    assert [result.index for result in results] == list(range(7))
+    assert all(isinstance(result.audio, bytes) and result.audio[:4] == b'RIFF' for result in results[:6])
+    assert not results[6].ok and results[6].audio is None
+
+
+def test_async_batch_writes_output_paths(async_tts, tmp_path):
+    async def run():
+        items = [{"text": "Saved.", "provider": "mock", "output_path": str(tmp_path / "saved.wav")}]
+        return [result async for result in async_tts.synthesize_batch(items)]
+
+    (result,) = asyncio.run(run())
+    assert result.ok and result.audio is None
+    assert (tmp_path / "saved.wav").read_bytes()[:4] == b'RIFF'
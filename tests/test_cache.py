@@ -0,0 +1,99 @@
+# tests/test_cache.py
+
+import os
+import asyncio
+
+import pytest
+
+from UnifiedTTS import AsyncUnifiedTTS, SynthesisCache
+from UnifiedTTS.cache import DiskCache, MemoryCache, make_cache_key
+
+
+def test_cache_key_fields():
+    base = make_cache_key('openai', 'Hello.', {'voice': 'nova', 'output_format': 'mp3'})
+    assert base == make_cache_key('openai', 'Hello.', {'output_format': 'mp3', 'voice': 'nova'})
+    assert base != make_cache_key('cartesia', 'Hello.', {'voice': 'nova', 'output_format': 'mp3'})
+    assert base != make_cache_key('openai', 'Hello!', {'voice': 'nova', 'output_format': 'mp3'})
+    assert base != make_cache_key('openai', 'Hello.', {'voice': 'alloy', 'output_format': 'mp3'})
+    assert base != make_cache_key('openai', 'Hello.', {'voice': 'nova', 'output_format': 'mp3', 'instructions': 'calm'})
+    # Scheduling options do not change the audio
+    assert base == make_cache_key('openai', 'Hello.', {'voice': 'nova', 'output_format': 'mp3', 'priority': 'bulk', 'tenant': 'a', 'deadline': 1.0})
+
+
+def test_memory_lru_by_items():
+    memory = MemoryCache(max_items=2)
+    memory.put('a', b'1')
+    memory.put('b', b'2')
+    assert memory.get('a') == b'1' # 'b' is now the least recently used
+    assert memory.put('c', b'3') == 1
+    assert memory.get('b') is None and memory.get('a') == b'1' and len(memory) == 2
+
+
+def test_memory_lru_by_bytes():
+    memory = MemoryCache(max_items=10, max_bytes=10)
+    memory.put('a', bytes(6))
+    memory.put('b', bytes(6))
+    assert memory.get('a') is None and memory.get('b') is not None
+    assert memory.put('huge', bytes(11)) == 0 and memory.get('huge') is None
+
+
+def test_disk_atomic_write(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    key = make_cache_key('mock', 'Hello.', {})
+    disk.put(key, b'first')
+    disk.put(key, b'second')
+    assert disk.get(key) == b'second'
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert files == [key + DiskCache.SUFFIX] # No temporary files left behind
+    assert DiskCache(str(tmp_path)).get(key) == b'second' # Persistent
+
+
+def test_disk_evicts_least_recently_used(tmp_path):
+    disk = DiskCache(str(tmp_path), max_bytes=300)
+    for index, key in enumerate(['aa1', 'bb2', 'cc3']):
+        disk.put(key, bytes(100))
+        os.utime(disk._path(key), (index, index)) # Distinct modification times
+    assert disk.get('aa1') is not None # Refreshes its mtime
+    assert disk.put('dd4', bytes(100)) == 1
+    assert disk.get('bb2') is None
+    assert all(disk.get(key) is not None for key in ['aa1', 'cc3', 'dd4'])
+
+
+def test_synthesis_cache_tiers(tmp_path):
+    cache = SynthesisCache(memory_max_items=1, directory=str(tmp_path))
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    assert cache.get('b') == b'2' # Memory
+    assert cache.get('a') == b'1' # Disk, promoted to memory
+    assert cache.get('missing') is None
+    stats = cache.stats.as_dict()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses'], stats['stores']) == (1, 1, 1, 2)
+    assert stats['memory_evictions'] == 2
+
+
+def test_sync_stream_and_file_use_cache(tts, cache, tmp_path):
+    tts.cache = cache
+    first = b''.join(tts.synthesize_stream("Hello there.", "mock", chunk_size=512))
+    second = b''.join(tts.synthesize_stream("Hello there.", "mock", chunk_size=512))
+    assert first == second
+    tts.synthesize("Hello there.", "mock", output_path=str(tmp_path / "out.wav"))
+    stats = cache.stats.as_dict()
+    assert (stats['hits'], stats['misses'], stats['stores']) == (2, 1, 1)
+
+
+@pytest.mark.parametrize('max_segment_chars', [None, 20])
+def test_async_stream_and_file_use_cache(cache, tmp_path, max_segment_chars):
+    tts = AsyncUnifiedTTS(mock_enabled=True, metrics=False, cache=cache, max_segment_chars=max_segment_chars)
+    text = "Hello there. This is a cached stream."
+
+    async def run():
+        streams = []
+        for _ in range(2):
+            streams.append(b''.join([chunk async for chunk in tts.synthesize_stream(text, "mock", output_format="pcm", chunk_size=512)]))
+        await tts.synthesize(text, "mock", output_path=str(tmp_path / "out.pcm"), output_format="pcm")
+        return streams, await tts.synthesize(text, "mock", output_format="pcm")
+
+    streams, clip = asyncio.run(run())
+    assert streams[0] == streams[1] == clip == (tmp_path / "out.pcm").read_bytes()
+    stats = cache.stats.as_dict()
+    assert (stats['hits'], stats['misses'], stats['stores']) == (3, 1, 1)
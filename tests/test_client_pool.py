@@ -0,0 +1,143 @@
+# tests/test_client_pool.py
+
+import gc
+import time
+import asyncio
+import warnings
+
+import pytest
+
+from UnifiedTTS import ClientPool
+
+
+class FakeClient:
+    """Records how it was closed; `connections` stands in for its transport's pool size."""
+
+    def __init__(self, key, connections=1):
+        self.key = key
+        self.connections = connections
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+class AsyncSDKClient:
+    """Like `openai.AsyncOpenAI`: `close` is a coroutine function and there is no `aclose`."""
+
+    def __init__(self, key):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class DualClient(FakeClient):
+    """Like a provider: a sync `close` for its sync session and an `aclose` for its async one."""
+
+    aclosed = False
+
+    async def aclose(self):
+        self.aclosed = True
+
+
+def lease(pool, key, cls=FakeClient, name='p', **kwargs):
+    with pool.lease(name, key, create=cls, **kwargs) as client:
+        return client
+
+
+def test_reuses_client_per_key():
+    pool = ClientPool()
+    first = lease(pool, 'key-a')
+    assert lease(pool, 'key-a') is first
+    assert lease(pool, 'key-b') is not first
+    assert lease(pool, 'key-a', name='other') is not first # Namespaced by name
+    assert pool.stats() == {'hits': 1, 'misses': 3, 'evictions': 0, 'expirations': 0, 'clients': 3, 'connections': 3}
+
+
+def test_evicts_least_recently_used_at_max_clients():
+    pool = ClientPool(max_clients=2)
+    a, b = lease(pool, 'a'), lease(pool, 'b')
+    lease(pool, 'a') # 'b' is now the least recently used
+    lease(pool, 'c')
+    assert b.closed == 1 and a.closed == 0
+    assert lease(pool, 'a') is a and len(pool) == 2
+    assert pool.stats()['evictions'] == 1
+
+
+def test_evicts_to_fit_max_connections():
+    pool = ClientPool(max_connections=10)
+    a = lease(pool, 'a', connections=4)
+    b = lease(pool, 'b', connections=4)
+    lease(pool, 'c', connections=6) # 4 + 4 + 6 > 10: evicting 'a' is enough
+    assert a.closed == 1 and b.closed == 0
+    assert pool.stats()['connections'] == 10
+    lease(pool, 'd') # Defaults to the client's pool size (1)
+    assert b.closed == 1 and pool.stats()['connections'] == 7
+
+
+def test_idle_clients_expire():
+    pool = ClientPool(idle_ttl=0.05)
+    a = lease(pool, 'a')
+    with pool.lease('p', 'b', create=FakeClient) as b:
+        time.sleep(0.1)
+        assert lease(pool, 'c') is not a # The lookup sweeps expired entries
+        assert a.closed == 1 and b.closed == 0 # Leased clients do not expire
+    assert lease(pool, 'a') is not a
+    assert pool.stats()['expirations'] == 1
+
+
+def test_client_evicted_while_leased_closes_after_release():
+    pool = ClientPool(max_clients=1)
+    with pool.lease('p', 'a', create=FakeClient) as a:
+        lease(pool, 'b')
+        assert a.closed == 0 and len(pool) == 1
+    assert a.closed == 1
+    pool.close()
+    assert len(pool) == 0 and pool.stats()['connections'] == 0
+
+
+def test_evicted_key_copy_is_zeroed():
+    pool = ClientPool(max_clients=1)
+    lease(pool, 'secret-key')
+    [entry] = pool._entries.values()
+    secret = entry.secret
+    assert bytes(secret) == b'secret-key'
+    assert all(b'secret-key' not in digest for _, digest in pool._entries) # Keyed by a salted hash
+    lease(pool, 'other')
+    assert bytes(secret) == bytes(len('secret-key'))
+
+
+def test_async_sdk_client_closed_without_unawaited_coroutine():
+    pool = ClientPool(max_clients=1)
+
+    async def run():
+        client = lease(pool, 'a', cls=AsyncSDKClient)
+        lease(pool, 'b', cls=AsyncSDKClient)
+        await asyncio.sleep(0)
+        return client
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        client = asyncio.run(run())
+        lease(pool, 'c', cls=AsyncSDKClient) # Evicted outside a loop: not closed, but nothing is left un-awaited
+        gc.collect()
+    assert client.closed
+
+
+def test_dual_client_gets_both_closes():
+    pool = ClientPool(max_clients=1)
+
+    async def run():
+        client = lease(pool, 'a', cls=DualClient)
+        lease(pool, 'b', cls=DualClient)
+        await asyncio.sleep(0)
+        return client
+
+    client = asyncio.run(run())
+    assert client.closed == 1 and client.aclosed
+
+
+def test_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        ClientPool(max_clients=0)
@@ -0,0 +1,147 @@
+# tests/test_incremental.py
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+from UnifiedTTS import TextChunker, TextStream, AsyncTextStream, SynthesisError
+from UnifiedTTS.segmentation import find_boundary
+
+
+def test_boundary_waits_for_whitespace():
+    assert find_boundary("It costs 3.5") is None # Could still be a decimal
+    assert find_boundary("It costs 3.") is None
+    assert find_boundary("It costs 3. Then") == len("It costs 3. ")
+    assert find_boundary('He said "stop." Then') == len('He said "stop." ')
+    assert find_boundary("Well, maybe", clauses=True) == len("Well, ")
+    assert find_boundary("Well, maybe", clauses=True, min_chars=10) is None
+
+
+def test_chunker_releases_complete_sentences():
+    chunker = TextChunker(first_chunk_chars=0)
+    fed = []
+    for token in ["Hel", "lo the", "re.", " How", " are you?", " I am", " fine"]:
+        fed.extend(chunker.feed(token))
+    assert fed == ["Hello there.", "How are you?"]
+    assert chunker.flush() == "I am fine"
+    assert chunker.flush() is None
+
+
+def test_first_chunk_may_end_at_a_clause():
+    chunker = TextChunker(first_chunk_chars=10)
+    assert chunker.feed("Hi, so ") == [] # Clause too short for a first chunk
+    assert chunker.feed("as I was saying, the plan, ") == ["Hi, so as I was saying,"]
+    assert chunker.feed("which is long, works. ") == ["the plan, which is long, works."] # Later chunks wait for sentences
+    chunker.flush()
+    assert chunker.feed("A new turn starts, again ") == ["A new turn starts,"] # Flush starts a new turn
+
+
+def test_chunker_cuts_long_text_at_whitespace():
+    chunker = TextChunker(first_chunk_chars=0, max_chars=20)
+    assert chunker.feed("one two three four five six") == ["one two three four"]
+    assert chunker.flush() == "five six"
+    assert chunker.feed("x" * 25) == ["x" * 20] # No whitespace: hard cut
+    assert chunker.flush() == "x" * 5
+
+
+def fake_synthesize(text, delay=0.0):
+    """Audio stream of one chunk per word, so ordering across chunks is visible."""
+    for word in text.split():
+        time.sleep(delay)
+        yield word.encode()
+
+
+def test_text_stream_yields_in_order():
+    stream = TextStream(lambda text: fake_synthesize(text, delay=0.01 if text.startswith('Slow') else 0.0), prefetch=3)
+    stream.feed("Slow first sentence. ")
+    stream.feed("Fast second. And")
+    stream.close() # Flushes "And"
+    frames = list(stream)
+    assert [frame.data for frame in frames] == [b'Slow', b'first', b'sentence.', b'Fast', b'second.', b'And']
+    assert [frame.seq for frame in frames] == list(range(6))
+    assert [frame.segment for frame in frames] == [0, 0, 0, 1, 1, 2]
+    with pytest.raises(SynthesisError):
+        stream.feed("More.")
+
+
+def test_text_stream_cancel_drops_pending_audio():
+    release = threading.Event()
+
+    def synthesize(text):
+        if text.startswith('Old'):
+            release.wait(5)
+        yield text.encode()
+
+    stream = TextStream(synthesize)
+    stream.feed("Old speech. Old buffered")
+    next_seq = stream.cancel()
+    release.set()
+    stream.feed("New speech. ")
+    stream.close()
+    frames = list(stream)
+    assert [frame.data for frame in frames] == [b'New speech.']
+    assert next_seq == 0 and frames[0].seq == 0
+
+
+def test_text_stream_raises_synthesis_errors():
+    def synthesize(text):
+        raise SynthesisError("provider down")
+        yield
+
+    stream = TextStream(synthesize)
+    stream.feed("Hello. ")
+    stream.close()
+    with pytest.raises(SynthesisError, match="provider down"):
+        list(stream)
+
+
+def test_async_text_stream():
+    async def synthesize(text):
+        for word in text.split():
+            await asyncio.sleep(0.01 if text.startswith('Slow') else 0)
+            yield word.encode()
+
+    async def run():
+        stream = AsyncTextStream(synthesize)
+        stream.feed("Slow one. Fast two.")
+        stream.flush() # Ends the turn: "Fast two." has no trailing whitespace yet
+        stream.close()
+        return [(frame.segment, frame.data) async for frame in stream]
+
+    assert asyncio.run(run()) == [(0, b'Slow'), (0, b'one.'), (1, b'Fast'), (1, b'two.')]
+
+
+def test_async_text_stream_cancel_stops_tasks():
+    started = []
+
+    async def synthesize(text):
+        started.append(text)
+        if text.startswith('Long'):
+            await asyncio.sleep(5)
+        yield text.encode()
+
+    async def run():
+        stream = AsyncTextStream(synthesize)
+        stream.feed("Long wait. ")
+        await asyncio.sleep(0.01)
+        stream.cancel()
+        stream.feed("After. ")
+        stream.close()
+        return [(frame.seq, frame.data) async for frame in stream]
+
+    start = time.monotonic()
+    assert asyncio.run(run()) == [(0, b'After.')]
+    assert started == ["Long wait.", "After."] and time.monotonic() - start < 1.0
+
+
+def test_open_text_stream_with_mock(tts):
+    stream = tts.open_text_stream("mock", output_format='pcm')
+    for token in ["Hello", " there.", " Bye"]:
+        stream.feed(token)
+    stream.close()
+    frames = list(stream)
+    assert {frame.text for frame in frames} == {"Hello there.", "Bye"}
+    audio = b''.join(frame.data for frame in frames)
+    assert audio == tts.synthesize("Hello there.", "mock", output_format='pcm') + tts.synthesize("Bye", "mock", output_format='pcm')
@@ -0,0 +1,112 @@
+# tests/test_jobs.py
+
+import time
+import sqlite3
+
+from UnifiedTTS import JobStore, WorkerPool
+from UnifiedTTS.jobs import PENDING, RUNNING, DONE, FAILED, run_worker
+from UnifiedTTS.transport import RetryPolicy
+
+NO_BACKOFF = RetryPolicy(max_retries=1, backoff_base=0.0, jitter=False)
+
+
+def _store(tmp_path, retry=NO_BACKOFF):
+    return JobStore(str(tmp_path / "jobs.db"), retry=retry)
+
+
+def test_claim_leases_each_task_once(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.submit([{'text': f"Text {i}.", 'provider': 'mock'} for i in range(3)])
+    first = store.claim('a', limit=2)
+    second = store.claim('b', limit=2)
+    assert [task.position for task in first] == [0, 1] and [task.position for task in second] == [2]
+    assert store.claim('c') == []
+    assert all(task.status == RUNNING and task.attempts == 1 for task in first + second)
+    assert store.job(job_id)['running'] == 3
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    store = _store(tmp_path)
+    store.submit([{'text': "Hello.", 'provider': 'mock'}])
+    [task] = store.claim('crashed', lease_seconds=0.05)
+    assert store.claim('other') == []
+    time.sleep(0.1)
+    [again] = store.claim('other')
+    assert again.id == task.id and again.worker == 'other' and again.attempts == 2
+    assert not store.complete(task.id, 'crashed') # The old lease holder cannot complete it any more
+    assert store.complete(task.id, 'other')
+
+
+def test_expired_lease_without_attempts_left_fails(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.submit([{'text': "Hello.", 'provider': 'mock'}], max_attempts=1)
+    store.claim('crashed', lease_seconds=0.0)
+    assert store.claim('other') == []
+    [task] = store.tasks(job_id)
+    assert task.status == FAILED and 'Lease expired' in task.error
+
+
+def test_retry_then_fail(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.submit([{'text': "Hello.", 'provider': 'mock'}])
+    [task] = store.claim('w')
+    assert store.fail(task.id, 'w', 'SynthesisError: 503') == PENDING
+    [task] = store.claim('w')
+    assert task.attempts == 2
+    assert store.fail(task.id, 'w', 'SynthesisError: 503') == FAILED
+    assert store.claim('w') == []
+    summary = store.job(job_id)
+    assert summary['failed'] == 1 and summary['finished']
+    assert store.retry_failed(job_id) == 1
+    assert store.claim('w')[0].attempts == 1
+
+
+def test_retry_waits_for_backoff(tmp_path):
+    store = _store(tmp_path, RetryPolicy(max_retries=2, backoff_base=60.0, jitter=False))
+    store.submit([{'text': "Hello.", 'provider': 'mock'}])
+    [task] = store.claim('w')
+    assert store.fail(task.id, 'w', 'boom') == PENDING
+    assert store.claim('w') == [] # Not before the backoff has passed
+
+
+def test_permanent_error_fails_at_once(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.submit([{'text': "Hello.", 'provider': 'nonexistent'}])
+    run_worker(store.path, {'mock_enabled': True, 'metrics': False}, poll_interval=0.01, exit_when_idle=True)
+    [task] = store.tasks(job_id)
+    assert task.status == FAILED and task.attempts == 1 and 'ProviderNotFoundError' in task.error
+
+
+def test_owner_scopes_job_and_quota(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.submit([{'text': "A.", 'provider': 'mock'}, {'text': "B.", 'provider': 'mock'}], owner='alice')
+    store.submit([{'text': "C.", 'provider': 'mock'}], owner='bob')
+    assert store.job(job_id, owner='alice')['total'] == 2
+    assert store.job(job_id, owner='bob') is None
+    assert store.unfinished(owner='alice') == 2 and store.unfinished(owner='bob') == 1 and store.unfinished() == 3
+
+
+def test_database_without_owner_column_is_upgraded(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE jobs (id TEXT PRIMARY KEY, created_at REAL NOT NULL)')
+    conn.execute("INSERT INTO jobs VALUES ('old', 0)")
+    conn.commit()
+    conn.close()
+    store = JobStore(path)
+    assert store.job('old')['total'] == 0
+    assert store.job(store.submit([{'text': "Hi.", 'provider': 'mock'}], owner='alice'), owner='alice') is not None
+
+
+def test_worker_pool_runs_job(tmp_path):
+    store = _store(tmp_path)
+    texts = [f"Sentence number {i}." for i in range(6)]
+    job_id = store.submit([{'text': text, 'provider': 'mock', 'output_format': 'wav'} for text in texts])
+    with WorkerPool(store.path, {'mock_enabled': True, 'metrics': False}, workers=2, poll_interval=0.05) as pool:
+        assert pool.wait(job_id, timeout=60)
+    summary = store.job(job_id)
+    assert summary['done'] == len(texts) and summary['finished']
+    for task in store.tasks(job_id):
+        assert task.status == DONE
+        with open(task.output_path, 'rb') as f:
+            assert f.read(4) == b'RIFF'
@@ -0,0 +1,151 @@
+# tests/test_metrics.py
+
+import re
+import asyncio
+
+import pytest
+
+from UnifiedTTS import UnifiedTTS, AsyncUnifiedTTS, MetricsRegistry, MetricsHooks, SynthesisHooks, SynthesisEvent, SynthesisError
+from UnifiedTTS.metrics import Observation
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_prometheus(text):
+    """Parses exposition text into {(name, frozenset(labels)): value}, checking HELP/TYPE lines."""
+    assert text.endswith('\n')
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            continue
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            types[name] = kind
+            continue
+        name, labels, value = SAMPLE.match(line).groups()
+        pairs = LABEL.findall(labels or '')
+        unescaped = {k: v.replace('\\n', '\n').replace('\\"', '"').replace('\\\\', '\\') for k, v in pairs}
+        assert re.sub(r'_(bucket|sum|count)$', '', name) in types
+        samples[(name, frozenset(unescaped.items()))] = float(value)
+    return samples
+
+
+def test_render_format():
+    registry = MetricsRegistry()
+    registry.counter('requests_total', 'Requests.', ('provider',)).inc(provider='mock')
+    registry.gauge('queue_depth', 'Queued.').set(3)
+    text = registry.render_prometheus()
+    assert text == (
+        '# HELP queue_depth Queued.\n'
+        '# TYPE queue_depth gauge\n'
+        'queue_depth 3\n'
+        '# HELP requests_total Requests.\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{provider="mock"} 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency.', ('scope',), buckets=(0.1, 1.0))
+    for value in [0.05, 0.1, 0.5, 5.0]:
+        histogram.observe(value, scope='request')
+    samples = parse_prometheus(registry.render_prometheus())
+
+    def bucket(le):
+        return samples[('latency_seconds_bucket', frozenset({'scope': 'request', 'le': le}.items()))]
+
+    assert (bucket('0.1'), bucket('1.0'), bucket('+Inf')) == (2, 3, 4) # A value on a bound falls in that bucket
+    assert samples[('latency_seconds_count', frozenset({'scope': 'request'}.items()))] == 4
+    assert samples[('latency_seconds_sum', frozenset({'scope': 'request'}.items()))] == pytest.approx(5.65)
+    assert histogram.count(scope='request') == 4 and histogram.count(scope='other') == 0
+
+
+def test_label_escaping_round_trips():
+    registry = MetricsRegistry()
+    counter = registry.counter('odd_total', 'Odd labels.', ('voice',))
+    voice = 'say "hi"\\\nbye'
+    counter.inc(2, voice=voice)
+    text = registry.render_prometheus()
+    assert 'odd_total{voice="say \\"hi\\"\\\\\\nbye"} 2' in text
+    assert parse_prometheus(text) == {('odd_total', frozenset({'voice': voice}.items())): 2.0}
+
+
+def test_registry_reuses_and_checks_types():
+    registry = MetricsRegistry()
+    assert registry.counter('a_total', 'A.') is registry.counter('a_total', 'A.')
+    with pytest.raises(ValueError):
+        registry.gauge('a_total', 'A.')
+
+
+class RecordingHooks(SynthesisHooks):
+    def __init__(self):
+        self.calls = []
+
+    def on_start(self, event):
+        self.calls.append(('start', event.scope))
+
+    def on_first_byte(self, event):
+        self.calls.append(('first_byte', event.scope))
+
+    def on_end(self, event):
+        self.calls.append(('end', event.scope, event.error_class, event.cancelled))
+
+
+class BrokenHooks(SynthesisHooks):
+    def on_start(self, event):
+        raise RuntimeError("hook bug")
+
+
+def test_observation_lifecycle():
+    hooks = RecordingHooks()
+    observation = Observation([BrokenHooks(), hooks], SynthesisEvent('provider', 'mock', 'Hi.', {'output_format': 'pcm', 'sample_rate': 8000}))
+    observation.output(b'')
+    observation.output(bytes(800))
+    observation.output(bytes(800))
+    observation.finish()
+    observation.fail(ValueError()) # Ignored: on_end fires once
+    event = observation.event
+    assert hooks.calls == [('start', 'provider'), ('first_byte', 'provider'), ('end', 'provider', None, False)]
+    assert event.output_bytes == 1600 and event.audio_seconds == pytest.approx(0.1)
+    assert event.ttfb is not None and event.latency >= event.ttfb
+
+
+def test_wrap_stream_failure_and_cancel():
+    hooks = RecordingHooks()
+
+    def failing():
+        yield b'abc'
+        raise SynthesisError("boom")
+
+    with pytest.raises(SynthesisError):
+        list(Observation([hooks], SynthesisEvent('request', 'mock', 'Hi.', {})).wrap_stream(failing()))
+    stream = Observation([hooks], SynthesisEvent('request', 'mock', 'Hi.', {})).wrap_stream(iter([b'a', b'b']))
+    next(stream)
+    stream.close()
+    ends = [call for call in hooks.calls if call[0] == 'end']
+    assert ends == [('end', 'request', 'SynthesisError', False), ('end', 'request', None, True)]
+
+
+def test_metrics_hooks_record_calls(cache):
+    registry = MetricsRegistry()
+    tts = UnifiedTTS(mock_enabled=True, metrics=registry, cache=cache)
+    tts.synthesize("Hello.", "mock", voice='v1')
+    tts.synthesize("Hello.", "mock", voice='v1')
+    with pytest.raises(SynthesisError):
+        tts.synthesize("Hello.", "mock", output_format='ogg')
+    asyncio.run(AsyncUnifiedTTS(mock_enabled=True, metrics=registry).synthesize("Hi.", "mock"))
+    samples = parse_prometheus(registry.render_prometheus())
+    hooks = MetricsHooks(registry) # Same metrics, looked up by name
+
+    def requests(scope, status, voice='v1'):
+        return hooks.requests.value(provider='mock', model='', voice=voice, scope=scope, status=status)
+
+    assert requests('request', 'ok') == 2 and requests('provider', 'ok') == 1
+    assert requests('request', 'error', voice='') == 1 and requests('request', 'ok', voice='') == 1
+    assert hooks.cache_hits.value(provider='mock', model='', voice='v1') == 1
+    assert hooks.errors.value(provider='mock', model='', voice='', scope='provider', error='SynthesisError') == 1
+    labels = frozenset({'provider': 'mock', 'model': '', 'voice': 'v1', 'scope': 'request'}.items())
+    assert samples[('unified_tts_latency_seconds_count', labels)] == 2
+    assert samples[('unified_tts_audio_seconds_total', labels)] > 0
@@ -0,0 +1,49 @@
+# tests/test_micro_batch.py
+
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from UnifiedTTS import UnifiedTTS
+from UnifiedTTS.audio import parse_wav
+from UnifiedTTS.providers.mock import MockTTSProvider
+
+
+class RecordingMockProvider(MockTTSProvider):
+    """Mock that keeps the options of every streaming request."""
+    PROVIDER_NAME = "mock"
+
+    def __init__(self, **kwargs):
+        self.stream_kwargs = []
+        super().__init__(**kwargs)
+
+    def synthesize_stream(self, text, output_format='wav', chunk_size=8192, **kwargs):
+        self.stream_kwargs.append(kwargs)
+        return super().synthesize_stream(text, output_format=output_format, chunk_size=chunk_size, **kwargs)
+
+
+def _voiced_samples(clip: bytes) -> int:
+    _, start, end = parse_wav(clip)
+    return sum(1 for sample in array('h', clip[start:end]) if sample)
+
+
+def test_short_texts_share_a_request():
+    texts = ["Yes", "No", "Gate B12", "Order ready", "Room 210", "Thank you"]
+    tts = UnifiedTTS(mock_enabled=True, mock_voiced=True, metrics=False, micro_batch={'window': 0.05, 'max_items': 8})
+    reference = UnifiedTTS(mock_enabled=True, mock_voiced=True, metrics=False)
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        clips = list(executor.map(lambda text: tts.synthesize(text, "mock", output_format='wav'), texts))
+    stats = tts.micro_batcher.stats()
+    tts.micro_batcher.close()
+    assert stats['batched_requests'] == len(texts) and stats['batches'] < len(texts)
+    for text, clip in zip(texts, clips):
+        assert _voiced_samples(clip) == _voiced_samples(reference.synthesize(text, "mock", output_format='wav'))
+
+
+def test_stream_accepts_micro_batch_opt_out():
+    tts = UnifiedTTS(mock_enabled=True, metrics=False, micro_batch=True)
+    provider = RecordingMockProvider(enabled=True)
+    tts.providers['mock'] = provider
+    chunks = list(tts.synthesize_stream("Hello.", "mock", micro_batch=False))
+    tts.micro_batcher.close()
+    assert b''.join(chunks)[:4] == b'RIFF'
+    assert provider.stream_kwargs and all('micro_batch' not in kwargs for kwargs in provider.stream_kwargs)
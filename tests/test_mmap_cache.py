@@ -0,0 +1,63 @@
+# tests/test_mmap_cache.py
+
+import os
+
+from UnifiedTTS import MmapCache, SynthesisCache
+
+
+def test_round_trip(tmp_path):
+    cache = MmapCache(str(tmp_path))
+    assert cache.get('missing') is None
+    cache.put('hello', b'RIFF' + bytes(1000))
+    view = cache.get('hello')
+    assert isinstance(view, memoryview) and view.readonly
+    assert bytes(view) == b'RIFF' + bytes(1000)
+    assert 'hello' in cache and len(cache) == 1
+
+
+def test_shared_between_instances(tmp_path):
+    writer = MmapCache(str(tmp_path))
+    reader = MmapCache(str(tmp_path))
+    writer.put('a', b'first')
+    assert bytes(reader.get('a')) == b'first' # Appended after the reader mapped the files
+    reader.put('a', b'replaced')
+    assert bytes(writer.get('a')) == b'replaced'
+    assert MmapCache(str(tmp_path)).stats()['entries'] == 1
+
+
+def test_compaction_keeps_live_entries(tmp_path):
+    cache = MmapCache(str(tmp_path))
+    for i in range(20):
+        cache.put('key', os.urandom(100))
+    cache.put('other', b'kept')
+    latest = os.urandom(100)
+    cache.put('key', latest)
+    old_view = cache.get('other')
+    assert cache.compact() == 0
+    assert bytes(cache.get('key')) == latest and bytes(cache.get('other')) == b'kept'
+    assert bytes(old_view) == b'kept' # Views handed out earlier stay valid
+    assert cache.stats()['dead_bytes'] == 0
+
+
+def test_index_grows(tmp_path):
+    cache = MmapCache(str(tmp_path), initial_slots=4)
+    for i in range(50):
+        cache.put(f'key-{i}', str(i).encode())
+    assert len(cache) == 50
+    assert all(bytes(cache.get(f'key-{i}')) == str(i).encode() for i in range(50))
+
+
+def test_eviction_over_budget(tmp_path):
+    cache = MmapCache(str(tmp_path), max_bytes=4096)
+    for i in range(8):
+        cache.put(f'key-{i}', bytes(1000))
+    cache.compact()
+    assert cache.get('key-0') is None and cache.get('key-7') is not None
+    assert cache.evictions > 0
+
+
+def test_disk_tier_of_synthesis_cache(tmp_path):
+    first = SynthesisCache(memory_max_items=0, disk_tier=MmapCache(str(tmp_path)))
+    first.put('clip', b'audio bytes')
+    second = SynthesisCache(memory_max_items=0, disk_tier=MmapCache(str(tmp_path)))
+    assert bytes(second.get('clip')) == b'audio bytes'
@@ -0,0 +1,135 @@
+# tests/test_processing.py
+
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from UnifiedTTS import SynthesisError
+from UnifiedTTS.audio import parse_wav, wav_header, WAV_UNKNOWN_SIZE
+from UnifiedTTS.processing import AudioPipeline, Resampler, decode_audio, pcm_fmt_chunk, resample
+
+RATE = 24000
+
+
+def tone(seconds, frequency=440.0, level=0.5, rate=RATE):
+    """A sine wave as (frames, 1) float32."""
+    t = np.arange(int(seconds * rate)) / rate
+    return (level * np.sin(2 * np.pi * frequency * t)).astype(np.float32)[:, None]
+
+
+def pcm(x):
+    return np.clip(np.rint(x * 32767.0), -32768, 32767).astype('<i2').tobytes()
+
+
+def wav(x, rate=RATE):
+    data = pcm(x)
+    return wav_header(pcm_fmt_chunk(rate, x.shape[1]), len(data)) + data
+
+
+def samples_of(clip):
+    fmt_chunk, start, end = parse_wav(clip)
+    channels = struct.unpack_from('<H', fmt_chunk, 2)[0]
+    rate = struct.unpack_from('<I', fmt_chunk, 4)[0]
+    return np.frombuffer(clip[start:end], dtype='<i2').reshape(-1, channels) / 32767.0, rate
+
+
+def dominant_frequency(x, rate):
+    spectrum = np.abs(np.fft.rfft(x[:, 0]))
+    return np.argmax(spectrum) * rate / len(x)
+
+
+def rms_dbfs(x):
+    return 20 * np.log10(np.sqrt(np.mean(np.square(x))))
+
+
+CLIP = np.concatenate((np.zeros((RATE // 5, 1), np.float32), tone(0.1), np.zeros((RATE // 5, 1), np.float32)))
+
+
+def test_decode_wav_and_pcm_without_copying():
+    clip = wav(CLIP)
+    samples, rate = decode_audio(clip)
+    assert rate == RATE and samples.shape == (len(CLIP), 1) and samples.dtype == np.dtype('<i2')
+    assert not samples.flags.writeable # A view of the bytes, not a copy
+    raw = bytearray(pcm(CLIP) + b'\x01') # Trailing partial frame is ignored
+    samples, _ = decode_audio(raw, 'pcm', sample_rate=RATE)
+    assert len(samples) == len(CLIP) and np.shares_memory(samples, np.frombuffer(raw, dtype='u1'))
+
+
+def test_decode_rejects_unusable_input():
+    with pytest.raises(SynthesisError, match="'wav' or 'pcm'"):
+        decode_audio(b'\xff\xfb\x90\x00' + bytes(100), 'mp3')
+    with pytest.raises(SynthesisError, match="sample rate"):
+        decode_audio(pcm(CLIP), 'pcm')
+
+
+def test_container_only_changes():
+    clip = wav(CLIP)
+    assert AudioPipeline().process(clip) == clip
+    assert AudioPipeline().process(pcm(CLIP), 'pcm', RATE) == clip
+    assert AudioPipeline(output_format='pcm').process(clip) == pcm(CLIP)
+
+
+def test_resample_keeps_pitch_and_level():
+    x = tone(0.5)
+    for out_rate in [16000, 44100]:
+        y = resample(x, RATE, out_rate)
+        assert len(y) == -(-len(x) * out_rate // RATE)
+        assert dominant_frequency(y, out_rate) == pytest.approx(440.0, abs=3.0)
+        assert rms_dbfs(y[100:-100]) == pytest.approx(rms_dbfs(x), abs=0.2)
+
+
+def test_resampler_chunks_match_whole_clip():
+    x = tone(0.3) + tone(0.3, frequency=3000.0, level=0.2)
+    whole = Resampler(RATE, 16000).process(x, final=True)
+    resampler = Resampler(RATE, 16000)
+    pieces = [resampler.process(x[i:i + 997]) for i in range(0, len(x), 997)]
+    pieces.append(resampler.process(x[:0], final=True))
+    assert np.allclose(np.concatenate(pieces), whole, atol=1e-5)
+
+
+def test_channels_trim_and_normalize():
+    stereo = np.repeat(CLIP, 2, axis=1)
+    out, rate = samples_of(AudioPipeline(channels=1, trim_silence=True, trim_padding=0.01).process(wav(stereo)))
+    assert rate == RATE and out.shape[1] == 1
+    assert len(out) == pytest.approx(0.1 * RATE + 2 * 0.01 * RATE, abs=2)
+    out, _ = samples_of(AudioPipeline(normalize=-20.0).process(wav(tone(0.5, level=0.05))))
+    assert rms_dbfs(out) == pytest.approx(-20.0, abs=0.1)
+    quiet = tone(0.5, level=0.01) # -43 dBFS: needs more than max_gain
+    out, _ = samples_of(AudioPipeline(normalize=-20.0, max_gain=20.0).process(wav(quiet)))
+    assert rms_dbfs(out) == pytest.approx(rms_dbfs(quiet) + 20.0, abs=0.1)
+    out, _ = samples_of(AudioPipeline(normalize=-3.0, peak_ceiling=-6.0).process(wav(tone(0.5))))
+    assert np.abs(out).max() == pytest.approx(10 ** (-6.0 / 20), abs=0.01) # Peak ceiling wins over the target
+
+
+def test_stream_matches_whole_clip():
+    clip = wav(CLIP)
+    pipeline = AudioPipeline(sample_rate=16000, trim_silence=True, trim_padding=0.01)
+    whole, _ = samples_of(pipeline.process(clip))
+    chunks = [clip[i:i + 333] for i in range(0, len(clip), 333)] # Splits the header and frames
+    streamed = b''.join(pipeline.process_stream(chunks))
+    assert struct.unpack_from('<I', streamed, 4)[0] == WAV_UNKNOWN_SIZE
+    out, rate = samples_of(streamed)
+    assert rate == 16000 and len(out) == pytest.approx(len(whole), abs=2)
+    n = min(len(out), len(whole))
+    assert np.allclose(out[:n], whole[:n], atol=0.01)
+
+
+def test_stream_pcm_passthrough_and_errors():
+    data = pcm(CLIP)
+    chunks = [data[i:i + 101] for i in range(0, len(data), 101)]
+    assert b''.join(AudioPipeline(output_format='pcm').process_stream(chunks, 'pcm', RATE)) == data
+    processor = AudioPipeline(sample_rate=16000).stream_processor()
+    processor.feed(wav(CLIP)[:20])
+    with pytest.raises(SynthesisError, match="inside its header"):
+        processor.finish()
+
+
+def test_pipeline_in_synthesize(tts):
+    pipeline = AudioPipeline(sample_rate=16000, output_format='pcm')
+    audio = tts.synthesize("Hello there.", "mock", output_format='wav', pipeline=pipeline)
+    streamed = b''.join(tts.synthesize_stream("Hello there.", "mock", output_format='wav', pipeline=pipeline))
+    seconds = len("Hello there.") / 15.0
+    assert len(audio) == pytest.approx(seconds * 16000 * 2, abs=4)
+    assert abs(len(streamed) - len(audio)) <= 4
@@ -0,0 +1,143 @@
+# tests/test_ratelimit.py
+
+import time
+import asyncio
+
+import pytest
+
+from UnifiedTTS import UnifiedTTS, AsyncUnifiedTTS, RateLimiter, DeadlineExceededError, register_provider
+from UnifiedTTS.ratelimit import TokenBucket, RetryTokens
+from UnifiedTTS.transport import TransportConfig, RetryPolicy, RetryableError, call_with_retries, acall_with_retries
+from UnifiedTTS.providers.mock import MockTTSProvider
+
+NO_BACKOFF = TransportConfig(retry=RetryPolicy(max_retries=2, backoff_base=0.0, jitter=False))
+
+
+class FlakyMockProvider(MockTTSProvider):
+    """Fails its first transport attempt of every call, like a 503 that succeeds on retry."""
+
+    PROVIDER_NAME = "flaky"
+
+    def synthesize(self, text, output_format='wav', **kwargs):
+        attempts = []
+
+        def attempt(timeout):
+            attempts.append(timeout)
+            if len(attempts) == 1:
+                raise RetryableError(RuntimeError("503"))
+            return super(FlakyMockProvider, self).synthesize(text, output_format, **kwargs)
+
+        return call_with_retries(attempt, NO_BACKOFF, kwargs.get('deadline'), kwargs.get('before_retry'))
+
+    async def asynthesize(self, text, output_format='wav', **kwargs):
+        attempts = []
+
+        async def attempt(timeout):
+            attempts.append(timeout)
+            if len(attempts) == 1:
+                raise RetryableError(RuntimeError("503"))
+            return super(FlakyMockProvider, self).synthesize(text, output_format, **kwargs)
+
+        return await acall_with_retries(attempt, NO_BACKOFF, kwargs.get('deadline'), kwargs.get('abefore_retry'))
+
+
+register_provider('flaky', FlakyMockProvider)
+
+
+def test_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+    now = time.monotonic()
+    bucket.take(2)
+    assert bucket.wait_time(1, now) == pytest.approx(0.1, abs=0.01)
+    assert bucket.wait_time(1, now + 0.1) == 0.0
+    assert bucket.wait_time(5, now + 10) == 0.0 # Refill stops at capacity; oversized requests wait for a full bucket
+    bucket.take(5)
+    assert bucket.wait_time(2, now + 10) == pytest.approx(0.2, abs=0.01)
+
+
+def test_burst_then_rate():
+    limiter = RateLimiter(requests_per_second=5, burst=3)
+    permits = [limiter.try_acquire() for _ in range(4)]
+    assert all(permits[:3]) and permits[3] is None
+    start = time.monotonic()
+    assert limiter.acquire(timeout=1.0) is not None
+    assert 0.1 < time.monotonic() - start < 0.5 # One token at 5/s
+    stats = limiter.stats()
+    assert stats['acquired'] == 4 and stats['rejected'] == 1 and stats['max_wait'] > 0.1
+
+
+def test_chars_per_minute():
+    limiter = RateLimiter(chars_per_minute=60)
+    assert limiter.try_acquire(chars=50) is not None
+    assert limiter.try_acquire(chars=20) is None
+    assert limiter.try_acquire(chars=10) is not None
+
+
+def test_timeout_returns_none():
+    limiter = RateLimiter(max_in_flight=1)
+    held = limiter.acquire()
+    start = time.monotonic()
+    assert limiter.acquire(timeout=0.05) is None
+    assert time.monotonic() - start < 0.5
+    assert asyncio.run(limiter.acquire_async(timeout=0.05)) is None
+    assert limiter.acquire(blocking=False) is None
+    held.release()
+    assert limiter.acquire(timeout=0.05) is not None
+    stats = limiter.stats()
+    assert stats['timeouts'] == 2 and stats['waiting'] == 0 and stats['in_flight'] == 1
+
+
+def test_release_wakes_waiter():
+    limiter = RateLimiter(max_in_flight=1)
+
+    async def run():
+        held = await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async(timeout=5.0))
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+        held.release()
+        return await waiter
+
+    assert asyncio.run(run()) is not None
+
+
+def test_retry_takes_tokens_but_no_slot():
+    limiter = RateLimiter(requests_per_second=10, burst=1, max_in_flight=1)
+    permit = limiter.acquire()
+    start = time.monotonic()
+    RetryTokens(limiter)() # Waits for a token, not for the held slot
+    assert time.monotonic() - start < 0.5
+    with pytest.raises(DeadlineExceededError):
+        RetryTokens(limiter, deadline=time.monotonic() + 0.01)()
+    permit.release()
+    stats = limiter.stats()
+    assert stats['acquired'] == 1 and stats['retries'] == 1 and stats['in_flight'] == 0
+
+
+def test_per_provider_buckets():
+    tts = UnifiedTTS(
+        config={'mock': {'enabled': True, 'requests_per_second': 1}, 'flaky': {'enabled': True, 'rate_limit': {'max_in_flight': 2}}},
+        metrics=False,
+    )
+    assert tts.rate_limiters['mock'] is not tts.rate_limiters['flaky']
+    tts.synthesize("Hello.", "mock")
+    with pytest.raises(DeadlineExceededError):
+        tts.synthesize("Again.", "mock", deadline=time.monotonic() + 0.05) # The bucket of 'mock' is empty
+    tts.synthesize("Hello.", "flaky") # Its own bucket
+    assert tts.rate_limiters['mock'].stats()['acquired'] == 1
+
+
+def test_transport_retries_take_tokens():
+    tts = UnifiedTTS(config={'flaky': {'enabled': True, 'requests_per_second': 100, 'chars_per_minute': 600}}, metrics=False)
+    tts.synthesize("Hello.", "flaky")
+    stats = tts.rate_limiters['flaky'].stats()
+    assert stats['acquired'] == 1 and stats['retries'] == 1 and stats['in_flight'] == 0
+    chars = tts.rate_limiters['flaky'].chars
+    assert chars._tokens == pytest.approx(600 - 2 * len("Hello."), abs=1) # Both attempts sent the text
+
+
+def test_async_transport_retries_take_tokens():
+    tts = AsyncUnifiedTTS(config={'flaky': {'enabled': True, 'requests_per_second': 100}}, metrics=False)
+    assert asyncio.run(tts.synthesize("Hello.", "flaky"))[:4] == b'RIFF'
+    stats = tts.rate_limiters['flaky'].stats()
+    assert stats['acquired'] == 1 and stats['retries'] == 1 and stats['in_flight'] == 0
@@ -0,0 +1,147 @@
+# tests/test_routing.py
+
+import time
+import asyncio
+
+import pytest
+
+from UnifiedTTS import AsyncUnifiedTTS, UnifiedTTS, RoutingPolicy, RequestScheduler, SynthesisError, register_provider
+from UnifiedTTS.providers.mock import MockTTSProvider
+
+
+class BackupMockProvider(MockTTSProvider):
+    PROVIDER_NAME = "mockbackup"
+
+
+register_provider('mockbackup', BackupMockProvider)
+
+
+def _config(primary=None, backup=None):
+    return {'mock': {'enabled': True, **(primary or {})}, 'mockbackup': {'enabled': True, **(backup or {})}}
+
+
+def test_sync_failover():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = UnifiedTTS(config=_config(primary={'error_rate': 1.0}), metrics=False, routing=policy)
+    assert tts.synthesize("Hello.", "auto")[:4] == b'RIFF'
+    assert policy.snapshot()['mock']['error_rate'] == 1.0
+    assert policy.snapshot()['mockbackup']['error_rate'] == 0.0
+
+
+def test_async_auto_and_policy():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = AsyncUnifiedTTS(config=_config(), metrics=False, routing=policy)
+
+    async def run():
+        return await tts.synthesize("Hello.", "auto"), await tts.synthesize("Hello.", RoutingPolicy(providers=['mockbackup']))
+
+    via_auto, via_policy = asyncio.run(run())
+    assert via_auto == via_policy == UnifiedTTS(mock_enabled=True, metrics=False).synthesize("Hello.", "mock")
+    assert policy.snapshot()['mock']['samples'] == 1
+
+
+def test_async_failover():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = AsyncUnifiedTTS(config=_config(primary={'error_rate': 1.0}), metrics=False, routing=policy)
+    assert asyncio.run(tts.synthesize("Hello.", "auto"))[:4] == b'RIFF'
+    assert policy.snapshot()['mock']['error_rate'] == 1.0
+
+
+def test_async_all_candidates_fail():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = AsyncUnifiedTTS(config=_config(primary={'error_rate': 1.0}, backup={'error_rate': 1.0}), metrics=False, routing=policy)
+    with pytest.raises(SynthesisError, match="All routing candidates failed"):
+        asyncio.run(tts.synthesize("Hello.", "auto"))
+
+
+def test_async_hedging_returns_faster_provider():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'], hedge=True, hedge_min_delay=0.05)
+    tts = AsyncUnifiedTTS(config=_config(primary={'latency': 1.0}), metrics=False, routing=policy)
+
+    async def run():
+        start = time.monotonic()
+        audio = await tts.synthesize("Hello.", "auto")
+        return audio, time.monotonic() - start
+
+    audio, elapsed = asyncio.run(run())
+    assert audio[:4] == b'RIFF'
+    assert elapsed < 0.5
+    assert policy.snapshot()['mockbackup']['samples'] == 1
+
+
+def test_async_stream_failover():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = AsyncUnifiedTTS(config=_config(primary={'error_rate': 1.0}), metrics=False, routing=policy)
+
+    async def run():
+        return b''.join([chunk async for chunk in tts.synthesize_stream("Hello.", "auto", output_format="pcm")])
+
+    assert asyncio.run(run()) == UnifiedTTS(mock_enabled=True, metrics=False).synthesize("Hello.", "mock", output_format="pcm")
+
+
+class BrokenPipeline:
+    """A post-processing step that fails with an error that is not a SynthesisError."""
+
+    def process(self, audio, output_format, sample_rate):
+        raise RuntimeError("pipeline bug")
+
+
+def _half_open(policy, name):
+    for _ in range(policy.failure_threshold):
+        policy.record(name, 0.1, ok=False)
+    time.sleep(policy.recovery_timeout)
+    assert policy.breaker(name).state == 'half_open'
+
+
+def test_trial_slot_freed_after_unexpected_error():
+    policy = RoutingPolicy(providers=['mock'], failure_threshold=1, recovery_timeout=0.01)
+    tts = UnifiedTTS(config=_config(), metrics=False, routing=policy)
+    _half_open(policy, 'mock')
+    with pytest.raises(RuntimeError):
+        tts.synthesize("Hello.", "auto", pipeline=BrokenPipeline())
+    assert policy.breaker('mock').allow_request() # Not locked out for good
+    assert policy.snapshot()['mock']['samples'] == 1 # Only the failure recorded above
+
+
+def test_async_trial_slot_freed_after_unexpected_error():
+    policy = RoutingPolicy(providers=['mock'], failure_threshold=1, recovery_timeout=0.01)
+    tts = AsyncUnifiedTTS(config=_config(), metrics=False, routing=policy)
+    _half_open(policy, 'mock')
+    with pytest.raises(RuntimeError):
+        asyncio.run(tts.synthesize("Hello.", "auto", pipeline=BrokenPipeline()))
+    assert policy.breaker('mock').allow_request()
+
+
+def test_cache_hits_are_not_latency_samples(cache):
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = UnifiedTTS(config=_config(), metrics=False, routing=policy, cache=cache)
+    for _ in range(3):
+        tts.synthesize("Hello.", "auto")
+    assert b''.join(tts.synthesize_stream("Hello.", "auto"))[:4] == b'RIFF'
+    assert policy.snapshot()['mock']['samples'] == 1
+
+
+def test_async_cache_hits_are_not_latency_samples(cache):
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'])
+    tts = AsyncUnifiedTTS(config=_config(), metrics=False, routing=policy, cache=cache)
+
+    async def run():
+        for _ in range(3):
+            await tts.synthesize("Hello.", "auto")
+        return b''.join([chunk async for chunk in tts.synthesize_stream("Hello.", "auto")])
+
+    assert asyncio.run(run())[:4] == b'RIFF'
+    assert policy.snapshot()['mock']['samples'] == 1
+
+
+def test_local_deadline_is_not_a_provider_failure():
+    policy = RoutingPolicy(providers=['mock', 'mockbackup'], failure_threshold=1)
+    tts = UnifiedTTS(config=_config(), metrics=False, routing=policy, scheduler=RequestScheduler())
+    with pytest.raises(SynthesisError, match="Deadline exceeded"):
+        tts.synthesize("Hello.", "auto", deadline=time.monotonic() - 1)
+    with pytest.raises(SynthesisError, match="Deadline exceeded"):
+        asyncio.run(AsyncUnifiedTTS(config=_config(), metrics=False, routing=policy, scheduler=RequestScheduler()).synthesize(
+            "Hello.", "auto", deadline=time.monotonic() - 1
+        ))
+    snapshot = policy.snapshot()
+    assert all(snapshot[name]['samples'] == 0 and snapshot[name]['circuit'] == 'closed' for name in ['mock', 'mockbackup'])
@@ -0,0 +1,121 @@
+# tests/test_scheduler.py
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+from UnifiedTTS import RequestScheduler, DeadlineExceededError, OverloadedError
+from UnifiedTTS.scheduler import priority_level
+
+
+def _queue_behind(scheduler, requests, granted):
+    """Starts one thread per (name, priority, tenant) and waits until all are queued."""
+    threads = []
+    for name, priority, tenant in requests:
+        def run(name=name, priority=priority, tenant=tenant):
+            with scheduler.acquire(priority, tenant):
+                granted.append(name)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+        while scheduler.stats()['queued'] < len(threads): # Queue them one at a time, in order
+            time.sleep(0.001)
+    return threads
+
+
+def test_priority_order():
+    scheduler = RequestScheduler(max_in_flight=1)
+    held = scheduler.acquire('normal')
+    granted = []
+    threads = _queue_behind(scheduler, [('bulk', 'bulk', None), ('normal', 'normal', None), ('interactive', 'interactive', None)], granted)
+    held.release()
+    for thread in threads:
+        thread.join(5)
+    assert granted == ['interactive', 'normal', 'bulk']
+
+
+def test_tenants_share_a_class_fairly():
+    scheduler = RequestScheduler(max_in_flight=1)
+    held = scheduler.acquire('bulk')
+    granted = []
+    burst = [('a', 'bulk', 'a')] * 3 + [('b', 'bulk', 'b')]
+    threads = _queue_behind(scheduler, burst, granted)
+    held.release()
+    for thread in threads:
+        thread.join(5)
+    assert granted.index('b') <= 1 # Not starved behind tenant a's burst
+
+
+def test_deadline_while_queued():
+    scheduler = RequestScheduler(max_in_flight=1)
+    held = scheduler.acquire()
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        scheduler.acquire(deadline=time.monotonic() + 0.05)
+    assert time.monotonic() - start < 1.0
+    with pytest.raises(DeadlineExceededError):
+        scheduler.acquire(deadline=time.monotonic() - 1) # Already passed
+    held.release()
+    stats = scheduler.stats()
+    assert stats['in_flight'] == 0 and stats['queued'] == 0
+    assert stats['priorities']['normal']['expired'] == 2
+
+
+def test_full_queue_sheds_lower_class():
+    scheduler = RequestScheduler(max_in_flight=1, max_queue=1)
+    held = scheduler.acquire()
+    outcomes = []
+
+    def run(priority):
+        try:
+            with scheduler.acquire(priority):
+                outcomes.append(priority)
+        except OverloadedError:
+            outcomes.append(f'{priority} shed')
+
+    bulk = threading.Thread(target=run, args=('bulk',), daemon=True)
+    bulk.start()
+    while scheduler.stats()['queued'] < 1:
+        time.sleep(0.001)
+    with pytest.raises(OverloadedError):
+        scheduler.acquire('bulk') # Nothing lower to displace
+    interactive = threading.Thread(target=run, args=('interactive',), daemon=True)
+    interactive.start()
+    bulk.join(5)
+    held.release()
+    interactive.join(5)
+    assert outcomes == ['bulk shed', 'interactive']
+
+
+def test_async_acquire_order_and_deadline():
+    scheduler = RequestScheduler(max_in_flight=1)
+
+    async def run():
+        held = await scheduler.acquire_async()
+        granted = []
+
+        async def waiter(priority):
+            ticket = await scheduler.acquire_async(priority)
+            granted.append(priority)
+            ticket.release()
+
+        tasks = [asyncio.ensure_future(waiter('bulk'))]
+        await asyncio.sleep(0.01)
+        tasks.append(asyncio.ensure_future(waiter('interactive')))
+        await asyncio.sleep(0.01)
+        with pytest.raises(DeadlineExceededError):
+            await scheduler.acquire_async(deadline=time.monotonic() + 0.05)
+        held.release()
+        await asyncio.gather(*tasks)
+        return granted
+
+    assert asyncio.run(run()) == ['interactive', 'bulk']
+    assert scheduler.stats()['in_flight'] == 0
+
+
+@pytest.mark.parametrize('priority', [['bulk'], {'level': 1}, -1, 'urgent', True, 1.5])
+def test_priority_level_rejects_invalid_values(priority):
+    with pytest.raises(ValueError):
+        priority_level(priority)
@@ -0,0 +1,71 @@
+# tests/test_segmentation.py
+
+import asyncio
+import threading
+
+from UnifiedTTS import AsyncUnifiedTTS, UnifiedTTS, SynthesisHooks
+from UnifiedTTS.audio import parse_wav
+
+
+class ProviderCalls(SynthesisHooks):
+    """Records the text of every provider request."""
+
+    def __init__(self):
+        self.texts = []
+        self._lock = threading.Lock()
+
+    def on_start(self, event):
+        if event.scope == 'provider':
+            with self._lock:
+                self.texts.append(event.text)
+
+
+LONG_TEXT = " ".join(f"Sentence number {i} of a long document." for i in range(200)) # ~7800 characters
+
+
+def _samples(clip: bytes) -> int:
+    _, start, end = parse_wav(clip)
+    return end - start
+
+
+def test_sync_segments_long_text():
+    calls = ProviderCalls()
+    tts = UnifiedTTS(mock_enabled=True, metrics=False, hooks=[calls], max_segment_chars=100)
+    clip = tts.synthesize(LONG_TEXT, "mock")
+    assert len(calls.texts) > 1 and max(len(text) for text in calls.texts) <= 100
+    reference = UnifiedTTS(mock_enabled=True, metrics=False)
+    assert _samples(clip) == sum(_samples(reference.synthesize(text, "mock")) for text in calls.texts)
+
+
+def test_async_segments_long_text():
+    calls = ProviderCalls()
+    tts = AsyncUnifiedTTS(mock_enabled=True, metrics=False, hooks=[calls], max_segment_chars=100)
+    clip = asyncio.run(tts.synthesize(LONG_TEXT, "mock"))
+    assert len(calls.texts) > 1 and max(len(text) for text in calls.texts) <= 100
+    assert clip == UnifiedTTS(mock_enabled=True, metrics=False, max_segment_chars=100).synthesize(LONG_TEXT, "mock")
+
+
+def test_async_stream_segments_long_text():
+    calls = ProviderCalls()
+    tts = AsyncUnifiedTTS(mock_enabled=True, metrics=False, hooks=[calls], max_segment_chars=100)
+
+    async def run():
+        return [chunk async for chunk in tts.synthesize_stream(LONG_TEXT, "mock", output_format="pcm")]
+
+    chunks = asyncio.run(run())
+    assert len(calls.texts) > 1 and max(len(text) for text in calls.texts) <= 100
+    reference = UnifiedTTS(mock_enabled=True, metrics=False, max_segment_chars=100)
+    assert b''.join(chunks) == reference.synthesize(LONG_TEXT, "mock", output_format="pcm")
+
+
+def test_async_phrase_cache(cache):
+    calls = ProviderCalls()
+    tts = AsyncUnifiedTTS(mock_enabled=True, metrics=False, hooks=[calls], cache=cache, phrase_cache='sentence')
+
+    async def run():
+        await tts.synthesize("Your order 12 ships today. Thank you for calling.", "mock", output_format="wav")
+        await tts.synthesize("Your order 34 ships today. Thank you for calling.", "mock", output_format="wav")
+
+    asyncio.run(run())
+    assert calls.texts == ["Your order 12 ships today.", "Thank you for calling.", "Your order 34 ships today."]
+    assert cache.stats.as_dict()['segment_hits'] == 1
@@ -0,0 +1,127 @@
+# tests/test_transport.py
+
+import time
+import asyncio
+import email.utils
+
+import pytest
+
+from UnifiedTTS import DeadlineExceededError
+from UnifiedTTS.transport import (
+    TransportConfig, RetryPolicy, RetryableError, parse_retry_after, call_with_retries, acall_with_retries, _next_delay,
+)
+
+NO_BACKOFF = TransportConfig(connect_timeout=2.0, read_timeout=30.0, retry=RetryPolicy(max_retries=2, backoff_base=0.0, jitter=False))
+
+
+class FakeAttempts:
+    """Attempt function that raises the queued errors in order, then returns 'ok'."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.timeouts = []
+
+    def __call__(self, timeout):
+        self.timeouts.append(timeout)
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+def test_delay_backoff_is_capped():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_delay_jitter_bounds():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=3.0)
+    for attempt in range(4):
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0.0 <= delay <= min(2 ** attempt, 3.0) for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_delay_retry_after():
+    policy = RetryPolicy(backoff_max=10.0)
+    assert policy.delay(0, retry_after=4.0) == 4.0
+    assert policy.delay(0, retry_after=60.0) == 10.0 # Capped
+    assert policy.delay(0, retry_after=-1.0) == 0.0
+    ignored = RetryPolicy(backoff_base=0.5, jitter=False, respect_retry_after=False)
+    assert ignored.delay(0, retry_after=4.0) == 0.5
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('1.5') == 1.5
+    assert parse_retry_after('-5') == 0.0
+    in_a_minute = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55 < parse_retry_after(in_a_minute) <= 60
+    assert parse_retry_after(email.utils.formatdate(time.time() - 60, usegmt=True)) == 0.0
+    for value in [None, '', 'soon', 'Mon, 99 Foo 2024']:
+        assert parse_retry_after(value) is None
+
+
+def test_timeout_shortened_by_deadline():
+    assert NO_BACKOFF.timeout() == (2.0, 30.0)
+    connect, read = NO_BACKOFF.timeout(time.monotonic() + 1.0)
+    assert 0.9 < connect <= 1.0 and 0.9 < read <= 1.0
+    connect, read = NO_BACKOFF.timeout(time.monotonic() + 10.0)
+    assert connect == 2.0 and 9.9 < read <= 10.0
+    with pytest.raises(DeadlineExceededError):
+        NO_BACKOFF.timeout(time.monotonic() - 1)
+
+
+def test_next_delay():
+    config = TransportConfig(retry=RetryPolicy(max_retries=1, backoff_base=1.0, jitter=False))
+    error = RetryableError(ValueError("503"))
+    assert _next_delay(config, 0, error, None) == 1.0
+    with pytest.raises(ValueError): # Retries exhausted: the cause is raised
+        _next_delay(config, 1, error, None)
+    with pytest.raises(DeadlineExceededError, match="after 1 attempt"):
+        _next_delay(config, 0, error, time.monotonic() + 0.5) # The backoff would overrun the deadline
+
+
+def test_call_retries_then_succeeds():
+    attempts = FakeAttempts(RetryableError(ValueError("503")), RetryableError(ValueError("502")))
+    retries = []
+    assert call_with_retries(attempts, NO_BACKOFF, before_retry=lambda: retries.append(len(attempts.timeouts))) == 'ok'
+    assert attempts.timeouts == [(2.0, 30.0)] * 3
+    assert retries == [1, 2]
+
+
+def test_call_gives_up_after_max_retries():
+    attempts = FakeAttempts(*[RetryableError(ValueError(str(i))) for i in range(3)])
+    with pytest.raises(ValueError, match="2"):
+        call_with_retries(attempts, NO_BACKOFF)
+    assert len(attempts.timeouts) == 3
+
+
+def test_call_does_not_retry_other_errors():
+    attempts = FakeAttempts(KeyError("bad request"))
+    with pytest.raises(KeyError):
+        call_with_retries(attempts, NO_BACKOFF)
+    assert len(attempts.timeouts) == 1
+
+
+def test_call_honors_deadline():
+    config = TransportConfig(retry=RetryPolicy(max_retries=5, backoff_base=0.05, jitter=False))
+    attempts = FakeAttempts(*[RetryableError(ValueError("503"), retry_after=1.0)] * 5)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        call_with_retries(attempts, config, deadline=start + 0.5) # Retry-After of 1s does not fit
+    assert len(attempts.timeouts) == 1 and time.monotonic() - start < 0.5
+    assert all(read <= 0.5 for _, read in attempts.timeouts)
+
+
+def test_async_call_retries_then_succeeds():
+    fake = FakeAttempts(RetryableError(ValueError("503")))
+    retries = []
+
+    async def attempt(timeout):
+        return fake(timeout)
+
+    async def before_retry():
+        retries.append(len(fake.timeouts))
+
+    assert asyncio.run(acall_with_retries(attempt, NO_BACKOFF, before_retry=before_retry)) == 'ok'
+    assert len(fake.timeouts) == 2 and retries == [1]
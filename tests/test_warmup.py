@@ -0,0 +1,77 @@
+# tests/test_warmup.py
+
+import os
+import sys
+import asyncio
+import subprocess
+
+import pytest
+
+from UnifiedTTS import AsyncUnifiedTTS, UnifiedTTS, ConfigurationError, HotPromptTracker, SynthesisCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST = ["Welcome back.", "Press 1 for sales.", {"text": "Goodbye.", "output_format": "pcm"}]
+
+
+def _cached(tts, text, output_format=None):
+    synth_args = tts._build_synth_args(output_format, {})
+    return tts.cache.get(tts._cache_key('mock', text, synth_args)) is not None
+
+
+def test_warmer_presynthesizes_manifest(cache):
+    tts = UnifiedTTS(mock_enabled=True, metrics=False, cache=cache)
+    warmer = tts.warmer(MANIFEST, provider='mock', refresh_interval=None).start()
+    assert warmer.wait_ready(5)
+    status = warmer.status()
+    assert status['presynthesized'] == 3 and status['failed'] == 0
+    assert status['connections'] == {'mock': None}
+    assert _cached(tts, "Welcome back.") and _cached(tts, "Goodbye.", "pcm")
+
+
+def test_warmer_requires_cache():
+    with pytest.raises(ConfigurationError):
+        UnifiedTTS(mock_enabled=True, metrics=False).warmer(MANIFEST, provider='mock')
+
+
+def test_tracker_learns_hot_prompts_but_not_presynthesis(cache):
+    tracker = HotPromptTracker(min_count=1.5)
+    tts = UnifiedTTS(mock_enabled=True, metrics=False, cache=cache)
+    warmer = tts.warmer(["Presynthesized."], provider='mock', tracker=tracker, refresh_interval=None).start()
+    assert warmer.wait_ready(5)
+    for _ in range(3):
+        tts.synthesize("Hot prompt.", 'mock')
+    tts.synthesize("Cold prompt.", 'mock')
+    assert [item.text for item in tracker.hot()] == ["Hot prompt."]
+
+
+def test_async_warm_up():
+    tts = AsyncUnifiedTTS(mock_enabled=True, metrics=False)
+    results = asyncio.run(tts.warm_up(providers=['mock', 'missing']))
+    assert results['mock'] is None
+    assert "not found" in results['missing']
+
+
+def test_async_warmer_awaits_presynthesis():
+    cache = SynthesisCache(memory_max_items=64)
+    tts = AsyncUnifiedTTS(mock_enabled=True, metrics=False, cache=cache)
+
+    async def run():
+        warmer = tts.warmer(MANIFEST, provider='mock', refresh_interval=None).start()
+        ready = await asyncio.get_running_loop().run_in_executor(None, warmer.wait_ready, 5)
+        return ready, warmer.status()
+
+    ready, status = asyncio.run(run())
+    assert ready
+    assert status['presynthesized'] == 3 and status['failed'] == 0
+    assert status['connections'] == {'mock': None}
+    assert _cached(tts, "Welcome back.") and _cached(tts, "Press 1 for sales.") and _cached(tts, "Goodbye.", "pcm")
+
+
+def test_webapp_import_starts_no_warm_up():
+    # In a fresh interpreter, so earlier tests' requests cannot have started it
+    script = (
+        "import sys, threading; sys.path.insert(0, sys.argv[1]); import webapp.app as relay; "
+        "assert relay._warmer is None; "
+        "assert not [t for t in threading.enumerate() if t.name.startswith('tts-warm')]"
+    )
+    subprocess.run([sys.executable, '-c', script, REPO_ROOT], check=True, timeout=60)
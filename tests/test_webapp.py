@@ -0,0 +1,142 @@
+# tests/test_webapp.py
+
+import importlib
+
+import pytest
+
+from UnifiedTTS import JobStore
+
+
+@pytest.fixture(scope='module')
+def relay():
+    return importlib.import_module('webapp.app')
+
+
+@pytest.fixture
+def client(relay):
+    return relay.app.test_client()
+
+
+def test_generate_speech_rejects_non_json(client):
+    response = client.post('/generate_speech', data='text=hello', content_type='application/x-www-form-urlencoded')
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "API Key and Text are required."}
+
+
+def test_generate_speech_rejects_non_object(client):
+    response = client.post('/generate_speech', json=["hello"])
+    assert response.status_code == 400
+
+
+def test_cartesia_call_requires_text(relay):
+    assert relay.call_cartesia_tts_stream(None, "") == {"error": "Text is required.", "status_code": 400}
+
+
+@pytest.fixture
+def jobs(relay, monkeypatch, tmp_path):
+    """Enables bulk jobs with one client key; the store is opened without starting workers."""
+    monkeypatch.setattr(relay, 'JOBS_PROVIDER', 'mock')
+    monkeypatch.setattr(relay, 'JOBS_API_KEY_DIGESTS', [relay._digest('alice-key'), relay._digest('bob-key')])
+    monkeypatch.setattr(relay, 'JOBS_MAX_UNFINISHED_TASKS', 3)
+    monkeypatch.setattr(relay, 'JOBS_SUBMITS_PER_MINUTE', 2)
+    monkeypatch.setattr(relay, '_job_submit_limiters', {})
+    monkeypatch.setattr(relay, '_job_store', JobStore(str(tmp_path / "jobs.db")))
+    return relay._job_store
+
+
+def _submit(client, key, texts):
+    return client.post('/jobs', json={"texts": texts}, headers={"Authorization": f"Bearer {key}"})
+
+
+def test_jobs_disabled_without_keys(client, relay, monkeypatch):
+    monkeypatch.setattr(relay, 'JOBS_PROVIDER', 'mock')
+    monkeypatch.setattr(relay, 'JOBS_API_KEY_DIGESTS', [])
+    assert client.post('/jobs', json={"texts": ["Hi."]}).status_code == 503
+
+
+def test_jobs_require_valid_key(client, jobs):
+    assert client.post('/jobs', json={"texts": ["Hi."]}).status_code == 401
+    response = _submit(client, 'wrong-key', ["Hi."])
+    assert response.status_code == 401 and 'Bearer' in response.headers['WWW-Authenticate']
+    assert client.post('/jobs', json={"texts": ["Hi."]}, headers={"X-API-Key": "alice-key"}).status_code == 202
+
+
+def test_jobs_are_private_to_their_client(client, jobs):
+    job_id = _submit(client, 'alice-key', ["Hi."]).get_json()["job_id"]
+    assert client.get(f'/jobs/{job_id}', headers={"Authorization": "Bearer alice-key"}).status_code == 200
+    assert client.get(f'/jobs/{job_id}', headers={"Authorization": "Bearer bob-key"}).status_code == 404
+    assert client.get(f'/jobs/{job_id}').status_code == 401
+    assert client.get(f'/jobs/{job_id}/audio/0', headers={"Authorization": "Bearer bob-key"}).status_code == 404
+
+
+def test_job_quota_per_client(client, jobs):
+    assert _submit(client, 'alice-key', ["One.", "Two."]).status_code == 202
+    response = _submit(client, 'alice-key', ["Three.", "Four."]) # 4 queued texts > 3
+    assert response.status_code == 429 and response.headers['Retry-After']
+    assert _submit(client, 'bob-key', ["One.", "Two."]).status_code == 202 # Other clients are unaffected
+
+
+def test_job_submission_rate_per_client(client, jobs):
+    assert _submit(client, 'alice-key', ["One."]).status_code == 202
+    assert _submit(client, 'alice-key', ["Two."]).status_code == 202
+    assert _submit(client, 'alice-key', ["Three."]).status_code == 429 # Burst of 2 per minute used up
+    assert _submit(client, 'bob-key', ["One."]).status_code == 202
+
+
+class FakeUpstream:
+    """Stands in for Cartesia: records the key of every call and answers with fixed audio, or 401 for 'bad-key'."""
+
+    def __init__(self):
+        self.keys = []
+
+    def __call__(self, session, text):
+        self.keys.append(session.headers["X-API-Key"])
+        if session.headers["X-API-Key"] == "bad-key":
+            return {"error": "Cartesia API Error (401): invalid key", "status_code": 401}
+        return self
+
+    def iter_content(self, chunk_size):
+        yield b"ID3" + bytes(100)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def upstream(relay, monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(relay, 'call_cartesia_tts_stream', fake)
+    monkeypatch.setattr(relay, 'RESPONSE_CACHE', relay.MemoryCache(max_items=16))
+    return fake
+
+
+def _speak(client, key, text="Cached per key."):
+    return client.post('/generate_speech', json={"apiKey": key, "text": text})
+
+
+def test_cache_hits_are_scoped_to_the_api_key(client, upstream):
+    first = _speak(client, "good-key")
+    assert first.status_code == 200 and first.data == b"ID3" + bytes(100)
+    assert _speak(client, "good-key").headers["Cache-Control"].startswith("private") # Served from the cache
+    assert _speak(client, "bad-key").status_code == 401 # Not served another key's clip
+    assert upstream.keys == ["good-key", "bad-key"]
+
+
+def test_cached_audio_requires_the_same_key(client, upstream):
+    location = _speak(client, "good-key").headers["Content-Location"]
+    assert client.get(location).status_code == 401
+    assert client.get(location, headers={"X-API-Key": "other-key"}).status_code == 404
+    response = client.get(location, headers={"X-API-Key": "good-key"})
+    assert response.status_code == 200 and response.headers["Vary"] == "X-API-Key"
+
+
+def test_streams_are_only_shared_by_one_key(relay):
+    key = relay.make_cache_key('cartesia', "Hello.", relay.SYNTH_ARGS)
+    assert relay._scoped_key("a", key) != relay._scoped_key("b", key)
+    assert relay._scoped_key("a", key) == relay._scoped_key("a", key)
+
+
+@pytest.mark.parametrize('priority', [["bulk"], {"level": 1}, -1, "urgent", True])
+def test_generate_speech_rejects_bad_priority(client, priority):
+    response = client.post('/generate_speech', json={"apiKey": "key", "text": "Hello.", "priority": priority})
+    assert response.status_code == 400
@@ -1,5 +1,15 @@
 import os
+import sys
+import hmac
+import json
+import time
+import atexit
+import socket
+import hashlib
+import threading
+import urllib.parse
 import requests
+from typing import Any, Dict, List, Optional, Tuple
 from flask import (
     Flask,
     render_template,
@@ -7,33 +17,155 @@ from flask import (
     jsonify,
     Response,
     stream_with_context,
+    send_file,
+    url_for,
 )
 
+# Make the UnifiedTTS package (repository root) importable when running `python webapp/app.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from UnifiedTTS.exceptions import DeadlineExceededError, OverloadedError, SynthesisError
+from UnifiedTTS.transport import TransportConfig, build_session, request_with_retries, warm_connections
+from UnifiedTTS.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE, MetricsHooks, Observation, SynthesisEvent
+from UnifiedTTS.cache import MemoryCache, make_cache_key
+from UnifiedTTS.mmap_cache import MmapCache
+from UnifiedTTS.batch import BatchItem
+from UnifiedTTS.warmup import Warmer, HotPromptTracker, load_manifest
+from UnifiedTTS.jobs import JobStore, WorkerPool, DONE
+from UnifiedTTS.scheduler import RequestScheduler, priority_level
+from UnifiedTTS.client_pool import ClientPool
+from UnifiedTTS.ratelimit import RateLimiter
+
 # --- Configuration ---
 # You can set defaults here, but we'll primarily take from the user
-CARTESIA_API_URL = "https://api.cartesia.ai/v1/text-to-speech"
+# Overridable so the relay can be pointed at a local stand-in (see benchmarks/mock_server.py)
+CARTESIA_API_URL = os.environ.get("CARTESIA_API_URL", "https://api.cartesia.ai/v1/text-to-speech")
 # Default voice ID (can be overridden if you add more options later)
 DEFAULT_VOICE_ID = "c61e634d-5f60-4949-b3e6-c886016bdf5f" # Replace if needed with a valid one
 DEFAULT_MODEL_ID = "sonic-english"
 DEFAULT_OUTPUT_FORMAT = "mp3"
 DEFAULT_SAMPLE_RATE = 24000
+# Registered media types per container; browsers' MediaSource only accepts 'audio/mpeg' for MP3
+AUDIO_MIME_TYPES = {"mp3": "audio/mpeg", "wav": "audio/wav", "pcm": "audio/pcm"}
+# Upper bound on the time spent reaching Cartesia (connect + retries) per request
+UPSTREAM_DEADLINE_SECONDS = 30.0
+
+# --- Upstream Transport ---
+# Pooled keep-alive sessions, one per caller API key with its headers preset, so repeat
+# calls from the same user reuse warm TCP+TLS connections instead of handshaking every
+# time. Sessions are evicted least-recently-used (and after WEBAPP_CLIENT_IDLE_TTL idle
+# seconds) to keep at most WEBAPP_MAX_CONNECTIONS upstream connections open.
+TENANT_TRANSPORT = TransportConfig(pool_maxsize=8, connect_timeout=5.0, read_timeout=30.0)
+CLIENT_POOL = ClientPool(
+    max_clients=int(os.environ.get("WEBAPP_CLIENT_POOL_SIZE", "256")),
+    idle_ttl=float(os.environ.get("WEBAPP_CLIENT_IDLE_TTL", "300")),
+    max_connections=int(os.environ.get("WEBAPP_MAX_CONNECTIONS", "1024")),
+)
+
+# --- Metrics ---
+# Relayed requests are recorded in the same registry UnifiedTTS uses, served at /metrics.
+# Requests made with the warm-up key are also counted per text, so the warm-up (below) can
+# keep that key's most requested clips cached; other users' texts are never tracked.
+HOT_PROMPTS = HotPromptTracker(capacity=int(os.environ.get("WEBAPP_HOT_PROMPTS_TRACKED", "1000")))
+RELAY_METRICS = MetricsHooks(REGISTRY)
+RELAY_HOOKS = [RELAY_METRICS, HOT_PROMPTS]
+COALESCED_REQUESTS = REGISTRY.counter(
+    'webapp_coalesced_requests_total', 'Requests that joined an identical Cartesia stream already in flight.'
+)
+
+# --- Request Scheduling ---
+# Upstream calls are admitted by priority class (requests may send "priority": "bulk" to
+# yield to interactive traffic), shared fairly between API keys, and dropped if they
+# cannot start within QUEUE_TIMEOUT_SECONDS.
+RELAY_MAX_IN_FLIGHT = int(os.environ.get("WEBAPP_MAX_IN_FLIGHT", "64"))
+RELAY_MAX_QUEUE = int(os.environ.get("WEBAPP_MAX_QUEUE", "256"))
+QUEUE_TIMEOUT_SECONDS = 10.0
+DEFAULT_PRIORITY = "interactive"
+RELAY_SCHEDULER = RequestScheduler(max_in_flight=RELAY_MAX_IN_FLIGHT, max_queue=RELAY_MAX_QUEUE, metrics=REGISTRY)
+
+# --- Response Cache ---
+# Completed clips keyed by content (text + voice/model/format) and scoped to the API key
+# that synthesized them: a clip is only ever served to requests made with the same key, so
+# the cache never vouches for an unchecked key nor reveals what other users asked for. By default a per-process LRU bounded by clip count and total bytes. With WEBAPP_CACHE_DIR
+# set, a memory-mapped store shared by every server process on the host (and kept across restarts).
+CACHE_DIR = os.environ.get("WEBAPP_CACHE_DIR")
+CACHE_MAX_BYTES = int(os.environ.get("WEBAPP_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+if CACHE_DIR:
+    RESPONSE_CACHE = MmapCache(CACHE_DIR, max_bytes=CACHE_MAX_BYTES)
+else:
+    RESPONSE_CACHE = MemoryCache(max_items=512, max_bytes=128 * 1024 * 1024)
+# Clips are served from content-addressed URLs (/audio/<key>, with the same API key in an
+# X-API-Key header); browsers may keep them, shared caches must not
+AUDIO_CACHE_CONTROL = "private, max-age=86400"
+SYNTH_ARGS = {
+    'model_id': DEFAULT_MODEL_ID,
+    'voice_id': DEFAULT_VOICE_ID,
+    'output_format': DEFAULT_OUTPUT_FORMAT,
+    'sample_rate': DEFAULT_SAMPLE_RATE,
+}
+
+# --- Bulk Synthesis Jobs ---
+# Disabled unless JOBS_PROVIDER is set (e.g. "cartesia", or "mock" to run offline) and
+# JOBS_API_KEYS lists the keys clients must send ("Authorization: Bearer <key>" or
+# "X-API-Key: <key>"). Jobs use the server's credentials (CARTESIA_API_KEY, OPENAI_API_KEY,
+# ...), never the caller's key, so every client is held to a quota: at most
+# JOBS_MAX_UNFINISHED_TASKS queued texts and JOBS_SUBMITS_PER_MINUTE submissions.
+# A job's status and audio are only served to the client that submitted it.
+JOBS_PROVIDER = os.environ.get("JOBS_PROVIDER")
+# Only digests are kept, so the keys themselves do not linger in memory
+JOBS_API_KEY_DIGESTS = [
+    hashlib.sha256(key.strip().encode('utf-8')).digest() for key in os.environ.get("JOBS_API_KEYS", "").split(",") if key.strip()
+]
+JOBS_MAX_UNFINISHED_TASKS = int(os.environ.get("JOBS_MAX_UNFINISHED_TASKS", "5000"))
+JOBS_SUBMITS_PER_MINUTE = float(os.environ.get("JOBS_SUBMITS_PER_MINUTE", "10"))
+JOBS_DB = os.environ.get("JOBS_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.db"))
+JOBS_WORKERS = int(os.environ.get("JOBS_WORKERS", "2"))
+# UnifiedTTS keyword arguments for the worker processes, as JSON
+JOBS_TTS_CONFIG = json.loads(os.environ.get("JOBS_TTS_CONFIG", "{}"))
+MAX_JOB_ITEMS = 1000
+_job_store: Optional[JobStore] = None
+_job_pool: Optional[WorkerPool] = None
+_jobs_lock = threading.Lock()
+_job_submit_limiters: Dict[str, RateLimiter] = {} # Per client; bounded by the number of JOBS_API_KEYS
+
+# --- Warm-up ---
+# After a deploy, each worker (on its first request, normally the first /readyz probe) resolves the Cartesia host, opens pooled connections and
+# pre-synthesizes hot prompts into the response cache before /readyz reports it ready, so
+# the load balancer only routes to warm workers. Prompts come from WEBAPP_WARMUP_MANIFEST
+# (a JSON list of texts) and, every WEBAPP_HOT_REFRESH_SECONDS, from the texts this worker
+# is asked for most with the warm-up key (the only key its clips are served to). Pre-synthesis runs at bulk priority and needs a server-side key
+# (WEBAPP_WARMUP_API_KEY, or CARTESIA_API_KEY); without one only connections are warmed.
+WARMUP_API_KEY = os.environ.get("WEBAPP_WARMUP_API_KEY") or os.environ.get("CARTESIA_API_KEY")
+WARMUP_MANIFEST = os.environ.get("WEBAPP_WARMUP_MANIFEST")
+WARMUP_CONCURRENCY = int(os.environ.get("WEBAPP_WARMUP_CONCURRENCY", "2"))
+WARMUP_CONNECTIONS = int(os.environ.get("WEBAPP_WARMUP_CONNECTIONS", "2"))
+HOT_PROMPT_COUNT = int(os.environ.get("WEBAPP_HOT_PROMPTS", "50"))
+HOT_REFRESH_SECONDS = float(os.environ.get("WEBAPP_HOT_REFRESH_SECONDS", "300"))
+_warmer: Optional[Warmer] = None
+_warmer_pid: Optional[int] = None
+_warmer_lock = threading.Lock()
 
 # --- Flask App Setup ---
 app = Flask(__name__)
+if JOBS_PROVIDER and not JOBS_API_KEY_DIGESTS:
+    app.logger.warning("JOBS_PROVIDER is set but JOBS_API_KEYS is empty: bulk jobs stay disabled.")
 
 # --- Helper Function for Cartesia API Call ---
-def call_cartesia_tts_stream(api_key: str, text: str):
-    """
-    Calls Cartesia API and returns the streaming response object or an error dict.
-    """
-    if not api_key or not text:
-        return {"error": "API Key and Text are required.", "status_code": 400}
-
-    headers = {
+def _tenant_session(api_key: str) -> requests.Session:
+    """Builds the pooled session for one caller API key."""
+    return build_session(TENANT_TRANSPORT, {
         "Cartesia-Version": "2024-05-10",  # Check for the latest version
         "X-API-Key": api_key,
         "Content-Type": "application/json",
-    }
+    })
+
+
+def call_cartesia_tts_stream(session: requests.Session, text: str):
+    """
+    Calls Cartesia API on a session from `_tenant_session` and returns the streaming response object or an error dict.
+    """
+    if not text:
+        return {"error": "Text is required.", "status_code": 400}
+
     payload = {
         "text": text,
         "voice_id": DEFAULT_VOICE_ID, # Using the default for simplicity
@@ -46,8 +178,10 @@ def call_cartesia_tts_stream(api_key: str, text: str):
     }
 
     try:
-        response = requests.post(
-            CARTESIA_API_URL, headers=headers, json=payload, stream=True
+        response = request_with_retries(
+            session, 'POST', CARTESIA_API_URL, TENANT_TRANSPORT,
+            deadline=time.monotonic() + UPSTREAM_DEADLINE_SECONDS,
+            json=payload, stream=True,
         )
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
         return response # Return the successful streaming response object
@@ -66,12 +200,16 @@ def call_cartesia_tts_stream(api_key: str, text: str):
             except ValueError: # Handle cases where response is not JSON
                 error_message = f"Cartesia API Error ({status_code}): {e.response.text}"
 
-        print(f"API Call Failed: {error_message}") # Log error server-side
-        return {"error": error_message, "status_code": status_code, "details": api_error_details}
+        app.logger.error("API Call Failed: %s", error_message) # Log error server-side
+        return {"error": error_message, "status_code": status_code, "details": api_error_details, "exception": e}
+
+    except DeadlineExceededError as e:
+        app.logger.error("API Call Failed: %s", e)
+        return {"error": "Timed out waiting for the Cartesia API.", "status_code": 504, "exception": e}
 
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return {"error": "An unexpected server error occurred.", "status_code": 500}
+        app.logger.exception("An unexpected error occurred: %s", e)
+        return {"error": "An unexpected server error occurred.", "status_code": 500, "exception": e}
 
 
 # --- Flask Routes ---
@@ -80,42 +218,398 @@ def index():
     """Renders the main HTML page."""
     return render_template('index.html')
 
+# --- Request Coalescing ---
+class SharedStream:
+    """
+    One upstream Cartesia stream, fanned out to every request for the same clip.
+
+    A background thread pumps the upstream body into `chunks`; each reader
+    replays it from the start at its own pace, so late joiners and slow
+    clients never hold up the others or the upstream connection.
+    """
+
+    def __init__(self, key: str, api_key: str):
+        self.key = key
+        self.key_digest = _digest(api_key) # Only a digest: the key itself is not kept around
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[Dict[str, Any]] = None
+        self._cond = threading.Condition()
+
+    def append(self, chunk: bytes) -> None:
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def close(self, error: Optional[Dict[str, Any]] = None) -> None:
+        with self._cond:
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def wait_started(self) -> Optional[Dict[str, Any]]:
+        """Blocks until audio starts flowing; returns the error dict if the call failed before any audio."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.chunks or self.done)
+            return None if self.chunks else self.error
+
+    def iter_chunks(self):
+        """Yields every chunk from the beginning, waiting for new ones until the stream ends."""
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: index < len(self.chunks) or self.done)
+                pending = self.chunks[index:]
+                error = self.error
+            if not pending:
+                if error is not None:
+                    raise SynthesisError(error["error"]) from error.get("exception")
+                return
+            index += len(pending)
+            yield from pending
+
+
+_inflight: Dict[str, SharedStream] = {}
+_inflight_lock = threading.Lock()
+
+
+def _digest(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode('utf-8')).digest()
+
+
+def _scoped_key(api_key: str, key: str) -> str:
+    """The response cache and in-flight key of content `key` for one API key."""
+    return hashlib.sha256(_digest(api_key) + key.encode('utf-8')).hexdigest()
+
+
+def _observe(scope: str, text: str, api_key: Optional[str] = None) -> Observation:
+    hooks = RELAY_HOOKS if api_key is not None and api_key == WARMUP_API_KEY else [RELAY_METRICS]
+    return Observation(hooks, SynthesisEvent(scope, 'cartesia', text or '', dict(SYNTH_ARGS), streaming=True))
+
+
+def join_or_start_stream(key: str, api_key: str, text: str, priority: str = DEFAULT_PRIORITY) -> Tuple[SharedStream, bool]:
+    """
+    Returns (stream, joined): the in-flight stream for `key` (a key from `_scoped_key`, so
+    only requests with the same API key share a stream), or a newly started one.
+    """
+    with _inflight_lock:
+        stream = _inflight.get(key)
+        if stream is not None:
+            return stream, True
+        stream = _inflight[key] = SharedStream(key, api_key)
+    threading.Thread(target=_pump, args=(stream, api_key, text, priority), name='cartesia-stream', daemon=True).start()
+    return stream, False
+
+
+def _pump(stream: SharedStream, api_key: str, text: str, priority: str) -> None:
+    """Waits for a scheduler slot, reads one Cartesia response to the end into `stream`, then caches the clip."""
+    observation = _observe('provider', text, api_key)
+    error = None
+    ticket = None
+    try:
+        ticket = RELAY_SCHEDULER.acquire(
+            priority, stream.key_digest.hex(), cost=len(text), deadline=time.monotonic() + QUEUE_TIMEOUT_SECONDS
+        )
+        # The session stays leased until the body is read, so it is never closed under us
+        with CLIENT_POOL.lease('cartesia', api_key, _tenant_session, connections=TENANT_TRANSPORT.pool_maxsize) as session:
+            cartesia_response = call_cartesia_tts_stream(session, text)
+            if isinstance(cartesia_response, dict):
+                error = cartesia_response
+                observation.fail(error.get("exception") or SynthesisError(error["error"]))
+            else:
+                try:
+                    for chunk in observation.wrap_stream(cartesia_response.iter_content(chunk_size=4096)):
+                        stream.append(chunk)
+                finally:
+                    cartesia_response.close() # Returns the connection to the session's pool
+        if error is None:
+            # Cache before leaving the in-flight table, so new requests always find one or the other
+            RESPONSE_CACHE.put(stream.key, b''.join(stream.chunks))
+    except DeadlineExceededError as e:
+        observation.fail(e)
+        error = {"error": "Timed out waiting for a free upstream slot.", "status_code": 504, "exception": e}
+    except OverloadedError as e:
+        observation.fail(e)
+        error = {"error": "The server is busy, please retry.", "status_code": 503, "exception": e}
+    except Exception as e:
+        app.logger.error("Cartesia stream failed: %s", e)
+        error = {"error": f"Error streaming from Cartesia API: {e}", "status_code": 502, "exception": e}
+    finally:
+        if ticket is not None:
+            ticket.release()
+        with _inflight_lock:
+            _inflight.pop(stream.key, None)
+        stream.close(error)
+
+
+def _cached_audio_response(audio: bytes, key: str) -> Response:
+    """Serves a complete clip with validators, so browsers can revalidate and request byte ranges."""
+    # Hash the bytes rather than reuse the key: re-synthesis after eviction may differ
+    etag = hashlib.blake2b(audio, digest_size=16).hexdigest()
+    # WSGI bodies must be bytes: clips mapped from the shared cache are copied here, once
+    response = Response(bytes(audio), mimetype=AUDIO_MIME_TYPES[DEFAULT_OUTPUT_FORMAT], headers={
+        "Content-Disposition": "inline; filename=speech.mp3",
+        "Cache-Control": AUDIO_CACHE_CONTROL,
+        "Vary": "X-API-Key",
+        "Content-Location": url_for('cached_audio', key=key),
+    })
+    response.set_etag(etag)
+    # Answers If-None-Match (304) and Range (206) on GET/HEAD
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(audio))
+
+
 @app.route('/generate_speech', methods=['POST'])
 def generate_speech():
     """Handles the API call and streams audio back."""
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {} # Not a JSON object: answered below with the 400 for missing fields
     api_key = data.get('apiKey')
     text = data.get('text')
 
-    # Call the helper function
-    cartesia_response = call_cartesia_tts_stream(api_key, text)
+    priority = data.get('priority', DEFAULT_PRIORITY)
+
+    if not isinstance(api_key, str) or not isinstance(text, str):
+        api_key = text = None # Answered below with the 400 for missing fields
+    observation = _observe('request', text, api_key)
+    if not api_key or not text:
+        error_message = "API Key and Text are required."
+        observation.fail(SynthesisError(error_message))
+        return jsonify({"error": error_message}), 400
+    try:
+        priority_level(priority)
+    except ValueError as e:
+        observation.fail(SynthesisError(str(e)))
+        return jsonify({"error": str(e)}), 400
+
+    # Hot content: served from the cache without an upstream call, but only to the key
+    # that synthesized it (Cartesia accepted that key for this very clip)
+    key = make_cache_key('cartesia', text, SYNTH_ARGS)
+    scoped_key = _scoped_key(api_key, key)
+    audio = RESPONSE_CACHE.get(scoped_key)
+    if audio is not None:
+        observation.event.cache_hit = True
+        observation.output(audio)
+        observation.finish()
+        return _cached_audio_response(audio, key)
 
-    # Check if the helper returned an error dictionary
-    if isinstance(cartesia_response, dict) and 'error' in cartesia_response:
-        return jsonify({"error": cartesia_response.get("error", "Unknown error")}), cartesia_response.get("status_code", 500)
+    # Identical requests in flight with the same key share one upstream stream
+    stream, joined = join_or_start_stream(scoped_key, api_key, text, priority)
+    error = stream.wait_started()
 
-    # If no error, cartesia_response is the streaming requests.Response object
-    # We need to stream this back to the client.
-    # Use stream_with_context to efficiently stream the response.
-    def generate_audio_chunks():
-        try:
-            for chunk in cartesia_response.iter_content(chunk_size=4096):
-                yield chunk
-        finally:
-            cartesia_response.close() # Ensure the connection is closed
+    # Check if the call failed before producing audio
+    if error is not None:
+        observation.fail(error.get("exception") or SynthesisError(error["error"]))
+        status_code = error.get("status_code", 500)
+        headers = {"Retry-After": "1"} if status_code == 503 else {}
+        return jsonify({"error": error.get("error", "Unknown error")}), status_code, headers
+    if joined:
+        COALESCED_REQUESTS.inc()
 
     # Return the streaming response to the browser
     return Response(
-        stream_with_context(generate_audio_chunks()),
-        mimetype=f'audio/{DEFAULT_OUTPUT_FORMAT}', # e.g., audio/mpeg for mp3
+        stream_with_context(observation.wrap_stream(stream.iter_chunks())),
+        mimetype=AUDIO_MIME_TYPES[DEFAULT_OUTPUT_FORMAT],
         headers={
-            "Content-Disposition": "inline; filename=speech.mp3" # Suggest inline playback
-            # Cartesia might include other relevant headers like Transfer-Encoding
-            # which requests/Flask usually handle, but check if specific ones are needed.
+            "Content-Disposition": "inline; filename=speech.mp3", # Suggest inline playback
+            "X-Accel-Buffering": "no", # Reverse proxies must not hold back the stream (progressive playback)
+            # Seekable, cacheable copy once the stream has completed (fetched with the same X-API-Key)
+            "Content-Location": url_for('cached_audio', key=key),
         }
     )
 
+@app.route('/audio/<key>', methods=['GET', 'HEAD'])
+def cached_audio(key: str):
+    """Serves a completed clip synthesized with the caller's API key (X-API-Key header) from the response cache."""
+    api_key = request.headers.get("X-API-Key")
+    if not api_key:
+        return jsonify({"error": "API Key is required."}), 401
+    audio = RESPONSE_CACHE.get(_scoped_key(api_key, key))
+    if audio is None:
+        return jsonify({"error": "Audio not found or expired."}), 404
+    return _cached_audio_response(audio, key)
+
+# --- Bulk Synthesis Jobs ---
+def get_job_store() -> JobStore:
+    """Opens the job database and starts the worker pool on first use."""
+    global _job_store, _job_pool
+    with _jobs_lock:
+        if _job_store is None:
+            tts_config = dict(JOBS_TTS_CONFIG)
+            if JOBS_PROVIDER == "mock":
+                tts_config.setdefault("mock_enabled", True)
+            _job_store = JobStore(JOBS_DB)
+            _job_pool = WorkerPool(JOBS_DB, tts_config, workers=JOBS_WORKERS).start()
+            atexit.register(_job_pool.stop)
+        return _job_store
+
+def _job_client() -> Tuple[Optional[str], Optional[Tuple[Response, int]]]:
+    """Authenticates a jobs request: returns (client id, None), or (None, error response)."""
+    if not JOBS_PROVIDER or not JOBS_API_KEY_DIGESTS:
+        return None, (jsonify({"error": "Bulk jobs are not enabled on this server."}), 503)
+    auth = request.headers.get("Authorization", "")
+    api_key = auth[7:].strip() if auth[:7].lower() == "bearer " else request.headers.get("X-API-Key", "")
+    if api_key:
+        digest = _digest(api_key)
+        for allowed in JOBS_API_KEY_DIGESTS:
+            if hmac.compare_digest(digest, allowed):
+                return digest.hex(), None
+    response = jsonify({"error": "A valid jobs API key is required."})
+    response.headers["WWW-Authenticate"] = 'Bearer realm="jobs"'
+    return None, (response, 401)
+
+
+def _job_submit_limiter(client: str) -> RateLimiter:
+    with _jobs_lock:
+        limiter = _job_submit_limiters.get(client)
+        if limiter is None:
+            limiter = _job_submit_limiters[client] = RateLimiter(
+                requests_per_second=JOBS_SUBMITS_PER_MINUTE / 60.0, burst=max(1.0, JOBS_SUBMITS_PER_MINUTE)
+            )
+        return limiter
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Enqueues a bulk job: {"texts": [...], "output_format": "mp3"}. Poll the returned status URL."""
+    client, error = _job_client()
+    if error is not None:
+        return error
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    texts = data.get("texts")
+    output_format = data.get("output_format", DEFAULT_OUTPUT_FORMAT)
+    if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+        return jsonify({"error": "'texts' must be a non-empty list of non-empty strings."}), 400
+    if len(texts) > MAX_JOB_ITEMS:
+        return jsonify({"error": f"A job may contain at most {MAX_JOB_ITEMS} texts."}), 400
+    if not isinstance(output_format, str) or output_format not in AUDIO_MIME_TYPES:
+        return jsonify({"error": f"'output_format' must be one of {sorted(AUDIO_MIME_TYPES)}."}), 400
+
+    permit = _job_submit_limiter(client).try_acquire()
+    if permit is None:
+        retry_after = str(max(1, round(60 / JOBS_SUBMITS_PER_MINUTE)))
+        return jsonify({"error": "Too many job submissions, please retry later."}), 429, {"Retry-After": retry_after}
+    permit.release() # Only the submission rate is limited, not concurrency
+    store = get_job_store()
+    if store.unfinished(owner=client) + len(texts) > JOBS_MAX_UNFINISHED_TASKS:
+        return jsonify({
+            "error": f"At most {JOBS_MAX_UNFINISHED_TASKS} texts may be queued per client; wait for earlier jobs to finish."
+        }), 429, {"Retry-After": "60"}
+
+    job_id = store.submit([BatchItem(text, JOBS_PROVIDER, output_format=output_format) for text in texts], owner=client)
+    status_url = url_for('job_status', job_id=job_id)
+    return jsonify({"job_id": job_id, "status_url": status_url}), 202, {"Location": status_url}
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id: str):
+    """Reports a job's progress and, per task, its state and download URL once done."""
+    client, error = _job_client()
+    if error is not None:
+        return error
+    store = get_job_store()
+    summary = store.job(job_id, owner=client)
+    if summary is None:
+        return jsonify({"error": "Job not found."}), 404
+    summary["tasks"] = [{
+        "position": task.position,
+        "status": task.status,
+        "attempts": task.attempts,
+        "error": task.error,
+        "audio_url": url_for('job_audio', job_id=job_id, position=task.position) if task.status == DONE else None,
+    } for task in store.tasks(job_id)]
+    return jsonify(summary)
+
+@app.route('/jobs/<job_id>/audio/<int:position>')
+def job_audio(job_id: str, position: int):
+    """Downloads the audio of a finished task (supports ETag and Range requests)."""
+    client, error = _job_client()
+    if error is not None:
+        return error
+    store = get_job_store()
+    task = store.task(job_id, position) if store.job(job_id, owner=client) is not None else None
+    if task is None or task.status != DONE:
+        return jsonify({"error": "Audio not found or not ready."}), 404
+    response = send_file(
+        task.output_path,
+        mimetype=AUDIO_MIME_TYPES.get(task.output_format, "application/octet-stream"),
+        conditional=True,
+        max_age=86400,
+    )
+    response.cache_control.public = False
+    response.cache_control.private = True # Per client: shared caches must not serve it to others
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Exposes synthesis metrics in the Prometheus text format."""
+    return Response(REGISTRY.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+# --- Warm-up and Readiness ---
+def _warm_connections() -> Dict[str, Optional[str]]:
+    """Resolves the Cartesia host and, with a warm-up key, opens that key's pooled connections."""
+    url = urllib.parse.urlsplit(CARTESIA_API_URL)
+    try:
+        socket.getaddrinfo(url.hostname, url.port or (443 if url.scheme == 'https' else 80))
+        if WARMUP_API_KEY:
+            with CLIENT_POOL.lease('cartesia', WARMUP_API_KEY, _tenant_session, connections=TENANT_TRANSPORT.pool_maxsize) as session:
+                # Any response will do (the endpoint only accepts POST): the connection stays pooled
+                warm_connections(
+                    lambda: session.head(CARTESIA_API_URL, timeout=TENANT_TRANSPORT.timeout()).close(), WARMUP_CONNECTIONS
+                )
+    except (OSError, requests.exceptions.RequestException) as e:
+        app.logger.warning("Connection warm-up failed: %s", e)
+        return {"cartesia": str(e)}
+    return {"cartesia": None}
+
+
+def _presynthesize(item: BatchItem) -> None:
+    """Synthesizes one prompt into the response cache with the warm-up key (served to live requests made with that key)."""
+    key = _scoped_key(WARMUP_API_KEY, make_cache_key('cartesia', item.text, SYNTH_ARGS))
+    stream, _ = join_or_start_stream(key, WARMUP_API_KEY, item.text, priority="bulk")
+    for _ in stream.iter_chunks(): # Raises SynthesisError if the call failed
+        pass
+
+
+def _is_cached(item: BatchItem) -> bool:
+    return RESPONSE_CACHE.get(_scoped_key(WARMUP_API_KEY, make_cache_key('cartesia', item.text, SYNTH_ARGS))) is not None
+
+
+def get_warmer() -> Warmer:
+    """Starts this process's warm-up on first use, and again in each forked worker (e.g. gunicorn --preload)."""
+    global _warmer, _warmer_pid
+    if _warmer is not None and _warmer_pid == os.getpid():
+        return _warmer
+    with _warmer_lock:
+        if _warmer is None or _warmer_pid != os.getpid():
+            _warmer = Warmer(
+                synthesize=_presynthesize if WARMUP_API_KEY else None,
+                manifest=load_manifest(WARMUP_MANIFEST, 'cartesia') if WARMUP_MANIFEST else (),
+                connect=_warm_connections,
+                tracker=HOT_PROMPTS,
+                is_cached=_is_cached,
+                concurrency=WARMUP_CONCURRENCY,
+                hot_prompts=HOT_PROMPT_COUNT,
+                refresh_interval=HOT_REFRESH_SECONDS,
+            ).start()
+            _warmer_pid = os.getpid()
+        return _warmer
+
+@app.before_request
+def _start_warm_up():
+    # Started by the first request (usually the load balancer's /readyz probe), not at
+    # import, so importing the module never opens connections or starts threads
+    get_warmer()
+
+@app.route('/readyz')
+def readyz():
+    """Readiness probe: 200 once this worker is warmed up, 503 with its progress until then."""
+    warmer = get_warmer()
+    return jsonify(warmer.status()), 200 if warmer.ready else 503
+
 # --- Run the App ---
 if __name__ == '__main__':
+    get_warmer()
     # Use port 5001 to avoid potential conflicts with default port 5000
     app.run(debug=True, port=5001) # debug=True for development (auto-reloads)
\ No newline at end of file
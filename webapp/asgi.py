@@ -0,0 +1,542 @@
+"""
+Async (ASGI) version of the webapp, for production serving.
+
+Same contract as app.py (`GET /`, `POST /generate_speech`, `GET /metrics`,
+`GET /readyz`, plus the realtime WebSocket `/ws/speech`, which app.py cannot offer), but the Cartesia relay runs on one pooled `httpx.AsyncClient`, so a listener
+costs a coroutine instead of a worker thread and upstream connections are
+reused across requests. Run with:
+
+    uvicorn asgi:app --app-dir webapp --port 5001
+
+Requires httpx and an ASGI server such as uvicorn (Jinja2 renders the index page).
+
+Streaming is backpressure-aware: the next upstream read only happens once the
+previous chunk was handed to the server, so a slow listener slows its upstream
+read instead of growing a buffer. A client disconnect cancels the upstream
+request immediately.
+
+`/ws/speech` speaks text as it is being produced (e.g. LLM tokens). The client
+sends JSON text messages:
+
+    {"type": "start", "apiKey": "..."}     first message
+    {"type": "text", "text": "..."}        any fragment; sentences are spoken as soon as they are complete
+    {"type": "flush"}                      end of turn: speak the remaining text now
+    {"type": "cancel"}                     barge-in: drop all unspoken text and audio
+    {"type": "close"}                      finish the remaining audio, then close
+
+and receives audio as binary messages (an 8-byte header, the frame's sequence
+number and segment index as big-endian uint32, followed by MP3 data) plus JSON
+events: `segment` (a text chunk starts playing), `cancelled` (frames from `seq`
+on belong to the new speech), `error` and `done`.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import struct
+import mimetypes
+from typing import Optional, Dict, Any, List, Tuple
+
+import httpx
+
+# Make the UnifiedTTS package (repository root) importable when running from webapp/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from UnifiedTTS.exceptions import DeadlineExceededError, SynthesisError
+from UnifiedTTS.transport import TransportConfig, build_httpx_limits, asend_with_retries
+from UnifiedTTS.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE, MetricsHooks, Observation, SynthesisEvent
+from UnifiedTTS.incremental import AsyncTextStream, TextChunker
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration (mirrors app.py) ---
+CARTESIA_API_URL = os.environ.get("CARTESIA_API_URL", "https://api.cartesia.ai/v1/text-to-speech")
+DEFAULT_VOICE_ID = "c61e634d-5f60-4949-b3e6-c886016bdf5f"
+DEFAULT_MODEL_ID = "sonic-english"
+DEFAULT_OUTPUT_FORMAT = "mp3"
+DEFAULT_SAMPLE_RATE = 24000
+AUDIO_MIME_TYPES = {"mp3": "audio/mpeg", "wav": "audio/wav", "pcm": "audio/pcm"}
+# Upper bound on the time spent reaching Cartesia (connect + retries) per request
+UPSTREAM_DEADLINE_SECONDS = 30.0
+# Largest accepted /generate_speech request body
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Largest accepted WebSocket message
+MAX_MESSAGE_BYTES = 64 * 1024
+# Binary audio frame header on /ws/speech: sequence number, segment index
+FRAME_HEADER = struct.Struct('>II')
+# Text chunks synthesized concurrently ahead of the one being played, per socket
+SOCKET_PREFETCH = 2
+
+# Adaptive chunking: the first bytes go out immediately (time to first audio), later
+# chunks grow while the listener keeps up, fewer and larger writes per stream.
+MIN_CHUNK_SIZE = 4 * 1024
+MAX_CHUNK_SIZE = 64 * 1024
+# Upstream pieces arriving further apart than this reset coalescing to MIN_CHUNK_SIZE,
+# so audio from a slow (real-time) upstream is forwarded as it arrives
+COALESCE_MAX_GAP = 0.05
+# A send faster than this means the listener is keeping up, so the chunk size may grow
+FAST_SEND_SECONDS = 0.005
+
+# --- Upstream Transport ---
+# Pooled keep-alive clients shared by all requests: `pool_connections` client shards of
+# `pool_maxsize` connections each, sized for thousands of concurrent streams per process
+CARTESIA_TRANSPORT = TransportConfig(
+    pool_connections=128, pool_maxsize=32, connect_timeout=5.0, read_timeout=30.0
+)
+
+# Connections opened at startup (spread over the client shards) before /readyz reports
+# ready, so the first requests after a deploy skip DNS, TCP and TLS setup. Defaults to one per shard.
+WARMUP_CONNECTIONS = int(os.environ.get("WEBAPP_WARMUP_CONNECTIONS", str(CARTESIA_TRANSPORT.pool_connections)))
+WARMUP_CONCURRENCY = 16
+
+WEBAPP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(WEBAPP_DIR, 'static')
+TEMPLATES_DIR = os.path.join(WEBAPP_DIR, 'templates')
+
+RELAY_HOOKS = [MetricsHooks(REGISTRY)]
+FIRST_AUDIO_SECONDS = REGISTRY.histogram(
+    'webapp_socket_first_audio_seconds', 'Time from the first text fragment of a turn to its first audio frame on /ws/speech.'
+)
+
+
+class ShardedClient:
+    """
+    Spreads requests round-robin over several `httpx.AsyncClient` pools.
+
+    httpcore rescans every pooled connection against every queued request on
+    each request start and close, so one pool with thousands of streaming
+    connections spends most of its CPU on bookkeeping; many small pools keep
+    that cost flat.
+    """
+
+    def __init__(self, config: TransportConfig):
+        _, timeout = build_httpx_limits(config)
+        limits = httpx.Limits(
+            max_connections=config.pool_maxsize,
+            max_keepalive_connections=config.pool_maxsize,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        self.clients = [httpx.AsyncClient(limits=limits, timeout=timeout) for _ in range(max(1, config.pool_connections))]
+        self._next = 0
+
+    def pick(self) -> httpx.AsyncClient:
+        client = self.clients[self._next]
+        self._next = (self._next + 1) % len(self.clients)
+        return client
+
+    async def aclose(self) -> None:
+        for client in self.clients:
+            await client.aclose()
+
+
+class RelayApp:
+    """Minimal ASGI application; no web framework needed beyond an ASGI server."""
+
+    def __init__(self):
+        self.client: Optional[ShardedClient] = None
+        self._index_html: Optional[bytes] = None
+        self._warmup: Optional[asyncio.Task] = None
+        self._warmup_status: Dict[str, Any] = {"ready": False, "opened": 0, "failed": 0}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] == 'websocket':
+            if scope['path'] == '/ws/speech':
+                await self.speech_socket(receive, send)
+            else:
+                await receive() # websocket.connect
+                await send({'type': 'websocket.close', 'code': 4404})
+            return
+        if scope['type'] != 'http':
+            return
+        path, method = scope['path'], scope['method']
+        if path == '/' and method in ('GET', 'HEAD'):
+            await self._send_body(send, 200, self._render_index(), 'text/html; charset=utf-8')
+        elif path.startswith('/static/') and method in ('GET', 'HEAD'):
+            await self._serve_static(path[len('/static/'):], send)
+        elif path == '/generate_speech' and method == 'POST':
+            await self.generate_speech(receive, send)
+        elif path == '/metrics' and method == 'GET':
+            await self._send_body(send, 200, REGISTRY.render_prometheus().encode('utf-8'), PROMETHEUS_CONTENT_TYPE)
+        elif path == '/readyz' and method == 'GET':
+            self._start_warm_up()
+            await self._send_json(send, 200 if self._warmup_status["ready"] else 503, self._warmup_status)
+        elif path in ('/', '/generate_speech', '/metrics', '/readyz'):
+            await self._send_json(send, 405, {"error": "Method not allowed."})
+        else:
+            await self._send_json(send, 404, {"error": "Not found."})
+
+    # --- Lifespan ---
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._get_client()
+                self._start_warm_up() # In the background: /readyz reports when it is done
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._warmup is not None and not self._warmup.done():
+                    self._warmup.cancel()
+                if self.client is not None:
+                    await self.client.aclose()
+                    self.client = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _get_client(self) -> ShardedClient:
+        # Also created lazily, for servers that do not run the lifespan protocol
+        if self.client is None:
+            self.client = ShardedClient(CARTESIA_TRANSPORT)
+        return self.client
+
+    # --- Warm-up ---
+
+    def _start_warm_up(self) -> None:
+        # Also started by the first /readyz, for servers that do not run the lifespan protocol
+        if self._warmup is None:
+            self._warmup = asyncio.ensure_future(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        """Opens WARMUP_CONNECTIONS pooled connections to Cartesia, round-robin over the client shards."""
+        started = time.monotonic()
+        client = self._get_client()
+        slots = asyncio.Semaphore(WARMUP_CONCURRENCY)
+
+        async def open_one(shard: httpx.AsyncClient) -> None:
+            async with slots:
+                try:
+                    # Any response will do (the endpoint only accepts POST): the connection stays pooled
+                    await shard.head(CARTESIA_API_URL)
+                    self._warmup_status["opened"] += 1
+                except httpx.HTTPError as e:
+                    logger.warning("Connection warm-up failed: %s", e)
+                    self._warmup_status["failed"] += 1
+
+        await asyncio.gather(*(open_one(client.pick()) for _ in range(WARMUP_CONNECTIONS)))
+        self._warmup_status.update(ready=True, ready_after_s=round(time.monotonic() - started, 3))
+
+    # --- /generate_speech ---
+
+    async def generate_speech(self, receive, send) -> None:
+        """Relays Cartesia audio to the client as it arrives."""
+        body, disconnected = await self._read_body(receive)
+        if disconnected:
+            return
+        if body is None:
+            await self._send_json(send, 413, {"error": "Request body too large."})
+            return
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            await self._send_json(send, 400, {"error": "Request body must be a JSON object."})
+            return
+        api_key, text = data.get('apiKey'), data.get('text')
+
+        observation = Observation(RELAY_HOOKS, SynthesisEvent('request', 'cartesia', text or '', {
+            'model_id': DEFAULT_MODEL_ID,
+            'voice_id': DEFAULT_VOICE_ID,
+            'output_format': DEFAULT_OUTPUT_FORMAT,
+            'sample_rate': DEFAULT_SAMPLE_RATE,
+        }, streaming=True))
+
+        # Watch for the client going away while we wait on the upstream, too
+        disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+        upstream = asyncio.ensure_future(self._open_upstream(api_key, text))
+        try:
+            await asyncio.wait({disconnect, upstream}, return_when=asyncio.FIRST_COMPLETED)
+            if not upstream.done():
+                observation.cancel()
+                return
+            response, error = upstream.result()
+            if error is not None:
+                observation.fail(error.get("exception") or SynthesisError(error["error"]))
+                await self._send_json(send, error["status_code"], {"error": error["error"]})
+                return
+
+            relay = asyncio.ensure_future(self._relay(response, send, observation))
+            await asyncio.wait({disconnect, relay}, return_when=asyncio.FIRST_COMPLETED)
+            if not relay.done():
+                relay.cancel() # Client is gone: stop reading from Cartesia right away
+            try:
+                await relay
+            except (asyncio.CancelledError, OSError):
+                pass
+        except Exception as e:
+            observation.fail(e) # No-op if the relay already recorded the outcome
+            raise
+        finally:
+            disconnect.cancel()
+            if not upstream.done():
+                upstream.cancel()
+            elif not upstream.cancelled() and upstream.exception() is None:
+                response, _ = upstream.result()
+                if response is not None:
+                    await response.aclose()
+
+    async def _open_upstream(self, api_key: Optional[str], text: Optional[str]) -> Tuple[Optional[httpx.Response], Optional[Dict[str, Any]]]:
+        """Starts the Cartesia request; returns (streaming response, None) or (None, error dict)."""
+        if not api_key or not text:
+            return None, {"error": "API Key and Text are required.", "status_code": 400}
+
+        headers = {
+            "Cartesia-Version": "2024-05-10",
+            "X-API-Key": api_key,
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "text": text,
+            "voice_id": DEFAULT_VOICE_ID,
+            "model_id": DEFAULT_MODEL_ID,
+            "output_format": {
+                "container": DEFAULT_OUTPUT_FORMAT,
+                "encoding": "mp3",
+                "sample_rate": DEFAULT_SAMPLE_RATE,
+            },
+        }
+        try:
+            response = await asend_with_retries(
+                self._get_client().pick(), 'POST', CARTESIA_API_URL, CARTESIA_TRANSPORT,
+                deadline=time.monotonic() + UPSTREAM_DEADLINE_SECONDS,
+                stream=True, headers=headers, json=payload,
+            )
+        except DeadlineExceededError as e:
+            logger.error("API Call Failed: %s", e)
+            return None, {"error": "Timed out waiting for the Cartesia API.", "status_code": 504, "exception": e}
+        except httpx.HTTPError as e:
+            logger.error("API Call Failed: %s", e)
+            return None, {"error": f"Error connecting to Cartesia API: {e}", "status_code": 500, "exception": e}
+
+        if response.status_code >= 400:
+            await response.aread()
+            await response.aclose()
+            try:
+                details = response.json()
+                message = details.get('message', response.text) if isinstance(details, dict) else response.text
+            except ValueError:
+                message = response.text
+            error_message = f"Cartesia API Error ({response.status_code}): {message}"
+            logger.error("API Call Failed: %s", error_message)
+            return None, {"error": error_message, "status_code": response.status_code}
+        return response, None
+
+    async def _relay(self, response: httpx.Response, send, observation: Observation) -> None:
+        """Streams the upstream body to the client with adaptive, backpressure-aware chunking."""
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', AUDIO_MIME_TYPES[DEFAULT_OUTPUT_FORMAT].encode()),
+                (b'content-disposition', b'inline; filename=speech.mp3'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        chunks = observation.wrap_async_stream(response.aiter_bytes())
+        target = MIN_CHUNK_SIZE
+        buffer: List[bytes] = []
+        buffered = 0
+        first = True
+        last_arrival = time.monotonic()
+        try:
+            async for piece in chunks:
+                now = time.monotonic()
+                if now - last_arrival > COALESCE_MAX_GAP:
+                    target = MIN_CHUNK_SIZE # Upstream is the bottleneck: stop holding audio back
+                last_arrival = now
+                buffer.append(piece)
+                buffered += len(piece)
+                if first or buffered >= target:
+                    target = await _flush(send, buffer, target, grow=not first)
+                    buffered = 0
+                    first = False
+            if buffered:
+                await _flush(send, buffer, target, grow=False)
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            await chunks.aclose()
+
+    # --- /ws/speech ---
+
+    async def speech_socket(self, receive, send) -> None:
+        """Speaks text fragments as they arrive; see the module docstring for the protocol."""
+        if (await receive())['type'] != 'websocket.connect':
+            return
+        await send({'type': 'websocket.accept'})
+
+        stream: Optional[AsyncTextStream] = None
+        writer: Optional[asyncio.Future] = None
+        turn_started: List[Optional[float]] = [None] # Monotonic time of the turn's first fragment
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'websocket.disconnect':
+                    return
+                raw = message.get('text')
+                if raw is None or len(raw) > MAX_MESSAGE_BYTES:
+                    await _send_event(send, 'error', error="Expected a JSON text message.")
+                    continue
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = None
+                kind = data.get('type') if isinstance(data, dict) else None
+
+                if stream is None:
+                    api_key = data.get('apiKey') if kind == 'start' else None
+                    if not api_key:
+                        await _send_event(send, 'error', error="The first message must be a 'start' message with an API key.")
+                        await send({'type': 'websocket.close', 'code': 1008})
+                        return
+                    stream = AsyncTextStream(
+                        lambda text: self._upstream_audio(api_key, text),
+                        chunker=TextChunker(),
+                        prefetch=SOCKET_PREFETCH,
+                    )
+                    writer = asyncio.ensure_future(self._send_frames(stream, send, turn_started))
+                elif kind == 'text' and isinstance(data.get('text'), str):
+                    if turn_started[0] is None:
+                        turn_started[0] = time.monotonic()
+                    stream.feed(data['text'])
+                elif kind == 'flush':
+                    stream.flush()
+                elif kind == 'cancel':
+                    turn_started[0] = None
+                    await _send_event(send, 'cancelled', seq=stream.cancel())
+                elif kind == 'close':
+                    stream.close()
+                    await writer # Finishes the remaining audio and closes the socket
+                    return
+                else:
+                    await _send_event(send, 'error', error="Unknown message type.")
+        finally:
+            if stream is not None:
+                await stream.aclose() # No-op once finished; stops upstream requests on disconnect
+            if writer is not None and not writer.done():
+                writer.cancel()
+                try:
+                    await writer
+                except (asyncio.CancelledError, OSError):
+                    pass
+
+    async def _send_frames(self, stream: AsyncTextStream, send, turn_started: List[Optional[float]]) -> None:
+        """Sends the stream's audio as binary frames, announcing each text segment first."""
+        segment = None
+        try:
+            async for frame in stream:
+                if frame.segment != segment:
+                    segment = frame.segment
+                    await _send_event(send, 'segment', segment=segment, seq=frame.seq, text=frame.text)
+                if turn_started[0] is not None:
+                    FIRST_AUDIO_SECONDS.observe(time.monotonic() - turn_started[0])
+                    turn_started[0] = None
+                await send({'type': 'websocket.send', 'bytes': FRAME_HEADER.pack(frame.seq, frame.segment) + frame.data})
+        except SynthesisError as e:
+            await _send_event(send, 'error', error=str(e))
+            await send({'type': 'websocket.close', 'code': 1011})
+            return
+        await _send_event(send, 'done')
+        await send({'type': 'websocket.close', 'code': 1000})
+
+    async def _upstream_audio(self, api_key: str, text: str):
+        """Streams the Cartesia audio for one text chunk; raises SynthesisError if the request fails."""
+        observation = Observation(RELAY_HOOKS, SynthesisEvent('request', 'cartesia', text, {
+            'model_id': DEFAULT_MODEL_ID,
+            'voice_id': DEFAULT_VOICE_ID,
+            'output_format': DEFAULT_OUTPUT_FORMAT,
+            'sample_rate': DEFAULT_SAMPLE_RATE,
+        }, streaming=True))
+        response, error = await self._open_upstream(api_key, text)
+        if error is not None:
+            observation.fail(error.get("exception") or SynthesisError(error["error"]))
+            raise SynthesisError(error["error"])
+        try:
+            async for chunk in observation.wrap_async_stream(response.aiter_bytes()):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    # --- Static content ---
+
+    def _render_index(self) -> bytes:
+        """Renders templates/index.html once (it only uses `url_for('static', ...)`)."""
+        if self._index_html is None:
+            import jinja2 # Installed with Flask; only needed to render the page
+
+            env = jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATES_DIR), autoescape=True)
+            url_for = lambda endpoint, filename: f'/static/{filename}'
+            self._index_html = env.get_template('index.html').render(url_for=url_for).encode('utf-8')
+        return self._index_html
+
+    async def _serve_static(self, filename: str, send) -> None:
+        path = os.path.realpath(os.path.join(STATIC_DIR, filename))
+        if not path.startswith(os.path.realpath(STATIC_DIR) + os.sep) or not os.path.isfile(path):
+            await self._send_json(send, 404, {"error": "Not found."})
+            return
+        loop = asyncio.get_running_loop()
+        with open(path, 'rb') as f:
+            body = await loop.run_in_executor(None, f.read)
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        await self._send_body(send, 200, body, content_type)
+
+    # --- Helpers ---
+
+    @staticmethod
+    async def _read_body(receive) -> Tuple[Optional[bytes], bool]:
+        """Returns (body, disconnected); body is None if it exceeds MAX_REQUEST_BYTES."""
+        parts = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None, True
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_REQUEST_BYTES:
+                return None, False
+            parts.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(parts), False
+
+    @staticmethod
+    async def _send_body(send, status: int, body: bytes, content_type: str) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', content_type.encode()), (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @classmethod
+    async def _send_json(cls, send, status: int, payload: Dict[str, Any]) -> None:
+        await cls._send_body(send, status, json.dumps(payload).encode('utf-8'), 'application/json')
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def _send_event(send, kind: str, **fields) -> None:
+    await send({'type': 'websocket.send', 'text': json.dumps({'type': kind, **fields})})
+
+
+async def _flush(send, buffer: List[bytes], target: int, grow: bool) -> int:
+    """Sends the buffered pieces as one chunk and returns the next chunk size target."""
+    body = buffer[0] if len(buffer) == 1 else b''.join(buffer)
+    buffer.clear()
+    start = time.monotonic()
+    # The server applies backpressure here: this waits while the client's socket is full
+    await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    if grow and time.monotonic() - start < FAST_SEND_SECONDS:
+        return min(target * 2, MAX_CHUNK_SIZE)
+    return target
+
+
+app = RelayApp()